@@ -97,6 +97,9 @@ ECDICT_DB_PATH = get_resource_path("ecdict.db", BASE_DIR / "static" / "ecdict.db
 # JMDICT_DB_PATH：内置日语词典（JMdict English）
 JMDICT_DB_PATH = get_resource_path("jmdict.db", BASE_DIR / "static" / "jmdict.db")
 
+# LEMMA_DB_PATH：由 ECDICT exchange 字段生成的屈折形式 -> 原型表（scripts/build_lemma_table.py）
+LEMMA_DB_PATH = get_resource_path("ecdict_lemmas.db", BASE_DIR / "static" / "ecdict_lemmas.db")
+
 # OPEN_DICT_DB_PATH：通常只在开发环境使用
 OPEN_DICT_DB_PATH = get_resource_path("open_dict.db", BASE_DIR / "data" / "open_dict.db")  # Legacy fallback
 
@@ -194,9 +194,10 @@ def ensure_fts5_index(db_path: str):
         
         # 创建自动同步触发器（UPDATE）
         # 对于 FTS5 外部内容表，更新时需先删除旧行再插入新行
+        # 只在索引相关列变化时触发，更新单词坐标等列不重建索引
         cursor.execute("DROP TRIGGER IF EXISTS pages_au;")
         cursor.execute("""
-            CREATE TRIGGER pages_au AFTER UPDATE ON pages BEGIN
+            CREATE TRIGGER pages_au AFTER UPDATE OF book_id, page_number, text_content ON pages BEGIN
                 INSERT INTO pages_fts(pages_fts, id) VALUES('delete', OLD.id);
                 INSERT INTO pages_fts(id, book_id, page_number, text_content)
                 VALUES (NEW.id, NEW.book_id, NEW.page_number, NEW.text_content);
@@ -268,6 +269,26 @@ async def lifespan(app: FastAPI):
                 except Exception as e:
                     logger.warning(f"添加列 books.language 失败: {e}")
 
+            if "processed_pages" not in book_columns:
+                try:
+                    conn.execute(text("ALTER TABLE books ADD COLUMN processed_pages INTEGER DEFAULT 0"))
+                    # 已完成的书籍视为全部页面已入库
+                    conn.execute(text("UPDATE books SET processed_pages = total_pages WHERE status = 'completed'"))
+                    conn.commit()
+                    logger.info("已添加列: books.processed_pages")
+                except Exception as e:
+                    logger.warning(f"添加列 books.processed_pages 失败: {e}")
+
+            # 单词坐标打包列（旧书籍可用 scripts/pack_words_data.py 迁移）
+            page_columns = [col["name"] for col in inspector.get_columns("pages")]
+            if "words_packed" not in page_columns:
+                try:
+                    conn.execute(text("ALTER TABLE pages ADD COLUMN words_packed BLOB"))
+                    conn.commit()
+                    logger.info("已添加列: pages.words_packed")
+                except Exception as e:
+                    logger.warning(f"添加列 pages.words_packed 失败: {e}")
+
             # 检查 word_contexts 表是否有 sentence_translation 列
             wc_columns = [col["name"] for col in inspector.get_columns("word_contexts")]
             if "sentence_translation" not in wc_columns:
@@ -303,12 +324,52 @@ async def lifespan(app: FastAPI):
         
     except Exception as e:
         logger.warning(f"调度器启动警告: {e}")
+
+    # 后台加载 ECDICT 词头索引，加载完成后原型校验不再查询 SQLite
+    try:
+        from app.services import ecdict_headwords
+
+        ecdict_headwords.start_background_load()
+    except Exception as e:
+        logger.warning(f"启动词头索引加载失败: {e}")
+
+    # 词形还原表载入内存（表不存在时回退到后缀规则）
+    try:
+        from app.services import lemma_service
+
+        lemma_service.start_background_load()
+    except Exception as e:
+        logger.warning(f"启动词形还原表加载失败: {e}")
+
+    # 恢复上次未完成的词典导入任务（从索引检查点继续）
+    try:
+        resumed = dicts.resume_import_jobs()
+        if resumed:
+            logger.info(f"已恢复 {resumed} 个词典导入任务")
+    except Exception as e:
+        logger.warning(f"恢复词典导入任务失败: {e}")
     yield
     # Shutdown: Stop scheduler
     logger.info("关闭后台任务调度器...")
     if scheduler.running:
         scheduler.shutdown()
 
+    # 关闭远程查词客户端的连接池
+    try:
+        from app.services.remote_lookup import close_remote_client
+
+        close_remote_client()
+    except Exception as e:
+        logger.warning(f"关闭远程查词客户端失败: {e}")
+
+    # 关闭缩略图后台进程池
+    try:
+        from app.services.thumbnail_service import shutdown_thumbnail_pool
+
+        shutdown_thumbnail_pool()
+    except Exception as e:
+        logger.warning(f"关闭缩略图进程池失败: {e}")
+
 
 app = FastAPI(title="多读书 - duodushu API", lifespan=lifespan)
 
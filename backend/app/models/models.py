@@ -26,6 +26,8 @@ class Book(Base):
     cover_image = Column(String)
     total_pages = Column(Integer)
     status = Column(String, default="processing")
+    # 已入库的页数，解析过程中逐批更新，前端据此显示进度并提前打开已就绪的页面
+    processed_pages = Column(Integer, default=0)
     book_type = Column(String, default="normal")  # 'normal' | 'webnovel'
     language = Column(String, default="unknown")
     created_at = Column(SADateTime(timezone=True), nullable=False, server_default=func.now())
@@ -38,7 +40,8 @@ class Page(Base):
     book_id = Column(String, ForeignKey("books.id"), nullable=False)
     page_number = Column(Integer, nullable=False)
     text_content = Column(Text)
-    words_data = Column(JSON)  # [{text, x, y, width, height}]
+    words_data = Column(JSON(none_as_null=True))  # [{text, x, y, width, height}]，已打包时为空
+    words_packed = Column(LargeBinary)  # words_data 的列式打包形式（app/utils/words_codec.py）
     images = Column(JSON)
 
 
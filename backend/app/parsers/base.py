@@ -1,12 +1,49 @@
 from abc import ABC, abstractmethod
-from typing import List, Dict, Any, Optional
+from typing import List, Dict, Any, Iterator
 
 class BaseParser(ABC):
+    """
+    文档解析器基类。
+
+    入库流程按页流式处理：先用 read_metadata 取得元数据和封面，再逐页消费 iter_pages，
+    全部页面写入后调用 finalize 做收尾（如生成缩略图），整本书的页面不会同时驻留内存。
+    parse 保留为一次性返回全部页面的便捷接口。
+    """
+
     @abstractmethod
+    def read_metadata(self, file_path: str, book_id: str) -> Dict[str, Any]:
+        """
+        读取书籍元数据并提取封面。
+
+        Returns:
+            Dict containing:
+            - title: str
+            - author: str
+            - total_pages: int
+            - language: str
+            - cover_image: str (path)
+            - outline: List[Dict]（可选）
+        """
+        pass
+
+    @abstractmethod
+    def iter_pages(self, file_path: str, book_id: str) -> Iterator[Dict[str, Any]]:
+        """
+        按页码顺序逐页生成页面内容。
+
+        Yields:
+            Dict (page_number, text_content, words_data, images)
+        """
+        pass
+
+    def finalize(self, file_path: str, book_id: str) -> None:
+        """全部页面入库后的收尾工作，默认无操作"""
+        return None
+
     def parse(self, file_path: str, book_id: str) -> Dict[str, Any]:
         """
         解析文档，返回书籍元数据和页面内容。
-        
+
         Args:
             file_path: 文档绝对路径
             book_id: 书籍ID
@@ -20,4 +57,7 @@ class BaseParser(ABC):
             - pages: List[Dict] (page_number, text_content, words_data, images)
             - cover_image: str (path)
         """
-        pass
+        metadata = self.read_metadata(file_path, book_id)
+        pages: List[Dict[str, Any]] = list(self.iter_pages(file_path, book_id))
+        self.finalize(file_path, book_id)
+        return {**metadata, "pages": pages}
@@ -1,13 +1,14 @@
 import logging
 import re
 from pathlib import Path
-from typing import Dict, Any, List, Optional
+from typing import Dict, Any, Iterator, List, Optional, Tuple
 
 import ebooklib
 from bs4 import BeautifulSoup
 from ebooklib import epub
 
 from .base import BaseParser
+from ..services.image_output import COVER_OUTPUT, transcode_image
 
 
 class EPUBParser(BaseParser):
@@ -21,24 +22,35 @@ class EPUBParser(BaseParser):
         "image/svg+xml",
     }
 
-    def parse(self, file_path: str, book_id: str) -> Dict[str, Any]:
-        """解析 EPUB 文件"""
-        book = epub.read_epub(file_path)
+    def __init__(self):
+        # 同一实例读取元数据和逐页解析时复用已加载的 EpubBook
+        self._loaded: Optional[Tuple[str, epub.EpubBook]] = None
+
+    def _load(self, file_path: str) -> epub.EpubBook:
+        if self._loaded is None or self._loaded[0] != file_path:
+            self._loaded = (file_path, epub.read_epub(file_path))
+        return self._loaded[1]
+
+    def read_metadata(self, file_path: str, book_id: str) -> Dict[str, Any]:
+        """提取 EPUB 元数据、封面和目录"""
+        book = self._load(file_path)
 
         title = self._get_metadata(book, "DC", "title") or Path(file_path).name
         author = self._get_metadata(book, "DC", "creator") or "Unknown"
         language = self._get_metadata(book, "DC", "language")
 
-        metadata = {
+        return {
             "title": title,
             "author": author,
             "total_pages": self._count_chapters(book),
             "language": language,
+            "cover_image": self._extract_cover(book, book_id, file_path),
+            "outline": self._extract_toc(book),
         }
 
-        cover_image = self._extract_cover(book, book_id, file_path)
-
-        pages_data = []
+    def iter_pages(self, file_path: str, book_id: str) -> Iterator[Dict[str, Any]]:
+        """逐章解析正文，每章作为一页"""
+        book = self._load(file_path)
         chapter_num = 0
 
         for item in book.get_items():
@@ -49,23 +61,15 @@ class EPUBParser(BaseParser):
                 text_content = soup.get_text(separator=" ", strip=True)
                 words_data = self._extract_words_from_text(text_content, chapter_num)
 
-                pages_data.append(
-                    {
-                        "page_number": chapter_num,
-                        "text_content": text_content,
-                        "words_data": words_data,
-                        "images": [],
-                    }
-                )
-
-        outline = self._extract_toc(book)
+                yield {
+                    "page_number": chapter_num,
+                    "text_content": text_content,
+                    "words_data": words_data,
+                    "images": [],
+                }
 
-        return {
-            **metadata,
-            "pages": pages_data,
-            "cover_image": cover_image,
-            "outline": outline,
-        }
+    def finalize(self, file_path: str, book_id: str) -> None:
+        self._loaded = None
 
     def _get_metadata(self, book: epub.EpubBook, namespace: str, name: str) -> Optional[str]:
         """提取元数据"""
@@ -152,11 +156,7 @@ class EPUBParser(BaseParser):
             if ext not in self._IMAGE_EXTENSIONS:
                 ext = ".jpg"
 
-            cover_filename = f"{book_id}_cover{ext}"
-            cover_path = covers_dir / cover_filename
-
-            with open(cover_path, "wb") as f:
-                f.write(img_data)
+            cover_filename = self._save_cover(img_data, ext, covers_dir, book_id)
 
             logger.info(f"[{book_id}] Successfully saved cover to {cover_filename}")
             return cover_filename
@@ -164,6 +164,21 @@ class EPUBParser(BaseParser):
             logger.error(f"[{book_id}] Exception during cover extraction: {e}", exc_info=True)
             return None
 
+    def _save_cover(self, img_data: bytes, ext: str, covers_dir: Path, book_id: str) -> str:
+        """
+        按 COVER_FORMAT / COVER_QUALITY 重新编码封面后保存，返回文件名。
+
+        SVG 等无法解码的图片，或重新编码后反而更大时，保留原始数据。
+        """
+        transcoded = transcode_image(img_data, COVER_OUTPUT) if ext != ".svg" else None
+        if transcoded is not None and len(transcoded[0]) < len(img_data):
+            img_data, ext = transcoded
+
+        cover_filename = f"{book_id}_cover{ext}"
+        with open(covers_dir / cover_filename, "wb") as f:
+            f.write(img_data)
+        return cover_filename
+
     def _extract_cover_from_opf(self, file_path: str, book_id: str, covers_dir: str) -> Optional[str]:
         """直接解析 EPUB zip 中的 OPF XML 提取封面，支持 EPUB2/EPUB3 规范"""
         import posixpath
@@ -262,10 +277,7 @@ class EPUBParser(BaseParser):
                 if ext not in self._IMAGE_EXTENSIONS:
                     ext = ".jpg"
 
-                cover_filename = f"{book_id}_cover{ext}"
-                cover_path = Path(covers_dir) / cover_filename
-                with open(cover_path, "wb") as f:
-                    f.write(img_data)
+                cover_filename = self._save_cover(img_data, ext, Path(covers_dir), book_id)
 
                 logger.info(f"[{book_id}] (OPF) Successfully saved cover to {cover_filename}")
                 return cover_filename
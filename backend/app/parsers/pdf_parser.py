@@ -6,10 +6,17 @@ PDF解析器 - 使用 PyMuPDF (fitz) 进行文字提取
 """
 
 import fitz  # PyMuPDF
+import itertools
 import logging
+import multiprocessing
+import os
+from collections import deque
+from concurrent.futures import ProcessPoolExecutor
+from concurrent.futures.process import BrokenProcessPool
 from pathlib import Path
 from .base import BaseParser
-from typing import Dict, Any, List, Tuple, Optional
+from typing import Dict, Any, Iterator, List, Tuple, Optional
+from ..services.image_output import COVER_OUTPUT, encode_pixmap
 from ..services.thumbnail_service import ThumbnailService
 
 logger = logging.getLogger(__name__)
@@ -17,6 +24,32 @@ logger = logging.getLogger(__name__)
 INLINE_PUNCTUATION = set(",.;:!?)]}%")
 OPENING_PUNCTUATION = set("([{")
 
+# 多进程解析：页数少于该值时串行解析（进程启动开销不划算）
+PARALLEL_MIN_PAGES = 40
+# 每个工作进程任务解析的连续页数
+PAGES_PER_SHARD = 16
+
+
+def default_parse_workers() -> int:
+    """解析工作进程数：环境变量 PDF_PARSE_WORKERS 优先（1 表示串行），否则按 CPU 核数取值，最多 4 个"""
+    value = os.getenv("PDF_PARSE_WORKERS")
+    if value:
+        try:
+            return max(1, int(value))
+        except ValueError:
+            logger.warning(f"PDF_PARSE_WORKERS 无效: {value!r}，使用默认值")
+    return max(1, min(4, (os.cpu_count() or 1) - 1))
+
+
+def _parse_page_range(file_path: str, start: int, end: int) -> List[Dict[str, Any]]:
+    """工作进程入口：独立打开文档，解析 [start, end) 范围内的页面"""
+    parser = PDFParser(workers=1)
+    doc = fitz.open(file_path)
+    try:
+        return [parser._parse_page(doc[page_num - 1], page_num) for page_num in range(start, end)]
+    finally:
+        doc.close()
+
 
 class PDFParser(BaseParser):
     """
@@ -26,50 +59,114 @@ class PDFParser(BaseParser):
     - 智能多栏布局检测（全宽块优先分离，避免跨栏标题破坏排序）
     - 首字下沉等艺术排版处理
     - 动态阈值计算
+    - 大文件按页段分发到多个进程并行解析，输出仍按页码顺序
     """
 
-    def parse(self, file_path: str, book_id: str) -> Dict[str, Any]:
+    def __init__(self, workers: Optional[int] = None):
+        """
+        Args:
+            workers: 解析工作进程数，None 时取 default_parse_workers()，1 表示串行
+        """
+        self.workers = workers if workers is not None else default_parse_workers()
+
+    def read_metadata(self, file_path: str, book_id: str) -> Dict[str, Any]:
         """
-        解析 PDF 文件，提取元数据、封面和每页文字内容。
+        提取 PDF 元数据与封面（首页）。
 
         Args:
             file_path: PDF 文件路径
             book_id: 书籍唯一标识符
 
         Returns:
-            包含元数据和页面数据的字典
+            元数据字典（含 cover_image）
         """
-        pages_data = []
-        metadata = {}
-        cover_image = None
-
         doc = fitz.open(file_path)
-
         try:
-            # 提取元数据
             pdf_meta = doc.metadata
-            metadata = {
+            return {
                 "title": pdf_meta.get("title") or Path(file_path).name,  # type: ignore
                 "author": pdf_meta.get("author") or "Unknown",  # type: ignore
                 "total_pages": len(doc),
                 "language": None,
+                "cover_image": self._extract_cover(doc, file_path, book_id),
             }
+        finally:
+            doc.close()
+
+    def iter_pages(self, file_path: str, book_id: str) -> Iterator[Dict[str, Any]]:
+        """
+        逐页解析文字内容，每次只持有一页的 rawdict 数据。
+
+        Args:
+            file_path: PDF 文件路径
+            book_id: 书籍唯一标识符
 
-            # 提取封面图片（首页）
-            cover_image = self._extract_cover(doc, file_path, book_id)
+        Yields:
+            单页数据字典
+        """
+        if self.workers > 1:
+            doc = fitz.open(file_path)
+            page_count = len(doc)
+            doc.close()
+            if page_count >= PARALLEL_MIN_PAGES:
+                yield from self._iter_pages_parallel(file_path, page_count)
+                return
 
-            # 解析每一页
-            for page_num, page in enumerate(doc, start=1):  # type: ignore
-                page_data = self._parse_page(page, page_num)
-                pages_data.append(page_data)
+        yield from self._iter_pages_serial(file_path)
 
+    def _iter_pages_serial(self, file_path: str, start: int = 1) -> Iterator[Dict[str, Any]]:
+        """在当前进程中从第 start 页起逐页解析"""
+        doc = fitz.open(file_path)
+        try:
+            for page_num in range(start, len(doc) + 1):
+                yield self._parse_page(doc[page_num - 1], page_num)
         finally:
             doc.close()
 
-        # 生成缩略图
-        self._generate_thumbnails(file_path, book_id)
+    def _iter_pages_parallel(self, file_path: str, page_count: int) -> Iterator[Dict[str, Any]]:
+        """
+        按连续页段分发到进程池解析，每个工作进程独立打开文档。
 
-        return {**metadata, "pages": pages_data, "cover_image": cover_image}
+        按提交顺序取回结果以保持页码顺序；在途页段数限制为工作进程数的两倍，
+        消费方（分批入库）较慢时不会积压整本书的解析结果。进程池不可用时退回串行。
+        """
+        shards = iter(
+            (start, min(start + PAGES_PER_SHARD, page_count + 1))
+            for start in range(1, page_count + 1, PAGES_PER_SHARD)
+        )
+        workers = min(self.workers, -(-page_count // PAGES_PER_SHARD))
+        try:
+            # spawn：后端进程中有其他线程在运行，fork 不安全
+            executor = ProcessPoolExecutor(max_workers=workers, mp_context=multiprocessing.get_context("spawn"))
+        except (OSError, ValueError) as e:
+            logger.warning(f"无法创建 PDF 解析进程池，改为串行解析: {e}")
+            yield from self._iter_pages_serial(file_path)
+            return
+
+        logger.info(f"PDF 多进程解析: {page_count} 页, {workers} 个进程")
+        next_page = 1
+        try:
+            pending = deque(
+                executor.submit(_parse_page_range, file_path, start, end)
+                for start, end in itertools.islice(shards, workers * 2)
+            )
+            while pending:
+                pages = pending.popleft().result()
+                shard = next(shards, None)
+                if shard is not None:
+                    pending.append(executor.submit(_parse_page_range, file_path, *shard))
+                for page in pages:
+                    yield page
+                    next_page = page["page_number"] + 1
+        except BrokenProcessPool as e:
+            logger.warning(f"PDF 解析进程异常退出，从第 {next_page} 页起改为串行解析: {e}")
+            yield from self._iter_pages_serial(file_path, start=next_page)
+        finally:
+            executor.shutdown(wait=True, cancel_futures=True)
+
+    def finalize(self, file_path: str, book_id: str) -> None:
+        """全部页面入库后提交缩略图后台生成"""
+        self._generate_thumbnails(file_path, book_id)
 
     def _extract_cover(self, doc: fitz.Document, file_path: str, book_id: str) -> Optional[str]:
         """
@@ -89,13 +186,13 @@ class PDFParser(BaseParser):
                 covers_dir = Path(file_path).parent / "covers"
                 covers_dir.mkdir(parents=True, exist_ok=True)
 
-                cover_filename = f"{book_id}_cover.png"
+                cover_filename = f"{book_id}_cover{COVER_OUTPUT.extension}"
                 cover_path = covers_dir / cover_filename
 
-                # 渲染页面为图片 (150 DPI)
+                # 渲染页面为图片 (150 DPI)，按 COVER_FORMAT / COVER_QUALITY 编码
                 mat = fitz.Matrix(150 / 72, 150 / 72)  # 72 DPI -> 150 DPI
                 pix = first_page.get_pixmap(matrix=mat)
-                pix.save(cover_path)
+                cover_path.write_bytes(encode_pixmap(pix, COVER_OUTPUT))
 
                 return cover_filename
         except Exception as e:
@@ -612,7 +709,7 @@ class PDFParser(BaseParser):
 
     def _generate_thumbnails(self, file_path: str, book_id: str) -> None:
         """
-        为 PDF 所有页面生成缩略图。
+        将 PDF 所有页面的缩略图提交到后台进程池生成（不阻塞入库流程）。
 
         Args:
             file_path: PDF 文件路径
@@ -622,6 +719,6 @@ class PDFParser(BaseParser):
             from ..models.database import UPLOADS_DIR
 
             thumbnail_service = ThumbnailService(UPLOADS_DIR)
-            thumbnail_service.generate_thumbnails(file_path, book_id, resolution=100)
+            thumbnail_service.schedule_thumbnails(file_path, book_id)
         except Exception as e:
             logger.error(f"Failed to generate thumbnails: {e}")
@@ -1,7 +1,7 @@
 import os
 import logging
 from pathlib import Path
-from typing import Dict, Any, List
+from typing import Dict, Any, Iterator, List, Optional, Tuple
 from .base import BaseParser
 
 logger = logging.getLogger(__name__)
@@ -11,65 +11,54 @@ CHARS_PER_PAGE = 2000
 
 
 class TXTParser(BaseParser):
-    def parse(self, file_path: str, book_id: str) -> Dict[str, Any]:
-        """解析 TXT 文件"""
+    def __init__(self):
+        # 同一实例读取元数据和逐页解析时复用分页结果
+        self._pages: Optional[Tuple[str, List[str]]] = None
 
-        logger.info(f"[TXTParser] 开始解析文件: {file_path}")
+    def _load_pages(self, file_path: str) -> List[str]:
+        if self._pages is None or self._pages[0] != file_path:
+            logger.info(f"[TXTParser] 开始解析文件: {file_path}")
 
-        # 尝试多种编码
-        content = self._read_file_with_encoding(file_path)
-        logger.info(f"[TXTParser] 文件内容长度: {len(content) if content else 0}")
+            # 尝试多种编码
+            content = self._read_file_with_encoding(file_path)
+            logger.info(f"[TXTParser] 文件内容长度: {len(content) if content else 0}")
 
-        if not content:
-            raise Exception("无法读取 TXT 文件（编码问题）")
+            if not content:
+                raise Exception("无法读取 TXT 文件（编码问题）")
+
+            # 按固定字符数分页，尽量在换行处分割
+            self._pages = (file_path, self._split_into_pages(content, CHARS_PER_PAGE))
+            logger.info(f"[TXTParser] 分页数量: {len(self._pages[1])}")
+        return self._pages[1]
+
+    def read_metadata(self, file_path: str, book_id: str) -> Dict[str, Any]:
+        """解析 TXT 文件元数据"""
+        pages_content = self._load_pages(file_path)
 
-        # 提取元数据
         # TXT 文件本身包含标题元数据，也不应该使用存储的文件名（UUID）作为标题
         # 让 service 层保留上传时的原始文件名
-        title = None
-        author = "Unknown"
-
-        # 按固定字符数分页，尽量在换行处分割
-        pages_content = self._split_into_pages(content, CHARS_PER_PAGE)
-        total_pages = len(pages_content)
-
-        logger.info(f"[TXTParser] 分页数量: {total_pages}")
-
-        # 构建页面数据
-        pages_data = []
-        for i, page_text in enumerate(pages_content):
-            words_data = self._extract_words_from_text(page_text, i + 1)
-
-            pages_data.append(
-                {
-                    "page_number": i + 1,
-                    "text_content": page_text,
-                    "words_data": words_data,
-                    "images": [],
-                }
-            )
-
-        metadata = {
-            "title": title,
-            "author": author,
-            "total_pages": total_pages,
+        return {
+            "title": None,
+            "author": "Unknown",
+            "total_pages": len(pages_content),
             "language": None,
-        }
-
-        # TXT 没有封面
-        cover_image = None
-
-        result = {
-            **metadata,
-            "pages": pages_data,
-            "cover_image": cover_image,
+            # TXT 没有封面
+            "cover_image": None,
             "outline": [],  # TXT 没有目录
         }
 
-        logger.info(
-            f"[TXTParser] 解析完成 - 页数: {total_pages}, 第一页长度: {len(pages_data[0]['text_content']) if pages_data else 0}"
-        )
-        return result
+    def iter_pages(self, file_path: str, book_id: str) -> Iterator[Dict[str, Any]]:
+        """逐页生成页面数据"""
+        for i, page_text in enumerate(self._load_pages(file_path)):
+            yield {
+                "page_number": i + 1,
+                "text_content": page_text,
+                "words_data": self._extract_words_from_text(page_text, i + 1),
+                "images": [],
+            }
+
+    def finalize(self, file_path: str, book_id: str) -> None:
+        self._pages = None
 
     def _split_into_pages(self, content: str, chars_per_page: int) -> List[str]:
         """按字符数分页，尽量在换行处分割"""
@@ -8,15 +8,16 @@ from fastapi import (
     HTTPException,
     Form,
 )
-from fastapi.responses import FileResponse
+from fastapi.responses import FileResponse, JSONResponse
 from sqlalchemy.orm import Session
 from pydantic import BaseModel, ConfigDict
 from datetime import datetime
 from pathlib import Path
 import logging
-from ..models.database import get_db, BASE_DIR, UPLOADS_DIR
+from ..models.database import get_db, UPLOADS_DIR
 from ..models.models import Book, Page, ReadingProgress, Vocabulary
 from ..services import book_service
+from ..utils.words_codec import PackedWords, load_words
 
 router = APIRouter(prefix="/api/books", tags=["books"])
 logger = logging.getLogger(__name__)
@@ -42,6 +43,7 @@ class BookResponse(BaseModel):
     file_path: Optional[str] = None
     cover_image: Optional[str] = None
     total_pages: Optional[int] = None
+    processed_pages: Optional[int] = None
     status: str
     book_type: Optional[str] = None
     language: Optional[str] = None
@@ -177,6 +179,7 @@ def get_book_status(book_id: str, db: Session = Depends(get_db)):
         "title": book.title,
         "format": book.format,
         "total_pages": book.total_pages,
+        "processed_pages": book_service.get_processed_pages(book),
         "download_url": download_url,
         "cover_image": book.cover_image,
         "language": book.language,
@@ -204,21 +207,24 @@ def save_progress(book_id: str, data: ProgressUpdate, db: Session = Depends(get_
 
 
 @router.get("/thumbnail/{book_id}/{page_number}")
-def get_page_thumbnail(book_id: str, page_number: int):
+def get_page_thumbnail(book_id: str, page_number: int, db: Session = Depends(get_db)):
     """Serve page thumbnail image"""
     from ..services.thumbnail_service import ThumbnailService
 
     thumbnail_service = ThumbnailService(UPLOADS_DIR)
-    thumbnail_path = thumbnail_service.get_thumbnail_path(book_id, page_number)
+    thumbnail_path = thumbnail_service.get_thumbnail_file(book_id, page_number)
 
-    if not thumbnail_path:
-        raise HTTPException(status_code=404, detail="Thumbnail not found")
+    if thumbnail_path is None:
+        # 后台尚未生成（或 lazy 模式）时按需渲染并缓存
+        book = db.query(Book.format, Book.file_path).filter(Book.id == book_id).first()
+        if book and book.format == "pdf" and isinstance(book.file_path, str):
+            pdf_path = (UPLOADS_DIR / Path(book.file_path).name).resolve()
+            thumbnail_path = thumbnail_service.ensure_thumbnail(str(pdf_path), book_id, page_number)
 
-    full_path = (BASE_DIR / thumbnail_path).resolve()
-    if not full_path.exists():
-        raise HTTPException(status_code=404, detail="Thumbnail file missing")
+    if thumbnail_path is None:
+        raise HTTPException(status_code=404, detail="Thumbnail not found")
 
-    return FileResponse(full_path)
+    return FileResponse(thumbnail_path)
 
 
 @router.get("/{book_id}/content")
@@ -253,18 +259,34 @@ def get_book_content(book_id: str, db: Session = Depends(get_db)):
 
 
 @router.get("/{book_id}/pages/{page_number}")
-def get_book_page(book_id: str, page_number: int, db: Session = Depends(get_db)):
+def get_book_page(
+    book_id: str,
+    page_number: int,
+    background_tasks: BackgroundTasks,
+    db: Session = Depends(get_db),
+):
     page = db.query(Page).filter(Page.book_id == book_id, Page.page_number == page_number).first()
 
     if not page:
+        # 书籍仍在入库、该页尚未写入时提示客户端稍后重试
+        book = db.query(Book.status, Book.total_pages).filter(Book.id == book_id).first()
+        if book and book.status == "processing" and (not book.total_pages or page_number <= book.total_pages):
+            raise HTTPException(status_code=404, detail="Page not ready", headers={"Retry-After": "1"})
         raise HTTPException(status_code=404, detail="Page not found")
 
-    return {
-        "page_number": page.page_number,
-        "text_content": page.text_content,
-        "words_data": page.words_data,
-        "images": page.images,
-    }
+    # 响应返回后预取本页和下一页单词的释义，首次点击即可命中查词缓存
+    background_tasks.add_task(book_service.prefetch_page_definitions_task, book_id, page_number)
+
+    # 直接序列化为 JSONResponse，跳过 jsonable_encoder 对上千个单词字典的逐项遍历
+    words = load_words(page.words_data, page.words_packed)  # type: ignore
+    return JSONResponse(
+        {
+            "page_number": page.page_number,
+            "text_content": page.text_content,
+            "words_data": words.to_list() if isinstance(words, PackedWords) else words,
+            "images": page.images,
+        }
+    )
 
 
 @router.get("/", response_model=list[BookResponse])
@@ -1,15 +1,53 @@
-from typing import Optional
+import json
+from typing import List, Optional
 from fastapi import APIRouter, Depends, HTTPException
-from fastapi.responses import Response
+from fastapi.responses import StreamingResponse
 from sqlalchemy.orm import Session
 from pydantic import BaseModel
 from ..models.database import get_db
 from ..services import dict_service, open_dict_service
+from ..services.lookup_cache import get_lookup_cache
 from ..utils.lookup_normalizer import normalize_lookup_word
 
 router = APIRouter(prefix="/api/dict", tags=["dictionary"])
 
 
+@router.get("/cache/stats")
+def get_lookup_cache_stats():
+    """查词缓存的容量与命中统计"""
+    return get_lookup_cache().stats()
+
+
+@router.delete("/cache")
+def clear_lookup_cache():
+    get_lookup_cache().invalidate("手动清空")
+    return {"message": "查词缓存已清空"}
+
+
+class BatchLookupRequest(BaseModel):
+    words: List[str]
+    # 本地词典未命中时是否走 AI / 网络兜底（逐词，较慢）
+    fallback: bool = False
+
+
+@router.post("/batch")
+def batch_lookup(req: BatchLookupRequest):
+    """
+    批量查词，以 NDJSON 流式返回：每行一个 {"word", "lookup_term", "found", "result"}，
+    顺序与请求一致，客户端可以边接收边渲染。
+    """
+    if len(req.words) > dict_service.BATCH_LOOKUP_MAX_WORDS:
+        raise HTTPException(
+            status_code=400, detail=f"单次最多查询 {dict_service.BATCH_LOOKUP_MAX_WORDS} 个单词"
+        )
+
+    def generate():
+        for item in dict_service.lookup_words_batch(req.words, fallback=req.fallback):
+            yield json.dumps(item, ensure_ascii=False) + "\n"
+
+    return StreamingResponse(generate(), media_type="application/x-ndjson")
+
+
 @router.get("/{word}/sources")
 def check_sources(word: str):
     """Check availability of word in different dictionaries"""
@@ -21,13 +59,14 @@ def check_sources(word: str):
 
 
 @router.get("/{word}")
-def get_definition(word: str, source: Optional[str] = None, db: Session = Depends(get_db)):
+async def get_definition(word: str, source: Optional[str] = None, db: Session = Depends(get_db)):
     word = normalize_lookup_word(word)
     if not word:
         raise HTTPException(status_code=400, detail="Invalid word")
     # 注意: source 为 None 时触发多词典模式, 空字符串则不会
     # 所以这里不能用 source or "", 必须保持 None
-    result = dict_service.lookup_word(db, word, source)
+    # 本地查询在线程池执行，AI / 网络兜底异步等待，不占用线程池
+    result = await dict_service.lookup_word_async(db, word, source)
     if not result:
         raise HTTPException(status_code=404, detail="Word not found")
     return result
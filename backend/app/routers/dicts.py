@@ -2,24 +2,29 @@
 词典管理 API 路由
 """
 
-from fastapi import APIRouter, UploadFile, HTTPException, Form
+from fastapi import APIRouter, UploadFile, HTTPException, Form, Header
+from fastapi.responses import Response
 from pydantic import BaseModel
 from typing import List, Optional
 from pathlib import Path
-import shutil
-import tempfile
+import mimetypes
 import re
 import threading
 
 # 从正确的位置导入 DictManager
 from app.services.dict_manager import DictManager
+from app.services.dict_import_jobs import DictImportJobs
 
 # 安全常量
 MAX_MDX_SIZE = 500 * 1024 * 1024  # 500 MB
 
+# 词典资源内容随导入固定，允许浏览器缓存一天，之后凭 ETag 重新验证
+RESOURCE_CACHE_CONTROL = "public, max-age=86400"
+
 router = APIRouter(prefix="/api/dicts", tags=["dicts"])
 
 _dict_manager = None
+_import_jobs = None
 _dict_manager_lock = threading.Lock()
 
 
@@ -38,9 +43,24 @@ def get_dict_manager():
 
 def set_dict_manager(manager: DictManager):
     """用于测试注入"""
-    global _dict_manager
+    global _dict_manager, _import_jobs
     with _dict_manager_lock:
         _dict_manager = manager
+        _import_jobs = None
+
+
+def get_import_jobs() -> DictImportJobs:
+    global _import_jobs
+    manager = get_dict_manager()
+    with _dict_manager_lock:
+        if _import_jobs is None:
+            _import_jobs = DictImportJobs(manager)
+        return _import_jobs
+
+
+def resume_import_jobs() -> int:
+    """启动时恢复未完成的导入任务"""
+    return get_import_jobs().resume_pending()
 
 
 class DictInfo(BaseModel):
@@ -66,9 +86,10 @@ def get_dicts():
     return manager.get_dicts()
 
 
-@router.post("/import")
+@router.post("/import", status_code=202)
 def import_dict(file: UploadFile, name: Optional[str] = Form(None)):
-    manager = get_dict_manager()
+    """创建后台导入任务，通过 GET /api/dicts/import/{job_id} 查询进度"""
+    jobs = get_import_jobs()
 
     if not file.filename or not (file.filename.endswith(".mdx") or file.filename.endswith(".zip")):
         raise HTTPException(400, "只支持 .mdx 或 .zip 文件")
@@ -89,22 +110,37 @@ def import_dict(file: UploadFile, name: Optional[str] = Form(None)):
         max_mb = MAX_MDX_SIZE / 1024 / 1024
         raise HTTPException(413, f"文件过大 ({size_mb:.2f} MB)，最大支持 {max_mb} MB")
 
-    tmp_path = None
-    suffix = ".zip" if file.filename.endswith(".zip") else ".mdx"
     try:
-        with tempfile.NamedTemporaryFile(delete=False, suffix=suffix) as tmp:
-            shutil.copyfileobj(file.file, tmp)
-            tmp_path = Path(tmp.name)
+        job = jobs.submit(file.file, file.filename, clean_name)
+        return {"message": "词典导入任务已创建", "job": job}
+    except ValueError as e:
+        raise HTTPException(400, str(e)) from e
+    except Exception as e:
+        raise HTTPException(500, f"导入失败: {str(e)}") from e
+
 
-        result = manager.import_dict(tmp_path, clean_name)
-        return {"message": "词典导入成功", "dict": result}
+@router.get("/import")
+def list_import_jobs():
+    return get_import_jobs().list_jobs()
+
+
+@router.get("/import/{job_id}")
+def get_import_job(job_id: str):
+    job = get_import_jobs().get(job_id)
+    if job is None:
+        raise HTTPException(404, f"导入任务 {job_id} 不存在")
+    return job
+
+
+@router.delete("/import/{job_id}")
+def cancel_import_job(job_id: str):
+    try:
+        job = get_import_jobs().cancel(job_id)
     except ValueError as e:
         raise HTTPException(400, str(e))
-    except Exception as e:
-        raise HTTPException(500, f"导入失败: {str(e)}")
-    finally:
-        if tmp_path and tmp_path.exists():
-            tmp_path.unlink()
+    if job is None:
+        raise HTTPException(404, f"导入任务 {job_id} 不存在")
+    return {"message": "已请求取消导入", "job": job}
 
 
 @router.delete("/{dict_name}")
@@ -173,25 +209,24 @@ def lookup_dict_word(dict_name: str, word: str):
 
 
 @router.get("/{dict_name}/resource/{path:path}")
-def get_dict_resource(dict_name: str, path: str):
+def get_dict_resource(dict_name: str, path: str, if_none_match: Optional[str] = Header(None)):
     manager = get_dict_manager()
     # Decode path if needed (FastAPI handles path parameters, but sometimes URL encoding persists)
     # usually path is raw string.
-    
-    content = manager.get_resource(dict_name, path)
-    if not content:
-        # Try with leading slash if not present
-        if not path.startswith("/"):
-             content = manager.get_resource(dict_name, f"/{path}")
-             
-    if not content:
+
+    # get_resource_with_etag 内部已尝试 \ 与 / 前缀的各种写法
+    resource = manager.get_resource_with_etag(dict_name, path)
+    if not resource:
         raise HTTPException(404, "Resource not found")
-    
+
+    content, etag = resource
+    headers = {"ETag": etag, "Cache-Control": RESOURCE_CACHE_CONTROL}
+    if if_none_match and etag in [tag.strip() for tag in if_none_match.split(",")]:
+        return Response(status_code=304, headers=headers)
+
     # Determine media type based on extension
-    import mimetypes
     media_type, _ = mimetypes.guess_type(path)
     if not media_type:
         media_type = "application/octet-stream"
-        
-    from fastapi.responses import Response
-    return Response(content=content, media_type=media_type)
+
+    return Response(content=content, media_type=media_type, headers=headers)
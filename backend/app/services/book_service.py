@@ -3,15 +3,30 @@ from ..models.models import Book, Page
 from ..models.database import SessionLocal, BASE_DIR, UPLOADS_DIR
 from ..parsers.factory import ParserFactory
 from .book_language_service import detect_book_language
+from ..utils.words_codec import encode_words_for_storage, load_word_texts
 import uuid
 import os
 import shutil
 import json
 from pathlib import Path
 import logging
+import threading
+import time
 
 logger = logging.getLogger(__name__)
 
+# 同一页在该时间（秒）内只预取一次，翻回已读页不重复解析
+PREFETCH_DEDUP_SECONDS = 300.0
+
+# 入库批次页数：首批较小，尽快让开头几页可读；之后按较大批次提交
+INGEST_FIRST_BATCH_PAGES = 4
+INGEST_BATCH_PAGES = 50
+# 语言检测取前几页文本作为样本
+LANGUAGE_SAMPLE_PAGES = 8
+
+_recent_prefetches: dict = {}
+_recent_prefetches_lock = threading.Lock()
+
 
 def save_upload_file(file, filename: str) -> str:
     """保存上传文件到本地"""
@@ -83,11 +98,11 @@ def verify_and_process_book_task(book_id: str):
             return
 
         parser = ParserFactory.get_parser(str(full_file_path))
-        result = parser.parse(str(full_file_path), book_id)
+        metadata = parser.read_metadata(str(full_file_path), book_id)
 
         # Update book metadata
         # Only update title if parser found a real title, not just the filename (which is a UUID)
-        parsed_title = result.get("title")
+        parsed_title = metadata.get("title")
         file_stem = full_file_path.stem
         
         logger.info(f"Book {book_id} Title Check - Original: '{book.title}', Parsed: '{parsed_title}', FileStem: '{file_stem}'")
@@ -99,42 +114,121 @@ def verify_and_process_book_task(book_id: str):
              else:
                  logger.info(f"Skipping title update: Parsed title '{parsed_title}' matches file stem (likely UUID).")
             
-        book.author = result.get("author")  # type: ignore
-        book.total_pages = result.get("total_pages")  # type: ignore
-        book.cover_image = result.get("cover_image")  # type: ignore
-        pages_data = result.get("pages", [])
-        language_sample = "\n".join(
-            (page.get("text_content") or "").strip()
-            for page in pages_data[:8]
-            if page.get("text_content")
-        )
-        book.language = detect_book_language(language_sample, result.get("language"))  # type: ignore
-
-        # Save pages (批量插入，提升大型书籍的入库性能)
-        batch_size = 500
-        for i in range(0, len(pages_data), batch_size):
-            batch = pages_data[i:i + batch_size]
-            page_objects = [
-                Page(
-                    book_id=book_id,
-                    page_number=p["page_number"],
-                    text_content=p["text_content"],
-                    words_data=p["words_data"],
-                    images=p["images"],
-                )
-                for p in batch
-            ]
-            db.bulk_save_objects(page_objects)
-            db.flush()  # 刷新到数据库但不提交，确保触发器执行
+        book.author = metadata.get("author")  # type: ignore
+        book.total_pages = metadata.get("total_pages")  # type: ignore
+        book.cover_image = metadata.get("cover_image")  # type: ignore
+        book.processed_pages = 0  # type: ignore
+        # 重新处理时清理上次残留的页面
+        db.query(Page).filter(Page.book_id == book_id).delete(synchronize_session=False)
+        db.commit()
+
+        # 逐页解析、分批提交：内存中最多保留一个批次，首批提交后即可打开第 1 页
+        language_sample = []
+        language_detected = False
+        batch = []
+        processed = 0
+        started = time.perf_counter()
+        for page in parser.iter_pages(str(full_file_path), book_id):
+            if processed + len(batch) < LANGUAGE_SAMPLE_PAGES and page.get("text_content"):
+                language_sample.append(page["text_content"].strip())
+            batch.append(page)
+
+            if len(batch) >= (INGEST_FIRST_BATCH_PAGES if processed == 0 else INGEST_BATCH_PAGES):
+                if not language_detected and processed + len(batch) >= LANGUAGE_SAMPLE_PAGES:
+                    book.language = detect_book_language("\n".join(language_sample), metadata.get("language"))  # type: ignore
+                    language_detected = True
+                processed = _save_page_batch(db, book, batch, processed)
+                batch = []
+
+        if not language_detected:
+            book.language = detect_book_language("\n".join(language_sample), metadata.get("language"))  # type: ignore
+        if batch:
+            processed = _save_page_batch(db, book, batch, processed)
 
         book.status = "completed"  # type: ignore
         db.commit()
 
-        logger.info(f"Book {book_id} processing completed: {len(pages_data)} pages")
+        logger.info(f"Book {book_id} processing completed: {processed} pages in {time.perf_counter() - started:.1f}s")
+
+        # 书籍已可阅读，再做缩略图等收尾工作
+        try:
+            parser.finalize(str(full_file_path), book_id)
+        except Exception as e:
+            logger.warning(f"Book {book_id} post-processing failed: {e}")
     except Exception as e:
         logger.error(f"Error processing book {book_id}: {e}", exc_info=True)
         if book is not None:
+            # 已提交的批次保留，阅读器仍可打开这些页面
+            db.rollback()
             book.status = "failed"  # type: ignore
             db.commit()
     finally:
         db.close()
+
+
+def _save_page_batch(db: Session, book: Book, pages: list, processed: int) -> int:
+    """写入一批页面并更新入库进度，返回累计页数"""
+    rows = []
+    for p in pages:
+        words_data, words_packed = encode_words_for_storage(p["words_data"])
+        rows.append(
+            Page(
+                book_id=book.id,
+                page_number=p["page_number"],
+                text_content=p["text_content"],
+                words_data=words_data,
+                words_packed=words_packed,
+                images=p["images"],
+            )
+        )
+    db.bulk_save_objects(rows)
+    processed += len(pages)
+    book.processed_pages = processed  # type: ignore
+    db.commit()
+    logger.debug(f"Book {book.id} ingested {processed}/{book.total_pages} pages")
+    return processed
+
+
+def get_processed_pages(book: Book) -> int:
+    """已入库的页数；迁移前完成的书籍没有记录时按总页数计"""
+    if book.processed_pages is not None:
+        return book.processed_pages  # type: ignore
+    return (book.total_pages or 0) if book.status == "completed" else 0  # type: ignore
+
+
+def prefetch_page_definitions_task(book_id: str, page_number: int):
+    """后台任务：预取当前页与下一页所有单词的释义，写入查词缓存"""
+    key = (book_id, page_number)
+    now = time.monotonic()
+    with _recent_prefetches_lock:
+        if now - _recent_prefetches.get(key, float("-inf")) < PREFETCH_DEDUP_SECONDS:
+            return
+        _recent_prefetches[key] = now
+        # 清理过期记录，避免长时间阅读后无限增长
+        for stale in [k for k, t in _recent_prefetches.items() if now - t >= PREFETCH_DEDUP_SECONDS]:
+            del _recent_prefetches[stale]
+
+    from . import dict_service
+
+    db = SessionLocal()
+    try:
+        pages = (
+            db.query(Page.page_number, Page.words_data, Page.words_packed)
+            .filter(Page.book_id == book_id, Page.page_number.in_([page_number, page_number + 1]))
+            .order_by(Page.page_number)
+            .all()
+        )
+        words = [text for _, words_data, words_packed in pages for text in load_word_texts(words_data, words_packed)]
+        if not words:
+            return
+
+        started = time.perf_counter()
+        stats = dict_service.prefetch_lookups(words)
+        logger.info(
+            f"预取释义 book={book_id} page={page_number}: 解析 {stats['requested']} 词, "
+            f"缓存 {stats['warmed']} 条, 已在缓存 {stats['cached']} 条, 耗时 {time.perf_counter() - started:.2f}s"
+        )
+    except Exception as e:
+        logger.warning(f"预取释义失败 book={book_id} page={page_number}: {e}")
+    finally:
+        db.close()
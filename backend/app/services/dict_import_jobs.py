@@ -0,0 +1,273 @@
+"""
+词典后台导入任务
+上传文件落盘后立即返回任务 ID，由单个工作线程串行执行导入；任务状态持久化为 JSON，
+后端重启后未完成的任务从索引检查点继续。
+"""
+
+import json
+import queue
+import shutil
+import threading
+import time
+import uuid
+from datetime import datetime, timedelta
+from pathlib import Path
+from typing import BinaryIO, Dict, List, Optional
+import logging
+
+from .dict_manager import DictAlreadyExists, DictManager, ImportCancelled
+
+logger = logging.getLogger(__name__)
+
+# 进度写盘的最小间隔（秒），避免每个批次都重写任务文件
+STATE_SAVE_INTERVAL = 1.0
+
+ACTIVE_STATUSES = ("queued", "running")
+
+# 已结束（完成/失败/取消）任务的保留期限与最多保留数量，超出的任务记录被清理
+FINISHED_JOB_RETENTION = timedelta(days=7)
+MAX_FINISHED_JOBS = 20
+
+
+class DictImportJobs:
+    """词典导入任务管理器"""
+
+    def __init__(self, manager: DictManager, jobs_dir: Optional[Path] = None):
+        self.manager = manager
+        self.jobs_dir = jobs_dir or manager.dicts_dir / "import_jobs"
+        self.jobs_dir.mkdir(parents=True, exist_ok=True)
+        self._lock = threading.Lock()
+        self._jobs: Dict[str, Dict] = {}
+        self._cancel_requested: set = set()
+        self._queue: "queue.Queue[str]" = queue.Queue()
+        self._worker: Optional[threading.Thread] = None
+        self._saved_at: Dict[str, float] = {}
+        # 上传文件仍在落盘、尚未创建任务的词典名
+        self._reserved_names: set = set()
+
+        for state_file in self.jobs_dir.glob("*.json"):
+            try:
+                job = json.loads(state_file.read_text(encoding="utf-8"))
+                self._jobs[job["job_id"]] = job
+            except Exception as e:
+                logger.error(f"读取导入任务失败 {state_file.name}: {e}")
+        self._prune_finished()
+
+    # ---- 对外接口 ----
+
+    def submit(self, fileobj: BinaryIO, filename: str, dict_name: str) -> Dict:
+        """保存上传文件并创建导入任务，立即返回任务状态"""
+        # 锁内只检查并预留词典名；上传文件可能很大，落盘在锁外进行，不阻塞任务查询和取消
+        with self._lock:
+            if any(d["name"] == dict_name for d in self.manager.get_dicts()):
+                raise ValueError(f"词典 {dict_name} 已存在")
+            if dict_name in self._reserved_names or any(
+                j["dict_name"] == dict_name and j["status"] in ACTIVE_STATUSES for j in self._jobs.values()
+            ):
+                raise ValueError(f"词典 {dict_name} 正在导入中")
+            self._reserved_names.add(dict_name)
+
+        job_id = uuid.uuid4().hex
+        suffix = ".zip" if filename.lower().endswith(".zip") else ".mdx"
+        source = self.jobs_dir / f"{job_id}{suffix}"
+        try:
+            with open(source, "wb") as f:
+                shutil.copyfileobj(fileobj, f)
+        except BaseException:
+            source.unlink(missing_ok=True)
+            with self._lock:
+                self._reserved_names.discard(dict_name)
+            raise
+
+        with self._lock:
+            self._reserved_names.discard(dict_name)
+            now = datetime.now().isoformat()
+            job = {
+                "job_id": job_id,
+                "dict_name": dict_name,
+                "filename": filename,
+                "source": source.name,
+                "status": "queued",
+                "phase": "pending",
+                "entries_indexed": 0,
+                "entries_total": 0,
+                "bytes_total": source.stat().st_size,
+                "bytes_processed": 0,
+                "rate": 0.0,
+                "eta_seconds": None,
+                "error": None,
+                "result": None,
+                "created_at": now,
+                "updated_at": now,
+            }
+            self._jobs[job_id] = job
+            self._save(job, force=True)
+
+        logger.info(f"已创建词典导入任务: {job_id} ({dict_name})")
+        self._enqueue(job_id)
+        return dict(job)
+
+    def get(self, job_id: str) -> Optional[Dict]:
+        job = self._jobs.get(job_id)
+        return dict(job) if job else None
+
+    def list_jobs(self) -> List[Dict]:
+        return sorted((dict(j) for j in list(self._jobs.values())), key=lambda j: j["created_at"], reverse=True)
+
+    def cancel(self, job_id: str) -> Optional[Dict]:
+        """取消任务：排队中的直接标记取消，运行中的在下一个批次边界停止并清理"""
+        with self._lock:
+            job = self._jobs.get(job_id)
+            if job is None:
+                return None
+            if job["status"] not in ACTIVE_STATUSES:
+                raise ValueError(f"任务已结束，无法取消 (状态: {job['status']})")
+            if job["status"] == "queued":
+                self._finish(job, "cancelled")
+            else:
+                self._cancel_requested.add(job_id)
+            return dict(job)
+
+    def resume_pending(self) -> int:
+        """重新排队上次未完成的任务（启动时调用），返回任务数"""
+        pending = [j for j in self._jobs.values() if j["status"] in ACTIVE_STATUSES]
+        for job in sorted(pending, key=lambda j: j["created_at"]):
+            logger.info(f"恢复词典导入任务: {job['job_id']} ({job['dict_name']}, 阶段: {job['phase']})")
+            self._enqueue(job["job_id"])
+        return len(pending)
+
+    # ---- 内部实现 ----
+
+    def _enqueue(self, job_id: str):
+        self._queue.put(job_id)
+        with self._lock:
+            if self._worker is None or not self._worker.is_alive():
+                self._worker = threading.Thread(target=self._run_worker, name="dict-import", daemon=True)
+                self._worker.start()
+
+    def _run_worker(self):
+        while True:
+            try:
+                job_id = self._queue.get(timeout=1.0)
+            except queue.Empty:
+                with self._lock:
+                    if self._queue.empty():
+                        self._worker = None
+                        return
+                continue
+            try:
+                self._run_job(job_id)
+            except Exception as e:
+                logger.error(f"导入任务执行异常 {job_id}: {e}", exc_info=True)
+
+    def _run_job(self, job_id: str):
+        job = self._jobs.get(job_id)
+        if job is None or job["status"] not in ACTIVE_STATUSES:
+            return
+
+        dict_name = job["dict_name"]
+        source = self.jobs_dir / job["source"]
+        # 已进入建索引阶段说明文件安装完成，可直接从检查点继续
+        resume = job["phase"] in ("indexing", "finalizing")
+
+        if any(d["name"] == dict_name for d in self.manager.get_dicts()):
+            # 重启前已写入配置但未来得及更新任务状态
+            if resume:
+                self._finish(job, "completed")
+            else:
+                self._finish(job, "failed", error=f"词典 {dict_name} 已存在")
+            return
+        if not source.exists():
+            self._finish(job, "failed", error="上传文件已丢失，请重新导入")
+            return
+
+        job["status"] = "running"
+        if not resume:
+            job["phase"] = "installing"
+        self._save(job, force=True)
+        started = time.perf_counter()
+
+        def on_progress(indexed: int, total: int, rate: float):
+            job["phase"] = "indexing"
+            job["entries_indexed"] = indexed
+            job["entries_total"] = total
+            job["rate"] = round(rate, 1)
+            # 按词条比例估算已处理的字节数
+            if total:
+                job["bytes_processed"] = int(job["bytes_total"] * min(indexed / total, 1.0))
+                job["eta_seconds"] = round((total - indexed) / rate, 1) if rate > 0 else None
+            if indexed >= total:
+                job["phase"] = "finalizing"
+            self._save(job)
+
+        try:
+            result = self.manager.import_dict(
+                source,
+                dict_name,
+                progress_callback=on_progress,
+                should_cancel=lambda: job_id in self._cancel_requested,
+                resume=resume,
+            )
+        except ImportCancelled:
+            logger.info(f"词典导入已取消，清理残留: {dict_name}")
+            self.manager.remove_dict(dict_name)
+            self._finish(job, "cancelled")
+            return
+        except DictAlreadyExists:
+            # 导入前检查失败，本任务没有写入任何文件，不能清理：通常是重启前已写入配置、
+            # 未来得及更新任务状态的词典，已安装即视为完成
+            logger.info(f"词典已安装，任务标记为完成: {dict_name}")
+            self._finish(job, "completed")
+            return
+        except Exception as e:
+            logger.error(f"词典导入失败 {dict_name}: {e}", exc_info=True)
+            self.manager.remove_dict(dict_name)
+            self._finish(job, "failed", error=str(e))
+            return
+
+        job["entries_indexed"] = result["word_count"]
+        job["entries_total"] = max(job["entries_total"], result["word_count"])
+        job["bytes_processed"] = job["bytes_total"]
+        job["result"] = result
+        self._finish(job, "completed")
+        logger.info(f"词典导入任务完成: {job_id} ({dict_name}), 耗时 {time.perf_counter() - started:.1f}s")
+
+    def _finish(self, job: Dict, status: str, error: Optional[str] = None):
+        job["status"] = status
+        job["phase"] = "done"
+        job["eta_seconds"] = None
+        job["error"] = error
+        self._cancel_requested.discard(job["job_id"])
+        source = self.jobs_dir / job["source"]
+        if source.exists():
+            source.unlink()
+        self._save(job, force=True)
+        self._prune_finished()
+
+    def _prune_finished(self):
+        """清理超过保留期限或超出保留数量的已结束任务（内存记录与状态文件）"""
+        finished = sorted(
+            (j for j in list(self._jobs.values()) if j["status"] not in ACTIVE_STATUSES),
+            key=lambda j: j.get("updated_at") or j["created_at"],
+            reverse=True,
+        )
+        cutoff = (datetime.now() - FINISHED_JOB_RETENTION).isoformat()
+        for index, job in enumerate(finished):
+            if index < MAX_FINISHED_JOBS and (job.get("updated_at") or job["created_at"]) >= cutoff:
+                continue
+            job_id = job["job_id"]
+            self._jobs.pop(job_id, None)
+            self._saved_at.pop(job_id, None)
+            (self.jobs_dir / f"{job_id}.json").unlink(missing_ok=True)
+            logger.debug(f"已清理过期的导入任务记录: {job_id}")
+
+    def _save(self, job: Dict, force: bool = False):
+        now = time.monotonic()
+        if not force and now - self._saved_at.get(job["job_id"], 0.0) < STATE_SAVE_INTERVAL:
+            return
+        self._saved_at[job["job_id"]] = now
+        job["updated_at"] = datetime.now().isoformat()
+        state_file = self.jobs_dir / f"{job['job_id']}.json"
+        tmp_file = state_file.with_suffix(".tmp")
+        tmp_file.write_text(json.dumps(job, ensure_ascii=False, indent=2), encoding="utf-8")
+        tmp_file.replace(state_file)
@@ -5,17 +5,125 @@
 
 import sqlite3
 import json
+import re
 import shutil
 import tempfile
+from collections import OrderedDict
 from pathlib import Path
-from typing import List, Dict, Optional
+from typing import List, Dict, Optional, Tuple
 from datetime import datetime
 import logging
 import threading
+import time
+import zlib
 
 logger = logging.getLogger(__name__)
 
-from .mdx_parser import MDXParser
+# 配置文件变更检查的最小间隔（秒），间隔内的查询直接使用内存配置
+CONFIG_CHECK_INTERVAL = 1.0
+
+# @@@LINK= 重定向最多跟随的层数
+MAX_REDIRECT_DEPTH = 3
+# 单条 IN (...) 查询中最多绑定的词数，避免超过 SQLite 变量上限
+LOOKUP_BATCH_SIZE = 500
+
+# 压缩存储时跳过过短的词条（如 @@@LINK= 跳转），压缩收益不抵开销
+COMPRESS_MIN_LENGTH = 256
+ZLIB_LEVEL = 1
+
+# 批量导入：每批写入暂存表的词条数与导入连接的页缓存大小（KiB）
+IMPORT_BATCH_SIZE = 5000
+IMPORT_CACHE_KIB = 256 * 1024
+
+# MDD 资源字节缓存：总容量上限与可缓存的单个资源上限（字节）
+RESOURCE_CACHE_BYTES = 32 * 1024 * 1024
+RESOURCE_CACHE_MAX_ITEM = 2 * 1024 * 1024
+
+# mdx_index.db 结构版本（PRAGMA user_version），由 _migrate_index_db 逐级升级
+INDEX_DB_VERSION = 3
+
+# 词条派生字段（音标、词性、中文摘要）的提取规则版本；修改 _extract_* 规则后递增，
+# 旧版本的派生结果在查询时自动重新计算，也可用 scripts/derive_mdx_projections.py 批量重建
+PROJECTION_VERSION = 1
+# 派生字段回写的合并延迟（秒）：查询路径只入队，由后台定时器批量写入
+PROJECTION_FLUSH_DELAY = 1.0
+
+# 导入暂存表与检查点表（v2），每批提交一次，进程重启后可从检查点继续建索引
+_IMPORT_TABLES_SQL = (
+    """
+    CREATE TABLE IF NOT EXISTS entries_staging (
+        dict_id INTEGER NOT NULL,
+        phase TEXT NOT NULL,
+        word TEXT NOT NULL,
+        word_lower TEXT NOT NULL,
+        offset INTEGER DEFAULT 0,
+        length INTEGER DEFAULT 0,
+        content
+    )
+    """,
+    "CREATE INDEX IF NOT EXISTS idx_staging_dict_phase ON entries_staging(dict_id, phase)",
+    """
+    CREATE TABLE IF NOT EXISTS import_checkpoints (
+        dict_id INTEGER NOT NULL,
+        phase TEXT NOT NULL,
+        position INTEGER NOT NULL DEFAULT 0,
+        word_count INTEGER NOT NULL DEFAULT 0,
+        done INTEGER NOT NULL DEFAULT 0,
+        PRIMARY KEY (dict_id, phase)
+    )
+    """,
+)
+
+# 词条派生字段表（v3），按 entries.id 一对一存储
+_PROJECTION_TABLE_SQL = """
+    CREATE TABLE IF NOT EXISTS entry_projections (
+        entry_id INTEGER PRIMARY KEY,
+        version INTEGER NOT NULL,
+        phonetic TEXT,
+        part_of_speech TEXT,
+        chinese_summary TEXT
+    )
+"""
+
+_LINK_PATTERN = re.compile(r"@@@LINK=([^\n\r]+)")
+_POS_PATTERN = re.compile(r'<span class="pos">([^<]+)</span>')
+_SANITIZE_PATTERNS = (
+    # Remove scripts
+    re.compile(r"<script[^>]*>.*?</script>", re.DOTALL | re.IGNORECASE),
+    re.compile(r"<script[^>]*/>", re.IGNORECASE),
+    # Remove links
+    re.compile(r"<link[^>]*/?>", re.IGNORECASE),
+    # Remove body tags
+    re.compile(r"<body(?:\s[^>]*)?>|</body>", re.IGNORECASE),
+    # Remove broken images
+    re.compile(r'<img[^>]*src=["\']/?sound\.png["\'][^>]*>', re.IGNORECASE),
+)
+
+
+def _encode_content(content: Optional[str], compress: bool):
+    """按存储模式编码词条内容：压缩模式下较长内容存为 zlib BLOB，其余保持 TEXT"""
+    if content is None or not compress or len(content) < COMPRESS_MIN_LENGTH:
+        return content
+    return zlib.compress(content.encode("utf-8"), ZLIB_LEVEL)
+
+
+def _decode_content(value) -> Optional[str]:
+    """透明解码词条内容：BLOB 为 zlib 压缩的 UTF-8，TEXT 原样返回"""
+    if isinstance(value, bytes):
+        return zlib.decompress(value).decode("utf-8")
+    return value
+
+
+class ImportCancelled(Exception):
+    """导入被调用方取消（should_cancel 返回 True）"""
+
+
+class DictAlreadyExists(ValueError):
+    """导入前检查：同名词典已安装（导入尚未写入任何文件）"""
+
+
+from .mdx_parser import MDXParser, get_cached_parser, evict_cached_parsers
+from .lookup_cache import get_lookup_cache
 from . import jmdict_service
 
 
@@ -40,18 +148,45 @@ class DictManager:
         self.dicts_dir = dicts_dir
         self.imported_dir.mkdir(parents=True, exist_ok=True)
         self._lock = threading.Lock()
+        # 每个线程持有一个只读连接，查询路径不再反复 connect/close
+        self._local = threading.local()
+        # 词典名 -> dict_id 映射缓存，导入/删除/启停时失效
+        self._dict_ids: Optional[Dict[str, int]] = None
+        # (词典名, 资源 key) -> (字节, ETag)，按总字节数 LRU 淘汰
+        self._resource_cache: "OrderedDict[Tuple[str, str], Tuple[bytes, str]]" = OrderedDict()
+        self._resource_cache_size = 0
+        self._resource_lock = threading.Lock()
+        # 待回写的派生字段：词条 id -> (规则版本, 音标, 词性, 中文摘要)，由后台定时器批量写入
+        self._pending_projections: Dict[int, Tuple[int, Optional[str], Optional[str], Optional[str]]] = {}
+        self._projection_lock = threading.Lock()
+        self._projection_timer: Optional[threading.Timer] = None
+        # 内存配置的版本号，每次从磁盘重载或保存时递增
+        self.config_version = 0
+        self._config_signature = None
+        self._config_checked_at = 0.0
         self.config = self._load_config()
         self._init_index_db()
 
+    def _config_file_signature(self):
+        try:
+            stat = self.config_file.stat()
+        except OSError:
+            return None
+        return (stat.st_mtime_ns, stat.st_size)
+
     def _load_config(self) -> Dict:
         if self.config_file.exists():
             try:
+                signature = self._config_file_signature()
                 with open(self.config_file, "r", encoding="utf-8") as f:
-                    return json.load(f)
+                    config = json.load(f)
+                self._config_signature = signature
+                self.config_version += 1
+                return config
             except (json.JSONDecodeError, OSError):
                 pass
 
-        default_config = {"dicts": {}, "priority": ["ECDICT"], "auto_index": True}
+        default_config = {"dicts": {}, "priority": ["ECDICT"], "auto_index": True, "compress_content": True}
         self._save_config(default_config)
         return default_config
 
@@ -63,11 +198,39 @@ class DictManager:
                 json.dump(config, f, indent=2, ensure_ascii=False)
             import os
             os.replace(temp_file, self.config_file)
+            self._config_signature = self._config_file_signature()
         except Exception as e:
             logger.error(f"保存词典配置失败: {e}")
             if temp_file.exists():
                 temp_file.unlink()
         self.config = config
+        self.config_version += 1
+        # 词典增删、启停、优先级变化都会经过这里，已缓存的查词结果随之失效
+        get_lookup_cache().invalidate("词典配置已变更")
+
+    def get_config_version(self) -> int:
+        """当前配置版本（先按间隔检查磁盘文件是否被修改），用于查词缓存的 key"""
+        self._refresh_config()
+        return self.config_version
+
+    def _refresh_config(self, force: bool = False) -> Dict:
+        """
+        返回内存中的配置，仅在配置文件被外部修改（mtime/大小变化）时重新解析。
+
+        查询热路径每 CONFIG_CHECK_INTERVAL 秒最多 stat 一次；写操作传入 force=True
+        立即检查，确保在最新配置上修改。
+        """
+        now = time.monotonic()
+        if not force and now - self._config_checked_at < CONFIG_CHECK_INTERVAL:
+            return self.config
+        self._config_checked_at = now
+
+        signature = self._config_file_signature()
+        if signature is None or signature != self._config_signature:
+            logger.info("检测到词典配置文件变化，重新加载")
+            self.config = self._load_config()
+            self._invalidate_dict_ids()
+        return self.config
 
     def _init_index_db(self):
         if not self.index_db.exists():
@@ -99,10 +262,15 @@ class DictManager:
                 )
             """)
 
-            cursor.execute("CREATE INDEX idx_entries_word ON entries(word_lower)")
-            cursor.execute("CREATE INDEX idx_entries_dict ON entries(dict_id)")
+            # 所有热查询都同时按 dict_id 和 word_lower 过滤，使用复合索引
+            cursor.execute("CREATE INDEX idx_entries_dict_word ON entries(dict_id, word_lower)")
+            for sql in _IMPORT_TABLES_SQL:
+                cursor.execute(sql)
+            cursor.execute(_PROJECTION_TABLE_SQL)
+            cursor.execute(f"PRAGMA user_version = {INDEX_DB_VERSION}")
 
             conn.commit()
+            self._enable_wal(conn)
             conn.close()
             logger.info("索引数据库初始化完成")
         else:
@@ -118,22 +286,108 @@ class DictManager:
                     conn.commit()
                 except Exception as e:
                     logger.error(f"迁移词典索引失败: {e}")
+            self._migrate_index_db(conn)
+            self._enable_wal(conn)
             conn.close()
             logger.info("索引数据库已就绪")
 
-    def import_dict(self, mdx_file: Path, name: Optional[str] = None, progress_callback=None) -> Dict:
-        # 强制从磁盘重载配置，防止内存缓存与实际文件不同步（例如手动删除或删除失败后的重试）
-        self.config = self._load_config()
+    @staticmethod
+    def _enable_wal(conn: sqlite3.Connection):
+        """
+        索引库使用 WAL 日志模式（持久化设置，只需切换一次）。
+
+        导入期间暂存表与检查点每批提交一次，WAL + synchronous=NORMAL 下断电最多丢失最近几批
+        （从检查点重做即可），不会像回滚日志 + synchronous=OFF 那样损坏整个索引库；
+        只读查询连接也不会被导入写入阻塞。
+        """
+        try:
+            conn.execute("PRAGMA journal_mode = WAL")
+        except sqlite3.Error as e:
+            logger.warning(f"索引库切换 WAL 模式失败，继续使用默认日志模式: {e}")
+
+    def _migrate_index_db(self, conn: sqlite3.Connection):
+        """按 PRAGMA user_version 逐级升级已有的索引数据库结构（幂等）"""
+        version = conn.execute("PRAGMA user_version").fetchone()[0]
+        if version >= INDEX_DB_VERSION:
+            return
+
+        try:
+            if version < 1:
+                # v1: 以 (dict_id, word_lower) 复合索引替代两个单列索引
+                logger.info("正在迁移词典索引数据库：创建 (dict_id, word_lower) 复合索引，词条较多时可能需要一些时间")
+                started = time.perf_counter()
+                conn.execute("CREATE INDEX IF NOT EXISTS idx_entries_dict_word ON entries(dict_id, word_lower)")
+                conn.execute("DROP INDEX IF EXISTS idx_entries_word")
+                conn.execute("DROP INDEX IF EXISTS idx_entries_dict")
+                conn.execute("PRAGMA user_version = 1")
+                conn.commit()
+                logger.info(f"复合索引创建完成，耗时 {time.perf_counter() - started:.1f}s")
+            if version < 2:
+                # v2: 持久化导入暂存表与检查点表，支持中断后续传
+                for sql in _IMPORT_TABLES_SQL:
+                    conn.execute(sql)
+                conn.execute("PRAGMA user_version = 2")
+                conn.commit()
+            if version < 3:
+                # v3: 词条派生字段表，查询时按需填充
+                conn.execute(_PROJECTION_TABLE_SQL)
+                conn.execute("PRAGMA user_version = 3")
+                conn.commit()
+        except Exception as e:
+            conn.rollback()
+            logger.error(f"迁移词典索引失败: {e}")
+
+    def _get_read_conn(self) -> sqlite3.Connection:
+        """获取当前线程的只读索引库连接（首次调用时创建）"""
+        conn = getattr(self._local, "conn", None)
+        if conn is None:
+            # 只读 URI 连接；sqlite3 会在连接内缓存预编译语句
+            uri = f"{self.index_db.resolve().as_uri()}?mode=ro"
+            conn = sqlite3.connect(uri, uri=True, cached_statements=256)
+            self._local.conn = conn
+        return conn
+
+    def _get_dict_ids(self) -> Dict[str, int]:
+        """获取词典名 -> dict_id 映射，仅在缓存失效后查询一次数据库"""
+        dict_ids = self._dict_ids
+        if dict_ids is None:
+            rows = self._get_read_conn().execute("SELECT name, id FROM dicts").fetchall()
+            dict_ids = {name: dict_id for name, dict_id in rows}
+            self._dict_ids = dict_ids
+        return dict_ids
+
+    def _invalidate_dict_ids(self):
+        self._dict_ids = None
+
+    def import_dict(
+        self,
+        mdx_file: Path,
+        name: Optional[str] = None,
+        progress_callback=None,
+        should_cancel=None,
+        resume: bool = False,
+    ) -> Dict:
+        """
+        导入 MDX（或包含 MDX 的 ZIP）并建立索引。
+
+        should_cancel() 在每个批次后检查，返回 True 时抛出 ImportCancelled（残留由调用方通过
+        remove_dict 清理）；resume=True 表示文件已安装到 imported 目录，直接从索引检查点继续。
+        """
+        # 强制检查磁盘配置，防止内存缓存与实际文件不同步（例如手动删除或删除失败后的重试）
+        self._refresh_config(force=True)
         
         dict_name = name or mdx_file.stem
         if dict_name in self.config["dicts"]:
-            raise ValueError(f"词典 {dict_name} 已存在")
+            raise DictAlreadyExists(f"词典 {dict_name} 已存在")
 
         logger.info(f"开始导入词典: {dict_name}")
 
         is_zip = mdx_file.suffix.lower() == ".zip"
-        
-        if is_zip:
+        target_mdx = self.imported_dir / f"{dict_name}.mdx"
+
+        if resume and target_mdx.exists():
+            logger.info(f"词典文件已就位，从检查点继续建立索引: {dict_name}")
+        elif is_zip:
              import zipfile
              # Extract to temp first to find MDX
              # Or just extract directly to imported_dir?
@@ -198,7 +452,9 @@ class DictManager:
                 shutil.copy2(mdd_file, target_mdd)
 
 
-        word_count = self._create_index(target_mdx, dict_name, progress_callback)
+        word_count = self._create_index(
+            target_mdx, dict_name, progress_callback, should_cancel=should_cancel, resume=resume
+        )
 
         # Index MDD if exists
         mdd_file = mdx_file.with_suffix(".mdd")
@@ -207,7 +463,9 @@ class DictManager:
             if not target_mdd.exists(): # copy if not already copied (should have been handled)
                  # Logic above copies it but let's be safe
                  pass 
-            self._create_index(target_mdd, dict_name, is_mdd=True) # Helper to reuse index logic
+            self._create_index(
+                target_mdd, dict_name, is_mdd=True, should_cancel=should_cancel, resume=resume
+            )  # Helper to reuse index logic
 
         self.config["dicts"][dict_name] = {
             "name": dict_name,
@@ -220,6 +478,7 @@ class DictManager:
 
         self.config["priority"].insert(0, dict_name)
         self._save_config(self.config)
+        self._clear_import_state(dict_name)
 
         logger.info(f"词典导入完成: {dict_name}, 单词数: {word_count}")
 
@@ -229,66 +488,275 @@ class DictManager:
             "size": mdx_file.stat().st_size,
         }
 
-    def _create_index(self, mdx_file: Path, dict_name: str, progress_callback=None, is_mdd: bool = False) -> int:
+    def _create_index(
+        self,
+        mdx_file: Path,
+        dict_name: str,
+        progress_callback=None,
+        is_mdd: bool = False,
+        should_cancel=None,
+        resume: bool = False,
+    ) -> int:
+        """
+        为 MDX/MDD 建立词条索引（批量导入模式）。
+
+        词条先写入无词头索引的暂存表（WAL 模式、synchronous=NORMAL、加大页缓存），每批连同检查点
+        （已读取的词条位置）一起提交；全部解析完成后按词头顺序一次性写入 entries，写入、清理暂存
+        与词数更新在同一事务中提交，查询方要么看不到该词典，要么看到完整索引。
+
+        resume=True 时从检查点位置继续，已完成的阶段直接返回记录的词数。
+        progress_callback(已处理词条数, 词条总数, 每秒词条数) 每个批次回调一次。
+        """
         parser = MDXParser(mdx_file)
         dict_id = self._get_or_create_dict_id(dict_name, mdx_file)
+        phase = "mdd" if is_mdd else "mdx"
+        total = parser.get_entry_count()
 
-        word_count = 0
+        compress = self.config.get("compress_content", True)
         conn = sqlite3.connect(self.index_db)
         cursor = conn.cursor()
+        # 暂存表与检查点在共享的索引库中持久提交，不能关闭同步（断电会损坏已安装的词典）；
+        # WAL 下 NORMAL 只在检查点时 fsync，断电最多回退到上一个已落盘的批次
+        cursor.execute("PRAGMA synchronous = NORMAL")
+        cursor.execute(f"PRAGMA cache_size = {-IMPORT_CACHE_KIB}")
+
+        checkpoint = None
+        if resume:
+            checkpoint = cursor.execute(
+                "SELECT position, word_count, done FROM import_checkpoints WHERE dict_id = ? AND phase = ?",
+                (dict_id, phase),
+            ).fetchone()
+        if checkpoint and checkpoint[2]:
+            conn.close()
+            logger.info(f"索引阶段已完成，跳过: {dict_name} ({phase})")
+            return checkpoint[1]
+        if checkpoint:
+            position, word_count = checkpoint[0], checkpoint[1]
+            logger.info(f"从检查点继续建立索引: {dict_name} ({phase}), 已处理 {position}/{total}")
+        else:
+            position = word_count = 0
+            cursor.execute("DELETE FROM entries_staging WHERE dict_id = ? AND phase = ?", (dict_id, phase))
+            cursor.execute("DELETE FROM import_checkpoints WHERE dict_id = ? AND phase = ?", (dict_id, phase))
+            conn.commit()
 
-        batch_size = 1000
+        resumed_from = word_count
+        batch_size = IMPORT_BATCH_SIZE
         batch = []
+        started = time.perf_counter()
 
-        for entry in parser.parse():
-            try:
-                word_lower = entry["word"].lower()
-                content = entry.get("content")
-                
-                # content 现在已经是被 MDXParser 解码后的字符串或 None
-                batch.append((dict_id, entry["word"], word_lower, entry["offset"], entry["length"], content))
-
-                if len(batch) >= batch_size:
-                    cursor.executemany(
-                        """
-                        INSERT OR REPLACE INTO entries (dict_id, word, word_lower, offset, length, content)
-                        VALUES (?, ?, ?, ?, ?, ?)
-                    """,
-                        batch,
-                    )
-                    conn.commit()
-                    batch = []
-
-                    if progress_callback:
-                        progress_callback(word_count, word_count)
-                
-                word_count += 1
-            except Exception as e:
-                logger.error(f"跳过故障词条: {e}")
-                continue
-
-        if batch:
+        def flush():
             cursor.executemany(
                 """
-                INSERT OR REPLACE INTO entries (dict_id, word, word_lower, offset, length, content)
-                VALUES (?, ?, ?, ?, ?, ?)
+                INSERT INTO entries_staging (dict_id, phase, word, word_lower, offset, length, content)
+                VALUES (?, ?, ?, ?, ?, ?, ?)
             """,
                 batch,
             )
+            cursor.execute(
+                "INSERT OR REPLACE INTO import_checkpoints (dict_id, phase, position, word_count) VALUES (?, ?, ?, ?)",
+                (dict_id, phase, position, word_count),
+            )
             conn.commit()
+            batch.clear()
+            if progress_callback:
+                elapsed = time.perf_counter() - started
+                rate = (word_count - resumed_from) / elapsed if elapsed > 0 else 0.0
+                progress_callback(word_count, total, rate)
+            if should_cancel and should_cancel():
+                raise ImportCancelled(f"词典导入已取消: {dict_name}")
 
-        cursor.execute("UPDATE dicts SET word_count = ? WHERE name = ?", (word_count, dict_name))
-        conn.commit()
-        conn.close()
+        try:
+            for entry in parser.parse(start=position):
+                position += 1
+                try:
+                    word_lower = entry["word"].lower()
+                    # content 现在已经是被 MDXParser 解码后的字符串或 None，按存储模式压缩
+                    content = _encode_content(entry.get("content"), compress)
+                    batch.append((dict_id, phase, entry["word"], word_lower, entry["offset"], entry["length"], content))
+                    word_count += 1
+
+                    if len(batch) >= batch_size:
+                        flush()
+                except ImportCancelled:
+                    raise
+                except Exception as e:
+                    logger.error(f"跳过故障词条: {e}")
+                    continue
+
+            if batch:
+                flush()
+
+            # 原子切换：写入正式表、清理暂存并更新词数，一次提交（恢复默认同步级别，保证落盘）。
+            # entries 由所有词典共享，词头索引保持在线：按 (dict_id, word_lower) 顺序写入，新词典的
+            # 索引项基本顺序追加，速度与删索引后重建相当；重建则要为其他词典的全部词条重新建索引，
+            # 已有词典越多越慢（benchmarks/bench_index_load.py）。同词头按暂存顺序（词典原顺序）写入
+            cursor.execute("PRAGMA synchronous = FULL")
+            cursor.execute(
+                """
+                INSERT INTO entries (dict_id, word, word_lower, offset, length, content)
+                SELECT dict_id, word, word_lower, offset, length, content FROM entries_staging
+                WHERE dict_id = ? AND phase = ?
+                ORDER BY word_lower, rowid
+            """,
+                (dict_id, phase),
+            )
+            cursor.execute("DELETE FROM entries_staging WHERE dict_id = ? AND phase = ?", (dict_id, phase))
+            cursor.execute(
+                "INSERT OR REPLACE INTO import_checkpoints (dict_id, phase, position, word_count, done) VALUES (?, ?, ?, ?, 1)",
+                (dict_id, phase, position, word_count),
+            )
+            cursor.execute("UPDATE dicts SET word_count = ? WHERE name = ?", (word_count, dict_name))
+            conn.commit()
+        except Exception:
+            conn.rollback()
+            raise
+        finally:
+            conn.close()
 
-        logger.info(f"索引创建完成: {dict_name}, 单词数: {word_count}")
+        elapsed = time.perf_counter() - started
+        rate = (word_count - resumed_from) / elapsed if elapsed > 0 else 0.0
+        logger.info(f"索引创建完成: {dict_name}, 单词数: {word_count}, 耗时 {elapsed:.1f}s ({rate:.0f} 条/秒)")
         return word_count
 
+    def _clear_import_state(self, dict_name: str):
+        """删除某词典残留的导入暂存与检查点"""
+        conn = sqlite3.connect(self.index_db)
+        try:
+            row = conn.execute("SELECT id FROM dicts WHERE name = ?", (dict_name,)).fetchone()
+            if row:
+                conn.execute("DELETE FROM entries_staging WHERE dict_id = ?", (row[0],))
+                conn.execute("DELETE FROM import_checkpoints WHERE dict_id = ?", (row[0],))
+                conn.commit()
+        finally:
+            conn.close()
+
+    def compact_index(
+        self,
+        dict_names: Optional[List[str]] = None,
+        compress: bool = True,
+        vacuum: bool = True,
+        sample_size: int = 200,
+    ) -> Dict:
+        """
+        将已有词条内容重写为压缩（或解压回 TEXT）存储，并统计每个词典的体积与查询延迟。
+
+        Args:
+            dict_names: 要处理的词典，默认为索引库中的全部词典
+            compress: True 压缩为 zlib BLOB，False 还原为 TEXT
+            vacuum: 完成后执行 VACUUM 回收磁盘空间
+            sample_size: 每个词典用于测量查询延迟的随机词条数
+
+        Returns:
+            {"dicts": [每个词典的统计], "file_size_before": int, "file_size_after": int}
+        """
+        with self._lock:
+            file_size_before = self.index_db.stat().st_size
+            conn = sqlite3.connect(self.index_db)
+            try:
+                rows = conn.execute("SELECT name, id FROM dicts ORDER BY id").fetchall()
+                targets = [(name, dict_id) for name, dict_id in rows if dict_names is None or name in dict_names]
+
+                stats = []
+                for dict_name, dict_id in targets:
+                    sample_words = [
+                        row[0]
+                        for row in conn.execute(
+                            "SELECT word_lower FROM entries WHERE dict_id = ? AND content IS NOT NULL ORDER BY RANDOM() LIMIT ?",
+                            (dict_id, sample_size),
+                        )
+                    ]
+                    bytes_before = self._content_bytes(conn, dict_id)
+                    latency_before = self._sample_lookup_latency(conn, dict_id, sample_words)
+
+                    rewritten = 0
+                    last_id = 0
+                    while True:
+                        batch = conn.execute(
+                            "SELECT id, content FROM entries WHERE dict_id = ? AND id > ? AND content IS NOT NULL ORDER BY id LIMIT 1000",
+                            (dict_id, last_id),
+                        ).fetchall()
+                        if not batch:
+                            break
+                        last_id = batch[-1][0]
+                        updates = []
+                        for entry_id, value in batch:
+                            encoded = _encode_content(_decode_content(value), compress)
+                            if type(encoded) is not type(value):
+                                updates.append((encoded, entry_id))
+                        if updates:
+                            conn.executemany("UPDATE entries SET content = ? WHERE id = ?", updates)
+                            conn.commit()
+                            rewritten += len(updates)
+
+                    bytes_after = self._content_bytes(conn, dict_id)
+                    latency_after = self._sample_lookup_latency(conn, dict_id, sample_words)
+                    stats.append(
+                        {
+                            "name": dict_name,
+                            "rewritten": rewritten,
+                            "content_bytes_before": bytes_before,
+                            "content_bytes_after": bytes_after,
+                            "lookup_ms_before": latency_before,
+                            "lookup_ms_after": latency_after,
+                        }
+                    )
+                    logger.info(
+                        f"词典 {dict_name} 内容{'压缩' if compress else '解压'}完成: "
+                        f"{bytes_before} -> {bytes_after} 字节, 重写 {rewritten} 条"
+                    )
+
+                if vacuum:
+                    conn.execute("VACUUM")
+                    # WAL 模式下 VACUUM 的结果先写入 -wal，检查点后主文件才会缩小
+                    conn.execute("PRAGMA wal_checkpoint(TRUNCATE)")
+            finally:
+                conn.close()
+
+            return {
+                "dicts": stats,
+                "file_size_before": file_size_before,
+                "file_size_after": self.index_db.stat().st_size,
+            }
+
+    @staticmethod
+    def _content_bytes(conn: sqlite3.Connection, dict_id: int) -> int:
+        row = conn.execute(
+            "SELECT COALESCE(SUM(LENGTH(CAST(content AS BLOB))), 0) FROM entries WHERE dict_id = ?", (dict_id,)
+        ).fetchone()
+        return row[0]
+
+    @staticmethod
+    def _sample_lookup_latency(conn: sqlite3.Connection, dict_id: int, words: List[str]) -> float:
+        """按给定词列表逐个查询并解码内容，返回平均耗时（毫秒）"""
+        if not words:
+            return 0.0
+        started = time.perf_counter()
+        for word in words:
+            row = conn.execute(
+                "SELECT content FROM entries WHERE dict_id = ? AND word_lower = ? LIMIT 1", (dict_id, word)
+            ).fetchone()
+            if row:
+                _decode_content(row[0])
+        return (time.perf_counter() - started) * 1000 / len(words)
+
     def get_resource(self, dict_name: str, resource_path: str) -> Optional[bytes]:
         """Get resource content from MDD file"""
+        resource = self.get_resource_with_etag(dict_name, resource_path)
+        return resource[0] if resource else None
+
+    def get_resource_with_etag(self, dict_name: str, resource_path: str) -> Optional[Tuple[bytes, str]]:
+        """读取 MDD 资源，返回 (字节, ETag)；热点资源命中内存缓存，MDD 读取器跨请求复用"""
+        self._refresh_config()
         if dict_name not in self.config["dicts"]:
             return None
-            
+
+        cache_key = (dict_name, resource_path.lower())
+        with self._resource_lock:
+            cached = self._resource_cache.get(cache_key)
+            if cached is not None:
+                self._resource_cache.move_to_end(cache_key)
+                return cached
+
         dict_info = self.config["dicts"][dict_name]
         mdd_filename = dict_info["filename"].replace(".mdx", ".mdd")
         mdd_path = self.imported_dir / mdd_filename
@@ -299,48 +767,66 @@ class DictManager:
         # Normalize path
         # MDD paths typically start with \ or / and utilize backslashes
         # resource_path usually comes from web url, e.g. /sound/a.wav
-        
-        # Ensure it starts with \ if not present (MDD convention varies, usually matches key in MDD)
-        # We need to find the key in DB.
-        
-        # Trial 1: Exact match
-        keys_to_try = [
+        stripped = resource_path.lstrip("/\\")
+        keys_to_try = list(dict.fromkeys([
             resource_path,
-            "\\" + resource_path.lstrip("/\\"),
-            "/" + resource_path.lstrip("/\\")
-        ]
-        
-        conn = sqlite3.connect(self.index_db)
-        cursor = conn.cursor()
-        
-        # Find dict_id
-        cursor.execute("SELECT id FROM dicts WHERE name = ?", (dict_name,))
-        row = cursor.fetchone()
-        if not row:
-            conn.close()
+            "\\" + stripped,
+            "/" + stripped,
+            "\\" + stripped.replace("/", "\\"),
+        ]))
+
+        # 索引中记录了记录偏移时直接定位读取；旧版本导入的索引 offset/length 均为 0，按 key 查找
+        resource_key = resource_path
+        span = None
+        dict_id = self._get_dict_ids().get(dict_name)
+        if dict_id is not None:
+            cursor = self._get_read_conn().cursor()
+            for key in keys_to_try:
+                cursor.execute(
+                    "SELECT word, offset, length FROM entries WHERE dict_id = ? AND word_lower = ? LIMIT 1",
+                    (dict_id, key.lower())
+                )
+                entry = cursor.fetchone()
+                if entry:
+                    resource_key = entry[0]
+                    if entry[1] or entry[2]:
+                        span = (entry[1], entry[2])
+                    break
+
+        parser = get_cached_parser(mdd_path)
+        content = None
+        if span:
+            try:
+                content = parser.read_at(*span)
+            except Exception as e:
+                logger.warning(f"按偏移读取资源失败，回退到 key 查找 {resource_key}: {e}")
+        if not content:
+            content = parser.get_resource_bytes(resource_key)
+        if not content:
             return None
-        dict_id = row[0]
-        
-        entry = None
-        for key in keys_to_try:
-            cursor.execute(
-                "SELECT offset, length FROM entries WHERE dict_id = ? AND word_lower = ? LIMIT 1", 
-                (dict_id, key.lower())
-            )
-            entry = cursor.fetchone()
-            if entry:
-                break
-        
-        conn.close()
-        
-        if entry:
-            offset, length = entry
-            
-            # 使用新的 MDXParser 提供的资源提取方法
-            parser = MDXParser(mdd_path)
-            return parser.get_resource_bytes(resource_path)
-                
-        return None
+        # read_at 对 MDD 返回原始字节；统一为字节后再计算 ETag 与写缓存
+        if isinstance(content, str):
+            content = content.encode("utf-8")
+
+        etag = f'"{zlib.crc32(content):08x}-{len(content):x}"'
+        if len(content) <= RESOURCE_CACHE_MAX_ITEM:
+            with self._resource_lock:
+                if cache_key not in self._resource_cache:
+                    self._resource_cache[cache_key] = (content, etag)
+                    self._resource_cache_size += len(content)
+                while self._resource_cache_size > RESOURCE_CACHE_BYTES:
+                    _, (evicted, _) = self._resource_cache.popitem(last=False)
+                    self._resource_cache_size -= len(evicted)
+        return content, etag
+
+    def _invalidate_resources(self, dict_name: str):
+        """丢弃某词典的资源缓存与已打开的读取器"""
+        with self._resource_lock:
+            for key in [k for k in self._resource_cache if k[0] == dict_name]:
+                content, _ = self._resource_cache.pop(key)
+                self._resource_cache_size -= len(content)
+        for suffix in (".mdx", ".mdd"):
+            evict_cached_parsers(self.imported_dir / f"{dict_name}{suffix}")
 
     def _get_or_create_dict_id(self, dict_name: str, mdx_file: Path) -> int:
         conn = sqlite3.connect(self.index_db)
@@ -359,36 +845,32 @@ class DictManager:
 
         conn.commit()
         conn.close()
+        self._invalidate_dict_ids()
         return dict_id
 
 
     def check_sources(self, word: str) -> Dict[str, bool]:
         """Check which dictionaries have a definition for the word."""
-        # 强制重载配置，确保使用最新的 is_active 状态
-        self.config = self._load_config()
+        # 配置文件变化时自动重载，确保使用最新的 is_active 状态
+        self._refresh_config()
         availability = {name: False for name in self.config["priority"] if name != "ECDICT"}
 
         word_lower = word.lower().strip()
-        conn = sqlite3.connect(self.index_db)
-        cursor = conn.cursor()
-        
+
         # Get active dict ids
+        dict_ids = self._get_dict_ids()
         active_dicts = {}
         for name, info in self.config["dicts"].items():
-            if info.get("is_active", True):
-                # get ID? We need ID.
-                cursor.execute("SELECT id FROM dicts WHERE name = ?", (name,))
-                row = cursor.fetchone()
-                if row:
-                    active_dicts[row[0]] = name
-        
+            if info.get("is_active", True) and name in dict_ids:
+                active_dicts[dict_ids[name]] = name
+
         if not active_dicts:
-             conn.close()
              return availability
-             
+
         placeholders = ",".join("?" * len(active_dicts))
         ids = list(active_dicts.keys())
-        
+
+        cursor = self._get_read_conn().cursor()
         cursor.execute(
             f"SELECT dict_id, COUNT(*) FROM entries WHERE word_lower = ? AND dict_id IN ({placeholders}) GROUP BY dict_id",
             (word_lower, *ids)
@@ -398,8 +880,7 @@ class DictManager:
             dict_id = row[0]
             if row[1] > 0 and dict_id in active_dicts:
                 availability[active_dicts[dict_id]] = True
-                
-        conn.close()
+
         return availability
 
     def word_exists(self, word: str) -> bool:
@@ -409,13 +890,16 @@ class DictManager:
 
     def remove_dict(self, dict_name: str) -> bool:
         with self._lock:
-            # 1. 强制重载配置，确保与磁盘状态同步
-            self.config = self._load_config()
+            # 1. 强制检查磁盘配置，确保与磁盘状态同步
+            self._refresh_config(force=True)
             
             if dict_name not in self.config["dicts"]:
                 # 如果配置里没有但数据库里有，我们依然继续尝试清理数据库（见下文）
                 logger.warning(f"配置文件中未找到词典 {dict_name}，将尝试清理数据库记录和残留文件")
 
+            # 释放缓存的读取器与资源，避免继续引用将被删除的文件
+            self._invalidate_resources(dict_name)
+
             # 2. 收集需要清理的文件
             # 基础文件名（不带后缀）
             stems_to_clean = {dict_name.lower()}
@@ -453,6 +937,7 @@ class DictManager:
                         logger.error(f"删除文件 {file_path.name} 失败 (可能被占用): {e}")
 
             # 5. 清理数据库
+            self._discard_pending_projections()
             conn = None
             try:
                 conn = sqlite3.connect(self.index_db)
@@ -463,7 +948,13 @@ class DictManager:
                 rows = cursor.fetchall()
                 for row in rows:
                     dict_id = row[0]
+                    cursor.execute(
+                        "DELETE FROM entry_projections WHERE entry_id IN (SELECT id FROM entries WHERE dict_id = ?)",
+                        (dict_id,),
+                    )
                     cursor.execute("DELETE FROM entries WHERE dict_id = ?", (dict_id,))
+                    cursor.execute("DELETE FROM entries_staging WHERE dict_id = ?", (dict_id,))
+                    cursor.execute("DELETE FROM import_checkpoints WHERE dict_id = ?", (dict_id,))
                     cursor.execute("DELETE FROM dicts WHERE id = ?", (dict_id,))
                 
                 conn.commit()
@@ -473,6 +964,7 @@ class DictManager:
             finally:
                 if conn:
                     conn.close()
+                self._invalidate_dict_ids()
 
             # 6. 更新内存配置并保存
             if dict_name in self.config["dicts"]:
@@ -491,8 +983,8 @@ class DictManager:
             return True
 
     def get_dicts(self) -> List[Dict]:
-        # 强制从磁盘重载配置，确保返回最新状态
-        self.config = self._load_config()
+        # 配置文件变化时自动重载，确保返回最新状态
+        self._refresh_config()
         result = []
 
         # 使用配置中的 ECDICT 路径
@@ -552,26 +1044,27 @@ class DictManager:
         return result
 
     def set_priority(self, priority_list: List[str]):
-        # 强制重载配置，确保与磁盘状态同步
-        self.config = self._load_config()
+        # 强制检查磁盘配置，确保与磁盘状态同步
+        self._refresh_config(force=True)
         self.config["priority"] = priority_list
         self._save_config(self.config)
         logger.info(f"词典优先级已更新: {priority_list}")
 
     def toggle_dict(self, dict_name: str, is_active: bool):
-        # 强制重载配置，确保与磁盘状态同步
-        self.config = self._load_config()
+        # 强制检查磁盘配置，确保与磁盘状态同步
+        self._refresh_config(force=True)
         if dict_name in self.config["dicts"]:
             self.config["dicts"][dict_name]["is_active"] = is_active
             self._save_config(self.config)
+            self._invalidate_dict_ids()
             logger.info(f"词典 {dict_name} 已{'启用' if is_active else '禁用'}")
 
     def lookup_word(self, word: str, source: Optional[str] = None, _depth: int = 0) -> Optional[Dict]:
         if _depth > 3:  # Prevent infinite recursion for redirects
             return None
 
-        # 强制重载配置，确保使用最新的 is_active 状态
-        self.config = self._load_config()
+        # 配置文件变化时自动重载，确保使用最新的 is_active 状态
+        self._refresh_config()
 
         word_lower = word.lower().strip()
 
@@ -599,33 +1092,24 @@ class DictManager:
                 continue
                 
             # 2. Query index for this dictionary
-            conn = sqlite3.connect(self.index_db)
-            cursor = conn.cursor()
-            
-            # Find dict_id
-            cursor.execute("SELECT id FROM dicts WHERE name = ?", (dict_name,))
-            row = cursor.fetchone()
-            if not row:
-                conn.close()
+            dict_id = self._get_dict_ids().get(dict_name)
+            if dict_id is None:
                 continue
-            dict_id = row[0]
-            
+
             # Find word entry with content
-            cursor.execute(
-                "SELECT word, content FROM entries WHERE dict_id = ? AND word_lower = ? LIMIT 1", 
+            entry = self._get_read_conn().execute(
+                "SELECT id, word, content FROM entries WHERE dict_id = ? AND word_lower = ? LIMIT 1", 
                 (dict_id, word_lower)
-            )
-            entry = cursor.fetchone()
-            conn.close()
+            ).fetchone()
             
             if entry:
-                original_word, content = entry
+                entry_id, original_word, content = entry[0], entry[1], _decode_content(entry[2])
                 
                 if not content:
                     # 如果数据库中没有内容（可能是增量索引期间的问题），回退到动态读取
                     mdx_file = self.imported_dir / dict_info["filename"]
                     if mdx_file.exists():
-                        parser = MDXParser(mdx_file)
+                        parser = get_cached_parser(mdx_file)
                         content = parser.get_content_by_word(word)
                 
                 if not content:
@@ -647,29 +1131,371 @@ class DictManager:
                     return self.lookup_word(target_word, source=source, _depth=_depth + 1)
 
                 # 5. Extract and Sanitize
-                chinese_summary = self._extract_chinese_summary(content)
-                phonetic = self._extract_phonetic(content)
-                part_of_speech = self._extract_part_of_speech(content)
-                sanitized_content = self._sanitize_html_for_web(content)
-
-                return {
-                    "word": original_word,
-                    "source": dict_name,
-                    "html_content": sanitized_content,
-                    "chinese_summary": chinese_summary,
-                    "chinese_translation": None, # Filled by service layer if needed
-                    "has_audio": True, # Assumption for MDX
-                    "phonetic": phonetic,
+                projection = self._get_projections([(entry_id, content)])[0]
+                return self._build_entry_result(original_word, content, dict_name, projection)
+
+        return None
+
+    def lookup_many(self, terms: List[str], dict_names: Optional[List[str]] = None) -> Dict[str, Tuple[str, Dict]]:
+        """
+        批量查询多个词在多个词典中的释义。
+
+        所有 (词, 词典) 组合通过一次 ``word_lower IN (...) AND dict_id IN (...)`` 查询取回，
+        @@@LINK= 重定向在后续批量查询中统一解析（同一词典内，最多 MAX_REDIRECT_DEPTH 层）。
+
+        Args:
+            terms: 按优先顺序排列的查询词，每个词典取第一个命中的词
+            dict_names: 要查询的词典，默认为优先级列表中的全部词典
+
+        Returns:
+            {词典名: (命中的查询词, 查询结果)}，按词典优先级排序，未命中的词典不出现
+        """
+        return self.lookup_many_groups([terms], dict_names)[0]
+
+    def lookup_many_groups(
+        self, term_groups: List[List[str]], dict_names: Optional[List[str]] = None
+    ) -> List[Dict[str, Tuple[str, Dict]]]:
+        """
+        lookup_many 的多词版本：多组查询词（如整页单词各自的原型候选）共用一次批量取回与重定向解析。
+
+        Returns:
+            与 term_groups 一一对应的 {词典名: (命中的查询词, 查询结果)}
+        """
+        self._refresh_config()
+
+        dict_ids = self._get_dict_ids()
+        priority = self.config.get("priority", [])
+        requested = priority if dict_names is None else dict_names
+        ordered_names = [n for n in priority if n in requested] + [n for n in requested if n not in priority]
+
+        targets: List[Tuple[str, int]] = []
+        for dict_name in ordered_names:
+            dict_info = self.config["dicts"].get(dict_name)
+            if not dict_info or not dict_info.get("is_active", True) or dict_name not in dict_ids:
+                continue
+            targets.append((dict_name, dict_ids[dict_name]))
+
+        term_keys = list(dict.fromkeys(
+            key for terms in term_groups for key in (term.lower().strip() for term in terms) if key
+        ))
+
+        if not targets or not term_keys:
+            return [{} for _ in term_groups]
+
+        target_ids = [dict_id for _, dict_id in targets]
+        entries = self._fetch_entries(target_ids, term_keys)
+
+        # 批量解析重定向：每一轮把所有尚未取回的跳转目标合并为一次查询
+        fetched_keys = {(dict_id, key) for dict_id in target_ids for key in term_keys}
+        for _ in range(MAX_REDIRECT_DEPTH):
+            pending: Dict[int, set] = {}
+            for (dict_id, _key), (_entry_id, _word, content) in entries.items():
+                link_match = _LINK_PATTERN.search(content or "")
+                if not link_match:
+                    continue
+                target_key = link_match.group(1).strip().lower()
+                if (dict_id, target_key) not in fetched_keys:
+                    pending.setdefault(dict_id, set()).add(target_key)
+                    fetched_keys.add((dict_id, target_key))
+            if not pending:
+                break
+            entries.update(self._fetch_entries(list(pending), sorted(set().union(*pending.values()))))
+
+        hits: List[Tuple[int, str, str, int, str, str]] = []
+        for group_index, terms in enumerate(term_groups):
+            for dict_name, dict_id in targets:
+                for term in terms:
+                    resolved = self._resolve_entry(entries, dict_name, dict_id, term)
+                    if resolved:
+                        hits.append((group_index, dict_name, term, *resolved))
+                        break
+
+        # 所有命中词条的派生字段一次取回，缺失的统一入队回写
+        projections = self._get_projections([(entry_id, content) for *_, entry_id, _word, content in hits])
+
+        grouped_results: List[Dict[str, Tuple[str, Dict]]] = [{} for _ in term_groups]
+        for (group_index, dict_name, term, _entry_id, original_word, content), projection in zip(hits, projections, strict=True):
+            grouped_results[group_index][dict_name] = (
+                term,
+                self._build_entry_result(original_word, content, dict_name, projection),
+            )
+
+        return grouped_results
+
+    def _fetch_entries(
+        self, dict_ids: List[int], word_keys: List[str]
+    ) -> Dict[Tuple[int, str], Tuple[int, str, Optional[str]]]:
+        """按 (dict_id, word_lower) 批量取回词条 (id, 原词, 内容)，每个组合保留第一条记录"""
+        entries: Dict[Tuple[int, str], Tuple[int, str, Optional[str]]] = {}
+        if not dict_ids or not word_keys:
+            return entries
+
+        cursor = self._get_read_conn().cursor()
+        dict_placeholders = ",".join("?" * len(dict_ids))
+        for start in range(0, len(word_keys), LOOKUP_BATCH_SIZE):
+            chunk = word_keys[start : start + LOOKUP_BATCH_SIZE]
+            word_placeholders = ",".join("?" * len(chunk))
+            cursor.execute(
+                f"SELECT dict_id, word_lower, id, word, content FROM entries "
+                f"WHERE word_lower IN ({word_placeholders}) AND dict_id IN ({dict_placeholders})",
+                (*chunk, *dict_ids),
+            )
+            for dict_id, word_lower, entry_id, word, content in cursor.fetchall():
+                if (dict_id, word_lower) not in entries:
+                    entries[(dict_id, word_lower)] = (entry_id, word, _decode_content(content))
+        return entries
+
+    def _resolve_entry(
+        self,
+        entries: Dict[Tuple[int, str], Tuple[int, str, Optional[str]]],
+        dict_name: str,
+        dict_id: int,
+        word: str,
+        _depth: int = 0,
+    ) -> Optional[Tuple[int, str, str]]:
+        """在已取回的词条中解析单词（含重定向），返回 (词条 id, 词条原词, 内容)"""
+        if _depth > MAX_REDIRECT_DEPTH:
+            return None
+
+        entry = entries.get((dict_id, word.lower().strip()))
+        if not entry:
+            return None
+
+        entry_id, original_word, content = entry
+        if not content:
+            # 如果数据库中没有内容（可能是增量索引期间的问题），回退到动态读取
+            mdx_file = self.imported_dir / self.config["dicts"][dict_name]["filename"]
+            if mdx_file.exists():
+                content = get_cached_parser(mdx_file).get_content_by_word(word)
+        if not content:
+            return None
+
+        link_match = _LINK_PATTERN.search(content)
+        if link_match:
+            return self._resolve_entry(entries, dict_name, dict_id, link_match.group(1).strip(), _depth + 1)
+
+        return entry_id, original_word, content
+
+    def _build_entry_result(
+        self,
+        original_word: str,
+        content: str,
+        dict_name: str,
+        projection: Tuple[Optional[str], Optional[str], Optional[str]],
+    ) -> Dict:
+        """构造查询结果；projection 为 _get_projections 取得的 (音标, 词性, 中文摘要)"""
+        phonetic, part_of_speech, chinese_summary = projection
+        sanitized_content = self._sanitize_html_for_web(content)
+
+        return {
+            "word": original_word,
+            "source": dict_name,
+            "html_content": sanitized_content,
+            "chinese_summary": chinese_summary,
+            "chinese_translation": None, # Filled by service layer if needed
+            "has_audio": True, # Assumption for MDX
+            "phonetic": phonetic,
+            "partOfSpeech": part_of_speech,
+            "meanings": [
+                {
                     "partOfSpeech": part_of_speech,
-                    "meanings": [
-                        {
-                            "partOfSpeech": part_of_speech,
-                            "definition": chinese_summary or "Detailed definition available",
-                        }
-                    ],
+                    "definition": chinese_summary or "Detailed definition available",
                 }
+            ],
+        }
 
-        return None
+    def _get_projections(
+        self, items: List[Tuple[Optional[int], str]]
+    ) -> List[Tuple[Optional[str], Optional[str], Optional[str]]]:
+        """
+        批量取词条的 (音标, 词性, 中文摘要)，items 为 (词条 id, 内容) 列表，结果与之一一对应。
+
+        当前规则版本的结果用一次 IN 查询从 entry_projections 取回；缺失或版本过期的词条用
+        BeautifulSoup 现场派生后放入待回写队列，由后台定时器合并写入，查询路径不做写事务。
+        尚未落盘的派生结果同样可被之后的查询直接复用。
+        """
+        entry_ids = list({entry_id for entry_id, _ in items if entry_id is not None})
+        stored: Dict[int, Tuple[Optional[str], Optional[str], Optional[str]]] = {}
+        cursor = self._get_read_conn().cursor()
+        for start in range(0, len(entry_ids), LOOKUP_BATCH_SIZE):
+            chunk = entry_ids[start : start + LOOKUP_BATCH_SIZE]
+            cursor.execute(
+                f"SELECT entry_id, phonetic, part_of_speech, chinese_summary FROM entry_projections "
+                f"WHERE version = ? AND entry_id IN ({','.join('?' * len(chunk))})",
+                (PROJECTION_VERSION, *chunk),
+            )
+            for entry_id, phonetic, part_of_speech, chinese_summary in cursor.fetchall():
+                stored[entry_id] = (phonetic, part_of_speech, chinese_summary)
+        if len(stored) < len(entry_ids):
+            with self._projection_lock:
+                for entry_id in entry_ids:
+                    pending = self._pending_projections.get(entry_id)
+                    if entry_id not in stored and pending is not None and pending[0] == PROJECTION_VERSION:
+                        stored[entry_id] = pending[1:]
+
+        projections = []
+        misses: Dict[int, Tuple[Optional[str], Optional[str], Optional[str]]] = {}
+        for entry_id, content in items:
+            projection = stored.get(entry_id) if entry_id is not None else None
+            if projection is None:
+                projection = misses.get(entry_id) if entry_id is not None else None
+            if projection is None:
+                projection = self._derive_projection(content)
+                if entry_id is not None:
+                    misses[entry_id] = projection
+            projections.append(projection)
+
+        if misses:
+            self._queue_projections(misses)
+        return projections
+
+    def _derive_projection(self, content: str) -> Tuple[Optional[str], Optional[str], Optional[str]]:
+        return (
+            self._extract_phonetic(content),
+            self._extract_part_of_speech(content),
+            self._extract_chinese_summary(content),
+        )
+
+    def _queue_projections(self, rows: Dict[int, Tuple[Optional[str], Optional[str], Optional[str]]]):
+        """派生结果入队，尚无定时器时安排一次延迟回写"""
+        with self._projection_lock:
+            for entry_id, fields in rows.items():
+                self._pending_projections[entry_id] = (PROJECTION_VERSION, *fields)
+            if self._projection_timer is None:
+                timer = threading.Timer(PROJECTION_FLUSH_DELAY, self.flush_projections)
+                timer.daemon = True
+                self._projection_timer = timer
+                timer.start()
+
+    def flush_projections(self):
+        """
+        把待回写的派生字段写入索引库（后台定时器调用，也可在测试或退出前手动调用）。
+        后台导入占用写锁时不等待，未写入的结果重新入队，稍后再试。
+        """
+        with self._projection_lock:
+            rows = self._pending_projections
+            self._pending_projections = {}
+            timer = self._projection_timer
+            self._projection_timer = None
+        if timer is not None:
+            timer.cancel()
+        if not rows:
+            return
+        if not self._save_projections([(entry_id, *fields) for entry_id, fields in rows.items()]):
+            with self._projection_lock:
+                for entry_id, row in rows.items():
+                    self._pending_projections.setdefault(entry_id, row)
+            self._queue_projections({})
+
+    def _discard_pending_projections(self):
+        """丢弃尚未回写的派生字段（删除词典后词条 id 可能被复用）"""
+        with self._projection_lock:
+            self._pending_projections = {}
+
+    def _save_projections(self, rows: List[Tuple[int, int, Optional[str], Optional[str], Optional[str]]]) -> bool:
+        """
+        回写派生字段（只是缓存）：不等待写锁，索引库正被写入时返回 False 由调用方稍后重试；
+        其他错误记录日志后放弃。词条已被删除时不写入，避免留下孤立记录。
+        """
+        try:
+            conn = sqlite3.connect(self.index_db, timeout=0)
+            try:
+                conn.executemany(
+                    "INSERT OR REPLACE INTO entry_projections "
+                    "(entry_id, version, phonetic, part_of_speech, chinese_summary) "
+                    "SELECT ?, ?, ?, ?, ? WHERE EXISTS (SELECT 1 FROM entries WHERE id = ?)",
+                    [(*row, row[0]) for row in rows],
+                )
+                conn.commit()
+            finally:
+                conn.close()
+        except sqlite3.OperationalError as e:
+            if "locked" in str(e) or "busy" in str(e):
+                logger.debug(f"索引库正被写入，稍后重试派生字段回写: {e}")
+                return False
+            logger.warning(f"保存词条派生字段失败: {e}")
+        except sqlite3.Error as e:
+            logger.warning(f"保存词条派生字段失败: {e}")
+        return True
+
+    def derive_projections(
+        self,
+        dict_names: Optional[List[str]] = None,
+        force: bool = False,
+        lazy: bool = False,
+        batch_size: int = 500,
+        progress_callback=None,
+    ) -> Dict:
+        """
+        批量重建词条派生字段（修改提取规则后使用）。
+
+        Args:
+            dict_names: 要处理的词典，默认为索引库中的全部词典
+            force: 丢弃这些词典的全部派生结果后重建（规则改动但未递增 PROJECTION_VERSION 时）
+            lazy: 只清理过期结果，不预先计算，留待查询时按需派生
+            batch_size: 每批派生并提交的词条数
+            progress_callback: progress_callback(词典名, 已派生条数)
+
+        Returns:
+            {"cleared": 清理的过期结果数, "dicts": {词典名: 派生条数}}
+        """
+        with self._lock:
+            conn = sqlite3.connect(self.index_db)
+            try:
+                rows = conn.execute("SELECT name, id FROM dicts ORDER BY id").fetchall()
+                targets = [(name, dict_id) for name, dict_id in rows if dict_names is None or name in dict_names]
+
+                cleared = conn.execute(
+                    "DELETE FROM entry_projections WHERE version != ?", (PROJECTION_VERSION,)
+                ).rowcount
+                if force:
+                    for _, dict_id in targets:
+                        cleared += conn.execute(
+                            "DELETE FROM entry_projections WHERE entry_id IN (SELECT id FROM entries WHERE dict_id = ?)",
+                            (dict_id,),
+                        ).rowcount
+                conn.commit()
+
+                derived: Dict[str, int] = {}
+                for dict_name, dict_id in targets:
+                    derived[dict_name] = 0
+                    if lazy:
+                        continue
+                    last_id = 0
+                    while True:
+                        batch = conn.execute(
+                            """
+                            SELECT e.id, e.content FROM entries e
+                            LEFT JOIN entry_projections p ON p.entry_id = e.id
+                            WHERE e.dict_id = ? AND e.id > ? AND e.content IS NOT NULL AND p.entry_id IS NULL
+                            ORDER BY e.id LIMIT ?
+                        """,
+                            (dict_id, last_id, batch_size),
+                        ).fetchall()
+                        if not batch:
+                            break
+                        last_id = batch[-1][0]
+                        projections = []
+                        for entry_id, value in batch:
+                            content = _decode_content(value)
+                            # 重定向条目查询时会跳到目标词条，无需派生
+                            if not content or content.startswith("@@@LINK="):
+                                continue
+                            projections.append((entry_id, PROJECTION_VERSION, *self._derive_projection(content)))
+                        conn.executemany(
+                            "INSERT OR REPLACE INTO entry_projections "
+                            "(entry_id, version, phonetic, part_of_speech, chinese_summary) VALUES (?, ?, ?, ?, ?)",
+                            projections,
+                        )
+                        conn.commit()
+                        derived[dict_name] += len(projections)
+                        if progress_callback:
+                            progress_callback(dict_name, derived[dict_name])
+                    logger.info(f"词典 {dict_name} 派生字段重建完成: {derived[dict_name]} 条")
+            finally:
+                conn.close()
+
+            return {"cleared": cleared, "dicts": derived}
 
     def _extract_phonetic(self, html_content: str) -> Optional[str]:
         """Extract phonetic transcription from HTML"""
@@ -702,8 +1528,7 @@ class DictManager:
 
     def _extract_part_of_speech(self, html_content: str) -> Optional[str]:
         """Extract part of speech from HTML"""
-        import re
-        match = re.search(r'<span class="pos">([^<]+)</span>', html_content)
+        match = _POS_PATTERN.search(html_content)
         if match:
             return match.group(1).strip()
         return None
@@ -749,16 +1574,6 @@ class DictManager:
 
     def _sanitize_html_for_web(self, html_content: str) -> str:
         """Sanitize HTML for web display"""
-        import re
-        
-        # Remove scripts
-        html_content = re.sub(r"<script[^>]*>.*?</script>", "", html_content, flags=re.DOTALL | re.IGNORECASE)
-        html_content = re.sub(r"<script[^>]*/>", "", html_content, flags=re.IGNORECASE)
-        # Remove links
-        html_content = re.sub(r"<link[^>]*/?>", "", html_content, flags=re.IGNORECASE)
-        # Remove body tags
-        html_content = re.sub(r"<body(?:\s[^>]*)?>|</body>", "", html_content, flags=re.IGNORECASE)
-        # Remove broken images
-        html_content = re.sub(r'<img[^>]*src=["\']/?sound\.png["\'][^>]*>', "", html_content, flags=re.IGNORECASE)
-        
+        for pattern in _SANITIZE_PATTERNS:
+            html_content = pattern.sub("", html_content)
         return html_content
@@ -1,22 +1,22 @@
 from sqlalchemy.orm import Session
 from sqlalchemy import func
-from typing import Optional, Dict, Any, List, Set, Tuple
+from typing import Optional, Dict, Any, Iterable, Iterator, List, NamedTuple, Set, Tuple, Union
 from functools import lru_cache
 from ..models.models import CacheDictionary
 from ..services import (
     cache_service,
-    gemini_service,
     ecdict_service,
     jmdict_service,
-    open_dict_service,
+    lemma_service,
 )
 from ..services.book_language_service import contains_japanese_text
+from ..services.ecdict_headwords import get_headword_index, normalize_pos_tags
 from ..services.japanese_text_service import get_japanese_lookup_terms
+from ..services.lookup_cache import get_lookup_cache
+from ..services.remote_lookup import get_remote_client
 from ..utils.lookup_normalizer import normalize_lookup_word
-from app import config
-import requests
+from fastapi.concurrency import run_in_threadpool
 import json
-import string
 import logging
 
 # 懒加载 DictManager，避免循环导入
@@ -39,279 +39,73 @@ def get_dict_manager():
 
 logger = logging.getLogger(__name__)
 
-FREE_DICT_API = "https://api.dictionaryapi.dev/api/v2/entries/en/{word}"
 JMDICT_SOURCE = "JMdict"
 
-# 例外词列表：以常见后缀结尾但本身是完整词的词
-# 这些词不应进行词形还原
-_EXCEPTION_WORDS = {
-    "ing": {
-        # 名词
-        "evening",
-        "morning",
-        "blessing",
-        "meeting",
-        "feeling",
-        "building",
-        "painting",
-        "drawing",
-        "clothing",
-        "housing",
-        "lighting",
-        "sightseeing",
-        "nothing",
-        "something",
-        "everything",
-        "anything",
-        "king",
-        "ring",
-        "wing",
-        "thing",
-        "bring",
-        "string",
-        "spring",
-        "sing",
-        "living",
-        "being",
-        "going",
-        "doing",
-        "dying",
-        "icing",
-        # 形容词
-        "interesting",
-        "boring",
-        "exciting",
-        "surprising",
-        "amazing",
-        "charming",
-        "alarming",
-        "frightening",
-        "worrying",
-        "tiring",
-    },
-    "ed": {
-        # 名词
-        "bed",
-        "red",
-        "wed",
-        "fed",
-        "led",
-        "shed",
-        "sled",
-        "bred",
-        "need",
-        "seed",
-        "deed",
-        "feed",
-        "weed",
-        "reed",
-        "speed",
-        # 形容词
-        "tired",
-        "bored",
-        "hired",
-        "fired",
-        "wired",
-        "mired",
-        "beloved",
-        "wicked",
-        "blessed",
-        "learned",
-        "aged",
-    },
-    "s": {
-        # 单数名词（以 s 结尾）
-        "bus",
-        "lens",
-        "class",
-        "grass",
-        "glass",
-        "pass",
-        "gas",
-        # 学科
-        "news",
-        "maths",
-        "physics",
-        "politics",
-        "economics",
-        "linguistics",
-        # 学术语
-        "analysis",
-        "crisis",
-        "thesis",
-        "basis",
-        "status",
-        "series",
-        "species",
-        "measles",
-        "mumps",
-        "rabies",
-        "billiards",
-        "darts",
-        "bowls",
-        # 其他
-        "address",
-        "process",
-        "campus",
-        "tennis",
-        "golf",
-        "campus",
-    },
-    "er": {
-        # 名词（后缀 -er 表示"人"或"物品"）
-        "teacher",
-        "mother",
-        "father",
-        "brother",
-        "sister",
-        "water",
-        "paper",
-        "letter",
-        "latter",
-        "master",
-        "matter",
-        "center",
-        "number",
-        "member",
-        "leader",
-        "player",
-        "driver",
-        "farmer",
-        "speaker",
-        "reader",
-        "worker",
-        "buyer",
-        "seller",
-        "owner",
-        "computer",
-        "camera",
-        "picture",
-        "feature",
-        "nature",
-        "future",
-        # 形容词/副词（better, latter 等不应被还原为 bet, lat）
-        "better",
-        "latter",
-        "matter",
-        "center",
-        "number",
-        "order",
-        "weather",
-        "feather",
-        "leather",
-        "gather",
-        "together",
-        "scatter",
-        "chapter",
-        "character",
-        "monster",
-        "shelter",
-        "winter",
-        "summer",
-        "finger",
-        "shoulder",
-        "peer",
-    },
-    "est": {
-        # 以 -est 结尾但不是最高级的词
-        "interest",
-        "different",
-        "important",
-        "excellent",
-        "consistent",
-        "permanent",
-        "significant",
-        "transparent",
-        "competent",
-    },
-}
+# 批量查询时用 get_words_details 一次取回的词条：单词 -> 词条（未收录为 None）
+PreloadedDetails = Dict[str, Optional[Dict[str, Any]]]
 
-_IRREGULAR_LEMMAS = {
-    "am": "be",
-    "are": "be",
-    "is": "be",
-    "strewn": "strew",
-    "strove": "strive",
-    "driven": "drive",
-    "written": "write",
-    "wrote": "write",
-    "spoken": "speak",
-    "spoke": "speak",
-    "taken": "take",
-    "took": "take",
-    "gone": "go",
-    "went": "go",
-    "seen": "see",
-    "saw": "see",
-    "has": "have",
-    "had": "have",
-    "done": "do",
-    "did": "do",
-    "been": "be",
-    "was": "be",
-    "were": "be",
-    "given": "give",
-    "gave": "give",
-    "better": "good",
-    "best": "good",
-    "worse": "bad",
-    "worst": "bad",
-    "farther": "far",
-    "further": "far",
-    "farthest": "far",
-    "furthest": "far",
-}
+# 单次预取最多解析的不同单词数（一页通常为数百个）
+PREFETCH_MAX_WORDS = 600
+
+# 批量查词接口单次请求的单词上限，以及每批集合查询的单词数（每批完成即输出一批结果）
+BATCH_LOOKUP_MAX_WORDS = 1000
+BATCH_LOOKUP_CHUNK_SIZE = 100
 
 _NOUN_VERB_POS = {"n", "v"}
 _VERB_LIKE_POS = {"n", "v", "j"}
 _COMPARATIVE_POS = {"j", "r"}
 
+# 规则候选类型 -> 原词应具备的词性（原词是 ECDICT 词头且词性不符时不按该类型还原）
+_INFLECTION_KIND_POS = {
+    "plural": _NOUN_VERB_POS,
+    "verb": _VERB_LIKE_POS,
+    "comparative": _COMPARATIVE_POS,
+    "superlative": _COMPARATIVE_POS,
+}
 
-@lru_cache(maxsize=4096)
-def _get_ecdict_entry_info(word: str) -> Tuple[bool, Tuple[str, ...]]:
-    details = ecdict_service.get_word_details(word)
+
+def _get_ecdict_entry_info(
+    word: str, preloaded: Optional[PreloadedDetails] = None
+) -> Tuple[bool, Tuple[str, ...]]:
+    """
+    词是否为 ECDICT 词头及其词性；词头索引加载后直接查内存，不再访问 SQLite。
+
+    preloaded 为批量查询时用 get_words_details 一次取回的 ECDICT 结果，命中时不再逐词查询。
+    """
+    index = get_headword_index()
+    if index is not None:
+        tags = index.lookup(word)
+        return tags is not None, tags or ()
+    if preloaded is not None and word in preloaded:
+        return _entry_info(preloaded[word])
+    return _get_ecdict_entry_info_from_db(word)
+
+
+def _entry_info(details: Optional[Dict]) -> Tuple[bool, Tuple[str, ...]]:
     if not details:
         return False, ()
+    return True, normalize_pos_tags(details.get("pos"))
+
+
+@lru_cache(maxsize=4096)
+def _get_ecdict_entry_info_from_db(word: str) -> Tuple[bool, Tuple[str, ...]]:
+    return _entry_info(ecdict_service.get_word_details(word))
 
-    pos_value = details.get("pos") or ""
-    tags: List[str] = []
-    for part in pos_value.split("/"):
-        tag = part.split(":", 1)[0].strip().lower().rstrip(".")
-        normalized_tag = {
-            "noun": "n",
-            "n": "n",
-            "verb": "v",
-            "v": "v",
-            "adj": "j",
-            "adjective": "j",
-            "j": "j",
-            "adv": "r",
-            "adverb": "r",
-            "r": "r",
-            "det": "d",
-            "determiner": "d",
-            "d": "d",
-            "pron": "p",
-            "pronoun": "p",
-            "p": "p",
-        }.get(tag, tag)
-        if normalized_tag:
-            tags.append(normalized_tag)
-
-    return True, tuple(tags)
-
-
-def _supports_inflection(word: str, allowed: Set[str]) -> bool:
-    exists, tags = _get_ecdict_entry_info(word)
+
+def _supports_inflection(word: str, allowed: Set[str], preloaded: Optional[PreloadedDetails] = None) -> bool:
+    exists, tags = _get_ecdict_entry_info(word, preloaded)
     if not exists or not tags:
         return True
     return bool(set(tags) & allowed)
 
 
-def _candidate_exists(candidate: str) -> bool:
-    exists, _ = _get_ecdict_entry_info(candidate)
+def _candidate_exists(candidate: str, preloaded: Optional[PreloadedDetails] = None) -> bool:
+    exists, _ = _get_ecdict_entry_info(candidate, preloaded)
     if exists:
         return True
+    # 词头索引已覆盖 ECDICT 全部词头，不再逐个探查导入词典
+    if get_headword_index() is not None:
+        return False
 
     dict_manager = get_dict_manager()
     return bool(dict_manager and dict_manager.word_exists(candidate))
@@ -321,152 +115,96 @@ def _is_japanese_lookup(word: str) -> bool:
     return contains_japanese_text(word)
 
 
-def _lookup_jmdict_terms(original_word: str, lookup_terms: List[str]) -> Optional[Dict]:
-    for term in lookup_terms:
-        result = jmdict_service.get_word_details(term)
-        if not result:
-            continue
-        result["lookup_term"] = original_word
-        if term != original_word:
-            result["lemma_from"] = term
-        return result
-    return None
+def _get_ecdict_details(word: str, preloaded: Optional[PreloadedDetails] = None) -> Optional[Dict]:
+    """查 ECDICT；批量查询时优先使用已通过 get_words_details 取回的结果"""
+    if preloaded is not None and word in preloaded:
+        return preloaded[word]
+    return ecdict_service.get_word_details(word)
+
+
+def _lookup_jmdict_terms(
+    original_word: str, lookup_terms: List[str], preloaded: Optional[PreloadedDetails] = None
+) -> Optional[Dict]:
+    match: Optional[Tuple[str, Dict[str, Any]]] = None
+    if preloaded is not None:
+        for term in lookup_terms:
+            details = preloaded.get(term)
+            if details:
+                match = (term, dict(details))
+                break
+    else:
+        # 全部检索词一次 IN 查询，只解码第一个命中词的词条
+        match = jmdict_service.get_first_word_details(lookup_terms)
+    if not match:
+        return None
+
+    term, result = match
+    result["lookup_term"] = original_word
+    if term != original_word:
+        result["lemma_from"] = term
+    return result
 
 
-def _get_lemma_candidates(word: str, validate_candidates: bool = True) -> List[str]:
+def _get_lemma_candidates(
+    word: str, validate_candidates: bool = True, preloaded: Optional[PreloadedDetails] = None
+) -> List[str]:
     """
     生成可能的原型词列表。
 
-    根据常见英语词尾规则推测原型，支持候选词验证。
+    优先使用共享词形还原表，表中没有时使用 lemma_service 的规则候选，并按原词词性过滤、
+    可选验证候选词是否存在。
 
     Args:
         word: 输入词
         validate_candidates: 是否验证候选词（默认 True）
+        preloaded: 批量查询时预先取回的 ECDICT 结果，词性校验优先使用
 
     Returns:
         可能的原型词列表（按优先级排序）
     """
-    candidates: List[Tuple[str, str]] = []
     word_lower = word.lower()
 
-    def add_candidate(candidate: str, kind: str) -> None:
-        if not candidate:
-            return
-        if candidate.lower() == word_lower:
-            return
-        candidates.append((candidate, kind))
+    # ECDICT exchange 记录的屈折形式：原型来自词典本身，无需再按规则推测和校验
+    table_lemmas = [lemma for lemma in lemma_service.get_lemmas(word_lower) if lemma != word_lower]
+    if table_lemmas:
+        return table_lemmas
 
-    irregular = _IRREGULAR_LEMMAS.get(word_lower)
-    if irregular:
-        if validate_candidates:
-            return _validate_lemma_candidates(word_lower, [(irregular, "irregular")])
-        return [irregular]
-
-    # 1. 检查例外列表：如果原词在例外列表中，直接返回空列表
-    for suffix, words in _EXCEPTION_WORDS.items():
-        if word_lower in words:
-            return []
-
-    # 2. 复数形式还原
-    if word_lower.endswith("ies"):
-        if _supports_inflection(word_lower, _NOUN_VERB_POS):
-            # cities -> city, movies -> movie
-            add_candidate(word[:-3] + "y", "plural")
-            add_candidate(word[:-1], "plural")
-    elif word_lower.endswith(("ses", "xes", "zes", "ches", "shes", "oes")):
-        # boxes -> box, watches -> watch, heroes -> hero
-        if _supports_inflection(word_lower, _NOUN_VERB_POS):
-            add_candidate(word[:-2], "plural")
-    elif word_lower.endswith("es") and len(word) > 3:
-        if _supports_inflection(word_lower, _NOUN_VERB_POS):
-            add_candidate(word[:-1], "plural")
-            add_candidate(word[:-2], "plural")
-    elif word_lower.endswith("s") and not word_lower.endswith("ss"):
-        # deserts -> desert, books -> book
-        if _supports_inflection(word_lower, _NOUN_VERB_POS):
-            add_candidate(word[:-1], "plural")
-
-    # 3. 过去式/过去分词还原
-    if word_lower.endswith("ied"):
-        if _supports_inflection(word_lower, _VERB_LIKE_POS):
-            # studied -> study, died -> die
-            add_candidate(word[:-3] + "y", "verb")
-            add_candidate(word[:-1], "verb")
-    elif word_lower.endswith("ed"):
-        # spotted -> spot, stopped -> stop
-        if _supports_inflection(word_lower, _VERB_LIKE_POS):
-            if len(word) > 4 and word[-3].lower() == word[-4].lower():
-                add_candidate(word[:-3], "verb")
-            # walked -> walk
-            add_candidate(word[:-2], "verb")
-            # loved -> love
-            add_candidate(word[:-1], "verb")
-
-    # 4. 进行时还原
-    if word_lower.endswith("ing"):
-        if _supports_inflection(word_lower, _VERB_LIKE_POS):
-            # running -> run (双写辅音)
-            if len(word) > 5 and word[-4].lower() == word[-5].lower():
-                add_candidate(word[:-4], "verb")
-            # loving -> love
-            add_candidate(word[:-3] + "e", "verb")
-            # running -> run, walking -> walk
-            add_candidate(word[:-3], "verb")
-            # panicking -> panic
-            if word_lower.endswith("cking"):
-                add_candidate(word[:-3], "verb")
-                add_candidate(word[:-4], "verb")
-
-    # 5. 比较级/最高级还原
-    if word_lower.endswith("iest"):
-        if _supports_inflection(word_lower, _COMPARATIVE_POS):
-            add_candidate(word[:-4] + "y", "superlative")  # happiest -> happy
-    elif word_lower.endswith("ier"):
-        if _supports_inflection(word_lower, _COMPARATIVE_POS):
-            add_candidate(word[:-3] + "y", "comparative")  # happier -> happy
-    elif word_lower.endswith("est"):
-        if _supports_inflection(word_lower, _COMPARATIVE_POS):
-            if len(word) > 5 and word[-4].lower() == word[-5].lower():
-                add_candidate(word[:-4], "superlative")  # biggest -> big
-            add_candidate(word[:-2], "superlative")  # largest -> large
-            add_candidate(word[:-3], "superlative")  # fastest -> fast
-    elif word_lower.endswith("er"):
-        if _supports_inflection(word_lower, _COMPARATIVE_POS):
-            if len(word) > 4 and word[-3].lower() == word[-4].lower():
-                add_candidate(word[:-3], "comparative")  # bigger -> big
-            add_candidate(word[:-1], "comparative")  # larger -> large
-            add_candidate(word[:-2], "comparative")  # faster -> fast
-
-    # 6. 去重并保序
-    deduped_candidates: List[Tuple[str, str]] = []
-    seen = set()
-    for candidate, kind in candidates:
-        lower_candidate = candidate.lower()
-        if lower_candidate in seen:
-            continue
-        seen.add(lower_candidate)
-        deduped_candidates.append((candidate, kind))
+    # 不规则词表和后缀规则由 lemma_service 统一维护，这里只按原词词性过滤
+    kind_supported: Dict[str, bool] = {}
+    candidates: List[Tuple[str, str]] = []
+    for candidate, kind in lemma_service.rule_candidates_with_kinds(word):
+        allowed = _INFLECTION_KIND_POS.get(kind)
+        if allowed is not None:
+            if kind not in kind_supported:
+                kind_supported[kind] = _supports_inflection(word_lower, allowed, preloaded)
+            if not kind_supported[kind]:
+                continue
+        candidates.append((candidate, kind))
 
-    # 7. 可选：验证候选词是否在词典中存在
     if validate_candidates:
-        return _validate_lemma_candidates(word_lower, deduped_candidates)
+        return _validate_lemma_candidates(word_lower, candidates, preloaded)
 
-    return [candidate for candidate, _ in deduped_candidates]
+    return [candidate for candidate, _ in candidates]
 
 
-def _validate_lemma_candidates(original_word: str, candidates: List[Tuple[str, str]]) -> List[str]:
+def _validate_lemma_candidates(
+    original_word: str,
+    candidates: List[Tuple[str, str]],
+    preloaded: Optional[PreloadedDetails] = None,
+) -> List[str]:
     """
     验证候选词是否在词典中存在。
 
     Args:
         original_word: 原始查询词
         candidates: 原始候选词列表
+        preloaded: 批量查询时预先取回的 ECDICT 结果
 
     Returns:
         验证后的候选词列表（只包含在词典中存在的词）
     """
     valid_candidates: List[str] = []
-    original_supports_comparison = _supports_inflection(original_word, _COMPARATIVE_POS)
+    original_supports_comparison = _supports_inflection(original_word, _COMPARATIVE_POS, preloaded)
 
     for lemma, kind in candidates:
         # 过滤过短的词
@@ -477,7 +215,7 @@ def _validate_lemma_candidates(original_word: str, candidates: List[Tuple[str, s
         if len(lemma) <= 2 and not lemma.isalpha():
             continue
 
-        exists_in_ecdict, pos_tags = _get_ecdict_entry_info(lemma)
+        exists_in_ecdict, pos_tags = _get_ecdict_entry_info(lemma, preloaded)
         pos_set = set(pos_tags)
 
         if kind in {"comparative", "superlative"}:
@@ -492,7 +230,7 @@ def _validate_lemma_candidates(original_word: str, candidates: List[Tuple[str, s
             if pos_set:
                 if pos_set & _NOUN_VERB_POS:
                     valid_candidates.append(lemma)
-            elif not exists_in_ecdict and _candidate_exists(lemma):
+            elif not exists_in_ecdict and _candidate_exists(lemma, preloaded):
                 valid_candidates.append(lemma)
             continue
 
@@ -500,11 +238,11 @@ def _validate_lemma_candidates(original_word: str, candidates: List[Tuple[str, s
             if pos_set:
                 if pos_set & _VERB_LIKE_POS:
                     valid_candidates.append(lemma)
-            elif not exists_in_ecdict and _candidate_exists(lemma):
+            elif not exists_in_ecdict and _candidate_exists(lemma, preloaded):
                 valid_candidates.append(lemma)
             continue
 
-        if _candidate_exists(lemma):
+        if _candidate_exists(lemma, preloaded):
             valid_candidates.append(lemma)
 
     return valid_candidates
@@ -566,11 +304,13 @@ def _annotate_lookup_result(
     return result
 
 
-def _get_lookup_terms(word: str, prefer_lemma: bool = True) -> List[str]:
+def _get_lookup_terms(
+    word: str, prefer_lemma: bool = True, preloaded: Optional[PreloadedDetails] = None
+) -> List[str]:
     if _is_japanese_lookup(word):
         return get_japanese_lookup_terms(word)
 
-    lemma_candidates = _get_lemma_candidates(word, validate_candidates=True)
+    lemma_candidates = _get_lemma_candidates(word, validate_candidates=True, preloaded=preloaded)
     if not prefer_lemma:
         terms = [word]
         for lemma in lemma_candidates:
@@ -586,12 +326,29 @@ def _get_lookup_terms(word: str, prefer_lemma: bool = True) -> List[str]:
     return terms
 
 
-def lookup_word_all_sources(db: Session, word: str) -> Optional[Dict]:
+def get_validated_lemmas(word: str) -> List[str]:
+    """原型候选（表中记录的原型，或通过词头/词性校验的规则候选），供例句提取等模块使用"""
+    if _is_japanese_lookup(word):
+        return []
+    return _get_lemma_candidates(word, validate_candidates=True)
+
+
+def lookup_word_all_sources(
+    db: Optional[Session],
+    word: str,
+    imported_hits: Optional[Dict[str, Tuple[str, Dict]]] = None,
+    allow_ai: bool = True,
+    ecdict_details: Optional[PreloadedDetails] = None,
+    jmdict_details: Optional[PreloadedDetails] = None,
+) -> Optional[Dict]:
     """Look up word in ALL active dictionaries and return aggregated results.
 
     Args:
-        db: Database session
+        db: Database session（批量查询时为 None，结果不写入数据库缓存）
         word: Word to look up
+        imported_hits: 已批量取回的导入词典结果（lookup_many 的返回值），预取时传入以跳过单词查询
+        allow_ai: 本地词典都未命中时是否调用 AI 兜底（预取时关闭）
+        ecdict_details / jmdict_details: 批量查询时预先取回的 ECDICT / JMdict 结果，未包含的词仍逐词查询
 
     Returns:
         Dict with multiple_sources=True and results array
@@ -607,42 +364,39 @@ def lookup_word_all_sources(db: Session, word: str) -> Optional[Dict]:
     # 获取所有启用的词典
     dict_manager = get_dict_manager()
     try:
-        dicts = dict_manager.get_dicts()
+        dicts = dict_manager.get_dicts() if dict_manager is not None else []
         # 过滤出启用的导入词典（排除内置词典）
         active_imported_dicts = [d["name"] for d in dicts if d.get("type") == "imported" and d.get("is_active", True)]
 
-        lookup_terms = _get_lookup_terms(original_word, prefer_lemma=True)
+        lookup_terms = _get_lookup_terms(original_word, prefer_lemma=True, preloaded=ecdict_details)
+
+        # 一次批量查询所有启用的词典。每个词典优先按原型命中，找不到再回退到原词。
+        hits = imported_hits if imported_hits is not None else {}
+        if dict_manager is not None and active_imported_dicts and imported_hits is None:
+            try:
+                hits = dict_manager.lookup_many(lookup_terms, active_imported_dicts)
+            except Exception as e:
+                logger.warning(f"Failed batch lookup for {lookup_terms}: {e}")
 
-        # 查询所有启用的词典。优先按原型查询，找不到再回退到原词。
         results = []
-        for dict_name in active_imported_dicts:
+        for dict_name, (term, result) in hits.items():
             try:
-                matched_word = original_word
-                matched_lemma = None
-                result = None
-
-                for term in lookup_terms:
-                    try:
-                        candidate_result = dict_manager.lookup_word(term, source=dict_name)
-                    except Exception as e:
-                        logger.warning(f"Failed lookup in {dict_name} for {term}: {e}")
-                        continue
-
-                    if candidate_result:
-                        result = candidate_result
-                        matched_word = term
-                        if term.lower() != original_word.lower():
-                            matched_lemma = term
-                        break
+                matched_word = term
+                matched_lemma = term if term.lower() != original_word.lower() else None
 
                 if result:
                     result_word = result.get("word")
                     if result_word and result_word.lower() != original_word.lower():
                         matched_word = result_word
-                        if result_word.lower() in [candidate.lower() for candidate in _get_lemma_candidates(original_word, validate_candidates=True)]:
+                        lemma_candidates = _get_lemma_candidates(
+                            original_word, validate_candidates=True, preloaded=ecdict_details
+                        )
+                        if result_word.lower() in [candidate.lower() for candidate in lemma_candidates]:
                             matched_lemma = result_word
 
-                    supplement = ecdict_service.get_word_details(matched_word) or ecdict_service.get_word_details(original_word)
+                    supplement = _get_ecdict_details(matched_word, ecdict_details) or _get_ecdict_details(
+                        original_word, ecdict_details
+                    )
                     if supplement:
                         if supplement.get("translation"):
                             result["chinese_translation"] = supplement["translation"]
@@ -661,7 +415,7 @@ def lookup_word_all_sources(db: Session, word: str) -> Optional[Dict]:
                 continue
 
         if is_japanese_lookup:
-            jmdict_result = _lookup_jmdict_terms(original_word, lookup_terms)
+            jmdict_result = _lookup_jmdict_terms(original_word, lookup_terms, jmdict_details)
             if jmdict_result:
                 results.append({"source_label": JMDICT_SOURCE, "source": JMDICT_SOURCE, **jmdict_result})
 
@@ -671,7 +425,7 @@ def lookup_word_all_sources(db: Session, word: str) -> Optional[Dict]:
 
             # 所有导入词典都没找到，优先返回原型的 ECDICT 结果，再回退原词。
             for term in lookup_terms:
-                ecdict_data = ecdict_service.get_word_details(term)
+                ecdict_data = _get_ecdict_details(term, ecdict_details)
                 if not ecdict_data:
                     continue
 
@@ -697,97 +451,13 @@ def lookup_word_all_sources(db: Session, word: str) -> Optional[Dict]:
                     ],
                 }
 
-            # ECDICT 也没找到，尝试 AI 兜底查询
-            logger.info(f"[lookup_word_all_sources] Not found in any imported dict or ECDICT, trying AI fallback for word: {word}")
-            try:
-                from ..services import supplier_factory
-
-                # 使用 AI 定义单词
-                prompt = f"""Please define the English word "{word}" in the following JSON format:
-{{
-    "word": "{word}",
-    "phonetic": "[phonetic transcription if available]",
-    "meanings": [
-        {{
-            "partOfSpeech": "part of speech",
-            "definitions": [
-                {{
-                    "definition": "clear definition in English",
-                    "translation": "Chinese translation"
-                }}
-            ]
-        }}
-    ]
-}}
-
-Return ONLY the JSON, no other text."""
-
-                response = supplier_factory.chat_with_active_supplier(
-                    prompt,
-                    history=[],
-                    temperature=0.3
-                )
-
-                if response:
-                    logger.info(f"[lookup_word_all_sources] AI response for word {word}: {response[:200]}...")
-
-                    # 尝试解析 JSON 响应
-                    import json
-                    import re
-
-                    # 提取 JSON（去除可能的 markdown 代码块）
-                    json_match = re.search(r'```json\s*(.*?)\s*```', response, re.DOTALL)
-                    if json_match:
-                        response = json_match.group(1).strip()
-                    else:
-                        # 尝试直接提取 JSON 对象
-                        json_match = re.search(r'\{.*\}', response, re.DOTALL)
-                        if json_match:
-                            response = json_match.group(0).strip()
-
-                    logger.info(f"[lookup_word_all_sources] Extracted JSON for word {word}: {response[:200]}...")
-                    ai_data = json.loads(response)
-                    logger.info(f"[lookup_word_all_sources] Parsed AI data for word {word}: {ai_data}")
-
-                    # 构造返回结果
-                    ai_word = lookup_terms[0] if lookup_terms else original_word
-                    result = {
-                        "word": ai_word,
-                        "lookup_term": original_word,
-                        "lemma_from": ai_word if ai_word.lower() != original_word.lower() else None,
-                        "source": "AI",
-                        "is_ai": True,
-                        "phonetic": ai_data.get("phonetic", ""),
-                        "chinese_translation": "",
-                    }
-
-                    # 处理 meanings
-                    meanings = ai_data.get("meanings", [])
-                    if meanings:
-                        result["meanings"] = []
-                        for meaning in meanings:
-                            definitions = meaning.get("definitions", [])
-                            if definitions:
-                                result["meanings"].append({
-                                    "partOfSpeech": meaning.get("partOfSpeech", ""),
-                                    "definitions": definitions
-                                })
-
-                        # 获取第一个中文翻译作为整体翻译
-                        if definitions and definitions[0].get("translation"):
-                            result["chinese_translation"] = definitions[0]["translation"]
-
-                    logger.info(f"[lookup_word_all_sources] AI fallback successful for word: {word}")
-                    return result
-                else:
-                    logger.warning(f"[lookup_word_all_sources] AI returned empty response for word {word}")
-
-            except Exception as e:
-                logger.warning(f"[lookup_word_all_sources] AI fallback failed for word {word}: {e}")
-                import traceback
-                logger.warning(f"[lookup_word_all_sources] Traceback: {traceback.format_exc()}")
+            if not allow_ai:
+                return None
 
-            return None
+            # ECDICT 也没找到，尝试 AI 兜底查询
+            return _resolve_remote_fallback(
+                db, _RemoteFallback(_ALL_SOURCES_MODE, original_word, original_word, lookup_terms)
+            )
 
         # 只有一个词典有结果，直接返回（使用单词典模式）
         if len(results) == 1:
@@ -797,7 +467,9 @@ Return ONLY the JSON, no other text."""
         # 单独查询 ECDICT 获取中文翻译和音标，而不是依赖词典结果
         preferred_result = next((item for item in results if item.get("lemma_from")), results[0] if results else None)
         preferred_word = preferred_result.get("word") if preferred_result else original_word
-        ecdict_for_multi = ecdict_service.get_word_details(preferred_word) or ecdict_service.get_word_details(original_word)
+        ecdict_for_multi = _get_ecdict_details(preferred_word, ecdict_details) or _get_ecdict_details(
+            original_word, ecdict_details
+        )
         chinese_translation = ecdict_for_multi.get("translation") if ecdict_for_multi else None
         phonetic = ecdict_for_multi.get("phonetic") if ecdict_for_multi else None
 
@@ -821,12 +493,238 @@ Return ONLY the JSON, no other text."""
     except Exception as e:
         logger.error(f"Error in lookup_word_all_sources: {e}")
         # 发生错误时，回退到 ECDICT 直接查询
-        return ecdict_service.get_word_details(original_word)
+        return _get_ecdict_details(original_word, ecdict_details)
+
+
+def _get_dict_config_version() -> int:
+    """导入词典配置的版本号，配置变化后旧的缓存 key 自然失效"""
+    try:
+        dict_manager = get_dict_manager()
+        return dict_manager.get_config_version() if dict_manager else 0
+    except Exception as e:
+        logger.debug(f"获取词典配置版本失败: {e}")
+        return 0
+
+
+def _lookup_cache_key(word: str, source: Optional[str]) -> Tuple[str, Optional[str], int]:
+    return (word, source, _get_dict_config_version())
+
+
+def _is_negative_result(result: Optional[Dict]) -> bool:
+    """未找到释义：None 或 source 为 "None" 的占位结果"""
+    return not result or result.get("source") == "None"
+
+
+_ALL_SOURCES_MODE = "all_sources"
+_SINGLE_SOURCE_MODE = "single_source"
+
+
+class _RemoteFallback(NamedTuple):
+    """本地查询全部未命中、需要远程兜底时的上下文"""
+
+    mode: str
+    original_word: str
+    matched_word: str
+    lookup_terms: List[str]
+    cn_translation: Optional[str] = None
+    source: Optional[str] = None
+
+
+def lookup_word(db: Optional[Session], word: str, source: Optional[str] = None) -> Optional[Dict]:
+    """查词入口：先查进程内查词缓存，未命中再走完整查询链并写回缓存（含未找到的结果）"""
+    normalized = normalize_lookup_word(word)
+    if not normalized:
+        return None
+
+    cache = get_lookup_cache()
+    cache_key = _lookup_cache_key(normalized, source)
+    hit, cached = cache.get(cache_key)
+    if hit:
+        return cached
+
+    result = _lookup_word_uncached(db, normalized, source)
+    cache.put(cache_key, result, negative=_is_negative_result(result))
+    return result
+
+
+async def lookup_word_async(db: Session, word: str, source: Optional[str] = None) -> Optional[Dict]:
+    """
+    异步查词入口（路由使用），语义与 lookup_word 相同。
+    本地查询放到线程池执行；远程兜底在共享异步客户端上等待，不占用线程池。
+    """
+    normalized = normalize_lookup_word(word)
+    if not normalized:
+        return None
+
+    cache = get_lookup_cache()
+    cache_key = await run_in_threadpool(_lookup_cache_key, normalized, source)
+    hit, cached = cache.get(cache_key)
+    if hit:
+        return cached
+
+    result = await run_in_threadpool(_lookup_word_local, db, normalized, source)
+    if isinstance(result, _RemoteFallback):
+        remote = await _lookup_remote(result)
+        result = await run_in_threadpool(_finish_remote_fallback, db, result, remote)
+    cache.put(cache_key, result, negative=_is_negative_result(result))
+    return result
+
+
+def _lookup_local_batch(words: List[str]) -> Dict[str, Optional[Dict]]:
+    """
+    按多词典模式批量查询一组已规范化的单词，只使用本地词典，不触发 AI 或网络兜底。
+
+    导入词典通过 lookup_many_groups、ECDICT 与 JMdict 通过各自的 get_words_details 做集合查询，
+    再逐词组装与 lookup_word_all_sources 相同的结果。
+    """
+    # 原型校验会逐个查询候选词的 ECDICT 词性，词头索引未加载时先用一次集合查询取回原词与全部候选，
+    # 显式传给原型推测与校验（每次调用各自持有，不与并发的查询共享）
+    candidate_words: List[str] = []
+    for word in words:
+        if get_headword_index() is None and not _is_japanese_lookup(word):
+            candidate_words.append(word)
+            candidate_words.extend(_get_lemma_candidates(word, validate_candidates=False))
+    ecdict_details = ecdict_service.get_words_details(candidate_words) if candidate_words else {}
+    lookup_terms = {word: _get_lookup_terms(word, prefer_lemma=True, preloaded=ecdict_details) for word in words}
+
+    grouped_hits: List[Dict[str, Tuple[str, Dict]]] = [{} for _ in words]
+    dict_manager = get_dict_manager()
+    try:
+        active_imported_dicts = (
+            [d["name"] for d in dict_manager.get_dicts() if d.get("type") == "imported" and d.get("is_active", True)]
+            if dict_manager is not None
+            else []
+        )
+        if dict_manager is not None and active_imported_dicts:
+            grouped_hits = dict_manager.lookup_many_groups([lookup_terms[w] for w in words], active_imported_dicts)
+    except Exception as e:
+        logger.warning(f"批量查询导入词典失败: {e}")
+
+    # ECDICT 需要覆盖兜底用的查询词以及导入词典命中的词头（用于补充中文释义和音标）
+    ecdict_words: List[str] = []
+    jmdict_words: List[str] = []
+    for word, hits in zip(words, grouped_hits, strict=True):
+        if _is_japanese_lookup(word):
+            jmdict_words.extend(lookup_terms[word])
+        ecdict_words.append(word)
+        ecdict_words.extend(lookup_terms[word])
+        ecdict_words.extend(result.get("word") or term for term, result in hits.values() if result)
+    ecdict_details.update(ecdict_service.get_words_details(w for w in ecdict_words if w not in ecdict_details))
+    jmdict_details = jmdict_service.get_words_details(jmdict_words) if jmdict_words else {}
+
+    results: Dict[str, Optional[Dict]] = {}
+    for word, hits in zip(words, grouped_hits, strict=True):
+        try:
+            results[word] = lookup_word_all_sources(
+                None,
+                word,
+                imported_hits=hits,
+                allow_ai=False,
+                ecdict_details=ecdict_details,
+                jmdict_details=jmdict_details,
+            )
+        except Exception as e:
+            logger.debug(f"批量查询单词失败 {word}: {e}")
+            results[word] = None
+    return results
 
 
-def lookup_word(db: Session, word: str, source: Optional[str] = None) -> Optional[Dict]:
+def prefetch_lookups(words: Iterable[str], max_words: int = PREFETCH_MAX_WORDS) -> Dict[str, int]:
+    """
+    预热查词缓存：把一批单词按多词典模式（与 GET /api/dict/{word} 不带 source 时相同）
+    解析并写入缓存，点击时直接命中内存。
+
+    只缓存本地词典（MDX/ECDICT）能给出的结果，不触发 AI 或网络兜底，也不缓存未命中
+    （真实点击时仍会走兜底）。日语文本需分词后查询，跳过。
+    """
+    cache = get_lookup_cache()
+    version = _get_dict_config_version()
+
+    pending: List[str] = []
+    skipped = 0
+    for raw in words:
+        word = normalize_lookup_word(raw)
+        if not word or word in pending or _is_japanese_lookup(word):
+            continue
+        if cache.contains((word, None, version)):
+            skipped += 1
+            continue
+        pending.append(word)
+        if len(pending) >= max_words:
+            break
+
+    if not pending:
+        return {"requested": 0, "warmed": 0, "cached": skipped}
+
+    warmed = 0
+    for word, result in _lookup_local_batch(pending).items():
+        if result:
+            cache.put((word, None, version), result)
+            warmed += 1
+
+    return {"requested": len(pending), "warmed": warmed, "cached": skipped}
+
+
+def lookup_words_batch(
+    words: List[str], fallback: bool = False, chunk_size: int = BATCH_LOOKUP_CHUNK_SIZE
+) -> Iterator[Dict[str, Any]]:
+    """
+    批量查词（多词典模式），按输入顺序逐个产出 {"word", "lookup_term", "found", "result"}。
+
+    已缓存的单词直接返回；其余每 chunk_size 个一批做集合查询，每批完成后立即产出，
+    调用方可以边查边输出。本地词典未命中的单词默认直接返回 found=False；
+    fallback=True 时改走 lookup_word 的完整回退链（AI / 网络，逐词，较慢）。
+    """
+    cache = get_lookup_cache()
+    version = _get_dict_config_version()
+
+    for i in range(0, len(words), chunk_size):
+        chunk = words[i : i + chunk_size]
+        normalized = [normalize_lookup_word(w) for w in chunk]
+
+        resolved: Dict[str, Optional[Dict]] = {}
+        pending: List[str] = []
+        for word in normalized:
+            if not word or word in resolved or word in pending:
+                continue
+            hit, cached = cache.get((word, None, version))
+            if hit:
+                resolved[word] = cached
+            else:
+                pending.append(word)
+
+        if pending:
+            for word, result in _lookup_local_batch(pending).items():
+                if result:
+                    cache.put((word, None, version), result)
+                elif fallback:
+                    # 多词典模式的回退链不使用数据库会话
+                    result = lookup_word(None, word)
+                resolved[word] = result
+
+        for raw, word in zip(chunk, normalized, strict=True):
+            result = resolved.get(word) if word else None
+            found = not _is_negative_result(result)
+            yield {"word": raw, "lookup_term": word, "found": found, "result": result if found else None}
+
+
+def _lookup_word_uncached(db: Optional[Session], word: str, source: Optional[str] = None) -> Optional[Dict]:
     """Look up word in dictionary (cache -> local mdx -> gemini -> internet)
 
+    本地查询未命中时，远程兜底在共享异步客户端上执行，当前线程等待结果。
+    """
+    local = _lookup_word_local(db, word, source)
+    if isinstance(local, _RemoteFallback):
+        return _resolve_remote_fallback(db, local)
+    return local
+
+
+def _lookup_word_local(db: Optional[Session], word: str, source: Optional[str] = None) -> Union[Optional[Dict], _RemoteFallback]:
+    """Look up word in local sources (local mdx -> JMdict -> db cache -> ECDICT)
+
+    本地都未命中且需要远程兜底（AI / Free Dictionary API）时返回 _RemoteFallback，
+    由调用方以同步或异步方式完成远程查询。
+
     Args:
         db: Database session
         word: Word to look up
@@ -839,7 +737,11 @@ def lookup_word(db: Session, word: str, source: Optional[str] = None) -> Optiona
     # 如果 source 是 None，使用多词典聚合查询
     # 空字符串被视为有效的 source 值（表示默认词典）
     if source is None:
-        return lookup_word_all_sources(db, word)
+        result = lookup_word_all_sources(db, word, allow_ai=False)
+        word = normalize_lookup_word(word)
+        if result is None and word and not _is_japanese_lookup(word):
+            return _RemoteFallback(_ALL_SOURCES_MODE, word, word, _get_lookup_terms(word, prefer_lemma=True))
+        return result
 
     word = normalize_lookup_word(word)
 
@@ -860,11 +762,12 @@ def lookup_word(db: Session, word: str, source: Optional[str] = None) -> Optiona
     matched_word = original_word
     try:
         dict_manager = get_dict_manager()
-        for term in lookup_terms:
-            imported_res = dict_manager.lookup_word(term, source=source)
-            if imported_res:
-                matched_word = term
-                break
+        if dict_manager is not None:
+            for term in lookup_terms:
+                imported_res = dict_manager.lookup_word(term, source=source)
+                if imported_res:
+                    matched_word = term
+                    break
     except Exception as e:
         logger.warning(f"DictManager lookup failed: {e}")
 
@@ -922,7 +825,7 @@ def lookup_word(db: Session, word: str, source: Optional[str] = None) -> Optiona
         }
 
     # 2. Search Database Cache (before ECDICT, to avoid redundant lookups)
-    if not source or source == "AI":
+    if db is not None and (not source or source == "AI"):
         db_res = db.query(CacheDictionary).filter(func.lower(CacheDictionary.word) == word.lower()).first()
         if db_res:
             data = db_res.data
@@ -960,15 +863,180 @@ def lookup_word(db: Session, word: str, source: Optional[str] = None) -> Optiona
         }
         return result
 
-    # 4. Try AI (Fallback for Chinese translation)
-    if not source or source == "AI":
+    # 4. AI / Free Dictionary API 兜底
+    return _RemoteFallback(_SINGLE_SOURCE_MODE, original_word, matched_word, lookup_terms, cn_translation, source)
+
+
+async def _lookup_remote(fallback: _RemoteFallback) -> Optional[Dict]:
+    """远程兜底查询（在事件循环中执行，不访问数据库）"""
+    client = get_remote_client()
+    word = fallback.original_word
+
+    if fallback.mode == _ALL_SOURCES_MODE:
+        logger.info(f"[lookup_word_all_sources] Not found in any imported dict or ECDICT, trying AI fallback for word: {word}")
+        response = await client.ai_chat(_all_sources_ai_prompt(word), history=[], temperature=0.3)
+        if not response:
+            logger.warning(f"[lookup_word_all_sources] AI returned empty response for word {word}")
+            return None
         try:
-            from .supplier_factory import chat_with_active_supplier, get_supplier_factory
+            return _parse_all_sources_ai_response(fallback, response)
+        except Exception as e:
+            logger.warning(f"[lookup_word_all_sources] AI fallback failed for word {word}: {e}")
+            return None
+
+    # 4. Try AI (Fallback for Chinese translation)
+    if not fallback.source or fallback.source == "AI":
+        # 未配置 AI 供应商时 ai_chat 直接返回 None（供应商配置在远程客户端的线程中读取）
+        ai_response = await client.ai_chat(
+            _single_source_ai_prompt(word),
+            system_prompt="You are a professional English dictionary. Return only valid JSON.",
+            temperature=0.1,
+            max_tokens=1000,
+        )
+        if ai_response:
+            ai_result = _parse_single_source_ai_response(fallback, ai_response)
+            if ai_result:
+                logger.info(f"Found via AI: {word}")
+                return ai_result
+
+    # 5. Fallback to Free Dictionary API
+    data = await client.free_dictionary(word)
+    if not data:
+        return None
+
+    entry = data[0]
+    matched_word = fallback.matched_word
+    result = {
+        "word": matched_word,
+        "lookup_term": word,
+        "lemma_from": matched_word if matched_word.lower() != word.lower() else None,
+        "phonetic": entry.get("phonetic"),
+        "audio_url": next(
+            (p["audio"] for p in entry.get("phonetics", []) if p.get("audio")),
+            None,
+        ),
+        "meanings": entry.get("meanings", []),
+        "cached": False,
+    }
+    if fallback.cn_translation:
+        result["chinese_translation"] = fallback.cn_translation
+    return result
+
+
+def _resolve_remote_fallback(db: Optional[Session], fallback: _RemoteFallback) -> Optional[Dict]:
+    """同步完成远程兜底：在远程客户端的事件循环中执行并阻塞等待"""
+    result = get_remote_client().run_sync(_lookup_remote(fallback))
+    return _finish_remote_fallback(db, fallback, result)
+
 
-            # 检查是否有配置的 AI 供应商
-            factory = get_supplier_factory()
-            if factory.get_active_supplier_type():
-                prompt = f"""请为英文单词 "{word}" 提供以下信息，返回 JSON 格式（只返回 JSON，不要有其他文本）：
+def _finish_remote_fallback(db: Optional[Session], fallback: _RemoteFallback, result: Optional[Dict]) -> Optional[Dict]:
+    """保存远程结果到数据库缓存；未找到时返回 None 或"未找到"占位结果"""
+    word = fallback.original_word
+    lookup_terms = fallback.lookup_terms
+
+    if result:
+        if fallback.mode == _SINGLE_SOURCE_MODE and db is not None:
+            # 缓存 AI / 网络结果（没有数据库会话的批量查询不写缓存）
+            cache_service.save_dictionary_cache(db, word.lower(), result)
+        return result
+
+    if fallback.mode == _ALL_SOURCES_MODE:
+        return None
+
+    # 如果指定了 source 但没有找到结果，返回 None 而不是默认的错误页面
+    # 这样前端会执行第二次查询（不指定 source 的 AI 兜底查询）
+    if fallback.source:
+        logger.info(f"No definition found for word '{word}' in source '{fallback.source}', returning None to trigger fallback")
+        return None
+
+    # 如果没有指定 source，返回默认的错误页面
+    return {
+        "word": lookup_terms[0] if lookup_terms else word,
+        "lookup_term": word,
+        "lemma_from": lookup_terms[0] if lookup_terms and lookup_terms[0].lower() != word.lower() else None,
+        "phonetic": "/.../",
+        "meanings": [],
+        "html_content": f"<div class='error'>No definition found for '{word}'</div>",
+        "source": "None",
+        "chinese_translation": fallback.cn_translation,
+    }
+
+
+def _all_sources_ai_prompt(word: str) -> str:
+    return f"""Please define the English word "{word}" in the following JSON format:
+{{
+    "word": "{word}",
+    "phonetic": "[phonetic transcription if available]",
+    "meanings": [
+        {{
+            "partOfSpeech": "part of speech",
+            "definitions": [
+                {{
+                    "definition": "clear definition in English",
+                    "translation": "Chinese translation"
+                }}
+            ]
+        }}
+    ]
+}}
+
+Return ONLY the JSON, no other text."""
+
+
+def _parse_all_sources_ai_response(fallback: _RemoteFallback, response: str) -> Dict:
+    import re
+
+    word = fallback.original_word
+    logger.info(f"[lookup_word_all_sources] AI response for word {word}: {response[:200]}...")
+
+    # 提取 JSON（去除可能的 markdown 代码块）
+    json_match = re.search(r'```json\s*(.*?)\s*```', response, re.DOTALL)
+    if json_match:
+        response = json_match.group(1).strip()
+    else:
+        # 尝试直接提取 JSON 对象
+        json_match = re.search(r'\{.*\}', response, re.DOTALL)
+        if json_match:
+            response = json_match.group(0).strip()
+
+    ai_data = json.loads(response)
+    logger.info(f"[lookup_word_all_sources] Parsed AI data for word {word}: {ai_data}")
+
+    # 构造返回结果
+    lookup_terms = fallback.lookup_terms
+    ai_word = lookup_terms[0] if lookup_terms else word
+    result = {
+        "word": ai_word,
+        "lookup_term": word,
+        "lemma_from": ai_word if ai_word.lower() != word.lower() else None,
+        "source": "AI",
+        "is_ai": True,
+        "phonetic": ai_data.get("phonetic", ""),
+        "chinese_translation": "",
+    }
+
+    # 处理 meanings
+    meanings = ai_data.get("meanings", [])
+    if meanings:
+        result["meanings"] = []
+        for meaning in meanings:
+            definitions = meaning.get("definitions", [])
+            if definitions:
+                result["meanings"].append({
+                    "partOfSpeech": meaning.get("partOfSpeech", ""),
+                    "definitions": definitions
+                })
+
+        # 获取第一个中文翻译作为整体翻译
+        if definitions and definitions[0].get("translation"):
+            result["chinese_translation"] = definitions[0]["translation"]
+
+    logger.info(f"[lookup_word_all_sources] AI fallback successful for word: {word}")
+    return result
+
+
+def _single_source_ai_prompt(word: str) -> str:
+    return f"""请为英文单词 "{word}" 提供以下信息，返回 JSON 格式（只返回 JSON，不要有其他文本）：
 {{
     "word": "{word}",
     "phonetic": "音标（如果知道）",
@@ -986,97 +1054,35 @@ def lookup_word(db: Session, word: str, source: Optional[str] = None) -> Optiona
     ]
 }}"""
 
-                ai_response = chat_with_active_supplier(
-                    prompt,
-                    system_prompt="You are a professional English dictionary. Return only valid JSON.",
-                    temperature=0.1,
-                    max_tokens=1000
-                )
-
-                if ai_response:
-                    import json
-                    # 移除可能的 markdown 代码块标记
-                    response_text = ai_response.strip()
-                    if response_text.startswith("```"):
-                        response_text = response_text.split("```")[1]
-                        if response_text.startswith("json"):
-                            response_text = response_text[4:]
-                    response_text = response_text.strip()
-
-                    try:
-                        ai_result = json.loads(response_text)
-                        ai_result["source"] = "AI"
-                        ai_result["cached"] = False
-                        ai_result["lookup_term"] = original_word
-                        ai_result["word"] = lookup_terms[0] if lookup_terms else original_word
-                        if ai_result["word"].lower() != original_word.lower():
-                            ai_result["lemma_from"] = ai_result["word"]
-
-                        # 如果 ECDICT 有翻译，优先使用 ECDICT 的翻译
-                        if cn_translation:
-                            ai_result["chinese_translation"] = cn_translation
-
-                        # 缓存 AI 结果
-                        cache_service.save_dictionary_cache(db, word.lower(), ai_result)
-                        logger.info(f"Found via AI: {word}")
-                        return ai_result
-                    except json.JSONDecodeError as e:
-                        logger.warning(f"AI 返回的 JSON 解析失败: {e}")
-            else:
-                logger.debug("未配置 AI 供应商，跳过 AI 词典查询")
-        except Exception as e:
-            logger.warning(f"AI 词典查询失败: {e}")
 
+def _parse_single_source_ai_response(fallback: _RemoteFallback, ai_response: str) -> Optional[Dict]:
+    # 移除可能的 markdown 代码块标记
+    response_text = ai_response.strip()
+    if response_text.startswith("```"):
+        response_text = response_text.split("```")[1]
+        if response_text.startswith("json"):
+            response_text = response_text[4:]
+    response_text = response_text.strip()
 
-
-    # 4. Fallback to Free Dictionary API
     try:
-        resp = requests.get(FREE_DICT_API.format(word=word), timeout=5)
-        if resp.status_code == 200:
-            data = resp.json()
-            if isinstance(data, list) and len(data) > 0:
-                entry = data[0]
-
-                # Extract relevant data
-                result = {
-                    "word": matched_word,
-                    "lookup_term": original_word,
-                    "lemma_from": matched_word if matched_word.lower() != original_word.lower() else None,
-                    "phonetic": entry.get("phonetic"),
-                    "audio_url": next(
-                        (p["audio"] for p in entry.get("phonetics", []) if p.get("audio")),
-                        None,
-                    ),
-                    "meanings": entry.get("meanings", []),
-                    "cached": False,
-                }
-
-                if cn_translation:
-                    result["chinese_translation"] = cn_translation
-
-                # 3. Save to cache
-                cache_service.save_dictionary_cache(db, word.lower(), result)
-                return result
-    except Exception as e:
-        logger.error(f"Dictionary API error: {e}")
-
-    # 如果指定了 source 但没有找到结果，返回 None 而不是默认的错误页面
-    # 这样前端会执行第二次查询（不指定 source 的 AI 兜底查询）
-    if source:
-        logger.info(f"No definition found for word '{word}' in source '{source}', returning None to trigger fallback")
+        ai_result = json.loads(response_text)
+    except json.JSONDecodeError as e:
+        logger.warning(f"AI 返回的 JSON 解析失败: {e}")
         return None
 
-    # 如果没有指定 source，返回默认的错误页面
-    return {
-        "word": lookup_terms[0] if lookup_terms else original_word,
-        "lookup_term": original_word,
-        "lemma_from": lookup_terms[0] if lookup_terms and lookup_terms[0].lower() != original_word.lower() else None,
-        "phonetic": "/.../",
-        "meanings": [],
-        "html_content": f"<div class='error'>No definition found for '{word}'</div>",
-        "source": "None",
-        "chinese_translation": cn_translation,
-    }
+    original_word = fallback.original_word
+    lookup_terms = fallback.lookup_terms
+    ai_result["source"] = "AI"
+    ai_result["cached"] = False
+    ai_result["lookup_term"] = original_word
+    ai_result["word"] = lookup_terms[0] if lookup_terms else original_word
+    if ai_result["word"].lower() != original_word.lower():
+        ai_result["lemma_from"] = ai_result["word"]
+
+    # 如果 ECDICT 有翻译，优先使用 ECDICT 的翻译
+    if fallback.cn_translation:
+        ai_result["chinese_translation"] = fallback.cn_translation
+    return ai_result
 
 
 def get_word_sources(word: str) -> Dict[str, bool]:
@@ -1089,7 +1095,8 @@ def get_word_sources(word: str) -> Dict[str, bool]:
         Dict mapping source name to availability boolean
     """
     normalized_word = normalize_lookup_word(word)
-    sources = get_dict_manager().check_sources(normalized_word)
+    dict_manager = get_dict_manager()
+    sources = dict_manager.check_sources(normalized_word) if dict_manager is not None else {}
     if _is_japanese_lookup(normalized_word):
         sources[JMDICT_SOURCE] = bool(_lookup_jmdict_terms(normalized_word, get_japanese_lookup_terms(normalized_word)))
     return sources
@@ -0,0 +1,201 @@
+"""
+ECDICT 词头内存索引
+启动时把 stardict 的全部词头（小写、UTF-8）与词性读入一段排好序的紧凑字节串，
+原型生成与校验直接二分查找，不再为每个候选词查询 SQLite。
+
+存储结构：
+    _blob      所有词头以 \\n 连接的 bytes（按字节序排序）
+    _offsets   每个词头在 _blob 中的起始位置（array('I')，末尾多一个哨兵）
+    _pos_masks 每个词头的词性位掩码（bytearray）
+"""
+
+import bisect
+import sys
+import threading
+import time
+from array import array
+from pathlib import Path
+from typing import Dict, Iterable, Optional, Tuple
+import logging
+
+from .readonly_db import connect_readonly
+
+logger = logging.getLogger(__name__)
+
+# 词性缩写归一化（ECDICT pos 字段形如 "n:46/v:54"）
+_POS_ALIASES = {
+    "noun": "n",
+    "n": "n",
+    "verb": "v",
+    "v": "v",
+    "adj": "j",
+    "adjective": "j",
+    "j": "j",
+    "adv": "r",
+    "adverb": "r",
+    "r": "r",
+    "det": "d",
+    "determiner": "d",
+    "d": "d",
+    "pron": "p",
+    "pronoun": "p",
+    "p": "p",
+}
+
+# 位掩码只区分原型校验用到的词性，其余词性合并为 "x"
+_POS_BITS = {"n": 1, "v": 2, "j": 4, "r": 8, "d": 16, "p": 32, "x": 64}
+
+
+def normalize_pos_tags(pos_value: Optional[str]) -> Tuple[str, ...]:
+    """把 ECDICT 的 pos 字段解析为归一化的词性元组"""
+    tags = []
+    for part in (pos_value or "").split("/"):
+        tag = part.split(":", 1)[0].strip().lower().rstrip(".")
+        normalized_tag = _POS_ALIASES.get(tag, tag)
+        if normalized_tag:
+            tags.append(normalized_tag)
+    return tuple(tags)
+
+
+def _encode_tags(tags: Iterable[str]) -> int:
+    mask = 0
+    for tag in tags:
+        mask |= _POS_BITS.get(tag, _POS_BITS["x"])
+    return mask
+
+
+# 位掩码 -> 词性元组，预先展开全部 128 种组合
+_MASK_TAGS = tuple(tuple(tag for tag, bit in _POS_BITS.items() if mask & bit) for mask in range(128))
+
+
+class _SortedKeys:
+    """把 _blob/_offsets 包装成可供 bisect 使用的只读序列"""
+
+    __slots__ = ("_blob", "_offsets")
+
+    def __init__(self, blob: bytes, offsets: array):
+        self._blob = blob
+        self._offsets = offsets
+
+    def __len__(self) -> int:
+        return len(self._offsets) - 1
+
+    def __getitem__(self, i: int) -> bytes:
+        # 去掉结尾的 \n 分隔符
+        return self._blob[self._offsets[i] : self._offsets[i + 1] - 1]
+
+
+class HeadwordIndex:
+    """不可变的词头集合（不区分大小写）及其词性"""
+
+    def __init__(self, entries: Dict[bytes, int]):
+        keys = sorted(entries)
+        offsets = array("I", [0])
+        position = 0
+        for key in keys:
+            position += len(key) + 1
+            offsets.append(position)
+        self._blob = b"\n".join(keys) + (b"\n" if keys else b"")
+        self._offsets = offsets
+        self._pos_masks = bytearray(entries[key] for key in keys)
+        self._keys = _SortedKeys(self._blob, self._offsets)
+
+    @classmethod
+    def from_rows(cls, rows: Iterable[Tuple[str, Optional[str]]]) -> "HeadwordIndex":
+        """由 (词头, pos) 行构建；大小写不同的同一词头合并词性"""
+        entries: Dict[bytes, int] = {}
+        for word, pos in rows:
+            if not word:
+                continue
+            key = word.lower().encode("utf-8")
+            entries[key] = entries.get(key, 0) | _encode_tags(normalize_pos_tags(pos))
+        return cls(entries)
+
+    def __len__(self) -> int:
+        return len(self._keys)
+
+    def __contains__(self, word: str) -> bool:
+        return self._find(word) >= 0
+
+    def lookup(self, word: str) -> Optional[Tuple[str, ...]]:
+        """词头存在时返回词性元组（可能为空），不存在返回 None"""
+        i = self._find(word)
+        if i < 0:
+            return None
+        return _MASK_TAGS[self._pos_masks[i]]
+
+    def memory_bytes(self) -> int:
+        """索引占用的内存（字节）"""
+        return (
+            sys.getsizeof(self._blob)
+            + sys.getsizeof(self._offsets)
+            + sys.getsizeof(self._pos_masks)
+        )
+
+    def _find(self, word: str) -> int:
+        if not word:
+            return -1
+        key = word.lower().encode("utf-8")
+        i = bisect.bisect_left(self._keys, key)
+        if i < len(self._keys) and self._keys[i] == key:
+            return i
+        return -1
+
+
+_index: Optional[HeadwordIndex] = None
+_load_lock = threading.Lock()
+_load_stats: Dict[str, float] = {}
+
+
+def get_headword_index() -> Optional[HeadwordIndex]:
+    """已加载的词头索引；尚未加载或 ECDICT 不可用时返回 None（调用方回退到 SQLite 查询）"""
+    return _index
+
+
+def get_load_stats() -> Dict[str, float]:
+    return dict(_load_stats)
+
+
+def load_headword_index(db_path: Optional[str] = None) -> Optional[HeadwordIndex]:
+    """从 ECDICT 读取全部词头构建索引（只加载一次），记录耗时与内存占用"""
+    global _index
+    with _load_lock:
+        if _index is not None:
+            return _index
+
+        if db_path is None:
+            from .ecdict_service import get_db_path
+
+            db_path = get_db_path()
+        if not Path(db_path).exists():
+            logger.warning(f"ECDICT 数据库不存在，跳过词头索引加载: {db_path}")
+            return None
+
+        started = time.perf_counter()
+        try:
+            conn = connect_readonly(db_path)
+            try:
+                index = HeadwordIndex.from_rows(conn.execute("SELECT word, pos FROM stardict"))
+            finally:
+                conn.close()
+        except Exception as e:
+            logger.error(f"加载 ECDICT 词头索引失败: {e}")
+            return None
+
+        elapsed = time.perf_counter() - started
+        _load_stats.update(
+            {"headwords": len(index), "load_seconds": round(elapsed, 3), "memory_bytes": index.memory_bytes()}
+        )
+        logger.info(
+            f"ECDICT 词头索引已加载: {len(index)} 个词头, 耗时 {elapsed:.2f}s, "
+            f"占用 {index.memory_bytes() / 1024 / 1024:.1f} MB"
+        )
+        _index = index
+        return index
+
+
+def start_background_load() -> threading.Thread:
+    """在后台线程加载索引，避免拖慢启动；加载完成前原型校验仍走 SQLite"""
+    thread = threading.Thread(target=load_headword_index, name="ecdict-headwords", daemon=True)
+    thread.start()
+    return thread
@@ -1,20 +1,12 @@
 import sqlite3
 import logging
-from pathlib import Path
-from typing import Optional
+from typing import Dict, Iterable, List, Optional
 
-logger = logging.getLogger(__name__)
-
-
-import threading
-from typing import Dict
+from . import lemma_service
+from .readonly_db import ReadOnlyConnectionPool
 
 logger = logging.getLogger(__name__)
 
-# 全局连接池和锁
-_connection_pool: Dict[int, sqlite3.Connection] = {}
-_pool_lock = threading.Lock()
-
 
 def get_db_path():
     """
@@ -27,31 +19,15 @@ def get_db_path():
     return str(ECDICT_DB_PATH)
 
 
+# 只读连接池；行对象自带列名，无需每次查询前执行 PRAGMA table_info
+_pool = ReadOnlyConnectionPool("ECDICT", lambda: get_db_path(), row_factory=sqlite3.Row)
+
 
 def _get_connection() -> Optional[sqlite3.Connection]:
     """
-    获取线程安全的数据库连接。
+    获取当前线程的只读数据库连接。
     """
-    db_path = get_db_path()
-    if not Path(db_path).exists():
-        logger.error(f"ECDICT database not found at {db_path}")
-        return None
-
-    thread_id = threading.get_ident()
-    if thread_id not in _connection_pool:
-        with _pool_lock:
-            # 双重检查
-            if thread_id not in _connection_pool:
-                try:
-                    conn = sqlite3.connect(db_path, check_same_thread=False)
-                    # 启用 WAL 模式提升并发性能
-                    conn.execute("PRAGMA journal_mode=WAL")
-                    _connection_pool[thread_id] = conn
-                except Exception as e:
-                    logger.error(f"Error connecting to ECDICT at {db_path}: {e}")
-                    return None
-
-    return _connection_pool[thread_id]
+    return _pool.get()
 
 
 def get_translation(word: str) -> Optional[str]:
@@ -62,82 +38,63 @@ def get_translation(word: str) -> Optional[str]:
     return res.get("translation") if res else None
 
 
+# 单条 IN 查询的参数个数上限（低于 SQLite 默认的 999）
+IN_QUERY_CHUNK = 500
+
+
+def _inflection_candidates(word: str) -> List[str]:
+    """原型候选（按优先级排序，不含原词），由共享的词形还原服务给出"""
+    return lemma_service.get_lemma_candidates(word)
+
+
+def _fetch_rows(cursor: sqlite3.Cursor, words: Iterable[str]) -> Dict[str, Dict]:
+    """
+    按词头集合分块执行 IN 查询（COLLATE NOCASE，与 stardict.word 列的排序规则一致，可走索引），
+    返回 {词头: 行}；另以小写词头登记一份，供大小写不一致的查询词匹配。
+    """
+    rows: Dict[str, Dict] = {}
+    folded: Dict[str, Dict] = {}
+    unique = list(dict.fromkeys(w for w in words if w))
+    for i in range(0, len(unique), IN_QUERY_CHUNK):
+        chunk = unique[i : i + IN_QUERY_CHUNK]
+        placeholders = ",".join("?" * len(chunk))
+        cursor.execute(f"SELECT * FROM stardict WHERE word COLLATE NOCASE IN ({placeholders})", chunk)
+        for res in cursor.fetchall():
+            row = dict(res)
+            rows.setdefault(row["word"], row)
+            folded.setdefault(row["word"].lower(), row)
+    for key, row in folded.items():
+        rows.setdefault(key, row)
+    return rows
+
+
+def _pick(rows: Dict[str, Dict], word: str) -> Optional[Dict]:
+    """优先原词，其次小写形式"""
+    return rows.get(word) or rows.get(word.lower())
+
+
 def get_word_details(word: str) -> Optional[Dict]:
     """
     Get all fields for a word from ECDICT database with basic lemmatization.
+
+    原词与全部原型候选合并为一次 IN 查询，再按 原词 -> 小写 -> 候选顺序 选取结果。
     """
+    if not word:
+        return None
     try:
         conn = _get_connection()
         if not conn:
             return None
 
-        cursor = conn.cursor()
-
-        # Get column names
-        cursor.execute("PRAGMA table_info(stardict)")
-        columns = [row[1] for row in cursor.fetchall()]
+        candidates = _inflection_candidates(word)
+        rows = _fetch_rows(conn.cursor(), [word, *candidates])
 
-        def _query(w):
-            cursor.execute("SELECT * FROM stardict WHERE word = ?", (w,))
-            res = cursor.fetchone()
-            if not res and w != w.lower():
-                cursor.execute("SELECT * FROM stardict WHERE word = ?", (w.lower(),))
-                res = cursor.fetchone()
-            return dict(zip(columns, res)) if res else None
-
-        # 1. Direct query
-        result = _query(word)
+        result = _pick(rows, word)
         if result:
             return result
 
-        # 2. Basic Lemmatization (for inflections)
-        candidates = []
-        seen = set()
-
-        def add_candidate(candidate: str):
-            if not candidate:
-                return
-            lower_candidate = candidate.lower()
-            if lower_candidate == word.lower() or lower_candidate in seen:
-                return
-            seen.add(lower_candidate)
-            candidates.append(candidate)
-
-        if word.endswith("ed"):
-            # spotted -> spot, stopped -> stop
-            if len(word) > 4 and word[-3].lower() == word[-4].lower():
-                add_candidate(word[:-3])
-            # cringed -> cringe, baked -> bake, played -> play
-            add_candidate(word[:-1])
-            add_candidate(word[:-2])
-            # Double consonant: clapped -> clap, robbed -> rob
-            if len(word) > 5 and word[-3] == word[-4]:
-                add_candidate(word[:-3])
-        if word.endswith("ing"):
-            if len(word) > 5:
-                # playing -> play
-                add_candidate(word[:-3])
-                # baking -> bake
-                add_candidate(word[:-3] + "e")
-                # Double consonant: clapping -> clap, robbing -> rob
-                if len(word) > 6 and word[-4] == word[-5]:
-                    add_candidate(word[:-4])
-                # panicking -> panic
-                if word.endswith("cking"):
-                    add_candidate(word[:-4])
-        if word.endswith("ies"):
-            add_candidate(word[:-3] + "y")  # studies -> study
-        if word.endswith(("ses", "xes", "zes", "ches", "shes", "oes")):
-            add_candidate(word[:-2])  # boxes -> box
-        elif word.endswith("es") and len(word) > 3:
-            add_candidate(word[:-1])
-            add_candidate(word[:-2])
-        if word.endswith("s") and not word.endswith("ss"):
-            add_candidate(word[:-1])  # cats -> cat
-
         for cand in candidates:
-            if not cand: continue
-            result = _query(cand)
+            result = _pick(rows, cand)
             if result:
                 logger.debug(f"ECDICT: Found lemma '{cand}' for '{word}'")
                 return result
@@ -146,3 +103,43 @@ def get_word_details(word: str) -> Optional[Dict]:
     except Exception as e:
         logger.error(f"Error querying ECDICT: {e}")
         return None
+
+
+def get_words_details(words: Iterable[str]) -> Dict[str, Optional[Dict]]:
+    """
+    get_word_details 的批量版本（原词 -> 小写 -> 原型候选的优先级与逐词调用相同）。
+
+    先用一次集合查询取回所有原词，再对未命中的词统一查询全部原型候选，
+    查询次数与单词数量无关。
+
+    Returns:
+        {输入单词: 词条字段或 None}
+    """
+    words = list(dict.fromkeys(w for w in words if w))
+    details: Dict[str, Optional[Dict]] = {w: None for w in words}
+    try:
+        conn = _get_connection()
+        if not conn or not words:
+            return details
+
+        cursor = conn.cursor()
+        rows = _fetch_rows(cursor, words)
+        missing: Dict[str, List[str]] = {}
+        for w in words:
+            details[w] = _pick(rows, w)
+            if details[w] is None:
+                missing[w] = _inflection_candidates(w)
+
+        if missing:
+            candidate_rows = _fetch_rows(cursor, [c for cands in missing.values() for c in cands])
+            for w, cands in missing.items():
+                for cand in cands:
+                    row = _pick(candidate_rows, cand)
+                    if row:
+                        details[w] = row
+                        break
+
+        return details
+    except Exception as e:
+        logger.error(f"Error querying ECDICT: {e}")
+        return details
@@ -0,0 +1,164 @@
+"""
+缩略图与封面的输出格式
+
+PNG 无损存储扫描版书籍的页面预览很浪费空间，缩略图和封面默认改为有损 WebP，
+可通过环境变量配置：
+    THUMBNAIL_FORMAT / THUMBNAIL_QUALITY   缩略图格式（webp | jpeg | png）与质量（1-100）
+    COVER_FORMAT / COVER_QUALITY           封面格式与质量
+    THUMBNAIL_BUDGET_MB                    每本书缩略图的存储预算（MB），0 表示不限制
+
+预算按页均摊：单页超出配额时依次降低质量、缩小尺寸重新编码，后台多个进程互不协调也能
+控制总量。WebP 编码依赖 Pillow，不可用时退回 JPEG（PyMuPDF 内置）。
+"""
+
+import io
+import os
+import logging
+from dataclasses import dataclass
+from typing import Optional, Tuple
+
+import fitz  # PyMuPDF
+
+try:
+    from PIL import Image
+except ImportError:  # pragma: no cover - Pillow 为可选依赖
+    Image = None
+
+logger = logging.getLogger(__name__)
+
+FORMAT_EXTENSIONS = {"webp": ".webp", "jpeg": ".jpg", "png": ".png"}
+# 各格式可能的缩略图/封面扩展名（兼容旧版 PNG 文件）
+IMAGE_EXTENSIONS = (".webp", ".jpg", ".jpeg", ".png")
+
+# 超出预算时的降质阶梯：质量下限与最多缩小次数
+MIN_QUALITY = 35
+QUALITY_STEP = 15
+MAX_DOWNSCALES = 2
+DOWNSCALE_FACTOR = 0.75
+
+
+@dataclass(frozen=True)
+class ImageOutput:
+    """图片输出配置"""
+
+    format: str = "webp"
+    quality: int = 75
+
+    def __post_init__(self):
+        fmt = self.format.lower()
+        fmt = "jpeg" if fmt == "jpg" else fmt
+        if fmt not in FORMAT_EXTENSIONS:
+            raise ValueError(f"不支持的图片格式: {self.format}")
+        if fmt == "webp" and not _webp_available():
+            logger.warning("Pillow 不支持 WebP 编码，改用 JPEG")
+            fmt = "jpeg"
+        object.__setattr__(self, "format", fmt)
+        object.__setattr__(self, "quality", max(1, min(100, int(self.quality))))
+
+    @property
+    def extension(self) -> str:
+        return FORMAT_EXTENSIONS[self.format]
+
+
+def _webp_available() -> bool:
+    if Image is None:
+        return False
+    from PIL import features
+
+    return bool(features.check("webp"))
+
+
+def _env_output(prefix: str, default_format: str, default_quality: int) -> ImageOutput:
+    fmt = os.getenv(f"{prefix}_FORMAT", default_format)
+    try:
+        return ImageOutput(fmt, int(os.getenv(f"{prefix}_QUALITY", default_quality)))
+    except ValueError as e:
+        logger.warning(f"{prefix}_FORMAT/{prefix}_QUALITY 配置无效（{e}），使用默认值")
+        return ImageOutput(default_format, default_quality)
+
+
+def _env_budget() -> int:
+    try:
+        return max(0, int(float(os.getenv("THUMBNAIL_BUDGET_MB", "20")) * 1024 * 1024))
+    except ValueError:
+        logger.warning("THUMBNAIL_BUDGET_MB 配置无效，使用默认值")
+        return 20 * 1024 * 1024
+
+
+THUMBNAIL_OUTPUT = _env_output("THUMBNAIL", "webp", 70)
+COVER_OUTPUT = _env_output("COVER", "webp", 85)
+# 每本书缩略图的存储预算（字节），0 表示不限制
+THUMBNAIL_BUDGET_BYTES = _env_budget()
+
+
+def page_budget(book_budget: int, page_count: int) -> Optional[int]:
+    """把每本书的预算均摊到单页，返回单页字节上限（不限制时返回 None）"""
+    if not book_budget or page_count <= 0:
+        return None
+    return book_budget // page_count
+
+
+def _encode_pixmap(pix: fitz.Pixmap, fmt: str, quality: int) -> bytes:
+    if fmt == "png":
+        return pix.tobytes("png")
+    if fmt == "jpeg" or Image is None:
+        # ImageOutput 已在 Pillow 不可用时改用 JPEG，这里再兜底一次
+        if pix.alpha:
+            pix = fitz.Pixmap(pix, 0)
+        return pix.tobytes("jpg", jpg_quality=quality)
+    mode = ("L" if pix.n - pix.alpha == 1 else "RGB") + ("A" if pix.alpha else "")
+    image = Image.frombytes(mode, (pix.width, pix.height), pix.samples)
+    buffer = io.BytesIO()
+    image.save(buffer, format="WEBP", quality=quality, method=4)
+    return buffer.getvalue()
+
+
+def encode_pixmap(pix: fitz.Pixmap, output: ImageOutput, max_bytes: Optional[int] = None) -> bytes:
+    """
+    按输出配置编码 PyMuPDF 渲染结果。
+
+    给定 max_bytes 时，超出上限则先逐级降低质量（PNG 跳过），再缩小尺寸，
+    直到满足上限或达到降质下限，返回尝试过的最小结果。
+    """
+    if pix.colorspace is not None and pix.colorspace.n not in (1, 3):
+        pix = fitz.Pixmap(fitz.csRGB, pix)
+    if output.format == "jpeg" and pix.alpha:
+        pix = fitz.Pixmap(pix, 0)
+
+    data = _encode_pixmap(pix, output.format, output.quality)
+    if not max_bytes or len(data) <= max_bytes:
+        return data
+
+    best = data
+    quality = output.quality
+    for downscale in range(MAX_DOWNSCALES + 1):
+        if downscale:
+            width = max(1, int(pix.width * DOWNSCALE_FACTOR))
+            height = max(1, int(pix.height * DOWNSCALE_FACTOR))
+            pix = fitz.Pixmap(pix, width, height, None)
+        qualities = [quality] if output.format == "png" else range(quality, MIN_QUALITY - 1, -QUALITY_STEP)
+        for q in qualities:
+            if downscale == 0 and q == output.quality:
+                continue
+            data = _encode_pixmap(pix, output.format, q)
+            if len(data) < len(best):
+                best = data
+            if len(data) <= max_bytes:
+                return data
+        # 缩小尺寸后只用最低质量再试
+        quality = MIN_QUALITY
+    return best
+
+
+def transcode_image(data: bytes, output: ImageOutput, max_bytes: Optional[int] = None) -> Optional[Tuple[bytes, str]]:
+    """
+    将任意位图（EPUB 封面、旧版 PNG 缩略图等）按输出配置重新编码。
+
+    Returns:
+        (编码后的数据, 扩展名)；无法解码（如 SVG）时返回 None
+    """
+    try:
+        pix = fitz.Pixmap(data)
+    except Exception:
+        return None
+    return encode_pixmap(pix, output, max_bytes), output.extension
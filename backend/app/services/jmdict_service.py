@@ -3,19 +3,40 @@ import logging
 import sqlite3
 import threading
 import zlib
-from pathlib import Path
-from typing import Any, Dict, Optional
+from collections import OrderedDict
+from typing import Any, Dict, Iterable, List, Optional, Tuple
+
+from .readonly_db import ReadOnlyConnectionPool
+
+try:
+    import orjson
+except ImportError:  # 可选依赖，缺失时使用标准库 json
+    orjson = None
+
+try:
+    import msgpack
+except ImportError:  # 只有 payload_format 为 msgpack 的词库才需要
+    msgpack = None
 
 logger = logging.getLogger(__name__)
 
-_connection_pool: Dict[int, sqlite3.Connection] = {}
-_pool_lock = threading.Lock()
-_metadata_cache: dict[str, str] | None = None
+# 词库路径 -> metadata
+_metadata_cache: dict[str, dict[str, str]] = {}
 
 JMDICT_SOURCE_URL = "https://www.edrdg.org/pub/Nihongo/JMdict_e.gz"
 JMDICT_LICENSE_URL = "https://www.edrdg.org/edrdg/licence.html"
 JMDICT_PROJECT_URL = "https://www.edrdg.org/wiki/index.php/JMdict-EDICT_Dictionary_Project"
 
+# payload 编码：metadata.payload_format 缺失的旧词库均为 zlib 压缩的 JSON
+PAYLOAD_FORMAT_JSON = "json"
+PAYLOAD_FORMAT_MSGPACK = "msgpack"
+
+# 已解码 payload 的 LRU 容量（按词条计）
+PAYLOAD_CACHE_SIZE = 4096
+
+_payload_cache: "OrderedDict[Tuple[str, int], Dict[str, Any]]" = OrderedDict()
+_payload_cache_lock = threading.Lock()
+
 
 def get_db_path() -> str:
     from app.config import JMDICT_DB_PATH
@@ -23,45 +44,31 @@ def get_db_path() -> str:
     return str(JMDICT_DB_PATH)
 
 
-def _get_connection() -> Optional[sqlite3.Connection]:
-    db_path = get_db_path()
-    if not Path(db_path).exists():
-        logger.error("JMdict database not found at %s", db_path)
-        return None
+_pool = ReadOnlyConnectionPool("JMdict", lambda: get_db_path(), row_factory=sqlite3.Row)
 
-    thread_id = threading.get_ident()
-    if thread_id not in _connection_pool:
-        with _pool_lock:
-            if thread_id not in _connection_pool:
-                try:
-                    conn = sqlite3.connect(db_path, check_same_thread=False)
-                    conn.row_factory = sqlite3.Row
-                    conn.execute("PRAGMA journal_mode=WAL")
-                    _connection_pool[thread_id] = conn
-                except Exception as exc:
-                    logger.error("Error connecting to JMdict at %s: %s", db_path, exc)
-                    return None
 
-    return _connection_pool[thread_id]
+def _get_connection() -> Optional[sqlite3.Connection]:
+    return _pool.get()
 
 
 def _load_metadata() -> dict[str, str]:
-    global _metadata_cache
-    if _metadata_cache is not None:
-        return _metadata_cache
+    db_path = get_db_path()
+    metadata = _metadata_cache.get(db_path)
+    if metadata is not None:
+        return metadata
 
     conn = _get_connection()
     if not conn:
-        _metadata_cache = {}
-        return _metadata_cache
+        return {}
 
     try:
         cursor = conn.cursor()
         cursor.execute("SELECT key, value FROM metadata")
-        _metadata_cache = {str(row["key"]): str(row["value"]) for row in cursor.fetchall()}
+        metadata = {str(row["key"]): str(row["value"]) for row in cursor.fetchall()}
     except Exception:
-        _metadata_cache = {}
-    return _metadata_cache
+        metadata = {}
+    _metadata_cache[db_path] = metadata
+    return metadata
 
 
 def get_entry_count() -> int:
@@ -72,6 +79,152 @@ def get_entry_count() -> int:
         return 0
 
 
+# 单条 IN 查询的参数个数上限（低于 SQLite 默认的 999）
+IN_QUERY_CHUNK = 500
+# 每个检索词最多合并的词条数
+MAX_ENTRIES_PER_TERM = 8
+
+_TERM_ENTRIES_SQL = """
+    SELECT {term_column} e.entry_id, e.word, e.reading, e.summary
+    FROM terms t
+    JOIN entries e ON e.entry_id = t.entry_id
+    WHERE t.term {condition}
+    ORDER BY {order_prefix} t.score DESC, e.rank DESC, e.entry_id ASC
+"""
+
+
+def _decode_payload(raw_payload: Any, payload_format: str) -> Dict[str, Any]:
+    data = zlib.decompress(raw_payload) if isinstance(raw_payload, bytes) else raw_payload.encode("utf-8")
+    if payload_format == PAYLOAD_FORMAT_MSGPACK:
+        if msgpack is None:
+            raise RuntimeError("JMdict 词库使用 msgpack 编码，但未安装 msgpack")
+        return msgpack.unpackb(data, raw=False)
+    return orjson.loads(data) if orjson is not None else json.loads(data)
+
+
+def _get_payloads(cursor: sqlite3.Cursor, entry_ids: Iterable[int]) -> Dict[int, Dict[str, Any]]:
+    """
+    取词条的已解码 payload：先查 LRU，未命中的用一次 IN 查询取回并解码。
+    缓存的 payload 由多次查询共享，调用方只能读取，不能修改。
+    """
+    db_path = get_db_path()
+    payloads: Dict[int, Dict[str, Any]] = {}
+    missing: List[int] = []
+    with _payload_cache_lock:
+        for entry_id in dict.fromkeys(entry_ids):
+            payload = _payload_cache.get((db_path, entry_id))
+            if payload is None:
+                missing.append(entry_id)
+            else:
+                _payload_cache.move_to_end((db_path, entry_id))
+                payloads[entry_id] = payload
+    if not missing:
+        return payloads
+
+    payload_format = _load_metadata().get("payload_format", PAYLOAD_FORMAT_JSON)
+    decoded: Dict[int, Dict[str, Any]] = {}
+    for i in range(0, len(missing), IN_QUERY_CHUNK):
+        chunk = missing[i : i + IN_QUERY_CHUNK]
+        cursor.execute(
+            f"SELECT entry_id, payload FROM entries WHERE entry_id IN ({','.join('?' * len(chunk))})",
+            chunk,
+        )
+        for row in cursor.fetchall():
+            decoded[row["entry_id"]] = _decode_payload(row["payload"], payload_format)
+
+    with _payload_cache_lock:
+        for entry_id, payload in decoded.items():
+            _payload_cache[(db_path, entry_id)] = payload
+        while len(_payload_cache) > PAYLOAD_CACHE_SIZE:
+            _payload_cache.popitem(last=False)
+    payloads.update(decoded)
+    return payloads
+
+
+def clear_payload_cache():
+    with _payload_cache_lock:
+        _payload_cache.clear()
+
+
+def _build_details(word: str, rows: list, payloads: Dict[int, Dict[str, Any]]) -> Dict[str, Any]:
+    entries: list[dict[str, Any]] = []
+    meanings: list[dict[str, Any]] = []
+
+    for row in rows:
+        payload = payloads.get(row["entry_id"], {})
+        entry_word = payload.get("word") or row["word"] or word
+        entry_reading = payload.get("reading") or row["reading"]
+        entry_senses = payload.get("senses", [])
+
+        entries.append(
+            {
+                "word": entry_word,
+                "reading": entry_reading,
+                "summary": payload.get("summary") or row["summary"],
+                "kanji_forms": list(payload.get("kanji_forms", [])),
+                "reading_forms": list(payload.get("reading_forms", [])),
+                "senses": [dict(sense) for sense in entry_senses],
+            }
+        )
+
+        for sense in entry_senses:
+            definitions = [
+                {"definition": gloss}
+                for gloss in sense.get("glosses", [])
+                if gloss
+            ]
+            if not definitions:
+                continue
+            meanings.append(
+                {
+                    "partOfSpeech": sense.get("part_of_speech") or "Japanese",
+                    "definitions": definitions,
+                }
+            )
+
+    first_entry = entries[0]
+    reading = first_entry.get("reading")
+    display_word = first_entry.get("word") or word
+
+    return {
+        "word": display_word,
+        "source": "JMdict",
+        "is_jmdict": True,
+        "phonetic": reading if reading and reading != display_word else None,
+        "meanings": meanings,
+        "raw_data": {
+            "entries": entries,
+            "attribution": {
+                "name": "JMdict / EDICT",
+                "project_url": JMDICT_PROJECT_URL,
+                "license_name": "CC BY-SA 4.0",
+                "license_url": JMDICT_LICENSE_URL,
+                "source_url": JMDICT_SOURCE_URL,
+            },
+        },
+    }
+
+
+def _fetch_term_rows(cursor: sqlite3.Cursor, terms: List[str]) -> Dict[str, list]:
+    """按检索词集合分块执行 IN 查询，每个词保留排序最靠前的若干词条"""
+    grouped: Dict[str, list] = {}
+    for i in range(0, len(terms), IN_QUERY_CHUNK):
+        chunk = terms[i : i + IN_QUERY_CHUNK]
+        cursor.execute(
+            _TERM_ENTRIES_SQL.format(
+                term_column="t.term AS term,",
+                condition=f"IN ({','.join('?' * len(chunk))})",
+                order_prefix="t.term,",
+            ),
+            chunk,
+        )
+        for row in cursor.fetchall():
+            rows = grouped.setdefault(row["term"], [])
+            if len(rows) < MAX_ENTRIES_PER_TERM:
+                rows.append(row)
+    return grouped
+
+
 def get_word_details(word: str) -> Optional[Dict[str, Any]]:
     if not word:
         return None
@@ -83,80 +236,62 @@ def get_word_details(word: str) -> Optional[Dict[str, Any]]:
     try:
         cursor = conn.cursor()
         cursor.execute(
-            """
-            SELECT e.entry_id, e.word, e.reading, e.summary, e.payload
-            FROM terms t
-            JOIN entries e ON e.entry_id = t.entry_id
-            WHERE t.term = ?
-            ORDER BY t.score DESC, e.rank DESC, e.entry_id ASC
-            LIMIT 8
-            """,
+            _TERM_ENTRIES_SQL.format(term_column="", condition="= ?", order_prefix="") + f"LIMIT {MAX_ENTRIES_PER_TERM}",
             (word,),
         )
         rows = cursor.fetchall()
         if not rows:
             return None
+        payloads = _get_payloads(cursor, [row["entry_id"] for row in rows])
+        return _build_details(word, rows, payloads)
+    except Exception as exc:
+        logger.error("Error querying JMdict: %s", exc)
+        return None
 
-        entries: list[dict[str, Any]] = []
-        meanings: list[dict[str, Any]] = []
-
-        for row in rows:
-            raw_payload = row["payload"]
-            if isinstance(raw_payload, bytes):
-                payload = json.loads(zlib.decompress(raw_payload).decode("utf-8"))
-            else:
-                payload = json.loads(raw_payload)
-            entry_word = payload.get("word") or row["word"] or word
-            entry_reading = payload.get("reading") or row["reading"]
-            entry_senses = payload.get("senses", [])
 
-            entries.append(
-                {
-                    "word": entry_word,
-                    "reading": entry_reading,
-                    "summary": payload.get("summary") or row["summary"],
-                    "kanji_forms": payload.get("kanji_forms", []),
-                    "reading_forms": payload.get("reading_forms", []),
-                    "senses": entry_senses,
-                }
-            )
+def get_first_word_details(terms: Iterable[str]) -> Optional[Tuple[str, Dict[str, Any]]]:
+    """
+    按优先级依次尝试多个检索词（如分词得到的原形、原文）：一次 IN 查询取回全部检索词的词条，
+    只为第一个命中的词解码 payload。返回 (命中的检索词, 结果)。
+    """
+    terms = list(dict.fromkeys(t for t in terms if t))
+    conn = _get_connection()
+    if not conn or not terms:
+        return None
 
-            for sense in entry_senses:
-                definitions = [
-                    {"definition": gloss}
-                    for gloss in sense.get("glosses", [])
-                    if gloss
-                ]
-                if not definitions:
-                    continue
-                meanings.append(
-                    {
-                        "partOfSpeech": sense.get("part_of_speech") or "Japanese",
-                        "definitions": definitions,
-                    }
-                )
-
-        first_entry = entries[0]
-        reading = first_entry.get("reading")
-        display_word = first_entry.get("word") or word
-
-        return {
-            "word": display_word,
-            "source": "JMdict",
-            "is_jmdict": True,
-            "phonetic": reading if reading and reading != display_word else None,
-            "meanings": meanings,
-            "raw_data": {
-                "entries": entries,
-                "attribution": {
-                    "name": "JMdict / EDICT",
-                    "project_url": JMDICT_PROJECT_URL,
-                    "license_name": "CC BY-SA 4.0",
-                    "license_url": JMDICT_LICENSE_URL,
-                    "source_url": JMDICT_SOURCE_URL,
-                },
-            },
-        }
+    try:
+        cursor = conn.cursor()
+        grouped = _fetch_term_rows(cursor, terms)
+        for term in terms:
+            rows = grouped.get(term)
+            if rows:
+                payloads = _get_payloads(cursor, [row["entry_id"] for row in rows])
+                return term, _build_details(term, rows, payloads)
+        return None
     except Exception as exc:
         logger.error("Error querying JMdict: %s", exc)
         return None
+
+
+def get_words_details(words: Iterable[str]) -> Dict[str, Optional[Dict[str, Any]]]:
+    """
+    get_word_details 的批量版本：按检索词集合分块执行 IN 查询，
+    每个词取排序最靠前的若干词条，结果与逐词调用一致。
+    """
+    words = list(dict.fromkeys(w for w in words if w))
+    details: Dict[str, Optional[Dict[str, Any]]] = {w: None for w in words}
+    conn = _get_connection()
+    if not conn or not words:
+        return details
+
+    try:
+        cursor = conn.cursor()
+        grouped = _fetch_term_rows(cursor, words)
+        payloads = _get_payloads(cursor, [row["entry_id"] for rows in grouped.values() for row in rows])
+        for word, rows in grouped.items():
+            if word in details:
+                details[word] = _build_details(word, rows, payloads)
+        return details
+    except Exception as exc:
+        logger.error("Error querying JMdict: %s", exc)
+        return details
@@ -0,0 +1,687 @@
+"""
+共享词形还原服务（屈折形式 <-> 原型）
+
+数据来自 ECDICT 的 exchange 字段，由 scripts/build_lemma_table.py 预先生成独立的
+ecdict_lemmas.db（inflections 表，form / lemma 均有索引）。查词、ECDICT 词形回退和例句提取
+都通过这里还原：已知屈折形式一次索引查询即可得到原型，表中没有的词才回退到不规则词表和
+后缀规则（规则也只在这里维护，查词侧只在此基础上做词性校验）。
+
+表可以在启动时整体载入内存（load_lemma_table），之后查询不再访问 SQLite。
+"""
+
+import sqlite3
+import threading
+import time
+from pathlib import Path
+from typing import Dict, Iterable, List, Optional, Tuple
+import logging
+
+from .readonly_db import ReadOnlyConnectionPool
+
+logger = logging.getLogger(__name__)
+
+# 表结构版本，写入 metadata.format_version，结构变化时递增
+LEMMA_TABLE_VERSION = 1
+
+# exchange 字段中表示屈折形式的类型码：
+# p 过去式, d 过去分词, i 现在分词, 3 第三人称单数, r 比较级, t 最高级, s 复数
+INFLECTION_CODES = "pdi3rts"
+
+_SCHEMA_SQL = """
+CREATE TABLE metadata (key TEXT PRIMARY KEY, value TEXT NOT NULL);
+CREATE TABLE inflections (
+    form TEXT NOT NULL,
+    lemma TEXT NOT NULL,
+    kinds TEXT NOT NULL,
+    PRIMARY KEY (form, lemma)
+) WITHOUT ROWID;
+CREATE INDEX idx_inflections_lemma ON inflections (lemma);
+"""
+
+
+def get_db_path() -> str:
+    from app.config import LEMMA_DB_PATH
+
+    return str(LEMMA_DB_PATH)
+
+
+_pool = ReadOnlyConnectionPool("lemma table", lambda: get_db_path())
+
+# 载入内存后的映射：屈折形式 -> 原型，原型 -> 屈折形式
+_forms_to_lemmas: Optional[Dict[str, Tuple[str, ...]]] = None
+_lemmas_to_forms: Optional[Dict[str, Tuple[str, ...]]] = None
+_load_lock = threading.Lock()
+
+
+def parse_exchange(word: str, exchange: Optional[str]) -> List[Tuple[str, str, str]]:
+    """
+    解析一条 ECDICT exchange 字段，返回 (屈折形式, 原型, 类型码) 列表（均为小写）。
+
+    原型词条形如 "p:went/d:gone/i:going/3:goes"；屈折词条自身带 "0:原型/1:类型码"。
+    """
+    if not word or not exchange:
+        return []
+
+    word = word.lower()
+    fields: Dict[str, str] = {}
+    for part in exchange.split("/"):
+        code, sep, value = part.partition(":")
+        if sep and value.strip():
+            fields[code.strip()] = value.strip()
+
+    pairs = []
+    for code in INFLECTION_CODES:
+        form = fields.get(code, "").lower()
+        if form and form != word:
+            pairs.append((form, word, code))
+
+    lemma = fields.get("0", "").lower()
+    if lemma and lemma != word:
+        pairs.append((word, lemma, fields.get("1", "")))
+    return pairs
+
+
+def build_lemma_table(ecdict_path: str, output_path: str) -> int:
+    """从 ECDICT 生成屈折形式表，返回写入的 (form, lemma) 对数"""
+    pairs: Dict[Tuple[str, str], set] = {}
+    source = sqlite3.connect(ecdict_path)
+    try:
+        for word, exchange in source.execute("SELECT word, exchange FROM stardict WHERE exchange <> ''"):
+            for form, lemma, kinds in parse_exchange(word, exchange):
+                pairs.setdefault((form, lemma), set()).update(kinds)
+    finally:
+        source.close()
+
+    output = Path(output_path)
+    tmp_output = output.with_suffix(".tmp")
+    tmp_output.unlink(missing_ok=True)
+    conn = sqlite3.connect(tmp_output)
+    try:
+        conn.executescript(_SCHEMA_SQL)
+        conn.executemany(
+            "INSERT INTO inflections (form, lemma, kinds) VALUES (?, ?, ?)",
+            ((form, lemma, "".join(sorted(kinds))) for (form, lemma), kinds in sorted(pairs.items())),
+        )
+        conn.executemany(
+            "INSERT INTO metadata (key, value) VALUES (?, ?)",
+            [("format_version", str(LEMMA_TABLE_VERSION)), ("pair_count", str(len(pairs)))],
+        )
+        conn.commit()
+        conn.execute("VACUUM")
+    finally:
+        conn.close()
+    tmp_output.replace(output)
+    return len(pairs)
+
+
+def _table_connection() -> Optional[sqlite3.Connection]:
+    # 表由构建生成并随程序分发；缺失时（如未生成的开发环境）回退到规则，load_lemma_table 会报错提示
+    if not Path(get_db_path()).exists():
+        return None
+    return _pool.get()
+
+
+def load_lemma_table() -> bool:
+    """把整张表载入内存，返回是否成功"""
+    global _forms_to_lemmas, _lemmas_to_forms
+    with _load_lock:
+        if _forms_to_lemmas is not None:
+            return True
+        conn = _table_connection()
+        if conn is None:
+            logger.error(
+                f"未找到词形还原表 {get_db_path()}，只能使用后缀规则还原；"
+                f"请运行 scripts/build_lemma_table.py 生成（打包构建会自动生成）"
+            )
+            return False
+
+        started = time.perf_counter()
+        forms: Dict[str, List[str]] = {}
+        lemmas: Dict[str, List[str]] = {}
+        try:
+            for form, lemma in conn.execute("SELECT form, lemma FROM inflections ORDER BY form, lemma"):
+                forms.setdefault(form, []).append(lemma)
+                lemmas.setdefault(lemma, []).append(form)
+        except Exception as e:
+            logger.error(f"载入词形还原表失败: {e}")
+            return False
+
+        _lemmas_to_forms = {k: tuple(v) for k, v in lemmas.items()}
+        _forms_to_lemmas = {k: tuple(v) for k, v in forms.items()}
+        logger.info(
+            f"词形还原表已载入内存: {len(_forms_to_lemmas)} 个屈折形式, 耗时 {time.perf_counter() - started:.2f}s"
+        )
+        return True
+
+
+def start_background_load() -> threading.Thread:
+    thread = threading.Thread(target=load_lemma_table, name="lemma-table", daemon=True)
+    thread.start()
+    return thread
+
+
+def _query(sql: str, value: str) -> Tuple[str, ...]:
+    conn = _table_connection()
+    if conn is None:
+        return ()
+    try:
+        return tuple(row[0] for row in conn.execute(sql, (value,)))
+    except Exception as e:
+        logger.error(f"查询词形还原表失败: {e}")
+        return ()
+
+
+def get_lemmas(word: str) -> Tuple[str, ...]:
+    """ECDICT 记录的原型（小写）；不是已知屈折形式时返回空元组"""
+    if not word:
+        return ()
+    key = word.lower()
+    if _forms_to_lemmas is not None:
+        return _forms_to_lemmas.get(key, ())
+    return _query("SELECT lemma FROM inflections WHERE form = ? ORDER BY lemma", key)
+
+
+def get_inflections(lemma: str) -> Tuple[str, ...]:
+    """ECDICT 记录的全部屈折形式（小写）"""
+    if not lemma:
+        return ()
+    key = lemma.lower()
+    if _lemmas_to_forms is not None:
+        return _lemmas_to_forms.get(key, ())
+    return _query("SELECT form FROM inflections WHERE lemma = ? ORDER BY form", key)
+
+
+# 例外词列表：以常见后缀结尾但本身是完整词的词
+# 这些词不应进行词形还原
+EXCEPTION_WORDS = {
+    "ing": {
+        # 名词
+        "evening",
+        "morning",
+        "blessing",
+        "meeting",
+        "feeling",
+        "building",
+        "painting",
+        "drawing",
+        "clothing",
+        "housing",
+        "lighting",
+        "sightseeing",
+        "nothing",
+        "something",
+        "everything",
+        "anything",
+        "king",
+        "ring",
+        "wing",
+        "thing",
+        "bring",
+        "string",
+        "spring",
+        "sing",
+        "living",
+        "being",
+        "going",
+        "doing",
+        "dying",
+        "icing",
+        # 形容词
+        "interesting",
+        "boring",
+        "exciting",
+        "surprising",
+        "amazing",
+        "charming",
+        "alarming",
+        "frightening",
+        "worrying",
+        "tiring",
+    },
+    "ed": {
+        # 名词
+        "bed",
+        "red",
+        "wed",
+        "fed",
+        "led",
+        "shed",
+        "sled",
+        "bred",
+        "need",
+        "seed",
+        "deed",
+        "feed",
+        "weed",
+        "reed",
+        "speed",
+        # 形容词
+        "tired",
+        "bored",
+        "hired",
+        "fired",
+        "wired",
+        "mired",
+        "beloved",
+        "wicked",
+        "blessed",
+        "learned",
+        "aged",
+    },
+    "s": {
+        # 单数名词（以 s 结尾）
+        "bus",
+        "lens",
+        "class",
+        "grass",
+        "glass",
+        "pass",
+        "gas",
+        # 学科
+        "news",
+        "maths",
+        "physics",
+        "politics",
+        "economics",
+        "linguistics",
+        # 学术语
+        "analysis",
+        "crisis",
+        "thesis",
+        "basis",
+        "status",
+        "series",
+        "species",
+        "measles",
+        "mumps",
+        "rabies",
+        "billiards",
+        "darts",
+        "bowls",
+        # 其他
+        "address",
+        "process",
+        "campus",
+        "tennis",
+        "golf",
+    },
+    "er": {
+        # 名词（后缀 -er 表示"人"或"物品"）
+        "teacher",
+        "mother",
+        "father",
+        "brother",
+        "sister",
+        "water",
+        "paper",
+        "letter",
+        "latter",
+        "master",
+        "matter",
+        "center",
+        "number",
+        "member",
+        "leader",
+        "player",
+        "driver",
+        "farmer",
+        "speaker",
+        "reader",
+        "worker",
+        "buyer",
+        "seller",
+        "owner",
+        "computer",
+        "camera",
+        "picture",
+        "feature",
+        "nature",
+        "future",
+        # 形容词/副词（better, latter 等不应被还原为 bet, lat）
+        "better",
+        "order",
+        "weather",
+        "feather",
+        "leather",
+        "gather",
+        "together",
+        "scatter",
+        "chapter",
+        "character",
+        "monster",
+        "shelter",
+        "winter",
+        "summer",
+        "finger",
+        "shoulder",
+        "peer",
+    },
+    "est": {
+        # 以 -est 结尾但不是最高级的词
+        "interest",
+        "different",
+        "important",
+        "excellent",
+        "consistent",
+        "permanent",
+        "significant",
+        "transparent",
+        "competent",
+    },
+}
+
+# 不规则屈折形式 -> 原型（动词、名词复数、比较级/最高级）。同形词列出全部原型（lives -> life/live），
+# 映射中包含自身表示该形式本身也是原型
+IRREGULAR_LEMMAS: Dict[str, List[str]] = {
+    # 不规则动词
+    "am": ["be"],
+    "is": ["be"],
+    "are": ["be"],
+    "was": ["be"],
+    "were": ["be"],
+    "been": ["be"],
+    "driven": ["drive"],
+    "strewn": ["strew"],
+    "strove": ["strive"],
+    "went": ["go"],
+    "gone": ["go"],
+    "bought": ["buy"],
+    "caught": ["catch"],
+    "chose": ["choose"],
+    "chosen": ["choose"],
+    "came": ["come"],
+    "did": ["do"],
+    "done": ["do"],
+    "drank": ["drink"],
+    "drunk": ["drink"],
+    "ate": ["eat"],
+    "eaten": ["eat"],
+    "fell": ["fall"],
+    "fallen": ["fall"],
+    "found": ["find", "found"],
+    "flew": ["fly"],
+    "flown": ["fly"],
+    "forgot": ["forget"],
+    "forgotten": ["forget"],
+    "froze": ["freeze"],
+    "frozen": ["freeze"],
+    "gave": ["give"],
+    "given": ["give"],
+    "got": ["get"],
+    "gotten": ["get"],
+    "grew": ["grow"],
+    "grown": ["grow"],
+    "had": ["have"],
+    "has": ["have"],
+    "heard": ["hear"],
+    "hid": ["hide"],
+    "hidden": ["hide"],
+    "hit": ["hit"],
+    "held": ["hold"],
+    "kept": ["keep"],
+    "knew": ["know"],
+    "known": ["know"],
+    "left": ["leave"],
+    "lent": ["lend"],
+    "let": ["let"],
+    "lay": ["lie", "lay"],
+    "laid": ["lay"],
+    "lain": ["lie"],
+    "lost": ["lose"],
+    "made": ["make"],
+    "meant": ["mean"],
+    "met": ["meet"],
+    "paid": ["pay"],
+    "put": ["put"],
+    "read": ["read"],
+    "ran": ["run"],
+    "said": ["say"],
+    "saw": ["see", "saw"],
+    "seen": ["see"],
+    "sold": ["sell"],
+    "sent": ["send"],
+    "sang": ["sing"],
+    "sung": ["sing"],
+    "sat": ["sit"],
+    "slept": ["sleep"],
+    "spoke": ["speak"],
+    "spoken": ["speak"],
+    "spent": ["spend"],
+    "stood": ["stand"],
+    "stole": ["steal"],
+    "stolen": ["steal"],
+    "swam": ["swim"],
+    "swum": ["swim"],
+    "took": ["take"],
+    "taken": ["take"],
+    "taught": ["teach"],
+    "thought": ["think"],
+    "threw": ["throw"],
+    "thrown": ["throw"],
+    "told": ["tell"],
+    "understood": ["understand"],
+    "wore": ["wear"],
+    "worn": ["wear"],
+    "won": ["win"],
+    "wrote": ["write"],
+    "written": ["write"],
+    # 不规则名词复数
+    "children": ["child"],
+    "men": ["man"],
+    "women": ["woman"],
+    "teeth": ["tooth"],
+    "feet": ["foot"],
+    "mice": ["mouse"],
+    "geese": ["goose"],
+    "people": ["person"],
+    "oxen": ["ox"],
+    "lives": ["life", "live"],
+    "leaves": ["leaf", "leave"],
+    "loaves": ["loaf"],
+    "thieves": ["thief"],
+    "knives": ["knife"],
+    "wives": ["wife"],
+    "selves": ["self"],
+    "calves": ["calf"],
+    "halves": ["half"],
+    "axes": ["axis", "axe"],
+    "analyses": ["analysis", "analyse"],
+    "bases": ["basis", "base"],
+    "crises": ["crisis"],
+    "criteria": ["criterion"],
+    "data": ["datum"],
+    "phenomena": ["phenomenon"],
+    "strata": ["stratum"],
+    "formulae": ["formula"],
+    "vertices": ["vertex"],
+    # 形容词比较级/最高级
+    "better": ["good", "well"],
+    "best": ["good", "well"],
+    "worse": ["bad"],
+    "worst": ["bad"],
+    "farther": ["far"],
+    "further": ["far"],
+    "farthest": ["far"],
+    "furthest": ["far"],
+    "more": ["many", "much"],
+    "most": ["many", "much"],
+    "less": ["little"],
+    "least": ["little"],
+}
+
+# 原型 -> 不规则屈折形式，生成变体时反查
+_IRREGULAR_FORMS: Dict[str, Tuple[str, ...]] = {}
+for _form, _lemmas in IRREGULAR_LEMMAS.items():
+    for _lemma in _lemmas:
+        if _form != _lemma:
+            _IRREGULAR_FORMS[_lemma] = _IRREGULAR_FORMS.get(_lemma, ()) + (_form,)
+
+
+def is_exception_word(word: str) -> bool:
+    """以常见后缀结尾但本身是完整词、不应还原的词"""
+    word_lower = word.lower()
+    return any(word_lower in words for words in EXCEPTION_WORDS.values())
+
+
+def rule_candidates_with_kinds(word: str) -> List[Tuple[str, str]]:
+    """
+    根据不规则词表和常见英语词尾规则推测原型候选，返回 (候选, 类型) 列表（按优先级排序，不含原词）。
+
+    类型为 irregular / plural / verb / comparative / superlative，调用方可按类型校验原词词性。
+    """
+    word_lower = word.lower()
+    irregular = IRREGULAR_LEMMAS.get(word_lower)
+    if irregular:
+        return [(lemma, "irregular") for lemma in irregular if lemma != word_lower]
+    if is_exception_word(word_lower):
+        return []
+
+    candidates: List[Tuple[str, str]] = []
+    seen = set()
+
+    def add_candidate(candidate: str, kind: str):
+        if not candidate:
+            return
+        lower_candidate = candidate.lower()
+        if lower_candidate == word_lower or lower_candidate in seen:
+            return
+        seen.add(lower_candidate)
+        candidates.append((candidate, kind))
+
+    # 复数 / 第三人称单数
+    if word_lower.endswith("ies"):
+        add_candidate(word[:-3] + "y", "plural")  # cities -> city
+        add_candidate(word[:-1], "plural")  # movies -> movie
+    elif word_lower.endswith(("ses", "xes", "zes", "ches", "shes", "oes")):
+        add_candidate(word[:-2], "plural")  # boxes -> box, watches -> watch, heroes -> hero
+    elif word_lower.endswith("es") and len(word) > 3:
+        add_candidate(word[:-1], "plural")
+        add_candidate(word[:-2], "plural")
+    elif word_lower.endswith("s") and not word_lower.endswith("ss"):
+        add_candidate(word[:-1], "plural")  # cats -> cat
+
+    # 过去式 / 过去分词
+    if word_lower.endswith("ied"):
+        add_candidate(word[:-3] + "y", "verb")  # studied -> study
+        add_candidate(word[:-1], "verb")  # died -> die
+    elif word_lower.endswith("ed"):
+        if len(word) > 4 and word[-3].lower() == word[-4].lower():
+            add_candidate(word[:-3], "verb")  # spotted -> spot
+        add_candidate(word[:-2], "verb")  # walked -> walk
+        add_candidate(word[:-1], "verb")  # baked -> bake
+
+    # 现在分词
+    if word_lower.endswith("ing"):
+        if len(word) > 5 and word[-4].lower() == word[-5].lower():
+            add_candidate(word[:-4], "verb")  # running -> run
+        add_candidate(word[:-3] + "e", "verb")  # loving -> love
+        add_candidate(word[:-3], "verb")  # walking -> walk
+        if word_lower.endswith("cking"):
+            add_candidate(word[:-4], "verb")  # panicking -> panic
+
+    # 比较级 / 最高级
+    if word_lower.endswith("iest"):
+        add_candidate(word[:-4] + "y", "superlative")  # happiest -> happy
+    elif word_lower.endswith("ier"):
+        add_candidate(word[:-3] + "y", "comparative")  # happier -> happy
+    elif word_lower.endswith("est"):
+        if len(word) > 5 and word[-4].lower() == word[-5].lower():
+            add_candidate(word[:-4], "superlative")  # biggest -> big
+        add_candidate(word[:-2], "superlative")  # largest -> large
+        add_candidate(word[:-3], "superlative")  # fastest -> fast
+    elif word_lower.endswith("er"):
+        if len(word) > 4 and word[-3].lower() == word[-4].lower():
+            add_candidate(word[:-3], "comparative")  # bigger -> big
+        add_candidate(word[:-1], "comparative")  # larger -> large
+        add_candidate(word[:-2], "comparative")  # faster -> fast
+
+    return candidates
+
+
+def rule_candidates(word: str) -> List[str]:
+    """根据不规则词表和常见英语词尾规则推测原型候选（按优先级排序，不含原词）"""
+    return [candidate for candidate, _ in rule_candidates_with_kinds(word)]
+
+
+def rule_inflections(lemma: str) -> List[str]:
+    """按不规则词表和常见词尾规则生成屈折形式（小写，可能包含不存在的拼写，仅用于匹配）"""
+    word = lemma.lower()
+    forms = list(_IRREGULAR_FORMS.get(word, ()))
+
+    # -s/-es（复数/第三人称单数）；辅音 + y 结尾：study -> studies
+    if not word.endswith("s"):
+        if word.endswith("y") and len(word) > 1 and word[-2] not in "aeiou":
+            forms.append(word[:-1] + "ies")
+        else:
+            forms.append(word + "s")
+        forms.append(word + "es")
+
+    # -ed（过去式/过去分词）
+    if not word.endswith("ed"):
+        if word.endswith("e"):
+            forms.append(word + "d")
+        elif word.endswith("y"):
+            forms.append(word[:-1] + "ied")
+        else:
+            forms.append(word + "ed")
+
+    # -ing（现在分词）
+    if not word.endswith("ing"):
+        if word.endswith("ie"):
+            forms.append(word[:-2] + "ying")
+        elif word.endswith("e"):
+            forms.append(word[:-1] + "ing")
+        else:
+            forms.append(word + "ing")
+
+    # -er/-est（比较级/最高级）
+    if not word.endswith(("er", "est")):
+        if word.endswith("e"):
+            forms.extend((word + "r", word + "st"))
+        else:
+            forms.extend((word + "er", word + "est"))
+
+    # 辅音 + 元音 + 辅音结尾的双写形式：run -> running, stop -> stopped, big -> bigger
+    if len(word) >= 3 and word[-1] not in "aeiouwxy" and word[-2] in "aeiou" and word[-3] not in "aeiou":
+        doubled = word + word[-1]
+        forms.extend((doubled + "ing", doubled + "ed", doubled + "er", doubled + "est"))
+
+    return forms
+
+
+def derivation_stems(word: str) -> List[str]:
+    """去掉常见派生后缀（-ly、-ment、-ness、-tion/-sion）得到的词干（小写）"""
+    word = word.lower()
+    stems = []
+    if word.endswith("ly") and len(word) > 4:
+        stems.append(word[:-2])  # quickly -> quick
+    if word.endswith("ment") and len(word) > 6:
+        stems.append(word[:-4])  # development -> develop
+    if word.endswith("ness") and len(word) > 5:
+        stems.append(word[:-4])  # darkness -> dark
+    if word.endswith(("tion", "sion")):
+        stems.append(word[:-4] + "e")
+    return stems
+
+
+def get_lemma_candidates(word: str) -> List[str]:
+    """
+    原型候选：已知屈折形式直接返回表中的原型（一次索引查询），
+    否则回退到不规则词表和后缀规则推测。
+    """
+    lemmas = [lemma for lemma in get_lemmas(word) if lemma != word.lower()]
+    if lemmas:
+        return lemmas
+    return rule_candidates(word)
+
+
+def get_word_family(words: Iterable[str]) -> set:
+    """单词（小写）及其原型、原型的全部屈折形式"""
+    family = set()
+    for word in words:
+        key = word.lower()
+        family.add(key)
+        for lemma in (key, *get_lemmas(key)):
+            family.add(lemma)
+            family.update(get_inflections(lemma))
+    return family
@@ -0,0 +1,107 @@
+"""
+查词结果内存缓存
+位于 dict_service.lookup_word 之前的进程级 LRU，按条目数和 TTL 淘汰；
+未找到的结果也会缓存（较短 TTL），避免重复走完整条回退链。
+"""
+
+import copy
+import threading
+import time
+from collections import OrderedDict
+from typing import Any, Dict, Hashable, Optional, Tuple
+import logging
+
+logger = logging.getLogger(__name__)
+
+# 默认容量与有效期（秒）；未命中结果可能源于网络失败，有效期更短
+LOOKUP_CACHE_MAX_ENTRIES = 2000
+LOOKUP_CACHE_TTL = 3600.0
+LOOKUP_CACHE_NEGATIVE_TTL = 300.0
+
+
+class LookupCache:
+    """线程安全的 LRU + TTL 缓存，记录命中统计"""
+
+    def __init__(
+        self,
+        max_entries: int = LOOKUP_CACHE_MAX_ENTRIES,
+        ttl: float = LOOKUP_CACHE_TTL,
+        negative_ttl: float = LOOKUP_CACHE_NEGATIVE_TTL,
+    ):
+        self.max_entries = max_entries
+        self.ttl = ttl
+        self.negative_ttl = negative_ttl
+        self._lock = threading.Lock()
+        # key -> (过期时间, 是否为未命中结果, 值)
+        self._entries: "OrderedDict[Hashable, Tuple[float, bool, Any]]" = OrderedDict()
+        self._hits = 0
+        self._negative_hits = 0
+        self._misses = 0
+        self._evictions = 0
+        self._invalidations = 0
+
+    def get(self, key: Hashable) -> Tuple[bool, Any]:
+        """返回 (是否命中, 值)；值为深拷贝，调用方可随意修改"""
+        with self._lock:
+            item = self._entries.get(key)
+            if item is not None and item[0] < time.monotonic():
+                del self._entries[key]
+                item = None
+            if item is None:
+                self._misses += 1
+                return False, None
+            self._entries.move_to_end(key)
+            self._hits += 1
+            if item[1]:
+                self._negative_hits += 1
+            value = item[2]
+        return True, copy.deepcopy(value)
+
+    def put(self, key: Hashable, value: Any, negative: bool = False):
+        ttl = self.negative_ttl if negative else self.ttl
+        stored = copy.deepcopy(value)
+        with self._lock:
+            self._entries[key] = (time.monotonic() + ttl, negative, stored)
+            self._entries.move_to_end(key)
+            while len(self._entries) > self.max_entries:
+                self._entries.popitem(last=False)
+                self._evictions += 1
+
+    def contains(self, key: Hashable) -> bool:
+        """是否存在未过期的缓存（不计入命中统计）"""
+        with self._lock:
+            item = self._entries.get(key)
+            return item is not None and item[0] >= time.monotonic()
+
+    def invalidate(self, reason: Optional[str] = None):
+        """清空缓存（词典导入、删除、启停或优先级变化时调用）"""
+        with self._lock:
+            size = len(self._entries)
+            self._entries.clear()
+            self._invalidations += 1
+        if size:
+            logger.info(f"查词缓存已清空 ({size} 条){f': {reason}' if reason else ''}")
+
+    def stats(self) -> Dict[str, Any]:
+        with self._lock:
+            lookups = self._hits + self._misses
+            return {
+                "size": len(self._entries),
+                "max_entries": self.max_entries,
+                "ttl_seconds": self.ttl,
+                "negative_ttl_seconds": self.negative_ttl,
+                "hits": self._hits,
+                "negative_hits": self._negative_hits,
+                "misses": self._misses,
+                "hit_rate": round(self._hits / lookups, 4) if lookups else 0.0,
+                "evictions": self._evictions,
+                "invalidations": self._invalidations,
+            }
+
+
+_lookup_cache = LookupCache()
+
+
+def get_lookup_cache() -> LookupCache:
+    """进程级查词缓存单例"""
+    return _lookup_cache
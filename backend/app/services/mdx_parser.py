@@ -3,13 +3,26 @@ MDX 词典解析器
 使用 mdict_utils 库提取词条信息，支持标准 MDX/MDD 格式
 """
 
+from bisect import bisect_right
+from collections import OrderedDict
 from pathlib import Path
-from typing import Dict, List, Optional, Generator, Union
+from typing import Dict, List, Optional, Generator, Tuple, Union
 import logging
-from mdict_utils.reader import MDX
+import mmap
+import threading
+from mdict_utils.reader import MDX, MDD
 
 logger = logging.getLogger(__name__)
 
+# 进程内同时保持打开的读取器数量上限（每个读取器常驻其 key 列表）
+MAX_OPEN_READERS = 8
+
+# 每个读取器缓存的已解压记录块数量（块通常为数十 KB）
+BLOCK_CACHE_SIZE = 32
+
+_reader_cache: "OrderedDict[Tuple[str, int, int], MDXParser]" = OrderedDict()
+_reader_cache_lock = threading.Lock()
+
 class MDXParser:
     """MDX 文件解析器 (基于 mdict_utils)"""
 
@@ -17,13 +30,127 @@ class MDXParser:
         self.mdx_path = mdx_path
         self.dict_name = mdx_path.stem
         self._mdx = None
+        self._key_index: Optional[Dict[bytes, Tuple[int, int]]] = None
+        # 记录块表：(文件内偏移, 压缩大小, 解压后起始偏移, 解压大小)
+        self._blocks: Optional[List[Tuple[int, int, int, int]]] = None
+        self._block_starts: List[int] = []
+        self._block_cache: "OrderedDict[int, bytes]" = OrderedDict()
+        self._block_lock = threading.Lock()
+        self._mm: Optional[mmap.mmap] = None
 
     @property
     def mdx(self):
+        return self.load()
+
+    def load(self):
+        """解析 header 与 key block（耗时操作），返回底层读取器；已加载时直接返回"""
         if self._mdx is None:
-            self._mdx = MDX(str(self.mdx_path))
+            # MDD 的 key 固定为 UTF-16 编码，必须用 MDD 读取，否则 key block 解析失败
+            if self.mdx_path.suffix.lower() == ".mdd":
+                self._mdx = MDD(str(self.mdx_path))
+            else:
+                self._mdx = MDX(str(self.mdx_path))
         return self._mdx
 
+    def _get_key_index(self) -> Dict[bytes, Tuple[int, int]]:
+        """小写 key -> (记录起始偏移, 记录长度)，长度 0 表示读到所在块末尾；同名词条取第一条"""
+        if self._key_index is None:
+            key_list = self.mdx._key_list
+            index: Dict[bytes, Tuple[int, int]] = {}
+            for i, (record_start, key) in enumerate(key_list):
+                length = key_list[i + 1][0] - record_start if i + 1 < len(key_list) else 0
+                index.setdefault(key.lower(), (record_start, length))
+            self._key_index = index
+        return self._key_index
+
+    def read_record(self, key: str) -> Union[bytes, str, None]:
+        """按 key 读取单条记录：MDD 返回原始字节，MDX 返回解码后的字符串"""
+        span = self._get_key_index().get(key.encode("utf-8").lower())
+        if span is None:
+            return None
+        return self.read_at(span[0], span[1])
+
+    def read_at(self, offset: int, length: int) -> Union[bytes, str, None]:
+        """
+        按索引中记录的 (offset, length) 直接读取：定位所在记录块，从内存映射的文件中只解压该块。
+        offset 为记录在解压后记录流中的起始位置，length 为 0 时读到块末尾。
+        """
+        blocks = self._get_block_table()
+        index = bisect_right(self._block_starts, offset) - 1
+        if index < 0 or index >= len(blocks):
+            return None
+        block = self._get_block(index)
+        start = offset - blocks[index][2]
+        data = block[start:start + length] if length > 0 else block[start:]
+        if self.mdx_path.suffix.lower() == ".mdd":
+            return data
+        return self.mdx._treat_record_data(data).decode("utf-8", errors="ignore")
+
+    def _get_block_table(self) -> List[Tuple[int, int, int, int]]:
+        """只读取记录块的头信息，建立块表（不解压任何记录）"""
+        if self._blocks is not None:
+            return self._blocks
+
+        md = self.mdx
+        blocks = []
+        decompressed_offset = 0
+        with open(self.mdx_path, "rb") as f:
+            f.seek(md._record_block_offset)
+            if md._version >= 3:
+                num_blocks = md._read_int32(f)
+                md._read_number(f)
+                for _ in range(num_blocks):
+                    decompressed_size = md._read_int32(f)
+                    compressed_size = md._read_int32(f)
+                    blocks.append((f.tell(), compressed_size, decompressed_offset, decompressed_size))
+                    decompressed_offset += decompressed_size
+                    f.seek(compressed_size, 1)
+            else:
+                num_blocks = md._read_number(f)
+                md._read_number(f)  # num_entries
+                md._read_number(f)  # record_block_info_size
+                md._read_number(f)  # record_block_size
+                sizes = [(md._read_number(f), md._read_number(f)) for _ in range(num_blocks)]
+                file_offset = f.tell()
+                for compressed_size, decompressed_size in sizes:
+                    blocks.append((file_offset, compressed_size, decompressed_offset, decompressed_size))
+                    file_offset += compressed_size
+                    decompressed_offset += decompressed_size
+
+        self._block_starts = [b[2] for b in blocks]
+        self._blocks = blocks
+        return blocks
+
+    def _get_block(self, index: int) -> bytes:
+        """取解压后的记录块，命中块 LRU 时不再读文件和解压"""
+        with self._block_lock:
+            block = self._block_cache.get(index)
+            if block is not None:
+                self._block_cache.move_to_end(index)
+                return block
+            if self._mm is None:
+                with open(self.mdx_path, "rb") as f:
+                    self._mm = mmap.mmap(f.fileno(), 0, access=mmap.ACCESS_READ)
+            # 在锁内拷出压缩数据：读取器可能被缓存淘汰并 close()，之后的读取会重新映射
+            file_offset, compressed_size, _, decompressed_size = self._get_block_table()[index]
+            compressed = self._mm[file_offset:file_offset + compressed_size]
+
+        block = self.mdx._decode_block(compressed, decompressed_size)
+
+        with self._block_lock:
+            self._block_cache[index] = block
+            while len(self._block_cache) > BLOCK_CACHE_SIZE:
+                self._block_cache.popitem(last=False)
+        return block
+
+    def close(self):
+        """释放内存映射（Windows 下映射未释放时无法删除文件）"""
+        with self._block_lock:
+            self._block_cache.clear()
+            if self._mm is not None:
+                self._mm.close()
+                self._mm = None
+
     def get_encoding(self) -> str:
         """从词典头部获取编码"""
         try:
@@ -42,9 +169,20 @@ class MDXParser:
             logger.warning(f"获取词典编码失败，恢复默认 UTF-8: {e}")
             return 'utf-8'
 
-    def parse(self) -> Generator[Dict, None, None]:
+    def get_entry_count(self) -> int:
+        """词条总数（读取 key block 后即可得到，无需解析记录）"""
+        try:
+            return len(self.mdx)
+        except Exception as e:
+            logger.warning(f"获取词条总数失败: {e}")
+            return 0
+
+    def parse(self, start: int = 0) -> Generator[Dict, None, None]:
         """
         解析 MDX 文件，生成词条信息
+
+        start: 跳过前 start 个词条，用于从导入检查点继续；直接从包含第 start 个词条的
+               记录块开始读取，之前的记录块不读取也不解压
         """
         logger.info(f"开始解析 MDX 文件: {self.mdx_path}")
         
@@ -52,12 +190,13 @@ class MDXParser:
             encoding = self.get_encoding()
             logger.info(f"词典使用编码: {encoding}")
 
-            # MDX.items() 返回 (word, content) 的生成器
-            # content 在这里是 bytes
+            # _iter_records 按 key 列表顺序产出 (序号, word, content)，content 在这里是 bytes
             entry_count = 0
             is_mdd = self.mdx_path.suffix.lower() == ".mdd"
-            
-            for word_bytes, content_bytes in self.mdx.items():
+            # offset/length 取自 key 列表中的记录起始位置
+            key_list = self.mdx._key_list
+
+            for index, word_bytes, content_bytes in self._iter_records(start):
                 try:
                     word = word_bytes.decode(encoding)
                 except UnicodeDecodeError:
@@ -79,11 +218,14 @@ class MDXParser:
                         except UnicodeDecodeError:
                             decoded_content = content_bytes.decode('latin1', errors='ignore')
 
+                offset = key_list[index][0]
+                length = key_list[index + 1][0] - offset if index + 1 < len(key_list) else 0
+
                 yield {
                     "word": word,
                     "content": decoded_content,
-                    "offset": 0,
-                    "length": 0,
+                    "offset": offset,
+                    "length": length,
                     "dict_name": self.dict_name,
                 }
 
@@ -94,27 +236,57 @@ class MDXParser:
         except Exception as e:
             logger.error(f"解析 MDX 失败: {e}", exc_info=True)
 
-    def get_entry_content(self, offset: int, length: int) -> str:
+    def _iter_records(self, start: int = 0) -> Generator[Tuple[int, bytes, bytes], None, None]:
         """
-        此方法在旧版本中用于通过偏移量读取，新版本建议直接通过单词查询。
-        为了兼容性，这里保留签名，但如果不提供 word，它将无法工作。
+        按 key 列表顺序逐块解压记录，产出 (词条序号, key, 记录数据)，从第 start 个词条开始。
+
+        与 MDX.items() 的切分方式相同，但借助块表直接定位到第 start 个词条所在的记录块，
+        顺序读取时不经过块 LRU（避免导入冲掉查询缓存）。
         """
-        return ""
+        key_list = self.mdx._key_list
+        if start >= len(key_list):
+            return
+        blocks = self._get_block_table()
+        block_index = max(0, bisect_right(self._block_starts, key_list[start][0]) - 1)
+
+        i = start
+        with open(self.mdx_path, "rb") as f:
+            for file_offset, compressed_size, block_start, decompressed_size in blocks[block_index:]:
+                if i >= len(key_list):
+                    break
+                f.seek(file_offset)
+                record_block = self.mdx._decode_block(f.read(compressed_size), decompressed_size)
+                block_end = block_start + len(record_block)
+                while i < len(key_list):
+                    record_start, key_text = key_list[i]
+                    if record_start >= block_end:
+                        break
+                    record_end = key_list[i + 1][0] if i + 1 < len(key_list) else block_end
+                    data = record_block[record_start - block_start:record_end - block_start]
+                    yield i, key_text, self.mdx._treat_record_data(data)
+                    i += 1
+
+    def get_entry_content(self, offset: int, length: int) -> str:
+        """按索引记录的偏移量读取 MDX 词条内容"""
+        try:
+            content = self.read_at(offset, length)
+        except Exception as e:
+            logger.error(f"按偏移读取词条失败 ({offset}, {length}): {e}")
+            return ""
+        if isinstance(content, bytes):
+            content = content.decode("utf-8", errors="ignore")
+        return (content or "").strip("\x00")
 
     def get_content_by_word(self, word: str) -> Optional[str]:
         """直接通过单词获取内容"""
         try:
-            results = self.mdx.get(word.encode('utf-8'))
-            if not results:
-                # 尝试小写匹配或去空格
-                results = self.mdx.get(word.lower().encode('utf-8'))
-            
-            if results:
-                content_bytes = results[0]
-                try:
-                    return content_bytes.decode('utf-8')
-                except UnicodeDecodeError:
-                    return content_bytes.decode('latin1', errors='ignore')
+            # key 索引本身不区分大小写，去空格后再试一次
+            for candidate in (word, word.strip()):
+                content = self.read_record(candidate)
+                if content:
+                    if isinstance(content, bytes):
+                        content = content.decode("utf-8", errors="ignore")
+                    return content.strip("\x00")
         except Exception as e:
             logger.error(f"查询单词内容失败 {word}: {e}")
         return None
@@ -124,16 +296,16 @@ class MDXParser:
         try:
             # MDD 中的路径通常以 \ 或 / 开头
             paths_to_try = [
-                path.encode('utf-8'),
-                f"\\{path.lstrip('/')}".encode('utf-8'),
-                f"/{path.lstrip('/')}".encode('utf-8'),
-                path.replace('/', '\\').encode('utf-8')
+                path,
+                f"\\{path.lstrip('/')}",
+                f"/{path.lstrip('/')}",
+                "\\" + path.lstrip("/\\").replace("/", "\\"),
             ]
-            
+
             for p in paths_to_try:
-                results = self.mdx.get(p)
-                if results:
-                    return results[0]
+                data = self.read_record(p)
+                if data:
+                    return data if isinstance(data, bytes) else data.encode("utf-8")
             return None
         except Exception as e:
             logger.error(f"读取资源失败 {path}: {e}")
@@ -145,3 +317,46 @@ class MDXParser:
             "file_size": self.mdx_path.stat().st_size if self.mdx_path.exists() else 0,
             "dict_name": self.dict_name,
         }
+
+
+def get_cached_parser(path: Path) -> MDXParser:
+    """
+    进程级读取器 LRU：按 (路径, mtime, 大小) 复用已解析 header/key block 的 MDXParser，
+    文件被替换后签名变化，旧读取器自然淘汰。
+    """
+    stat = path.stat()
+    cache_key = (str(path.resolve()), stat.st_mtime_ns, stat.st_size)
+    with _reader_cache_lock:
+        parser = _reader_cache.get(cache_key)
+        if parser is not None:
+            _reader_cache.move_to_end(cache_key)
+            return parser
+
+    # 在锁外完成耗时的 key block 解析
+    parser = MDXParser(path)
+    parser.load()
+
+    evicted = []
+    with _reader_cache_lock:
+        for stale in [k for k in _reader_cache if k[0] == cache_key[0]]:
+            evicted.append(_reader_cache.pop(stale))
+        _reader_cache[cache_key] = parser
+        while len(_reader_cache) > MAX_OPEN_READERS:
+            evicted.append(_reader_cache.popitem(last=False)[1])
+    # 在锁外释放被淘汰读取器的内存映射，否则 Windows 下无法删除或替换词典文件
+    for stale_parser in evicted:
+        stale_parser.close()
+    return parser
+
+
+def evict_cached_parsers(path: Optional[Path] = None):
+    """丢弃缓存的读取器（删除/重新导入词典时调用），path 为空时全部清空"""
+    with _reader_cache_lock:
+        if path is None:
+            stale = list(_reader_cache)
+        else:
+            resolved = str(path.resolve())
+            stale = [k for k in _reader_cache if k[0] == resolved]
+        parsers = [_reader_cache.pop(k) for k in stale]
+    for parser in parsers:
+        parser.close()
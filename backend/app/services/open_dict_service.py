@@ -1,11 +1,13 @@
-import sqlite3
 import logging
-from pathlib import Path
 from typing import Optional, Dict, List
 from app.config import OPEN_DICT_DB_PATH
+from .readonly_db import ReadOnlyConnectionPool
 
 logger = logging.getLogger(__name__)
 
+# 开发环境下导入脚本可能改写 open_dict.db，只读打开但不声明 immutable
+_pool = ReadOnlyConnectionPool("open_dict", lambda: str(OPEN_DICT_DB_PATH), immutable=False)
+
 def lookup_word_open(word: str) -> Optional[Dict]:
     """
     在开源数据库 open_dict.db 中查询词典定义。
@@ -14,7 +16,9 @@ def lookup_word_open(word: str) -> Optional[Dict]:
         return None
 
     try:
-        conn = sqlite3.connect(str(OPEN_DICT_DB_PATH))
+        conn = _pool.get()
+        if not conn:
+            return None
         cursor = conn.cursor()
         
         # 精确匹配或小写匹配
@@ -26,7 +30,6 @@ def lookup_word_open(word: str) -> Optional[Dict]:
         """, (word_lower,))
         
         row = cursor.fetchone()
-        conn.close()
         
         if row:
             return {
@@ -56,7 +59,9 @@ def get_examples_open(word: str, limit: int = 10) -> List[Dict]:
         return []
 
     try:
-        conn = sqlite3.connect(str(OPEN_DICT_DB_PATH))
+        conn = _pool.get()
+        if not conn:
+            return []
         cursor = conn.cursor()
         
         word_lower = word.lower()
@@ -70,7 +75,6 @@ def get_examples_open(word: str, limit: int = 10) -> List[Dict]:
         """, (word_lower, limit))
         
         rows = cursor.fetchall()
-        conn.close()
         
         return [{"en": r[0], "cn": r[1]} for r in rows]
     except Exception as e:
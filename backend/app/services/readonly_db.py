@@ -0,0 +1,106 @@
+"""
+随程序分发的参考词库（ECDICT / JMdict / open_dict）只读连接池
+
+以 URI 只读方式（可选 immutable）打开，不写 WAL / journal 文件；启用 mmap 与更大的页缓存。
+每个线程复用一个连接，新建连接时顺带关闭已退出线程遗留的连接，避免线程池轮换后池子无限增长。
+"""
+
+import sqlite3
+import threading
+from pathlib import Path
+from typing import Callable, Dict, Optional, Tuple
+import logging
+
+logger = logging.getLogger(__name__)
+
+# 内存映射上限与页缓存（KiB，PRAGMA cache_size 取负值表示按 KiB 计）
+READONLY_MMAP_SIZE = 256 * 1024 * 1024
+READONLY_CACHE_KIB = 16 * 1024
+
+
+def connect_readonly(db_path: str, immutable: bool = True) -> sqlite3.Connection:
+    """
+    以只读方式打开 SQLite 数据库。
+
+    immutable=True 时 SQLite 不再加锁或检查文件变化，只适用于运行期间不会被改写的文件。
+    """
+    uri = Path(db_path).resolve().as_uri() + "?mode=ro" + ("&immutable=1" if immutable else "")
+    conn = sqlite3.connect(uri, uri=True, check_same_thread=False)
+    conn.execute(f"PRAGMA mmap_size={READONLY_MMAP_SIZE}")
+    conn.execute(f"PRAGMA cache_size=-{READONLY_CACHE_KIB}")
+    conn.execute("PRAGMA temp_store=MEMORY")
+    return conn
+
+
+class ReadOnlyConnectionPool:
+    """按线程复用的只读连接池"""
+
+    def __init__(
+        self,
+        name: str,
+        path_getter: Callable[[], str],
+        row_factory: Optional[Callable] = None,
+        immutable: bool = True,
+    ):
+        self.name = name
+        self._path_getter = path_getter
+        self._row_factory = row_factory
+        self._immutable = immutable
+        self._lock = threading.Lock()
+        # 线程 ID -> (线程对象, 数据库路径, 连接)
+        self._connections: Dict[int, Tuple[threading.Thread, str, sqlite3.Connection]] = {}
+
+    def get(self) -> Optional[sqlite3.Connection]:
+        """返回当前线程的连接；数据库不存在或打开失败时返回 None"""
+        db_path = self._path_getter()
+        thread = threading.current_thread()
+        thread_id = threading.get_ident()
+        item = self._connections.get(thread_id)
+        # 线程 ID 可能被新线程复用，需同时核对线程对象
+        if item is not None and item[0] is thread and item[1] == db_path:
+            return item[2]
+
+        if not Path(db_path).exists():
+            logger.error(f"{self.name} database not found at {db_path}")
+            return None
+
+        with self._lock:
+            item = self._connections.get(thread_id)
+            if item is not None:
+                if item[0] is thread and item[1] == db_path:
+                    return item[2]
+                # 已退出线程遗留的连接，或数据库路径变化（测试或重新配置）
+                item[2].close()
+            try:
+                conn = connect_readonly(db_path, immutable=self._immutable)
+            except Exception as e:
+                logger.error(f"Error connecting to {self.name} at {db_path}: {e}")
+                self._connections.pop(thread_id, None)
+                return None
+            if self._row_factory is not None:
+                conn.row_factory = self._row_factory
+            self._connections[thread_id] = (thread, db_path, conn)
+            self._prune_dead_threads()
+            return conn
+
+    def close_all(self):
+        """关闭池中所有连接"""
+        with self._lock:
+            for _, _, conn in self._connections.values():
+                conn.close()
+            self._connections.clear()
+
+    def size(self) -> int:
+        return len(self._connections)
+
+    def _prune_dead_threads(self):
+        """关闭已退出线程的连接（调用方持有锁）"""
+        dead = [tid for tid, (thread, _, _) in self._connections.items() if not thread.is_alive()]
+        for tid in dead:
+            _, _, conn = self._connections.pop(tid)
+            try:
+                conn.close()
+            except Exception:
+                pass
+        if dead:
+            logger.debug(f"{self.name} 连接池清理已退出线程的连接 {len(dead)} 个")
@@ -0,0 +1,346 @@
+"""
+查词远程兜底客户端（Free Dictionary API / AI）
+
+本地词典都未命中时才会走到这里。所有远程请求都在一个专用后台事件循环线程中执行：
+    - 共享一个 httpx.AsyncClient 连接池，不再为每次查询新建连接
+    - 按主机限制并发数，AI 调用单独限流（SDK 为同步接口，放到线程中执行）
+    - 相同的在途请求合并为一次（例如同一单词被连续点击多次）
+    - 每个远程源一个熔断器：连续失败达到阈值后在冷却期内直接跳过，冷却结束后放行一次试探请求
+
+异步调用方（路由）直接 await free_dictionary / ai_chat，不占用线程池；
+同步调用方（批量查词等）通过 run_sync 在该事件循环中执行，阻塞当前线程等待结果。
+"""
+
+import asyncio
+import threading
+import time
+from typing import Any, Awaitable, Callable, Coroutine, Dict, Hashable, Optional, TypeVar
+from urllib.parse import quote, urlsplit
+import logging
+
+import httpx
+
+logger = logging.getLogger(__name__)
+
+_T = TypeVar("_T")
+
+FREE_DICT_API = "https://api.dictionaryapi.dev/api/v2/entries/en/{word}"
+FREE_DICT_SOURCE = "free_dictionary"
+AI_SOURCE = "ai"
+
+# 单次 HTTP 请求超时（秒）
+REMOTE_TIMEOUT = 5.0
+# 同一主机的最大并发请求数，以及 AI 调用的最大并发数
+PER_HOST_CONCURRENCY = 4
+AI_CONCURRENCY = 2
+# 连续失败多少次后熔断，以及熔断后跳过该远程源的时长（秒）
+BREAKER_FAILURE_THRESHOLD = 3
+BREAKER_COOLDOWN_SECONDS = 60.0
+
+
+class CircuitBreaker:
+    """
+    连续失败计数熔断器：closed -> open（冷却期内拒绝）-> half_open（放行一次试探）。
+    试探成功恢复 closed，失败重新进入 open。
+    """
+
+    CLOSED = "closed"
+    OPEN = "open"
+    HALF_OPEN = "half_open"
+
+    def __init__(
+        self,
+        name: str,
+        failure_threshold: int = BREAKER_FAILURE_THRESHOLD,
+        cooldown: float = BREAKER_COOLDOWN_SECONDS,
+        clock: Callable[[], float] = time.monotonic,
+    ):
+        self.name = name
+        self.failure_threshold = failure_threshold
+        self.cooldown = cooldown
+        self._clock = clock
+        self._lock = threading.Lock()
+        self._state = self.CLOSED
+        self._failures = 0
+        self._opened_at = 0.0
+        self._trial_in_flight = False
+
+    @property
+    def state(self) -> str:
+        with self._lock:
+            return self._state
+
+    def allow(self) -> bool:
+        """是否允许发起请求；冷却结束后只放行一个试探请求"""
+        with self._lock:
+            if self._state == self.CLOSED:
+                return True
+            if self._state == self.OPEN and self._clock() - self._opened_at >= self.cooldown:
+                self._state = self.HALF_OPEN
+                self._trial_in_flight = False
+            if self._state == self.HALF_OPEN and not self._trial_in_flight:
+                self._trial_in_flight = True
+                return True
+            return False
+
+    def record_success(self):
+        with self._lock:
+            if self._state != self.CLOSED:
+                logger.info(f"远程源 {self.name} 已恢复")
+            self._state = self.CLOSED
+            self._failures = 0
+            self._trial_in_flight = False
+
+    def record_failure(self):
+        with self._lock:
+            self._failures += 1
+            self._trial_in_flight = False
+            if self._state == self.HALF_OPEN or self._failures >= self.failure_threshold:
+                if self._state != self.OPEN:
+                    logger.warning(f"远程源 {self.name} 连续失败 {self._failures} 次，{self.cooldown:.0f}s 内跳过")
+                self._state = self.OPEN
+                self._opened_at = self._clock()
+
+    def stats(self) -> Dict[str, Any]:
+        with self._lock:
+            return {"state": self._state, "failures": self._failures}
+
+
+class RemoteLookupClient:
+    """远程兜底请求的共享客户端，事件循环线程在首次使用时启动"""
+
+    def __init__(
+        self,
+        free_dict_url: str = FREE_DICT_API,
+        timeout: float = REMOTE_TIMEOUT,
+        per_host_limit: int = PER_HOST_CONCURRENCY,
+        ai_limit: int = AI_CONCURRENCY,
+        failure_threshold: int = BREAKER_FAILURE_THRESHOLD,
+        cooldown: float = BREAKER_COOLDOWN_SECONDS,
+    ):
+        self.free_dict_url = free_dict_url
+        self.timeout = timeout
+        self.per_host_limit = per_host_limit
+        self.ai_limit = ai_limit
+        self.breakers = {
+            FREE_DICT_SOURCE: CircuitBreaker(FREE_DICT_SOURCE, failure_threshold, cooldown),
+            AI_SOURCE: CircuitBreaker(AI_SOURCE, failure_threshold, cooldown),
+        }
+
+        self._lock = threading.Lock()
+        self._loop: Optional[asyncio.AbstractEventLoop] = None
+        self._thread: Optional[threading.Thread] = None
+        # 以下状态只在事件循环线程中访问
+        self._client: Optional[httpx.AsyncClient] = None
+        self._host_limits: Dict[str, asyncio.Semaphore] = {}
+        self._ai_limit: Optional[asyncio.Semaphore] = None
+        self._inflight: Dict[Hashable, asyncio.Task] = {}
+        self._stats = {"requests": 0, "coalesced": 0, "skipped": 0, "failures": 0}
+
+    # ---- 对外接口 ----
+
+    async def free_dictionary(self, word: str) -> Optional[list]:
+        """查询 Free Dictionary API，返回解析后的 JSON 列表；未收录、失败或熔断时返回 None"""
+        return await self.run(self._free_dictionary(word))
+
+    async def ai_chat(self, prompt: str, **kwargs) -> Optional[str]:
+        """通过当前 AI 供应商对话（参数同 chat_with_active_supplier）；失败或熔断时返回 None"""
+        return await self.run(self._ai_chat(prompt, kwargs))
+
+    async def run(self, coro: Coroutine[Any, Any, _T]) -> _T:
+        """在客户端事件循环中执行协程并等待结果（可从任意事件循环调用）"""
+        loop = self._ensure_loop()
+        if asyncio.get_running_loop() is loop:
+            return await coro
+        return await asyncio.wrap_future(asyncio.run_coroutine_threadsafe(coro, loop))
+
+    def run_sync(self, coro: Coroutine[Any, Any, _T], timeout: Optional[float] = None) -> _T:
+        """同步调用方使用：阻塞当前线程直到协程在客户端事件循环中完成"""
+        loop = self._ensure_loop()
+        if threading.current_thread() is self._thread:
+            coro.close()
+            raise RuntimeError("不能在远程查词事件循环线程中同步等待")
+        return asyncio.run_coroutine_threadsafe(coro, loop).result(timeout)
+
+    def stats(self) -> Dict[str, Any]:
+        return {
+            **self._stats,
+            "in_flight": len(self._inflight),
+            "breakers": {name: breaker.stats() for name, breaker in self.breakers.items()},
+        }
+
+    def close(self):
+        """关闭连接池并停止事件循环线程"""
+        with self._lock:
+            loop, thread = self._loop, self._thread
+            self._loop = self._thread = None
+        if loop is None:
+            return
+        try:
+            asyncio.run_coroutine_threadsafe(self._aclose(), loop).result(timeout=self.timeout)
+        except Exception as e:
+            logger.debug(f"关闭远程查词客户端失败: {e}")
+        loop.call_soon_threadsafe(loop.stop)
+        if thread is not None:
+            thread.join(timeout=self.timeout)
+        loop.close()
+        # 信号量绑定在旧事件循环上，重新启动时重建
+        self._host_limits.clear()
+        self._ai_limit = None
+        self._inflight.clear()
+
+    # ---- 事件循环 ----
+
+    def _ensure_loop(self) -> asyncio.AbstractEventLoop:
+        with self._lock:
+            if self._loop is None:
+                loop = asyncio.new_event_loop()
+                thread = threading.Thread(target=loop.run_forever, name="remote-lookup", daemon=True)
+                thread.start()
+                self._loop, self._thread = loop, thread
+            return self._loop
+
+    async def _aclose(self):
+        if self._client is not None:
+            await self._client.aclose()
+            self._client = None
+
+    def _get_client(self) -> httpx.AsyncClient:
+        if self._client is None:
+            self._client = httpx.AsyncClient(
+                timeout=self.timeout,
+                follow_redirects=True,
+                limits=httpx.Limits(
+                    max_connections=self.per_host_limit * 4,
+                    max_keepalive_connections=self.per_host_limit,
+                ),
+            )
+        return self._client
+
+    async def _coalesce(self, key: Hashable, factory: Callable[[], Awaitable]):
+        """相同 key 的请求在途时直接等待已有结果，不再重复发起"""
+        task = self._inflight.get(key)
+        if task is not None:
+            self._stats["coalesced"] += 1
+        else:
+            task = asyncio.ensure_future(factory())
+            self._inflight[key] = task
+            task.add_done_callback(lambda _: self._inflight.pop(key, None))
+        # shield：某个调用方取消等待时不影响其他合并进来的调用方
+        return await asyncio.shield(task)
+
+    # ---- 各远程源 ----
+
+    async def _free_dictionary(self, word: str) -> Optional[list]:
+        return await self._coalesce((FREE_DICT_SOURCE, word.lower()), lambda: self._fetch_free_dictionary(word))
+
+    async def _fetch_free_dictionary(self, word: str) -> Optional[list]:
+        breaker = self.breakers[FREE_DICT_SOURCE]
+        if not breaker.allow():
+            self._stats["skipped"] += 1
+            return None
+
+        url = self.free_dict_url.format(word=quote(word, safe=""))
+        host = urlsplit(url).netloc
+        limit = self._host_limits.setdefault(host, asyncio.Semaphore(self.per_host_limit))
+        async with limit:
+            self._stats["requests"] += 1
+            try:
+                resp = await self._get_client().get(url)
+            except httpx.HTTPError as e:
+                logger.error(f"Dictionary API error: {e!r}")
+                self._record_failure(breaker)
+                return None
+
+        # 404 表示未收录，属于正常结果，不计入失败
+        if resp.status_code == 404:
+            breaker.record_success()
+            return None
+        if resp.status_code != 200:
+            logger.error(f"Dictionary API error: HTTP {resp.status_code}")
+            self._record_failure(breaker)
+            return None
+
+        breaker.record_success()
+        try:
+            data = resp.json()
+        except ValueError as e:
+            logger.error(f"Dictionary API 返回内容无法解析: {e}")
+            return None
+        return data if isinstance(data, list) and data else None
+
+    async def _ai_chat(self, prompt: str, kwargs: Dict[str, Any]) -> Optional[str]:
+        key = (AI_SOURCE, prompt, tuple(sorted((k, repr(v)) for k, v in kwargs.items())))
+        return await self._coalesce(key, lambda: self._call_ai(prompt, kwargs))
+
+    async def _call_ai(self, prompt: str, kwargs: Dict[str, Any]) -> Optional[str]:
+        from .supplier_factory import chat_with_active_supplier
+
+        # 未配置 AI 供应商属于正常情况，不发起调用，也不占用熔断器的试探名额
+        # （首次读取供应商配置会访问磁盘，放到线程中执行，不阻塞事件循环）
+        if not await asyncio.to_thread(_ai_supplier_configured):
+            logger.debug("未配置 AI 供应商，跳过 AI 查询")
+            return None
+
+        breaker = self.breakers[AI_SOURCE]
+        if not breaker.allow():
+            self._stats["skipped"] += 1
+            return None
+
+        if self._ai_limit is None:
+            self._ai_limit = asyncio.Semaphore(self.ai_limit)
+        async with self._ai_limit:
+            self._stats["requests"] += 1
+            try:
+                response = await asyncio.to_thread(
+                    chat_with_active_supplier, prompt, raise_errors=True, **kwargs
+                )
+            except Exception as e:
+                # 只有供应商调用真正出错才计入失败；空回复说明供应商可用
+                logger.warning(f"AI 词典查询失败: {e}")
+                self._record_failure(breaker)
+                return None
+
+        breaker.record_success()
+        return response
+
+    def _record_failure(self, breaker: CircuitBreaker):
+        self._stats["failures"] += 1
+        breaker.record_failure()
+
+
+def _ai_supplier_configured() -> bool:
+    from .supplier_factory import get_supplier_factory
+
+    try:
+        return get_supplier_factory().get_active_supplier_config() is not None
+    except Exception as e:
+        logger.warning(f"读取 AI 供应商配置失败: {e}")
+        return False
+
+
+_remote_client: Optional[RemoteLookupClient] = None
+_client_lock = threading.Lock()
+
+
+def get_remote_client() -> RemoteLookupClient:
+    """进程级远程查词客户端单例"""
+    global _remote_client
+    with _client_lock:
+        if _remote_client is None:
+            _remote_client = RemoteLookupClient()
+        return _remote_client
+
+
+def set_remote_client(client: Optional[RemoteLookupClient]) -> Optional[RemoteLookupClient]:
+    """替换单例（测试中指向本地桩服务器），返回旧实例；旧实例由调用方负责关闭"""
+    global _remote_client
+    with _client_lock:
+        previous, _remote_client = _remote_client, client
+        return previous
+
+
+def close_remote_client():
+    previous = set_remote_client(None)
+    if previous is not None:
+        previous.close()
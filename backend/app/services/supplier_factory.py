@@ -395,6 +395,7 @@ def chat_with_active_supplier(
     system_prompt: Optional[str] = None,
     temperature: float = 0.7,
     max_tokens: int = 2000,
+    raise_errors: bool = False,
 ) -> Optional[str]:
     """
     使用当前活跃的供应商进行对话
@@ -405,6 +406,7 @@ def chat_with_active_supplier(
         system_prompt: 系统提示词
         temperature: 温度参数
         max_tokens: 最大token数
+        raise_errors: 供应商调用出错时抛出异常而不是返回 None（调用方需要区分出错与无结果时使用）
 
     Returns:
         AI回复文本或 None
@@ -488,4 +490,6 @@ def chat_with_active_supplier(
 
     except Exception as e:
         logger.error(f"对话失败: {e}")
+        if raise_errors:
+            raise
         return None
@@ -1,65 +1,197 @@
 import os
-import pdfplumber
-from typing import Optional
+import fitz  # PyMuPDF
+import logging
+import multiprocessing
+import threading
+from concurrent.futures import Future, ProcessPoolExecutor
+from concurrent.futures.process import BrokenProcessPool
+from typing import Dict, List, Optional
 from pathlib import Path
+from .image_output import IMAGE_EXTENSIONS, THUMBNAIL_BUDGET_BYTES, THUMBNAIL_OUTPUT, ImageOutput, encode_pixmap, page_budget
+
+logger = logging.getLogger(__name__)
+
+# 缩略图分辨率（DPI）
+THUMBNAIL_DPI = 100
+# 缩略图生成模式：background（书籍可读后在后台进程池中预生成）或 lazy（仅在首次请求时渲染）
+THUMBNAIL_MODE = os.getenv("THUMBNAIL_MODE", "background").lower()
+# 后台生成的工作进程数，以及每个任务渲染的连续页数
+THUMBNAIL_WORKERS = max(1, min(2, (os.cpu_count() or 1) - 1))
+THUMBNAIL_PAGES_PER_TASK = 32
+
+# PyMuPDF 不支持多线程并发使用，进程内的按需渲染串行执行
+_render_lock = threading.Lock()
+
+_pool: Optional[ProcessPoolExecutor] = None
+_pool_lock = threading.Lock()
+# 各书籍尚未完成的后台任务，删除书籍时取消
+_pending_tasks: Dict[str, List[Future]] = {}
 
 
 class ThumbnailService:
     """Service for generating and managing PDF page thumbnails"""
 
-    def __init__(self, uploads_dir: Path):
+    def __init__(self, uploads_dir: Path, output: Optional[ImageOutput] = None, budget_bytes: Optional[int] = None):
+        """
+        Args:
+            uploads_dir: 上传目录（UPLOADS_DIR）
+            output: 缩略图格式与质量，默认取 THUMBNAIL_FORMAT / THUMBNAIL_QUALITY
+            budget_bytes: 每本书缩略图存储预算，默认取 THUMBNAIL_BUDGET_MB，0 表示不限制
+        """
         self.uploads_dir = uploads_dir  # 直接使用 UPLOADS_DIR
+        self.output = output or THUMBNAIL_OUTPUT
+        self.budget_bytes = THUMBNAIL_BUDGET_BYTES if budget_bytes is None else budget_bytes
 
     def get_thumbnails_dir(self, book_id: str) -> Path:
         """Get thumbnails directory for a specific book"""
         # 使用 uploads_dir 而不是 base_dir
-        thumbnails_dir = self.uploads_dir / "thumbnails" / book_id
+        thumbnails_dir = self._book_dir(book_id)
         thumbnails_dir.mkdir(parents=True, exist_ok=True)
         return thumbnails_dir
 
-    def generate_thumbnails(self, pdf_path: str, book_id: str, resolution: int = 150) -> Optional[bool]:
+    def _book_dir(self, book_id: str) -> Path:
+        return self.uploads_dir / "thumbnails" / book_id
+
+    def generate_thumbnails(
+        self,
+        pdf_path: str,
+        book_id: str,
+        resolution: int = THUMBNAIL_DPI,
+        start: int = 1,
+        end: Optional[int] = None,
+        create_dir: bool = True,
+    ) -> Optional[bool]:
         """
-        Generate thumbnails for all pages of a PDF
+        在当前进程中用 PyMuPDF 渲染 [start, end) 范围内页面的缩略图（默认全部页面），已存在的跳过
 
         Args:
             pdf_path: Path to the PDF file
             book_id: Unique identifier for the book
-            resolution: Image resolution in DPI (default: 150)
+            resolution: Image resolution in DPI
+            create_dir: 缩略图目录不存在时是否创建；后台任务传 False，目录由提交方创建，
+                书籍删除后目录消失即停止生成，不会重新创建出孤立文件
 
         Returns:
             True if successful, None if failed
         """
         try:
-            thumbnails_dir = self.get_thumbnails_dir(book_id)
-
-            with pdfplumber.open(pdf_path) as pdf:
-                total_pages = len(pdf.pages)
-
-                for i, page in enumerate(pdf.pages):
-                    page_num = i + 1
-                    thumbnail_filename = f"page_{page_num}.png"
-                    thumbnail_path = thumbnails_dir / thumbnail_filename
-
-                    # Skip if thumbnail already exists
-                    if thumbnail_path.exists():
+            thumbnails_dir = self.get_thumbnails_dir(book_id) if create_dir else self._book_dir(book_id)
+            doc = fitz.open(pdf_path)
+            try:
+                end = min(end or len(doc) + 1, len(doc) + 1)
+                max_bytes = page_budget(self.budget_bytes, len(doc))
+                rendered = 0
+                for page_num in range(start, end):
+                    # 每页写入前确认书籍未被删除（PDF 与缩略图目录都还在）
+                    if not thumbnails_dir.is_dir() or not Path(pdf_path).exists():
+                        logger.info(f"书籍已删除，停止生成缩略图 book={book_id}")
+                        break
+                    if self.get_thumbnail_file(book_id, page_num) is not None:
                         continue
-
-                    # Generate thumbnail
                     try:
-                        im = page.to_image(resolution=resolution)
-                        im.save(str(thumbnail_path), format="PNG")
-                        print(f"Generated thumbnail for page {page_num}/{total_pages}")
+                        self._render(doc, page_num, thumbnails_dir / self._filename(page_num), resolution, max_bytes)
+                        rendered += 1
                     except Exception as e:
-                        print(f"Failed to generate thumbnail for page {page_num}: {e}")
-                        continue
+                        logger.warning(f"缩略图生成失败 book={book_id} page={page_num}: {e}")
+            finally:
+                doc.close()
 
-            print(f"Thumbnail generation complete for book {book_id}")
+            logger.debug(f"缩略图生成完成 book={book_id} pages={start}-{end - 1}，新生成 {rendered} 张")
             return True
 
         except Exception as e:
-            print(f"Error generating thumbnails for book {book_id}: {e}")
+            logger.error(f"Error generating thumbnails for book {book_id}: {e}")
             return None
 
+    def schedule_thumbnails(self, pdf_path: str, book_id: str, resolution: int = THUMBNAIL_DPI) -> List[Future]:
+        """
+        将整本书的缩略图按页段提交到后台进程池生成，立即返回。
+
+        lazy 模式下不预生成，缩略图在首次请求时由 ensure_thumbnail 渲染。
+        """
+        if THUMBNAIL_MODE == "lazy":
+            return []
+
+        doc = fitz.open(pdf_path)
+        page_count = len(doc)
+        doc.close()
+
+        self.get_thumbnails_dir(book_id)
+        futures = []
+        try:
+            pool = _get_pool()
+            for start in range(1, page_count + 1, THUMBNAIL_PAGES_PER_TASK):
+                future = pool.submit(
+                    _generate_page_range,
+                    str(self.uploads_dir),
+                    self.output,
+                    self.budget_bytes,
+                    pdf_path,
+                    book_id,
+                    resolution,
+                    start,
+                    start + THUMBNAIL_PAGES_PER_TASK,
+                )
+                future.add_done_callback(_log_task_failure)
+                _track_task(book_id, future)
+                futures.append(future)
+        except (BrokenProcessPool, OSError) as e:
+            # 进程池不可用时丢弃，下次重新创建；缺失的缩略图由请求时按需渲染补齐
+            logger.warning(f"缩略图后台生成不可用，改为按需渲染: {e}")
+            shutdown_thumbnail_pool()
+        else:
+            logger.info(f"已提交缩略图后台生成 book={book_id}: {page_count} 页，{len(futures)} 个任务")
+        return futures
+
+    def ensure_thumbnail(
+        self, pdf_path: str, book_id: str, page_number: int, resolution: int = THUMBNAIL_DPI
+    ) -> Optional[Path]:
+        """返回缩略图文件路径；不存在时立即渲染并缓存到缩略图目录"""
+        thumbnail_path = self.get_thumbnail_file(book_id, page_number)
+        if thumbnail_path is not None:
+            return thumbnail_path
+
+        with _render_lock:
+            existing = self.get_thumbnail_file(book_id, page_number)
+            if existing is not None:
+                return existing
+            thumbnail_path = self.uploads_dir / "thumbnails" / book_id / self._filename(page_number)
+            try:
+                doc = fitz.open(pdf_path)
+            except Exception as e:
+                logger.warning(f"无法打开 PDF 渲染缩略图 book={book_id}: {e}")
+                return None
+            try:
+                if not 1 <= page_number <= len(doc):
+                    return None
+                thumbnail_path.parent.mkdir(parents=True, exist_ok=True)
+                self._render(doc, page_number, thumbnail_path, resolution, page_budget(self.budget_bytes, len(doc)))
+                return thumbnail_path
+            except Exception as e:
+                logger.warning(f"缩略图渲染失败 book={book_id} page={page_number}: {e}")
+                return None
+            finally:
+                doc.close()
+
+    def _render(self, doc: fitz.Document, page_number: int, thumbnail_path: Path, resolution: int, max_bytes: Optional[int]):
+        """渲染单页，按输出配置和单页预算编码"""
+        zoom = resolution / 72
+        pix = doc[page_number - 1].get_pixmap(matrix=fitz.Matrix(zoom, zoom))
+        write_atomic(thumbnail_path, encode_pixmap(pix, self.output, max_bytes))
+
+    def _filename(self, page_number: int) -> str:
+        return f"page_{page_number}{self.output.extension}"
+
+    def get_thumbnail_file(self, book_id: str, page_number: int) -> Optional[Path]:
+        """缩略图文件的绝对路径（优先当前格式，兼容旧版 PNG 等其他格式），不存在时返回 None"""
+        thumbnails_dir = self.uploads_dir / "thumbnails" / book_id
+        extensions = (self.output.extension,) + tuple(ext for ext in IMAGE_EXTENSIONS if ext != self.output.extension)
+        for ext in extensions:
+            thumbnail_path = thumbnails_dir / f"page_{page_number}{ext}"
+            if thumbnail_path.exists():
+                return thumbnail_path
+        return None
+
     def get_thumbnail_path(self, book_id: str, page_number: int) -> Optional[str]:
         """
         Get relative path to a thumbnail image
@@ -71,13 +203,10 @@ class ThumbnailService:
         Returns:
             Relative path from uploads directory or None if not found
         """
-        thumbnail_filename = f"page_{page_number}.png"
-        relative_path = f"thumbnails/{book_id}/{thumbnail_filename}"
-
         # Check if file exists
-        full_path = self.uploads_dir / relative_path
-        if full_path.exists():
-            return f"uploads/{relative_path}"
+        full_path = self.get_thumbnail_file(book_id, page_number)
+        if full_path is not None:
+            return f"uploads/thumbnails/{book_id}/{full_path.name}"
 
         return None
 
@@ -88,12 +217,86 @@ class ThumbnailService:
         Args:
             book_id: Unique identifier for the book
         """
+        cancelled = cancel_thumbnail_tasks(book_id)
+        if cancelled:
+            logger.info(f"已取消 {cancelled} 个未开始的缩略图任务 book={book_id}")
         try:
-            thumbnails_dir = self.get_thumbnails_dir(book_id)
+            thumbnails_dir = self._book_dir(book_id)
             if thumbnails_dir.exists():
                 import shutil
 
                 shutil.rmtree(thumbnails_dir)
-                print(f"Deleted thumbnails for book {book_id}")
+                logger.info(f"Deleted thumbnails for book {book_id}")
         except Exception as e:
-            print(f"Error deleting thumbnails for book {book_id}: {e}")
+            logger.error(f"Error deleting thumbnails for book {book_id}: {e}")
+
+
+def write_atomic(path: Path, data: bytes):
+    """先写临时文件再替换，避免并发读取到不完整的图片"""
+    tmp_path = path.with_name(f".{path.name}.{os.getpid()}.{threading.get_ident()}.tmp")
+    tmp_path.write_bytes(data)
+    os.replace(tmp_path, path)
+
+
+def _generate_page_range(
+    uploads_dir: str,
+    output: ImageOutput,
+    budget_bytes: int,
+    pdf_path: str,
+    book_id: str,
+    resolution: int,
+    start: int,
+    end: int,
+):
+    """后台工作进程入口：渲染一个页段的缩略图"""
+    if not Path(pdf_path).exists():
+        # 书籍已被删除
+        return None
+    service = ThumbnailService(Path(uploads_dir), output=output, budget_bytes=budget_bytes)
+    return service.generate_thumbnails(pdf_path, book_id, resolution, start, end, create_dir=False)
+
+
+def _log_task_failure(future: Future):
+    if not future.cancelled() and future.exception() is not None:
+        logger.warning(f"缩略图后台任务失败: {future.exception()}")
+
+
+def _track_task(book_id: str, future: Future):
+    with _pool_lock:
+        _pending_tasks.setdefault(book_id, []).append(future)
+    future.add_done_callback(lambda f: _untrack_task(book_id, f))
+
+
+def _untrack_task(book_id: str, future: Future):
+    with _pool_lock:
+        tasks = _pending_tasks.get(book_id)
+        if tasks and future in tasks:
+            tasks.remove(future)
+            if not tasks:
+                del _pending_tasks[book_id]
+
+
+def cancel_thumbnail_tasks(book_id: str) -> int:
+    """取消某本书尚未开始的后台缩略图任务，返回取消的任务数（运行中的任务会在下一页写入前自行停止）"""
+    with _pool_lock:
+        tasks = list(_pending_tasks.get(book_id, ()))
+    return sum(1 for future in tasks if future.cancel())
+
+
+def _get_pool() -> ProcessPoolExecutor:
+    """后台缩略图进程池（spawn，首次使用时创建）"""
+    global _pool
+    with _pool_lock:
+        if _pool is None:
+            _pool = ProcessPoolExecutor(max_workers=THUMBNAIL_WORKERS, mp_context=multiprocessing.get_context("spawn"))
+        return _pool
+
+
+def shutdown_thumbnail_pool():
+    """关闭后台进程池，未开始的任务直接取消（缺失的缩略图会在请求时按需渲染）"""
+    global _pool
+    with _pool_lock:
+        pool, _pool = _pool, None
+        _pending_tasks.clear()
+    if pool is not None:
+        pool.shutdown(wait=False, cancel_futures=True)
@@ -0,0 +1,220 @@
+"""
+页面单词坐标（words_data）的紧凑列式编码
+
+JSON 形式每个单词都要重复 text/x/y/width/height/block_id 键名，密集的 PDF 页面可达数十 KB，
+每次翻页都要完整解析。打包格式按列存储，写入 pages.words_packed（BLOB）：
+
+    头部  <3sBBxI>  magic b"WDP" | 格式版本 | flags | 单词数
+    x, y, width, height        float32[n]（小端）
+    block_id                   int32[n]（flags 含 FLAG_BLOCK_IDS 时存在，-1 表示该词无 block_id）
+    文本偏移                   uint32[n + 1]，指向其后的 UTF-8 字符串表
+    字符串表                   所有单词文本依次拼接
+
+坐标以 float32 存储（PyMuPDF 输出的坐标本身即 float32 精度）；全部坐标为整数时（TXT/EPUB
+的模拟坐标）置 FLAG_INT_COORDS，解码时还原为 int。
+
+PackedWords 是惰性视图：只解析头部即可得到长度，坐标列和字符串表在首次访问时才解码；
+只需要单词文本时（如预取释义）调用 texts() 不会解码坐标。
+"""
+
+import struct
+import sys
+from array import array
+from collections.abc import Sequence
+from typing import Any, Dict, List, Optional, Tuple, Union
+
+WORDS_MAGIC = b"WDP"
+WORDS_FORMAT_VERSION = 1
+
+FLAG_BLOCK_IDS = 0x01
+FLAG_INT_COORDS = 0x02
+
+_HEADER = struct.Struct("<3sBBxI")
+_COORD_KEYS = ("x", "y", "width", "height")
+_KNOWN_KEYS = frozenset(("text",) + _COORD_KEYS + ("block_id",))
+_NO_BLOCK_ID = -1
+_BIG_ENDIAN = sys.byteorder == "big"
+
+
+def _to_bytes(values: array) -> bytes:
+    if _BIG_ENDIAN:
+        values = array(values.typecode, values)
+        values.byteswap()
+    return values.tobytes()
+
+
+def _from_bytes(typecode: str, data) -> array:
+    values = array(typecode)
+    values.frombytes(data)
+    if _BIG_ENDIAN:
+        values.byteswap()
+    return values
+
+
+def pack_words(words: List[Dict[str, Any]]) -> bytes:
+    """
+    将单词列表编码为打包格式。
+
+    Raises:
+        ValueError: 单词包含打包格式无法表示的字段或取值
+    """
+    count = len(words)
+    columns = {key: array("f") for key in _COORD_KEYS}
+    block_ids = array("i")
+    has_block_ids = False
+    int_coords = True
+    encoded_texts = []
+
+    for word in words:
+        if not isinstance(word, dict) or not _KNOWN_KEYS.issuperset(word):
+            raise ValueError(f"无法打包的单词数据: {word!r}")
+        text = word.get("text")
+        if not isinstance(text, str):
+            raise ValueError(f"单词缺少文本: {word!r}")
+        for key in _COORD_KEYS:
+            value = word.get(key)
+            if type(value) is not int:
+                if not isinstance(value, float):
+                    raise ValueError(f"单词坐标无效: {word!r}")
+                int_coords = False
+            columns[key].append(value)
+        block_id = word.get("block_id")
+        if block_id is None:
+            block_ids.append(_NO_BLOCK_ID)
+        elif type(block_id) is int and block_id >= 0:
+            block_ids.append(block_id)
+            has_block_ids = True
+        else:
+            raise ValueError(f"单词 block_id 无效: {word!r}")
+        encoded_texts.append(text.encode("utf-8"))
+
+    offsets = array("I", [0])
+    total = 0
+    for encoded in encoded_texts:
+        total += len(encoded)
+        offsets.append(total)
+
+    flags = (FLAG_BLOCK_IDS if has_block_ids else 0) | (FLAG_INT_COORDS if int_coords and count else 0)
+    parts = [_HEADER.pack(WORDS_MAGIC, WORDS_FORMAT_VERSION, flags, count)]
+    parts.extend(_to_bytes(columns[key]) for key in _COORD_KEYS)
+    if has_block_ids:
+        parts.append(_to_bytes(block_ids))
+    parts.append(_to_bytes(offsets))
+    parts.extend(encoded_texts)
+    return b"".join(parts)
+
+
+class PackedWords(Sequence):
+    """打包单词数据的惰性只读视图，元素为与 JSON 形式相同的单词字典"""
+
+    def __init__(self, blob: bytes):
+        if len(blob) < _HEADER.size:
+            raise ValueError("words 数据不完整")
+        magic, version, flags, count = _HEADER.unpack_from(blob)
+        if magic != WORDS_MAGIC:
+            raise ValueError("不是打包的 words 数据")
+        if version != WORDS_FORMAT_VERSION:
+            raise ValueError(f"不支持的 words 格式版本: {version}")
+
+        self._blob = memoryview(blob)
+        self._flags = flags
+        self._count = count
+        self._columns: Optional[List[list]] = None
+        self._block_ids: Optional[list] = None
+        self._texts: Optional[List[str]] = None
+
+        column_bytes = 4 * count
+        self._offsets_start = _HEADER.size + column_bytes * (len(_COORD_KEYS) + (1 if flags & FLAG_BLOCK_IDS else 0))
+        self._strings_start = self._offsets_start + 4 * (count + 1)
+        if len(blob) < self._strings_start:
+            raise ValueError("words 数据不完整")
+
+    def __len__(self) -> int:
+        return self._count
+
+    def __getitem__(self, index):
+        if isinstance(index, slice):
+            return [self[i] for i in range(*index.indices(self._count))]
+        if index < 0:
+            index += self._count
+        if not 0 <= index < self._count:
+            raise IndexError("words index out of range")
+        xs, ys, widths, heights = self._decode_columns()
+        block_ids = self._block_ids
+        return self._word(
+            self.texts()[index],
+            xs[index],
+            ys[index],
+            widths[index],
+            heights[index],
+            block_ids[index] if block_ids is not None else _NO_BLOCK_ID,
+        )
+
+    def texts(self) -> List[str]:
+        """只解码单词文本（不解码坐标）"""
+        if self._texts is None:
+            offsets = _from_bytes("I", self._blob[self._offsets_start:self._strings_start])
+            strings = bytes(self._blob[self._strings_start:])
+            self._texts = [strings[offsets[i]:offsets[i + 1]].decode("utf-8") for i in range(self._count)]
+        return self._texts
+
+    def to_list(self) -> List[Dict[str, Any]]:
+        """一次性解码为 JSON 形式的单词列表"""
+        columns = self._decode_columns()
+        block_ids = self._block_ids or [_NO_BLOCK_ID] * self._count
+        word = self._word
+        return [word(*values) for values in zip(self.texts(), *columns, block_ids)]
+
+    def _decode_columns(self) -> List[list]:
+        if self._columns is None:
+            step = 4 * self._count
+            start = _HEADER.size
+            columns = []
+            for _ in _COORD_KEYS:
+                values = _from_bytes("f", self._blob[start:start + step]).tolist()
+                columns.append([int(v) for v in values] if self._flags & FLAG_INT_COORDS else values)
+                start += step
+            if self._flags & FLAG_BLOCK_IDS:
+                self._block_ids = _from_bytes("i", self._blob[start:start + step]).tolist()
+            self._columns = columns
+        return self._columns
+
+    @staticmethod
+    def _word(text: str, x, y, width, height, block_id: int) -> Dict[str, Any]:
+        word = {"text": text, "x": x, "y": y, "width": width, "height": height}
+        if block_id != _NO_BLOCK_ID:
+            word["block_id"] = block_id
+        return word
+
+
+def unpack_words(blob: bytes) -> List[Dict[str, Any]]:
+    """将打包格式完整解码为单词列表"""
+    return PackedWords(blob).to_list()
+
+
+def encode_words_for_storage(words: Optional[List[Dict[str, Any]]]) -> Tuple[Optional[list], Optional[bytes]]:
+    """
+    返回写入 pages 表的 (words_data, words_packed)。
+
+    能打包时只写 words_packed；包含无法表示的字段时保留 JSON 形式。
+    """
+    if words is None:
+        return None, None
+    try:
+        return None, pack_words(words)
+    except (ValueError, OverflowError):
+        return words, None
+
+
+def load_words(words_data: Optional[list], words_packed: Optional[bytes]) -> Union[List[Dict[str, Any]], PackedWords]:
+    """读取页面单词：优先打包列（惰性视图），否则返回 JSON 列"""
+    if words_packed is not None:
+        return PackedWords(words_packed)
+    return words_data or []
+
+
+def load_word_texts(words_data: Optional[list], words_packed: Optional[bytes]) -> List[str]:
+    """只读取页面单词文本"""
+    if words_packed is not None:
+        return PackedWords(words_packed).texts()
+    return [w.get("text", "") for w in (words_data or []) if isinstance(w, dict)]
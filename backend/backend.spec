@@ -30,6 +30,10 @@ datas += [('app', 'app')]
 import os
 datas += [(os.path.abspath('static/ecdict.db'), '.')]  # 使用绝对路径，放到打包根目录
 datas += [(os.path.abspath('static/jmdict.db'), '.')]  # 使用绝对路径，放到打包根目录
+# 词形还原表由 scripts/build_lemma_table.py 生成（npm run build:backend 会先生成），必须随程序分发
+if not os.path.exists('static/ecdict_lemmas.db'):
+    raise SystemExit('缺少 static/ecdict_lemmas.db，请先运行 python scripts/build_lemma_table.py')
+datas += [(os.path.abspath('static/ecdict_lemmas.db'), '.')]
 tmp_ret = collect_all('uvicorn')
 datas += tmp_ret[0]; binaries += tmp_ret[1]; hiddenimports += tmp_ret[2]
 tmp_ret = collect_all('sqlalchemy')
@@ -0,0 +1,100 @@
+#!/usr/bin/env python3
+"""
+DictManager 索引库连接数基准
+
+构建一个包含多个合成词典的临时 mdx_index.db，对 lookup_word / check_sources
+执行一批查询，统计每次查询触发的 sqlite3.connect 次数和平均耗时。
+
+用法：
+    cd backend
+    python benchmarks/bench_dict_connections.py --dicts 8 --entries 20000 --lookups 500
+"""
+
+import sys
+import os
+import argparse
+import sqlite3
+import tempfile
+import time
+from pathlib import Path
+
+# 确保能找到 app 包
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+from app.services import dict_manager as dict_manager_module
+from app.services.dict_manager import DictManager
+
+
+def build_fixture(dicts_dir: Path, dict_count: int, entry_count: int) -> DictManager:
+    """在 dicts_dir 下生成合成词典索引和配置"""
+    manager = DictManager(dicts_dir=dicts_dir)
+    conn = sqlite3.connect(manager.index_db)
+    config = manager.config
+    for i in range(dict_count):
+        name = f"BenchDict{i}"
+        cursor = conn.execute(
+            "INSERT INTO dicts (name, filename, size, word_count) VALUES (?, ?, ?, ?)",
+            (name, f"{name}.mdx", 0, entry_count),
+        )
+        dict_id = cursor.lastrowid
+        conn.executemany(
+            "INSERT INTO entries (dict_id, word, word_lower, content) VALUES (?, ?, ?, ?)",
+            ((dict_id, f"word{j}", f"word{j}", f"<span class=\"pos\">n.</span> 释义 {j}") for j in range(entry_count)),
+        )
+        config["dicts"][name] = {"name": name, "filename": f"{name}.mdx", "size": 0, "word_count": entry_count, "is_active": True}
+        config["priority"].insert(0, name)
+    conn.commit()
+    conn.close()
+    manager._save_config(config)
+    return manager
+
+
+def run(manager: DictManager, lookups: int, entry_count: int) -> dict:
+    connect_calls = 0
+    original_connect = dict_manager_module.sqlite3.connect
+
+    def counting_connect(*args, **kwargs):
+        nonlocal connect_calls
+        connect_calls += 1
+        return original_connect(*args, **kwargs)
+
+    dict_names = [name for name in manager.config["priority"] if name != "ECDICT"]
+    dict_manager_module.sqlite3.connect = counting_connect
+    try:
+        started = time.perf_counter()
+        for i in range(lookups):
+            word = f"word{(i * 7919) % entry_count}"
+            # 模拟一次点词：先查可用来源，再逐个词典取释义
+            manager.check_sources(word)
+            for name in dict_names:
+                manager.lookup_word(word, source=name)
+        elapsed = time.perf_counter() - started
+    finally:
+        dict_manager_module.sqlite3.connect = original_connect
+
+    return {
+        "lookups": lookups,
+        "connects": connect_calls,
+        "connects_per_lookup": connect_calls / lookups,
+        "avg_ms_per_lookup": elapsed * 1000 / lookups,
+    }
+
+
+def main():
+    parser = argparse.ArgumentParser(description="统计 DictManager 每次查询的连接数")
+    parser.add_argument("--dicts", type=int, default=8, help="合成词典数量")
+    parser.add_argument("--entries", type=int, default=20000, help="每个词典的词条数")
+    parser.add_argument("--lookups", type=int, default=500, help="查询次数")
+    args = parser.parse_args()
+
+    with tempfile.TemporaryDirectory() as tmp_dir:
+        manager = build_fixture(Path(tmp_dir) / "dicts", args.dicts, args.entries)
+        result = run(manager, args.lookups, args.entries)
+
+    print(f"词典数: {args.dicts}, 每词典词条: {args.entries}")
+    for key, value in result.items():
+        print(f"{key}: {value:.3f}" if isinstance(value, float) else f"{key}: {value}")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,172 @@
+#!/usr/bin/env python3
+"""
+ECDICT 查词微基准
+
+用 1 万词左右的页面语料对比三种查询方式：
+  legacy  旧实现：每次先执行 PRAGMA table_info，再为原词和每个原型候选各查询 1~2 次
+  single  当前的 get_word_details：原词与全部候选合并为一次 IN 查询
+  batch   get_words_details：整批单词两次集合查询
+
+另外统计 dict_service 原型校验（_get_lookup_terms）在冷缓存下的耗时，
+以及 ECDICT 词头内存索引的加载耗时、内存占用和使用索引后的原型校验耗时。
+
+用法：
+    cd backend
+    python benchmarks/bench_ecdict_lookup.py
+
+可选参数：
+    --db <path>        ECDICT 数据库路径（默认使用配置中的 ECDICT_DB_PATH）
+    --corpus <file>    从文本文件分词作为语料（默认从词库抽样并生成屈折变化）
+    --words <n>        语料词数（默认 10000）
+    --seed <n>         抽样随机种子
+"""
+
+import sys
+import os
+import argparse
+import random
+import re
+import sqlite3
+import statistics
+import time
+from pathlib import Path
+
+# 确保能找到 app 包
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+from app.services import ecdict_service
+
+WORD_PATTERN = re.compile(r"[A-Za-z][A-Za-z'-]*")
+INFLECTIONS = ("", "", "s", "ed", "ing", "es", "er")
+
+
+def build_corpus(db_path: str, size: int, seed: int, corpus_file: str = None) -> list:
+    """构造语料：优先使用文本文件，否则从词库抽样并随机加词尾"""
+    if corpus_file:
+        words = WORD_PATTERN.findall(Path(corpus_file).read_text(encoding="utf-8", errors="ignore"))
+        return (words * (size // max(len(words), 1) + 1))[:size]
+
+    rng = random.Random(seed)
+    conn = sqlite3.connect(db_path)
+    headwords = [
+        row[0]
+        for row in conn.execute(
+            "SELECT word FROM stardict WHERE word NOT LIKE '% %' AND length(word) > 2 ORDER BY random() LIMIT ?",
+            (size,),
+        )
+    ]
+    conn.close()
+    if not headwords:
+        raise SystemExit("词库为空，无法抽样语料")
+
+    corpus = []
+    for _ in range(size):
+        word = rng.choice(headwords)
+        suffix = rng.choice(INFLECTIONS)
+        corpus.append(word.capitalize() + suffix if rng.random() < 0.1 else word + suffix)
+    return corpus
+
+
+def legacy_lookup(conn: sqlite3.Connection, word: str):
+    """旧版 get_word_details 的查询模式，作为对照"""
+    cursor = conn.cursor()
+    cursor.execute("PRAGMA table_info(stardict)")
+    columns = [row[1] for row in cursor.fetchall()]
+
+    def _query(w):
+        cursor.execute("SELECT * FROM stardict WHERE word = ?", (w,))
+        res = cursor.fetchone()
+        if not res and w != w.lower():
+            cursor.execute("SELECT * FROM stardict WHERE word = ?", (w.lower(),))
+            res = cursor.fetchone()
+        return dict(zip(columns, res)) if res else None
+
+    result = _query(word)
+    if result:
+        return result
+    for cand in ecdict_service._inflection_candidates(word):
+        result = _query(cand)
+        if result:
+            return result
+    return None
+
+
+def time_per_word(func, words: list) -> dict:
+    samples = []
+    started = time.perf_counter()
+    for word in words:
+        t0 = time.perf_counter()
+        func(word)
+        samples.append((time.perf_counter() - t0) * 1e6)
+    total = time.perf_counter() - started
+    samples.sort()
+    return {
+        "total_s": total,
+        "p50_us": statistics.median(samples),
+        "p95_us": samples[int(len(samples) * 0.95) - 1],
+    }
+
+
+def report(name: str, words: int, stats: dict):
+    line = f"{name:<14} 总耗时 {stats['total_s'] * 1000:9.1f} ms   平均 {stats['total_s'] / words * 1e6:8.1f} µs/词"
+    if "p50_us" in stats:
+        line += f"   p50 {stats['p50_us']:7.1f} µs   p95 {stats['p95_us']:7.1f} µs"
+    print(line)
+
+
+def main():
+    parser = argparse.ArgumentParser(description="ECDICT 查词微基准")
+    parser.add_argument("--db", help="ECDICT 数据库路径")
+    parser.add_argument("--corpus", help="语料文本文件")
+    parser.add_argument("--words", type=int, default=10000, help="语料词数")
+    parser.add_argument("--seed", type=int, default=42, help="抽样随机种子")
+    args = parser.parse_args()
+
+    db_path = args.db or ecdict_service.get_db_path()
+    if not Path(db_path).exists():
+        raise SystemExit(f"未找到 ECDICT 数据库: {db_path}")
+    ecdict_service.get_db_path = lambda: db_path
+
+    corpus = build_corpus(db_path, args.words, args.seed, args.corpus)
+    unique = list(dict.fromkeys(corpus))
+    print(f"语料: {len(corpus)} 词, 去重后 {len(unique)} 词, 数据库: {db_path}\n")
+
+    legacy_conn = sqlite3.connect(db_path, check_same_thread=False)
+    report("legacy", len(corpus), time_per_word(lambda w: legacy_lookup(legacy_conn, w), corpus))
+    legacy_conn.close()
+
+    report("single", len(corpus), time_per_word(ecdict_service.get_word_details, corpus))
+
+    started = time.perf_counter()
+    ecdict_service.get_words_details(corpus)
+    report("batch", len(corpus), {"total_s": time.perf_counter() - started})
+
+    # 原型校验：冷缓存下逐词生成查询词
+    from app.services import dict_service
+
+    dict_service._get_ecdict_entry_info_from_db.cache_clear()
+    report(
+        "lemma terms",
+        len(unique),
+        time_per_word(lambda w: dict_service._get_lookup_terms(w, prefer_lemma=True), unique),
+    )
+
+    # 词头内存索引
+    from app.services import ecdict_headwords
+
+    index = ecdict_headwords.load_headword_index(db_path)
+    stats = ecdict_headwords.get_load_stats()
+    print(
+        f"\n词头索引: {stats['headwords']} 个词头, 加载 {stats['load_seconds'] * 1000:.0f} ms, "
+        f"内存 {stats['memory_bytes'] / 1024 / 1024:.1f} MB"
+    )
+    report("index probe", len(corpus), time_per_word(index.lookup, corpus))
+    report(
+        "lemma (index)",
+        len(unique),
+        time_per_word(lambda w: dict_service._get_lookup_terms(w, prefer_lemma=True), unique),
+    )
+
+
+if __name__ == "__main__":
+    main()
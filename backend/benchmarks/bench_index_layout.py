@@ -0,0 +1,143 @@
+#!/usr/bin/env python3
+"""
+mdx_index.db 索引结构基准
+
+按旧结构（entries(word_lower) + entries(dict_id) 两个单列索引）生成一个大体量
+合成索引库，测量热查询延迟；然后交给 DictManager 启动迁移为
+(dict_id, word_lower) 复合索引，再次测量并对比。
+
+用法：
+    cd backend
+    python benchmarks/bench_index_layout.py --dicts 10 --entries 300000 --lookups 2000
+"""
+
+import sys
+import os
+import argparse
+import random
+import sqlite3
+import statistics
+import tempfile
+import time
+from pathlib import Path
+
+# 确保能找到 app 包
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+from app.services.dict_manager import DictManager
+
+CONTENT = "<div class=\"entry\"><span class=\"pos\">n.</span> " + "释义 " * 60 + "</div>"
+
+
+def build_legacy_index(index_db: Path, dict_count: int, entry_count: int):
+    """生成旧版结构的索引库（user_version = 0）"""
+    conn = sqlite3.connect(index_db)
+    conn.execute("PRAGMA synchronous = OFF")
+    conn.execute("PRAGMA journal_mode = MEMORY")
+    conn.execute("""
+        CREATE TABLE dicts (
+            id INTEGER PRIMARY KEY AUTOINCREMENT,
+            name TEXT NOT NULL UNIQUE,
+            filename TEXT NOT NULL,
+            size INTEGER,
+            word_count INTEGER,
+            created_at TIMESTAMP DEFAULT CURRENT_TIMESTAMP,
+            is_active BOOLEAN DEFAULT 1
+        )
+    """)
+    conn.execute("""
+        CREATE TABLE entries (
+            id INTEGER PRIMARY KEY AUTOINCREMENT,
+            dict_id INTEGER NOT NULL,
+            word TEXT NOT NULL,
+            word_lower TEXT NOT NULL,
+            offset INTEGER DEFAULT 0,
+            length INTEGER DEFAULT 0,
+            content TEXT,
+            FOREIGN KEY (dict_id) REFERENCES dicts(id)
+        )
+    """)
+    for i in range(dict_count):
+        name = f"BenchDict{i}"
+        dict_id = conn.execute(
+            "INSERT INTO dicts (name, filename, size, word_count) VALUES (?, ?, 0, ?)",
+            (name, f"{name}.mdx", entry_count),
+        ).lastrowid
+        conn.executemany(
+            "INSERT INTO entries (dict_id, word, word_lower, content) VALUES (?, ?, ?, ?)",
+            ((dict_id, f"word{j}", f"word{j}", CONTENT) for j in range(entry_count)),
+        )
+    conn.execute("CREATE INDEX idx_entries_word ON entries(word_lower)")
+    conn.execute("CREATE INDEX idx_entries_dict ON entries(dict_id)")
+    conn.commit()
+    conn.close()
+
+
+def measure(index_db: Path, dict_count: int, entry_count: int, lookups: int) -> dict:
+    """测量单词典点查与跨词典存在性检查的延迟（毫秒）"""
+    conn = sqlite3.connect(index_db)
+    rng = random.Random(42)
+    point_ms = []
+    exists_ms = []
+    dict_ids = list(range(1, dict_count + 1))
+    placeholders = ",".join("?" * dict_count)
+    for _ in range(lookups):
+        word = f"word{rng.randrange(entry_count)}"
+        dict_id = rng.choice(dict_ids)
+
+        started = time.perf_counter()
+        conn.execute(
+            "SELECT word, content FROM entries WHERE dict_id = ? AND word_lower = ? LIMIT 1", (dict_id, word)
+        ).fetchone()
+        point_ms.append((time.perf_counter() - started) * 1000)
+
+        started = time.perf_counter()
+        conn.execute(
+            f"SELECT dict_id, COUNT(*) FROM entries WHERE word_lower = ? AND dict_id IN ({placeholders}) GROUP BY dict_id",
+            (word, *dict_ids),
+        ).fetchall()
+        exists_ms.append((time.perf_counter() - started) * 1000)
+    conn.close()
+
+    def summary(samples):
+        samples = sorted(samples)
+        return {
+            "p50": statistics.median(samples),
+            "p95": samples[int(len(samples) * 0.95) - 1],
+            "mean": statistics.fmean(samples),
+        }
+
+    return {"point_lookup": summary(point_ms), "check_sources": summary(exists_ms)}
+
+
+def print_result(label: str, result: dict):
+    print(f"[{label}]")
+    for query, stats in result.items():
+        print(f"  {query:<14} p50={stats['p50']:.4f}ms p95={stats['p95']:.4f}ms mean={stats['mean']:.4f}ms")
+
+
+def main():
+    parser = argparse.ArgumentParser(description="对比 mdx_index.db 单列索引与复合索引的查询延迟")
+    parser.add_argument("--dicts", type=int, default=10, help="合成词典数量")
+    parser.add_argument("--entries", type=int, default=300000, help="每个词典的词条数")
+    parser.add_argument("--lookups", type=int, default=2000, help="查询次数")
+    args = parser.parse_args()
+
+    with tempfile.TemporaryDirectory() as tmp_dir:
+        dicts_dir = Path(tmp_dir) / "dicts"
+        dicts_dir.mkdir()
+        index_db = dicts_dir / "mdx_index.db"
+
+        started = time.perf_counter()
+        build_legacy_index(index_db, args.dicts, args.entries)
+        print(f"生成 {args.dicts * args.entries} 条词条，耗时 {time.perf_counter() - started:.1f}s")
+        print_result("单列索引", measure(index_db, args.dicts, args.entries, args.lookups))
+
+        started = time.perf_counter()
+        DictManager(dicts_dir=dicts_dir)
+        print(f"启动迁移耗时 {time.perf_counter() - started:.1f}s")
+        print_result("复合索引", measure(index_db, args.dicts, args.entries, args.lookups))
+
+
+if __name__ == "__main__":
+    main()
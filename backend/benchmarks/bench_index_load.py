@@ -0,0 +1,94 @@
+#!/usr/bin/env python3
+"""
+导入暂存表写入正式表的基准
+
+_create_index 解析完成后把 entries_staging 中的词条一次性写入 entries（所有词典共享，
+带 (dict_id, word_lower) 词头索引）。对比三种写法的耗时：
+    - 索引在线、按暂存顺序写入
+    - 索引在线、按 (word_lower, rowid) 顺序写入（当前实现）
+    - 先删除词头索引，写入后重建
+
+已有词典的词条越多，重建索引的代价越高（要为全部词典重新建索引）。
+
+用法：
+    cd backend
+    python benchmarks/bench_index_load.py --existing 900000 --new 300000
+"""
+
+import argparse
+import random
+import sqlite3
+import string
+import tempfile
+import time
+from pathlib import Path
+
+STRATEGIES = ("索引在线", "索引在线+按词头排序", "删除后重建索引")
+
+
+def random_words(count: int, seed: int):
+    rng = random.Random(seed)
+    return ["".join(rng.choices(string.ascii_lowercase, k=rng.randint(3, 12))) for _ in range(count)]
+
+
+def prepare(path: Path, existing: int, new: int) -> sqlite3.Connection:
+    conn = sqlite3.connect(path)
+    conn.execute("PRAGMA journal_mode = WAL")
+    conn.execute(
+        "CREATE TABLE entries (id INTEGER PRIMARY KEY, dict_id INTEGER, word TEXT, word_lower TEXT, "
+        "offset INTEGER, length INTEGER, content BLOB)"
+    )
+    conn.execute(
+        "CREATE TABLE entries_staging (dict_id INTEGER, phase TEXT, word TEXT, word_lower TEXT, "
+        "offset INTEGER, length INTEGER, content BLOB)"
+    )
+    content = b"x" * 200
+    # 已有词典分为三个，模拟用户已导入多部词典
+    for dict_id in (1, 2, 3):
+        conn.executemany(
+            "INSERT INTO entries (dict_id, word, word_lower, offset, length, content) VALUES (?, ?, ?, 0, 0, ?)",
+            ((dict_id, w, w, content) for w in random_words(existing // 3, dict_id)),
+        )
+    conn.execute("CREATE INDEX idx_entries_dict_word ON entries(dict_id, word_lower)")
+    conn.executemany(
+        "INSERT INTO entries_staging VALUES (9, 'mdx', ?, ?, 0, 0, ?)",
+        ((w, w, content) for w in random_words(new, 99)),
+    )
+    conn.commit()
+    return conn
+
+
+def load(conn: sqlite3.Connection, strategy: str) -> float:
+    started = time.perf_counter()
+    if strategy == "删除后重建索引":
+        conn.execute("DROP INDEX idx_entries_dict_word")
+    order = " ORDER BY word_lower, rowid" if strategy == "索引在线+按词头排序" else ""
+    conn.execute(
+        "INSERT INTO entries (dict_id, word, word_lower, offset, length, content) "
+        "SELECT dict_id, word, word_lower, offset, length, content FROM entries_staging "
+        "WHERE dict_id = 9 AND phase = 'mdx'" + order
+    )
+    if strategy == "删除后重建索引":
+        conn.execute("CREATE INDEX idx_entries_dict_word ON entries(dict_id, word_lower)")
+    conn.commit()
+    return time.perf_counter() - started
+
+
+def main():
+    parser = argparse.ArgumentParser(description="对比暂存表写入正式表时的索引处理方式")
+    parser.add_argument("--existing", type=int, default=900000, help="已有词典的词条总数")
+    parser.add_argument("--new", type=int, default=300000, help="新导入词典的词条数")
+    args = parser.parse_args()
+
+    with tempfile.TemporaryDirectory() as tmp_dir:
+        for index, strategy in enumerate(STRATEGIES):
+            conn = prepare(Path(tmp_dir) / f"index_{index}.db", args.existing, args.new)
+            try:
+                elapsed = load(conn, strategy)
+            finally:
+                conn.close()
+            print(f"[{strategy}] 已有 {args.existing} 条，写入 {args.new} 条，耗时 {elapsed:.2f}s")
+
+
+if __name__ == "__main__":
+    main()
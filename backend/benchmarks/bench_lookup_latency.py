@@ -0,0 +1,328 @@
+#!/usr/bin/env python3
+"""
+查词延迟基准
+
+先按给定规模生成合成 ECDICT、JMdict、MDX 索引库和 MDD 资源（见 lookup_fixtures.py），
+再分别在单线程和多线程并发下测量以下操作的 p50 / p95 / p99 延迟与吞吐量：
+
+  lookup_word              dict_service.lookup_word，指定第一个导入词典（含进程内查词缓存）
+  lookup_word_all_sources  dict_service.lookup_word_all_sources（多词典聚合，不经过缓存）
+  get_word_sources         dict_service.get_word_sources（各词典是否收录）
+  get_resource             DictManager.get_resource（MDD 资源读取，含资源字节缓存）
+
+查询词按 Zipf 分布从词头、屈折形式、日语词条和未收录词中抽样，模拟阅读时的点词分布。
+远程兜底（AI / Free Dictionary API）替换为立即返回未找到的离线客户端，不产生网络请求。
+
+结果以 JSON 输出，可用 --compare 与之前提交的结果逐项对比。
+
+用法：
+    cd backend
+    python benchmarks/bench_lookup_latency.py --output bench-results.json
+    python benchmarks/bench_lookup_latency.py --compare bench-results.json
+
+可选参数：
+    --ecdict-words <n>     合成 ECDICT 词头数（默认 50000）
+    --jmdict-entries <n>   合成 JMdict 词条数（默认 20000）
+    --dicts <n>            导入词典数量（默认 3）
+    --resources <n>        MDD 资源数量（默认 500）
+    --ops <n>              每个场景每种模式的操作数（默认 2000）
+    --threads <n>          并发模式的线程数（默认 8）
+    --miss-rate <f>        未收录词的比例（默认 0.1）
+    --japanese-rate <f>    日语查询的比例（默认 0.1）
+    --scenario <name>      只运行指定场景（可重复）
+    --headword-index       测量前加载 ECDICT 词头内存索引与词形还原表（与正式启动一致）
+    --output <file>        结果 JSON 输出路径
+    --compare <file>       与之前保存的结果 JSON 对比
+"""
+
+import sys
+import os
+import argparse
+import json
+import logging
+import platform
+import random
+import statistics
+import subprocess
+import tempfile
+import time
+from concurrent.futures import ThreadPoolExecutor
+from datetime import datetime, timezone
+from pathlib import Path
+from typing import Callable, Dict, List, Optional
+
+# 确保能找到 app 包
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+from lookup_fixtures import RESOURCE_DICT, LookupFixture, build_fixture, install_fixture, synthetic_words
+
+from app.services import dict_service
+from app.services.lookup_cache import get_lookup_cache
+from app.services.remote_lookup import RemoteLookupClient, set_remote_client
+
+RESULT_FORMAT_VERSION = 1
+SCENARIOS = ("lookup_word", "lookup_word_all_sources", "get_word_sources", "get_resource")
+COMPARED_METRICS = ("p50_ms", "p95_ms", "p99_ms", "throughput_ops")
+
+
+class OfflineRemoteClient(RemoteLookupClient):
+    """远程兜底立即返回未找到，基准只测量本地查询链"""
+
+    async def free_dictionary(self, word: str):
+        return None
+
+    async def ai_chat(self, prompt: str, **kwargs):
+        return None
+
+
+def zipf_sample(rng: random.Random, pool: List[str], count: int, exponent: float = 1.1) -> List[str]:
+    """按 Zipf 分布从 pool 抽样（排名靠前的词更常被查询）"""
+    weights = [1.0 / (rank**exponent) for rank in range(1, len(pool) + 1)]
+    return rng.choices(pool, weights=weights, k=count)
+
+
+def build_workload(fixture: LookupFixture, ops: int, miss_rate: float, japanese_rate: float, seed: int) -> List[str]:
+    rng = random.Random(seed)
+    misses = [word + "qx" for word in synthetic_words(random.Random(seed + 1), 2000)]
+    english = fixture.headwords + fixture.inflections
+    rng.shuffle(english)
+
+    workload = []
+    for word in zipf_sample(rng, english, ops):
+        roll = rng.random()
+        if roll < miss_rate:
+            word = rng.choice(misses)
+        elif roll < miss_rate + japanese_rate and fixture.japanese_words:
+            word = rng.choice(fixture.japanese_words)
+        elif rng.random() < 0.1:
+            word = word.capitalize()
+        workload.append(word)
+    return workload
+
+
+def summarize(samples_ms: List[float], wall_seconds: float, errors: int) -> Dict:
+    samples = sorted(samples_ms)
+    count = len(samples)
+
+    def percentile(p: float) -> float:
+        return samples[min(count - 1, max(0, int(round(p / 100 * count)) - 1))]
+
+    return {
+        "ops": count,
+        "errors": errors,
+        "p50_ms": round(percentile(50), 4),
+        "p95_ms": round(percentile(95), 4),
+        "p99_ms": round(percentile(99), 4),
+        "mean_ms": round(statistics.fmean(samples), 4),
+        "max_ms": round(samples[-1], 4),
+        "wall_seconds": round(wall_seconds, 4),
+        "throughput_ops": round(count / wall_seconds, 1) if wall_seconds else 0.0,
+    }
+
+
+def measure(operation: Callable[[str], object], inputs: List[str], threads: int) -> Dict:
+    """逐个计时；threads > 1 时用线程池并发执行，吞吐量按总墙钟时间计算"""
+    errors = 0
+
+    def timed(value: str) -> float:
+        nonlocal errors
+        started = time.perf_counter()
+        try:
+            operation(value)
+        except Exception:
+            errors += 1
+        return (time.perf_counter() - started) * 1000
+
+    started = time.perf_counter()
+    if threads <= 1:
+        samples = [timed(value) for value in inputs]
+    else:
+        with ThreadPoolExecutor(max_workers=threads) as pool:
+            samples = list(pool.map(timed, inputs))
+    return summarize(samples, time.perf_counter() - started, errors)
+
+
+def scenario_operations(fixture: LookupFixture) -> Dict[str, Callable[[str], object]]:
+    source = fixture.dict_names[0] if fixture.dict_names else ""
+    manager = fixture.manager
+    return {
+        "lookup_word": lambda word: dict_service.lookup_word(None, word, source),
+        "lookup_word_all_sources": lambda word: dict_service.lookup_word_all_sources(None, word),
+        "get_word_sources": dict_service.get_word_sources,
+        "get_resource": lambda path: manager.get_resource(RESOURCE_DICT, path),
+    }
+
+
+def reset_caches(fixture: LookupFixture):
+    """每轮测量前清空查词缓存与资源字节缓存，结果不依赖上一轮的预热"""
+    get_lookup_cache().invalidate("基准测量")
+    manager = fixture.manager
+    with manager._resource_lock:
+        manager._resource_cache.clear()
+        manager._resource_cache_size = 0
+
+
+def run_benchmarks(fixture: LookupFixture, args) -> Dict:
+    operations = scenario_operations(fixture)
+    workload = build_workload(fixture, args.ops, args.miss_rate, args.japanese_rate, args.seed)
+    resource_rng = random.Random(args.seed + 2)
+    resource_workload = zipf_sample(resource_rng, fixture.resources, args.ops) if fixture.resources else []
+    warmup = workload[: args.warmup]
+
+    results = {}
+    for name in args.scenario or SCENARIOS:
+        inputs = resource_workload if name == "get_resource" else workload
+        if not inputs:
+            continue
+        operation = operations[name]
+        for mode, threads in (("single", 1), ("concurrent", args.threads)):
+            reset_caches(fixture)
+            # 预热连接、读取器和编译语句，预热结果不计入
+            for value in (resource_workload[: args.warmup] if name == "get_resource" else warmup):
+                operation(value)
+            reset_caches(fixture)
+
+            cache_before = get_lookup_cache().stats()
+            result = measure(operation, inputs, threads)
+            if name == "lookup_word":
+                cache_after = get_lookup_cache().stats()
+                lookups = (cache_after["hits"] + cache_after["misses"]) - (cache_before["hits"] + cache_before["misses"])
+                hits = cache_after["hits"] - cache_before["hits"]
+                result["cache_hit_rate"] = round(hits / lookups, 4) if lookups else 0.0
+            result["threads"] = threads
+            key = f"{name}/{mode}"
+            results[key] = result
+            print(
+                f"{key:<34} p50 {result['p50_ms']:8.3f} ms  p95 {result['p95_ms']:8.3f} ms  "
+                f"p99 {result['p99_ms']:8.3f} ms  {result['throughput_ops']:9.1f} ops/s"
+            )
+    return results
+
+
+def git_revision() -> Optional[str]:
+    try:
+        return subprocess.run(
+            ["git", "rev-parse", "--short", "HEAD"],
+            capture_output=True,
+            text=True,
+            check=True,
+            cwd=os.path.dirname(os.path.abspath(__file__)),
+        ).stdout.strip()
+    except (OSError, subprocess.CalledProcessError):
+        return None
+
+
+def compare(current: Dict, baseline: Dict):
+    """逐项打印与基线结果的变化（延迟下降、吞吐上升为改善）"""
+    print(f"\n对比基线 {baseline.get('meta', {}).get('git_revision') or '(unknown)'}:")
+    if baseline.get("meta", {}).get("params") != current["meta"]["params"]:
+        print("  注意: 两次运行的参数不同，结果仅供参考")
+    for key, result in current["results"].items():
+        base = baseline.get("results", {}).get(key)
+        if not base:
+            print(f"  {key:<34} (基线中没有该项)")
+            continue
+        deltas = []
+        for metric in COMPARED_METRICS:
+            if base.get(metric):
+                change = (result[metric] - base[metric]) / base[metric] * 100
+                deltas.append(f"{metric} {change:+6.1f}%")
+        print(f"  {key:<34} " + "  ".join(deltas))
+
+
+def main():
+    parser = argparse.ArgumentParser(description="查词延迟与吞吐量基准")
+    parser.add_argument("--ecdict-words", type=int, default=50000, help="合成 ECDICT 词头数")
+    parser.add_argument("--jmdict-entries", type=int, default=20000, help="合成 JMdict 词条数")
+    parser.add_argument("--dicts", type=int, default=3, help="导入词典数量")
+    parser.add_argument("--coverage", type=float, default=0.6, help="每个导入词典收录词头的比例")
+    parser.add_argument("--resources", type=int, default=500, help="MDD 资源数量")
+    parser.add_argument("--ops", type=int, default=2000, help="每个场景每种模式的操作数")
+    parser.add_argument("--warmup", type=int, default=100, help="预热操作数")
+    parser.add_argument("--threads", type=int, default=8, help="并发模式线程数")
+    parser.add_argument("--miss-rate", type=float, default=0.1, help="未收录词比例")
+    parser.add_argument("--japanese-rate", type=float, default=0.1, help="日语查询比例")
+    parser.add_argument("--seed", type=int, default=42, help="随机种子")
+    parser.add_argument("--scenario", action="append", choices=SCENARIOS, help="只运行指定场景（可重复）")
+    parser.add_argument("--headword-index", action="store_true", help="加载词头内存索引与词形还原表后再测量")
+    parser.add_argument("--output", type=Path, help="结果 JSON 输出路径（默认打印到标准输出）")
+    parser.add_argument("--compare", type=Path, help="与之前保存的结果 JSON 对比")
+    parser.add_argument("--verbose", action="store_true", help="输出查询过程中的 INFO 日志（会影响测量结果）")
+    args = parser.parse_args()
+
+    if not args.verbose:
+        logging.disable(logging.INFO)
+
+    params = {
+        key: getattr(args, key)
+        for key in (
+            "ecdict_words",
+            "jmdict_entries",
+            "dicts",
+            "coverage",
+            "resources",
+            "ops",
+            "warmup",
+            "threads",
+            "miss_rate",
+            "japanese_rate",
+            "seed",
+            "headword_index",
+        )
+    }
+
+    with tempfile.TemporaryDirectory() as tmp_dir:
+        print("生成合成词库...")
+        fixture = build_fixture(
+            Path(tmp_dir),
+            ecdict_words=args.ecdict_words,
+            jmdict_entries=args.jmdict_entries,
+            dict_count=args.dicts,
+            dict_coverage=args.coverage,
+            resource_count=args.resources,
+            seed=args.seed,
+        )
+        print(f"合成词库: {json.dumps(fixture.describe(), ensure_ascii=False)}\n")
+        install_fixture(fixture)
+
+        if args.headword_index:
+            from app.services import ecdict_headwords, lemma_service
+
+            ecdict_headwords.load_headword_index(str(fixture.ecdict_path))
+            lemma_service.load_lemma_table()
+
+        offline = OfflineRemoteClient()
+        previous = set_remote_client(offline)
+        try:
+            results = run_benchmarks(fixture, args)
+        finally:
+            set_remote_client(previous)
+            offline.close()
+        fixture_info = fixture.describe()
+
+    report = {
+        "format_version": RESULT_FORMAT_VERSION,
+        "meta": {
+            "git_revision": git_revision(),
+            "timestamp": datetime.now(timezone.utc).isoformat(timespec="seconds"),
+            "python": platform.python_version(),
+            "platform": platform.platform(),
+            "cpu_count": os.cpu_count(),
+            "params": params,
+        },
+        "fixture": fixture_info,
+        "results": results,
+    }
+
+    if args.output:
+        args.output.write_text(json.dumps(report, ensure_ascii=False, indent=2), encoding="utf-8")
+        print(f"\n结果已写入 {args.output}")
+    elif not args.compare:
+        print(json.dumps(report, ensure_ascii=False, indent=2))
+
+    if args.compare:
+        compare(report, json.loads(args.compare.read_text(encoding="utf-8")))
+
+
+if __name__ == "__main__":
+    main()
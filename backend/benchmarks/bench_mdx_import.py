@@ -0,0 +1,105 @@
+#!/usr/bin/env python3
+"""
+MDX 导入索引基准
+
+用 mdict_utils 生成一个合成 MDX 文件，分别按旧版逐批提交方式（1000 条一批、
+每批 commit、索引在线）和 DictManager 当前的批量导入路径建立索引，对比耗时与速率。
+
+用法：
+    cd backend
+    python benchmarks/bench_mdx_import.py --entries 150000
+"""
+
+import sys
+import os
+import argparse
+import random
+import sqlite3
+import tempfile
+import time
+from pathlib import Path
+
+# 确保能找到 app 包
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+from mdict_utils.base.writemdict import MDictWriter
+
+from app.services.dict_manager import DictManager
+from app.services.mdx_parser import MDXParser
+
+
+def build_mdx(path: Path, entry_count: int) -> Path:
+    rng = random.Random(42)
+    vocabulary = ["run", "walk", "mark", "spot", "quick", "house", "light", "table", "example", "sense"]
+    entries = {
+        f"word{i}": (
+            "<div class=\"entry\"><span class=\"pos\">n.</span>"
+            + "".join(
+                f"<li class=\"sense\"><span class=\"def\">{' '.join(rng.choice(vocabulary) for _ in range(20))}</span>"
+                f"<span class=\"chn\">释义 {i}-{k}</span></li>"
+                for k in range(6)
+            )
+            + "</div>"
+        )
+        for i in range(entry_count)
+    }
+    with open(path, "wb") as f:
+        MDictWriter(entries, "Bench", "Benchmark dictionary").write(f)
+    return path
+
+
+def legacy_index(manager: DictManager, mdx_file: Path, dict_name: str) -> int:
+    """复现旧版 _create_index：1000 条一批 INSERT OR REPLACE，每批提交，索引在线"""
+    dict_id = manager._get_or_create_dict_id(dict_name, mdx_file)
+    conn = sqlite3.connect(manager.index_db)
+    batch = []
+    word_count = 0
+    for entry in MDXParser(mdx_file).parse():
+        batch.append((dict_id, entry["word"], entry["word"].lower(), entry["offset"], entry["length"], entry["content"]))
+        if len(batch) >= 1000:
+            conn.executemany(
+                "INSERT OR REPLACE INTO entries (dict_id, word, word_lower, offset, length, content) VALUES (?, ?, ?, ?, ?, ?)",
+                batch,
+            )
+            conn.commit()
+            batch = []
+        word_count += 1
+    if batch:
+        conn.executemany(
+            "INSERT OR REPLACE INTO entries (dict_id, word, word_lower, offset, length, content) VALUES (?, ?, ?, ?, ?, ?)",
+            batch,
+        )
+        conn.commit()
+    conn.close()
+    return word_count
+
+
+def main():
+    parser = argparse.ArgumentParser(description="对比旧版与批量导入的 MDX 索引速度")
+    parser.add_argument("--entries", type=int, default=150000, help="合成 MDX 词条数")
+    args = parser.parse_args()
+
+    with tempfile.TemporaryDirectory() as tmp_dir:
+        tmp_path = Path(tmp_dir)
+        started = time.perf_counter()
+        mdx_file = build_mdx(tmp_path / "bench.mdx", args.entries)
+        print(f"生成 MDX: {args.entries} 条，耗时 {time.perf_counter() - started:.1f}s")
+
+        # 每种方式各自使用独立的索引库，并预先放入一个已有词典，模拟在线索引
+        for label in ("旧版逐批提交", "批量导入", "批量导入+压缩"):
+            manager = DictManager(dicts_dir=tmp_path / label)
+            manager.config["compress_content"] = label == "批量导入+压缩"
+            manager._create_index(mdx_file, "Existing")
+
+            started = time.perf_counter()
+            if label == "旧版逐批提交":
+                count = legacy_index(manager, mdx_file, "Bench")
+            else:
+                count = manager._create_index(mdx_file, "Bench")
+            elapsed = time.perf_counter() - started
+            size_mb = manager.index_db.stat().st_size / 1024 / 1024
+            print(f"[{label}] {count} 条，耗时 {elapsed:.2f}s，{count / elapsed:.0f} 条/秒，索引库 {size_mb:.0f} MB")
+
+
+if __name__ == "__main__":
+    main()
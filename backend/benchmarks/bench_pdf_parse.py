@@ -0,0 +1,119 @@
+#!/usr/bin/env python3
+"""
+PDF 多进程解析基准
+
+用 PyMuPDF 生成一个双栏排版的合成 PDF（每页一个全宽标题 + 左右两栏正文），
+分别以串行和不同工作进程数运行 PDFParser.iter_pages，对比耗时与吞吐，
+并校验各模式输出与串行结果完全一致（包括页码顺序）。
+
+用法：
+    cd backend
+    python benchmarks/bench_pdf_parse.py --pages 500 --workers 1 2 4
+"""
+
+import sys
+import os
+import argparse
+import logging
+import random
+import tempfile
+import time
+from pathlib import Path
+
+# 确保能找到 app 包
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+import fitz  # PyMuPDF
+
+from app.parsers.pdf_parser import PDFParser
+
+WORDS = (
+    "reading language vocabulary context sentence meaning chapter novel author "
+    "column layout paragraph margin figure caption quotation dialogue narrative "
+    "river mountain window morning evening journey letter memory garden silence"
+).split()
+
+PAGE_WIDTH, PAGE_HEIGHT = 595, 842  # A4
+MARGIN = 50
+GUTTER = 20
+
+
+def _paragraphs(rng: random.Random, count: int) -> str:
+    paragraphs = []
+    for _ in range(count):
+        sentences = []
+        for _ in range(rng.randint(3, 6)):
+            words = rng.choices(WORDS, k=rng.randint(8, 16))
+            sentences.append(" ".join(words).capitalize() + ".")
+        paragraphs.append(" ".join(sentences))
+    return "\n\n".join(paragraphs)
+
+
+def build_two_column_pdf(path: Path, pages: int, seed: int = 42) -> None:
+    """生成双栏合成 PDF：全宽标题 + 两栏正文，每栏文字填满栏高"""
+    rng = random.Random(seed)
+    column_width = (PAGE_WIDTH - 2 * MARGIN - GUTTER) / 2
+    doc = fitz.open()
+    for page_num in range(1, pages + 1):
+        page = doc.new_page(width=PAGE_WIDTH, height=PAGE_HEIGHT)
+        page.insert_textbox(
+            fitz.Rect(MARGIN, MARGIN, PAGE_WIDTH - MARGIN, MARGIN + 30),
+            f"Chapter {page_num}: {' '.join(rng.choices(WORDS, k=4)).title()}",
+            fontsize=16,
+        )
+        top = MARGIN + 45
+        for col in range(2):
+            x0 = MARGIN + col * (column_width + GUTTER)
+            page.insert_textbox(
+                fitz.Rect(x0, top, x0 + column_width, PAGE_HEIGHT - MARGIN),
+                _paragraphs(rng, 6),
+                fontsize=9,
+            )
+    doc.save(path)
+    doc.close()
+
+
+def run(pdf_path: Path, workers: int) -> tuple:
+    parser = PDFParser(workers=workers)
+    started = time.perf_counter()
+    pages = list(parser.iter_pages(str(pdf_path), "bench"))
+    return time.perf_counter() - started, pages
+
+
+def main():
+    parser = argparse.ArgumentParser(description="PDF 多进程解析基准")
+    parser.add_argument("--pages", type=int, default=500, help="合成 PDF 页数")
+    parser.add_argument("--workers", type=int, nargs="+", default=[1, 2, 4], help="要对比的工作进程数（1 为串行）")
+    parser.add_argument("--pdf", type=Path, help="使用已有 PDF 而不是生成合成文件")
+    args = parser.parse_args()
+
+    logging.basicConfig(level=logging.WARNING)
+    print(f"CPU 核数: {os.cpu_count()}")
+
+    with tempfile.TemporaryDirectory() as tmp:
+        pdf_path = args.pdf
+        if pdf_path is None:
+            pdf_path = Path(tmp) / "two_column.pdf"
+            started = time.perf_counter()
+            build_two_column_pdf(pdf_path, args.pages)
+            print(f"生成双栏 PDF: {args.pages} 页，{pdf_path.stat().st_size / 1024 / 1024:.1f} MB，耗时 {time.perf_counter() - started:.1f}s")
+
+        baseline = None
+        baseline_elapsed = None
+        for workers in sorted(set([1] + args.workers)):
+            elapsed, pages = run(pdf_path, workers)
+            if baseline is None:
+                baseline, baseline_elapsed = pages, elapsed
+                identical = True
+            else:
+                identical = pages == baseline
+            words = sum(len(page["words_data"]) for page in pages)
+            print(
+                f"[workers={workers}] {len(pages)} 页, {words} 词, 耗时 {elapsed:.2f}s, "
+                f"{len(pages) / elapsed:.1f} 页/秒, 加速比 {baseline_elapsed / elapsed:.2f}x, "
+                f"与串行结果一致: {'是' if identical else '否'}"
+            )
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,147 @@
+#!/usr/bin/env python3
+"""
+页面单词坐标存储基准：JSON vs 打包格式
+
+用 bench_pdf_parse 的双栏合成 PDF 解析出真实的 words_data，分别以 JSON 文本和
+words_codec 打包格式写入两个 SQLite 表，对比：
+    - 存储大小（列字节数与数据库文件大小）
+    - 单页读取延迟：读取 -> 解码 -> 序列化为 JSON 响应体（即 GET /api/books/{id}/pages/{n} 的主要开销）
+    - 只取单词文本的延迟（预取释义路径）
+
+用法：
+    cd backend
+    python benchmarks/bench_words_storage.py --pages 200 --reads 2000
+"""
+
+import sys
+import os
+import argparse
+import json
+import logging
+import random
+import sqlite3
+import statistics
+import tempfile
+import time
+from pathlib import Path
+
+# 确保能找到 app 包
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+from fastapi.encoders import jsonable_encoder
+
+from bench_pdf_parse import build_two_column_pdf
+from app.parsers.pdf_parser import PDFParser
+from app.utils.words_codec import PackedWords, pack_words
+
+
+def build_tables(db_path: Path, pages: list) -> sqlite3.Connection:
+    conn = sqlite3.connect(db_path)
+    conn.execute("CREATE TABLE pages_json (page_number INTEGER PRIMARY KEY, words_data TEXT)")
+    conn.execute("CREATE TABLE pages_packed (page_number INTEGER PRIMARY KEY, words_packed BLOB)")
+    conn.executemany(
+        "INSERT INTO pages_json VALUES (?, ?)",
+        ((p["page_number"], json.dumps(p["words_data"], ensure_ascii=False)) for p in pages),
+    )
+    conn.executemany(
+        "INSERT INTO pages_packed VALUES (?, ?)",
+        ((p["page_number"], pack_words(p["words_data"])) for p in pages),
+    )
+    conn.commit()
+    return conn
+
+
+def table_size(db_path: Path, table: str, pages: list) -> int:
+    """单独建库写入一张表，得到该表对应的数据库文件大小"""
+    path = db_path.with_name(f"{table}.db")
+    conn = sqlite3.connect(path)
+    if table == "pages_json":
+        conn.execute("CREATE TABLE t (page_number INTEGER PRIMARY KEY, v TEXT)")
+        rows = ((p["page_number"], json.dumps(p["words_data"], ensure_ascii=False)) for p in pages)
+    else:
+        conn.execute("CREATE TABLE t (page_number INTEGER PRIMARY KEY, v BLOB)")
+        rows = ((p["page_number"], pack_words(p["words_data"])) for p in pages)
+    conn.executemany("INSERT INTO t VALUES (?, ?)", rows)
+    conn.commit()
+    conn.execute("VACUUM")
+    conn.close()
+    return path.stat().st_size
+
+
+def measure(fn, page_numbers) -> dict:
+    timings = []
+    for page_number in page_numbers:
+        started = time.perf_counter()
+        fn(page_number)
+        timings.append((time.perf_counter() - started) * 1000)
+    timings.sort()
+    return {
+        "p50": statistics.median(timings),
+        "p95": timings[int(len(timings) * 0.95) - 1],
+        "mean": statistics.fmean(timings),
+    }
+
+
+def main():
+    parser = argparse.ArgumentParser(description="页面单词坐标存储基准")
+    parser.add_argument("--pages", type=int, default=200, help="合成 PDF 页数")
+    parser.add_argument("--reads", type=int, default=2000, help="随机读取次数")
+    parser.add_argument("--pdf", type=Path, help="使用已有 PDF 而不是生成合成文件")
+    args = parser.parse_args()
+
+    logging.basicConfig(level=logging.WARNING)
+
+    with tempfile.TemporaryDirectory() as tmp:
+        pdf_path = args.pdf
+        if pdf_path is None:
+            pdf_path = Path(tmp) / "two_column.pdf"
+            build_two_column_pdf(pdf_path, args.pages)
+        pages = list(PDFParser(workers=1).iter_pages(str(pdf_path), "bench"))
+        word_count = sum(len(p["words_data"]) for p in pages)
+        print(f"解析 {len(pages)} 页，{word_count} 词（平均每页 {word_count / len(pages):.0f} 词）")
+
+        db_path = Path(tmp) / "bench.db"
+        conn = build_tables(db_path, pages)
+
+        json_bytes = conn.execute("SELECT SUM(LENGTH(CAST(words_data AS BLOB))) FROM pages_json").fetchone()[0]
+        packed_bytes = conn.execute("SELECT SUM(LENGTH(words_packed)) FROM pages_packed").fetchone()[0]
+        json_file = table_size(db_path, "pages_json", pages)
+        packed_file = table_size(db_path, "pages_packed", pages)
+        print("\n存储大小：")
+        print(f"  JSON   列 {json_bytes / 1024:.0f} KB（每页 {json_bytes / len(pages) / 1024:.1f} KB），库文件 {json_file / 1024:.0f} KB")
+        print(
+            f"  打包   列 {packed_bytes / 1024:.0f} KB（每页 {packed_bytes / len(pages) / 1024:.1f} KB），库文件 {packed_file / 1024:.0f} KB，"
+            f"为 JSON 的 {packed_bytes / json_bytes:.0%}"
+        )
+
+        # 校验往返一致（坐标为 float32 精度）
+        sample = pages[len(pages) // 2]["words_data"]
+        decoded = PackedWords(pack_words(sample)).to_list()
+        assert [w["text"] for w in decoded] == [w["text"] for w in sample]
+        assert all(abs(a["x"] - b["x"]) < 1e-3 for a, b in zip(decoded, sample))
+
+        def read_json(page_number):
+            return conn.execute("SELECT words_data FROM pages_json WHERE page_number = ?", (page_number,)).fetchone()[0]
+
+        def read_packed(page_number):
+            return conn.execute("SELECT words_packed FROM pages_packed WHERE page_number = ?", (page_number,)).fetchone()[0]
+
+        scenarios = {
+            "JSON 解码 + jsonable_encoder（原接口）": lambda n: json.dumps(jsonable_encoder({"words_data": json.loads(read_json(n))})),
+            "JSON 解码 + 直接序列化": lambda n: json.dumps({"words_data": json.loads(read_json(n))}),
+            "打包解码 + 直接序列化（新接口）": lambda n: json.dumps({"words_data": PackedWords(read_packed(n)).to_list()}),
+            "JSON 只取单词文本": lambda n: [w["text"] for w in json.loads(read_json(n))],
+            "打包只取单词文本": lambda n: PackedWords(read_packed(n)).texts(),
+        }
+
+        rng = random.Random(7)
+        page_numbers = [rng.randint(1, len(pages)) for _ in range(args.reads)]
+        print(f"\n单页读取延迟（{args.reads} 次随机读取，ms）：")
+        for label, fn in scenarios.items():
+            result = measure(fn, page_numbers)
+            print(f"  {label:<36} p50 {result['p50']:.3f}  p95 {result['p95']:.3f}  mean {result['mean']:.3f}")
+        conn.close()
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,311 @@
+"""
+查词基准的合成数据
+
+按给定规模生成 ECDICT（stardict 表，含 exchange 屈折字段）、JMdict（通过
+scripts/build_jmdict_db.py 从合成 XML 构建）、MDX 索引库（多个导入词典）以及一个
+带 MDD 资源的真实 MDX/MDD 词典，并把各服务的数据路径指向这些文件。
+
+相同的规模参数和随机种子生成完全相同的数据，便于跨提交对比结果。
+"""
+
+import gzip
+import importlib.util
+import random
+import sqlite3
+import time
+from dataclasses import dataclass, field
+from pathlib import Path
+from typing import Dict, List
+from xml.sax.saxutils import escape
+
+from mdict_utils.base.writemdict import MDictWriter
+
+from app.services import dict_manager as dict_manager_module
+from app.services.dict_manager import DictManager
+
+BACKEND_DIR = Path(__file__).resolve().parents[1]
+
+_SYLLABLES = (
+    "ba be bi bo bu ca co da de di do fa fe fi fo ga ge go ha he hi ka ke ki ko la le li lo lu "
+    "ma me mi mo mu na ne ni no nu pa pe pi po ra re ri ro ru sa se si so su ta te ti to tu "
+    "va ve vi vo wa we wi ya yo za ze zi zo ar er in on or st th"
+).split()
+_KANA = "あいうえおかきくけこさしすせそたちつてとなにぬねのはひふへほまみむめもやゆよらりるれろわ"
+_KANJI = "日月火水木金土山川田人口目耳手足力気天雨花草竹石糸車門空海"
+_POS = ("n", "v", "j", "r", "n:60/v:40", "v:70/n:30", "j:80/r:20")
+
+RESOURCE_DICT = "BenchRes"
+
+
+@dataclass
+class LookupFixture:
+    root: Path
+    ecdict_path: Path
+    lemma_path: Path
+    jmdict_path: Path
+    manager: DictManager
+    dict_names: List[str]
+    # 合成词表：ECDICT 词头、按 exchange 生成的屈折形式、JMdict 词条、MDD 资源路径
+    headwords: List[str]
+    inflections: List[str]
+    japanese_words: List[str]
+    resources: List[str]
+    build_seconds: Dict[str, float] = field(default_factory=dict)
+
+    def describe(self) -> Dict:
+        return {
+            "ecdict_headwords": len(self.headwords),
+            "jmdict_entries": len(self.japanese_words),
+            "imported_dicts": len(self.dict_names),
+            "mdd_resources": len(self.resources),
+            "build_seconds": {k: round(v, 3) for k, v in self.build_seconds.items()},
+        }
+
+
+def synthetic_words(rng: random.Random, count: int) -> List[str]:
+    """生成 count 个互不相同的拼写类英语单词"""
+    words = []
+    seen = set()
+    while len(words) < count:
+        word = "".join(rng.choice(_SYLLABLES) for _ in range(rng.randint(2, 4)))
+        if word not in seen:
+            seen.add(word)
+            words.append(word)
+    return words
+
+
+def build_ecdict(path: Path, headwords: List[str], rng: random.Random) -> List[str]:
+    """生成与 ECDICT 相同结构的 stardict 表，返回 exchange 中记录的屈折形式"""
+    conn = sqlite3.connect(path)
+    conn.execute("""
+        CREATE TABLE stardict (
+            id INTEGER PRIMARY KEY AUTOINCREMENT,
+            word VARCHAR(64) COLLATE NOCASE NOT NULL UNIQUE,
+            sw VARCHAR(64) COLLATE NOCASE NOT NULL,
+            phonetic VARCHAR(64),
+            definition TEXT,
+            translation TEXT,
+            pos VARCHAR(16),
+            collins INTEGER DEFAULT(0),
+            oxford INTEGER DEFAULT(0),
+            tag VARCHAR(64),
+            bnc INTEGER DEFAULT(NULL),
+            frq INTEGER DEFAULT(NULL),
+            exchange TEXT,
+            detail TEXT,
+            audio TEXT
+        )
+    """)
+    inflections = []
+    rows = []
+    for rank, word in enumerate(headwords, 1):
+        exchange = ""
+        # 约一半的词带屈折形式
+        if rng.random() < 0.5:
+            exchange = f"p:{word}ed/d:{word}ed/i:{word}ing/3:{word}s"
+            inflections.extend((f"{word}ed", f"{word}ing", f"{word}s"))
+        rows.append((
+            word,
+            word,
+            f"'{word}",
+            f"n. definition of {word}\nv. to {word}",
+            f"n. {word} 的释义\nv. {word} 的动词释义",
+            rng.choice(_POS),
+            rng.randint(0, 5),
+            rng.randint(0, 1),
+            "cet4 cet6" if rank % 7 == 0 else "",
+            rank,
+            rank,
+            exchange,
+        ))
+    conn.executemany(
+        "INSERT INTO stardict (word, sw, phonetic, definition, translation, pos, collins, oxford, tag, bnc, frq, exchange)"
+        " VALUES (?, ?, ?, ?, ?, ?, ?, ?, ?, ?, ?, ?)",
+        rows,
+    )
+    conn.execute("CREATE INDEX stardict_1 ON stardict (sw, word collate nocase)")
+    conn.commit()
+    conn.close()
+    return inflections
+
+
+def _load_jmdict_builder():
+    path = BACKEND_DIR / "scripts" / "build_jmdict_db.py"
+    spec = importlib.util.spec_from_file_location("build_jmdict_db", path)
+    module = importlib.util.module_from_spec(spec)
+    spec.loader.exec_module(module)
+    return module
+
+
+def build_jmdict(path: Path, entry_count: int, rng: random.Random) -> List[str]:
+    """生成合成 JMdict XML 并用正式构建脚本建库，返回汉字词头列表"""
+    words = []
+    seen = set()
+    parts = ["<?xml version=\"1.0\" encoding=\"UTF-8\"?>\n<JMdict>\n"]
+    seq = 1000000
+    while len(words) < entry_count:
+        kanji = "".join(rng.choice(_KANJI) for _ in range(rng.randint(1, 2))) + rng.choice(("る", "い", "す", ""))
+        if kanji in seen:
+            continue
+        seen.add(kanji)
+        reading = "".join(rng.choice(_KANA) for _ in range(rng.randint(2, 5)))
+        seq += 1
+        parts.append(
+            f"<entry><ent_seq>{seq}</ent_seq>"
+            f"<k_ele><keb>{escape(kanji)}</keb></k_ele>"
+            f"<r_ele><reb>{escape(reading)}</reb></r_ele>"
+            f"<sense><pos>noun</pos><gloss>meaning {seq}</gloss><gloss>sense {seq}</gloss></sense>"
+            "</entry>\n"
+        )
+        words.append(kanji)
+    parts.append("</JMdict>\n")
+
+    source = path.with_suffix(".xml.gz")
+    with gzip.open(source, "wt", encoding="utf-8") as f:
+        f.writelines(parts)
+    _load_jmdict_builder().build_database(source, path)
+    source.unlink()
+    return words
+
+
+def _entry_html(word: str, dict_index: int, resources: List[str], rng: random.Random) -> str:
+    image = f'<img src="{rng.choice(resources)}">' if resources and rng.random() < 0.3 else ""
+    senses = "".join(
+        f'<li class="sense"><span class="def">sense {k} of {word} in dictionary {dict_index}</span>'
+        f'<span class="chn">{word} 的第 {k} 个义项</span></li>'
+        for k in range(rng.randint(2, 6))
+    )
+    return (
+        f'<div class="entry"><span class="hw">{word}</span><span class="phon">/{word}/</span>'
+        f'<span class="pos">n.</span>{image}<ol>{senses}</ol></div>'
+    )
+
+
+def build_mdx_index(
+    dicts_dir: Path,
+    dict_count: int,
+    headwords: List[str],
+    coverage: float,
+    rng: random.Random,
+) -> DictManager:
+    """直接写入索引库生成多个导入词典（每个词典随机收录 coverage 比例的词头）"""
+    manager = DictManager(dicts_dir=dicts_dir)
+    compress = manager.config.get("compress_content", True)
+    conn = sqlite3.connect(manager.index_db)
+    config = manager.config
+    for i in range(dict_count):
+        name = f"BenchDict{i}"
+        words = [word for word in headwords if rng.random() < coverage]
+        dict_id = conn.execute(
+            "INSERT INTO dicts (name, filename, size, word_count) VALUES (?, ?, ?, ?)",
+            (name, f"{name}.mdx", 0, len(words)),
+        ).lastrowid
+        conn.executemany(
+            "INSERT INTO entries (dict_id, word, word_lower, content) VALUES (?, ?, ?, ?)",
+            (
+                (dict_id, word, word.lower(), dict_manager_module._encode_content(_entry_html(word, i, [], rng), compress))
+                for word in words
+            ),
+        )
+        config["dicts"][name] = {
+            "name": name,
+            "filename": f"{name}.mdx",
+            "size": 0,
+            "word_count": len(words),
+            "is_active": True,
+        }
+        config["priority"].insert(i, name)
+    conn.commit()
+    conn.close()
+    manager._save_config(config)
+    manager._invalidate_dict_ids()
+    return manager
+
+
+def build_resource_dict(manager: DictManager, work_dir: Path, headwords: List[str], resource_count: int, rng: random.Random) -> List[str]:
+    """用 mdict_utils 写出真实的 MDX/MDD 文件并走正式导入流程，返回资源路径列表"""
+    resources = [f"img/{word}.png" for word in headwords[:resource_count]]
+    mdd_entries = {
+        "\\" + path.replace("/", "\\"): b"\x89PNG\r\n\x1a\n" + rng.randbytes(rng.randint(512, 16384))
+        for path in resources
+    }
+    mdx_entries = {word: _entry_html(word, -1, resources, rng) for word in headwords[: max(resource_count, 1)]}
+
+    work_dir.mkdir(parents=True, exist_ok=True)
+    for suffix, entries, is_mdd in ((".mdx", mdx_entries, False), (".mdd", mdd_entries, True)):
+        with open(work_dir / f"{RESOURCE_DICT}{suffix}", "wb") as f:
+            MDictWriter(entries, RESOURCE_DICT, "Benchmark resources", is_mdd=is_mdd).write(f)
+    manager.import_dict(work_dir / f"{RESOURCE_DICT}.mdx", RESOURCE_DICT)
+    return resources
+
+
+def build_fixture(
+    root: Path,
+    ecdict_words: int = 50000,
+    jmdict_entries: int = 20000,
+    dict_count: int = 3,
+    dict_coverage: float = 0.6,
+    resource_count: int = 500,
+    seed: int = 42,
+) -> LookupFixture:
+    from app.services import lemma_service
+
+    rng = random.Random(seed)
+    root.mkdir(parents=True, exist_ok=True)
+    timings = {}
+
+    started = time.perf_counter()
+    headwords = synthetic_words(rng, ecdict_words)
+    ecdict_path = root / "ecdict.db"
+    inflections = build_ecdict(ecdict_path, headwords, rng)
+    lemma_path = root / "ecdict_lemmas.db"
+    lemma_service.build_lemma_table(str(ecdict_path), str(lemma_path))
+    timings["ecdict"] = time.perf_counter() - started
+
+    started = time.perf_counter()
+    jmdict_path = root / "jmdict.db"
+    japanese_words = build_jmdict(jmdict_path, jmdict_entries, rng)
+    timings["jmdict"] = time.perf_counter() - started
+
+    started = time.perf_counter()
+    manager = build_mdx_index(root / "dicts", dict_count, headwords, dict_coverage, rng)
+    timings["mdx_index"] = time.perf_counter() - started
+
+    started = time.perf_counter()
+    resources = build_resource_dict(manager, root / "source", headwords, resource_count, rng)
+    timings["mdd"] = time.perf_counter() - started
+
+    return LookupFixture(
+        root=root,
+        ecdict_path=ecdict_path,
+        lemma_path=lemma_path,
+        jmdict_path=jmdict_path,
+        manager=manager,
+        dict_names=[f"BenchDict{i}" for i in range(dict_count)],
+        headwords=headwords,
+        inflections=inflections,
+        japanese_words=japanese_words,
+        resources=resources,
+        build_seconds=timings,
+    )
+
+
+def install_fixture(fixture: LookupFixture):
+    """把 ECDICT / 词形表 / JMdict / DictManager 指向合成数据，清空各级缓存"""
+    from app.services import (
+        dict_service,
+        ecdict_service,
+        jmdict_service,
+        lemma_service,
+    )
+    from app.services.lookup_cache import get_lookup_cache
+
+    ecdict_service.get_db_path = lambda: str(fixture.ecdict_path)
+    jmdict_service.get_db_path = lambda: str(fixture.jmdict_path)
+    lemma_service.get_db_path = lambda: str(fixture.lemma_path)
+    for pool in (ecdict_service._pool, jmdict_service._pool, lemma_service._pool):
+        pool.close_all()
+    jmdict_service.clear_payload_cache()
+    dict_service._get_ecdict_entry_info_from_db.cache_clear()
+    dict_service._dict_manager = fixture.manager
+    get_lookup_cache().invalidate("基准数据切换")
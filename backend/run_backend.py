@@ -1,6 +1,7 @@
 import os
 import sys
 import argparse
+import multiprocessing
 import uvicorn
 from pathlib import Path
 
@@ -56,4 +57,6 @@ def main():
 
 
 if __name__ == "__main__":
+    # 打包环境下 PDF 解析进程池（spawn）的子进程需要由此进入
+    multiprocessing.freeze_support()
     main()
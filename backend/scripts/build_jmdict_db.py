@@ -10,10 +10,35 @@ import xml.etree.ElementTree as ET
 import zlib
 from pathlib import Path
 
+try:
+    import orjson
+except ImportError:  # 可选依赖，仅用于加快 JSON 编码
+    orjson = None
+
+try:
+    import msgpack
+except ImportError:
+    msgpack = None
+
 SOURCE_URL = "https://www.edrdg.org/pub/Nihongo/JMdict_e.gz"
 PROJECT_URL = "https://www.edrdg.org/wiki/index.php/JMdict-EDICT_Dictionary_Project"
 LICENSE_URL = "https://www.edrdg.org/edrdg/licence.html"
 
+# 词库格式版本，写入 metadata.format_version；payload 编码写入 metadata.payload_format
+# 1: zlib(JSON)；2: 增加 payload_format，可选 zlib(msgpack)
+FORMAT_VERSION = 2
+PAYLOAD_FORMATS = ("json", "msgpack")
+
+
+def _encode_payload(payload: dict[str, object], payload_format: str) -> bytes:
+    if payload_format == "msgpack":
+        data = msgpack.packb(payload, use_bin_type=True)
+    elif orjson is not None:
+        data = orjson.dumps(payload)
+    else:
+        data = json.dumps(payload, ensure_ascii=False, separators=(",", ":")).encode("utf-8")
+    return zlib.compress(data, level=9)
+
 
 def _priority_score(priorities: list[str]) -> int:
     score = 0
@@ -72,7 +97,9 @@ def _iter_entries(jmdict_path: Path):
             elem.clear()
 
 
-def build_database(source_path: Path, output_path: Path) -> None:
+def build_database(source_path: Path, output_path: Path, payload_format: str = "json") -> None:
+    if payload_format == "msgpack" and msgpack is None:
+        raise SystemExit("使用 msgpack 编码需要先安装 msgpack")
     output_path.parent.mkdir(parents=True, exist_ok=True)
     if output_path.exists():
         output_path.unlink()
@@ -136,15 +163,14 @@ def build_database(source_path: Path, output_path: Path) -> None:
         reading = reading_forms[0] if reading_forms else display_word
         summary = str(senses[0]["glosses"][0])
         rank = _priority_score(priorities)
-        payload = zlib.compress(json.dumps(
+        payload = _encode_payload(
             {
                 "kanji_forms": kanji_forms,
                 "reading_forms": reading_forms,
                 "senses": senses,
             },
-            ensure_ascii=False,
-            separators=(",", ":"),
-        ).encode("utf-8"), level=9)
+            payload_format,
+        )
 
         cursor.execute(
             """
@@ -174,6 +200,8 @@ def build_database(source_path: Path, output_path: Path) -> None:
             ("source_url", SOURCE_URL),
             ("project_url", PROJECT_URL),
             ("license_url", LICENSE_URL),
+            ("format_version", str(FORMAT_VERSION)),
+            ("payload_format", payload_format),
         ],
     )
     conn.commit()
@@ -192,6 +220,12 @@ def main() -> None:
     parser = argparse.ArgumentParser(description="构建内置 JMdict SQLite 数据库")
     parser.add_argument("--source", type=Path, default=None, help="本地 JMdict_e.gz 路径")
     parser.add_argument("--output", type=Path, required=True, help="输出 SQLite 路径")
+    parser.add_argument(
+        "--format",
+        choices=PAYLOAD_FORMATS,
+        default="json",
+        help="词条 payload 编码（msgpack 更小、解码更快，但运行环境需安装 msgpack）",
+    )
     args = parser.parse_args()
 
     if args.source:
@@ -199,10 +233,10 @@ def main() -> None:
     else:
         with tempfile.TemporaryDirectory() as tmp_dir:
             source_path = download_source(Path(tmp_dir) / "JMdict_e.gz")
-            build_database(source_path, args.output)
+            build_database(source_path, args.output, args.format)
             return
 
-    build_database(source_path, args.output)
+    build_database(source_path, args.output, args.format)
 
 
 if __name__ == "__main__":
@@ -0,0 +1,48 @@
+#!/usr/bin/env python3
+"""
+生成词形还原表
+
+读取 ECDICT 的 exchange 字段（过去式、分词、复数、比较级等），生成独立的 ecdict_lemmas.db：
+inflections(form, lemma, kinds) 表按屈折形式和原型分别建索引，供 lemma_service 一次索引查询完成还原。
+ecdict.db 随程序只读分发，因此结果写入单独的文件。
+
+用法：
+    cd backend
+    python scripts/build_lemma_table.py
+
+可选参数：
+    --ecdict <path>    ECDICT 数据库路径（默认 static/ecdict.db）
+    --output <path>    输出路径（默认 static/ecdict_lemmas.db）
+"""
+
+import sys
+import os
+import argparse
+import time
+from pathlib import Path
+
+# 确保能找到 app 包
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+from app.services.lemma_service import build_lemma_table
+
+BACKEND_DIR = Path(__file__).resolve().parent.parent
+
+
+def main():
+    parser = argparse.ArgumentParser(description="由 ECDICT exchange 字段生成屈折形式 -> 原型表")
+    parser.add_argument("--ecdict", default=str(BACKEND_DIR / "static" / "ecdict.db"), help="ECDICT 数据库路径")
+    parser.add_argument("--output", default=str(BACKEND_DIR / "static" / "ecdict_lemmas.db"), help="输出路径")
+    args = parser.parse_args()
+
+    if not Path(args.ecdict).exists():
+        raise SystemExit(f"未找到 ECDICT 数据库: {args.ecdict}")
+
+    started = time.perf_counter()
+    count = build_lemma_table(args.ecdict, args.output)
+    size_mb = Path(args.output).stat().st_size / 1024 / 1024
+    print(f"已生成 {args.output}: {count} 个屈折形式/原型对, {size_mb:.1f} MB, 耗时 {time.perf_counter() - started:.1f}s")
+
+
+if __name__ == "__main__":
+    main()
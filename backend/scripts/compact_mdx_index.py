@@ -0,0 +1,60 @@
+#!/usr/bin/env python3
+"""
+MDX 索引内容压缩脚本
+
+将 mdx_index.db 中已导入词典的词条内容重写为 zlib 压缩 BLOB（或还原为 TEXT），
+执行 VACUUM 回收空间，并逐个词典输出体积与查询延迟对比。
+
+用法：
+    cd backend
+    python scripts/compact_mdx_index.py
+
+可选参数：
+    --dict <name>    只处理指定词典（可重复）
+    --decompress     还原为未压缩的 TEXT 存储
+    --no-vacuum      跳过 VACUUM
+"""
+
+import sys
+import os
+import argparse
+import logging
+
+# 确保能找到 app 包
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+from app.services.dict_manager import DictManager
+
+logging.basicConfig(
+    level=logging.INFO,
+    format="%(asctime)s [%(levelname)s] %(message)s",
+)
+logger = logging.getLogger(__name__)
+
+
+def _format_size(size: int) -> str:
+    return f"{size / 1024 / 1024:.1f} MB"
+
+
+def main():
+    parser = argparse.ArgumentParser(description="压缩（或解压）MDX 索引库中的词条内容")
+    parser.add_argument("--dict", action="append", dest="dicts", help="只处理指定词典，可重复")
+    parser.add_argument("--decompress", action="store_true", help="还原为未压缩的 TEXT 存储")
+    parser.add_argument("--no-vacuum", action="store_true", help="跳过 VACUUM")
+    args = parser.parse_args()
+
+    manager = DictManager()
+    report = manager.compact_index(dict_names=args.dicts, compress=not args.decompress, vacuum=not args.no_vacuum)
+
+    print(f"{'词典':<24}{'重写条数':>10}{'内容体积(前)':>14}{'内容体积(后)':>14}{'查询(前)':>12}{'查询(后)':>12}")
+    for item in report["dicts"]:
+        print(
+            f"{item['name']:<24}{item['rewritten']:>10}"
+            f"{_format_size(item['content_bytes_before']):>14}{_format_size(item['content_bytes_after']):>14}"
+            f"{item['lookup_ms_before']:>10.3f}ms{item['lookup_ms_after']:>10.3f}ms"
+        )
+    print(f"索引库文件: {_format_size(report['file_size_before'])} -> {_format_size(report['file_size_after'])}")
+
+
+if __name__ == "__main__":
+    main()
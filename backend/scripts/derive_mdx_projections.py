@@ -0,0 +1,58 @@
+#!/usr/bin/env python3
+"""
+MDX 词条派生字段重建脚本
+
+为 mdx_index.db 中的词条预先计算音标、词性、中文摘要（entry_projections 表），
+修改 DictManager 的提取规则后运行，避免查询时再逐条解析 HTML。
+
+用法：
+    cd backend
+    python scripts/derive_mdx_projections.py
+
+可选参数：
+    --dict <name>    只处理指定词典（可重复）
+    --force          丢弃已有结果后全部重建（规则改动但未递增 PROJECTION_VERSION 时）
+    --lazy           只清理过期结果，留待查询时按需派生
+"""
+
+import sys
+import os
+import argparse
+import logging
+
+# 确保能找到 app 包
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+from app.services.dict_manager import DictManager, PROJECTION_VERSION
+
+logging.basicConfig(
+    level=logging.INFO,
+    format="%(asctime)s [%(levelname)s] %(message)s",
+)
+logger = logging.getLogger(__name__)
+
+
+def main():
+    parser = argparse.ArgumentParser(description="重建 MDX 词条的音标/词性/中文摘要派生字段")
+    parser.add_argument("--dict", action="append", dest="dicts", help="只处理指定词典，可重复")
+    parser.add_argument("--force", action="store_true", help="丢弃已有结果后全部重建")
+    parser.add_argument("--lazy", action="store_true", help="只清理过期结果，不预先计算")
+    args = parser.parse_args()
+
+    manager = DictManager()
+
+    def on_progress(dict_name: str, count: int):
+        if count % 10000 < 500:
+            logger.info(f"{dict_name}: 已派生 {count} 条")
+
+    report = manager.derive_projections(
+        dict_names=args.dicts, force=args.force, lazy=args.lazy, progress_callback=on_progress
+    )
+
+    print(f"规则版本: {PROJECTION_VERSION}，清理过期结果 {report['cleared']} 条")
+    for name, count in report["dicts"].items():
+        print(f"{name:<24}{count:>10} 条")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,150 @@
+#!/usr/bin/env python3
+"""
+单词坐标打包迁移脚本
+
+把已有书籍 pages.words_data 中的 JSON 单词坐标转换为打包格式写入 pages.words_packed，
+并清空 JSON 列；新入库的书籍已直接写入打包格式。无法打包的页面（含未知字段）保持原样。
+完成后输出转换前后的存储大小。
+
+用法：
+    cd backend
+    python scripts/pack_words_data.py
+
+可选参数：
+    --book-id <id>      只迁移指定书籍
+    --batch-size <n>    每批处理页数（默认 500）
+    --dry-run           只统计转换后的大小，不写入数据库
+    --unpack            反向迁移：把打包格式还原为 JSON（用于回退旧版本）
+"""
+
+import sys
+import os
+import argparse
+import json
+import logging
+
+# 确保能找到 app 包
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+from sqlalchemy import inspect, text
+
+from app.models.database import engine
+from app.utils.words_codec import encode_words_for_storage, unpack_words
+
+logging.basicConfig(
+    level=logging.INFO,
+    format="%(asctime)s [%(levelname)s] %(message)s",
+)
+logger = logging.getLogger(__name__)
+
+
+def ensure_column(conn):
+    columns = [col["name"] for col in inspect(conn).get_columns("pages")]
+    if "words_packed" not in columns:
+        conn.execute(text("ALTER TABLE pages ADD COLUMN words_packed BLOB"))
+        logger.info("已添加列: pages.words_packed")
+
+
+def _book_filter(book_id):
+    return (" AND book_id = :book_id", {"book_id": book_id}) if book_id else ("", {})
+
+
+def pack_pages(conn, book_id=None, batch_size=500, dry_run=False) -> dict:
+    """JSON -> 打包格式，按 id 分批处理"""
+    where, params = _book_filter(book_id)
+    stats = {"pages": 0, "packed": 0, "skipped": 0, "json_bytes": 0, "packed_bytes": 0}
+    last_id = 0
+    while True:
+        rows = conn.execute(
+            text(
+                f"SELECT id, words_data FROM pages WHERE id > :last_id AND words_packed IS NULL "
+                f"AND words_data IS NOT NULL{where} ORDER BY id LIMIT :limit"
+            ),
+            {"last_id": last_id, "limit": batch_size, **params},
+        ).fetchall()
+        if not rows:
+            break
+        last_id = rows[-1][0]
+
+        updates = []
+        for page_id, raw in rows:
+            stats["pages"] += 1
+            raw_bytes = len(raw.encode("utf-8")) if isinstance(raw, str) else len(raw or b"")
+            try:
+                words = json.loads(raw)
+            except (TypeError, ValueError):
+                stats["skipped"] += 1
+                continue
+            words_data, words_packed = encode_words_for_storage(words)
+            if words_packed is None:
+                stats["skipped"] += 1
+                continue
+            stats["packed"] += 1
+            stats["json_bytes"] += raw_bytes
+            stats["packed_bytes"] += len(words_packed)
+            updates.append({"id": page_id, "words_packed": words_packed})
+
+        if updates and not dry_run:
+            conn.execute(text("UPDATE pages SET words_packed = :words_packed, words_data = NULL WHERE id = :id"), updates)
+            conn.commit()
+        logger.info(f"  已处理 {stats['pages']} 页")
+    return stats
+
+
+def unpack_pages(conn, book_id=None, batch_size=500, dry_run=False) -> dict:
+    """打包格式 -> JSON"""
+    where, params = _book_filter(book_id)
+    stats = {"pages": 0, "json_bytes": 0, "packed_bytes": 0}
+    last_id = 0
+    while True:
+        rows = conn.execute(
+            text(
+                f"SELECT id, words_packed FROM pages WHERE id > :last_id AND words_packed IS NOT NULL{where} "
+                f"ORDER BY id LIMIT :limit"
+            ),
+            {"last_id": last_id, "limit": batch_size, **params},
+        ).fetchall()
+        if not rows:
+            break
+        last_id = rows[-1][0]
+
+        updates = []
+        for page_id, blob in rows:
+            words_data = json.dumps(unpack_words(blob), ensure_ascii=False)
+            stats["pages"] += 1
+            stats["packed_bytes"] += len(blob)
+            stats["json_bytes"] += len(words_data.encode("utf-8"))
+            updates.append({"id": page_id, "words_data": words_data})
+
+        if updates and not dry_run:
+            conn.execute(text("UPDATE pages SET words_data = :words_data, words_packed = NULL WHERE id = :id"), updates)
+            conn.commit()
+        logger.info(f"  已处理 {stats['pages']} 页")
+    return stats
+
+
+def main():
+    parser = argparse.ArgumentParser(description="迁移 pages.words_data 到打包格式")
+    parser.add_argument("--book-id", help="只迁移指定书籍 ID")
+    parser.add_argument("--batch-size", type=int, default=500, help="每批处理页数")
+    parser.add_argument("--dry-run", action="store_true", help="只统计，不写入")
+    parser.add_argument("--unpack", action="store_true", help="反向迁移为 JSON")
+    args = parser.parse_args()
+
+    with engine.connect() as conn:
+        ensure_column(conn)
+        conn.commit()
+        migrate = unpack_pages if args.unpack else pack_pages
+        stats = migrate(conn, book_id=args.book_id, batch_size=args.batch_size, dry_run=args.dry_run)
+
+    json_mb = stats["json_bytes"] / 1024 / 1024
+    packed_mb = stats["packed_bytes"] / 1024 / 1024
+    ratio = stats["packed_bytes"] / stats["json_bytes"] if stats["json_bytes"] else 0
+    logger.info(f"完成：{stats}")
+    logger.info(f"JSON {json_mb:.2f} MB -> 打包 {packed_mb:.2f} MB（{ratio:.0%}）{'（dry-run，未写入）' if args.dry_run else ''}")
+    if not args.dry_run:
+        logger.info("提示：可执行 VACUUM 回收数据库文件空间")
+
+
+if __name__ == "__main__":
+    main()
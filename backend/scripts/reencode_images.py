@@ -0,0 +1,180 @@
+#!/usr/bin/env python3
+"""
+缩略图与封面重新编码脚本
+
+把已有书库中的缩略图（uploads/thumbnails/<book_id>/page_N.*）和封面（uploads/covers/）
+按当前输出配置（THUMBNAIL_FORMAT/QUALITY、COVER_FORMAT/QUALITY）重新编码，缩略图同时
+套用每本书的存储预算（THUMBNAIL_BUDGET_MB）。重新编码后不比原文件小的图片保持原样；
+封面文件名变化时同步更新 books.cover_image。完成后输出节省的字节数。
+
+用法：
+    cd backend
+    python scripts/reencode_images.py
+
+可选参数：
+    --book-id <id>        只处理指定书籍
+    --format <fmt>        覆盖输出格式（webp | jpeg | png）
+    --quality <n>         覆盖输出质量（1-100）
+    --budget-mb <n>       覆盖每本书缩略图预算（MB，0 表示不限制）
+    --thumbnails-only     只处理缩略图
+    --covers-only         只处理封面
+    --dry-run             只统计重新编码后的大小，不写入
+"""
+
+import sys
+import os
+import argparse
+import logging
+from pathlib import Path
+
+# 确保能找到 app 包
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+from app.models.database import SessionLocal, UPLOADS_DIR
+from app.models.models import Book
+from app.services.image_output import (
+    COVER_OUTPUT,
+    IMAGE_EXTENSIONS,
+    THUMBNAIL_BUDGET_BYTES,
+    THUMBNAIL_OUTPUT,
+    ImageOutput,
+    page_budget,
+    transcode_image,
+)
+from app.services.thumbnail_service import write_atomic
+
+logging.basicConfig(
+    level=logging.INFO,
+    format="%(asctime)s [%(levelname)s] %(message)s",
+)
+logger = logging.getLogger(__name__)
+
+
+def new_stats() -> dict:
+    return {"files": 0, "reencoded": 0, "kept": 0, "failed": 0, "bytes_before": 0, "bytes_after": 0}
+
+
+def reencode_file(path: Path, output: ImageOutput, max_bytes, stats: dict, dry_run: bool = False) -> Path:
+    """重新编码单个图片文件，返回处理后的文件路径（未变化时为原路径）"""
+    data = path.read_bytes()
+    stats["files"] += 1
+    stats["bytes_before"] += len(data)
+
+    result = transcode_image(data, output, max_bytes)
+    if result is None:
+        stats["failed"] += 1
+        stats["bytes_after"] += len(data)
+        return path
+
+    encoded, ext = result
+    if len(encoded) >= len(data) and (max_bytes is None or len(data) <= max_bytes):
+        # 原文件已经更小且满足预算，保持原样
+        stats["kept"] += 1
+        stats["bytes_after"] += len(data)
+        return path
+
+    stats["reencoded"] += 1
+    stats["bytes_after"] += len(encoded)
+    target = path.with_suffix(ext)
+    if not dry_run:
+        write_atomic(target, encoded)
+        if target != path:
+            path.unlink()
+    return target
+
+
+def reencode_thumbnails(db, output: ImageOutput, budget_bytes: int, book_id=None, dry_run=False) -> dict:
+    stats = new_stats()
+    thumbnails_root = UPLOADS_DIR / "thumbnails"
+    if not thumbnails_root.exists():
+        return stats
+
+    book_dirs = [thumbnails_root / book_id] if book_id else sorted(p for p in thumbnails_root.iterdir() if p.is_dir())
+    for book_dir in book_dirs:
+        if not book_dir.exists():
+            continue
+        files = sorted(p for p in book_dir.glob("page_*") if p.suffix.lower() in IMAGE_EXTENSIONS)
+        if not files:
+            continue
+        book = db.query(Book).filter(Book.id == book_dir.name).first()
+        page_count = (book.total_pages if book and book.total_pages else 0) or len(files)
+        max_bytes = page_budget(budget_bytes, page_count)
+
+        before, after = stats["bytes_before"], stats["bytes_after"]
+        for path in files:
+            try:
+                reencode_file(path, output, max_bytes, stats, dry_run)
+            except Exception as e:
+                logger.warning(f"  [失败] {path}: {e}")
+                stats["failed"] += 1
+        saved = (stats["bytes_before"] - before) - (stats["bytes_after"] - after)
+        logger.info(f"  缩略图 {book_dir.name}: {len(files)} 张，节省 {saved / 1024:.0f} KB")
+    return stats
+
+
+def reencode_covers(db, output: ImageOutput, book_id=None, dry_run=False) -> dict:
+    stats = new_stats()
+    covers_dir = UPLOADS_DIR / "covers"
+    query = db.query(Book).filter(Book.cover_image.isnot(None))
+    if book_id:
+        query = query.filter(Book.id == book_id)
+
+    for book in query.all():
+        path = covers_dir / book.cover_image
+        if not path.exists() or path.suffix.lower() not in IMAGE_EXTENSIONS:
+            continue
+        try:
+            target = reencode_file(path, output, None, stats, dry_run)
+        except Exception as e:
+            logger.warning(f"  [失败] {path}: {e}")
+            stats["failed"] += 1
+            continue
+        if target.name != book.cover_image and not dry_run:
+            book.cover_image = target.name
+            db.commit()
+    return stats
+
+
+def report(label: str, stats: dict, dry_run: bool):
+    before_mb = stats["bytes_before"] / 1024 / 1024
+    after_mb = stats["bytes_after"] / 1024 / 1024
+    saved_mb = before_mb - after_mb
+    logger.info(f"{label}：{stats}")
+    logger.info(
+        f"{label} {before_mb:.2f} MB -> {after_mb:.2f} MB，节省 {saved_mb:.2f} MB"
+        f"{'（dry-run，未写入）' if dry_run else ''}"
+    )
+
+
+def main():
+    parser = argparse.ArgumentParser(description="按当前输出配置重新编码缩略图与封面")
+    parser.add_argument("--book-id", help="只处理指定书籍 ID")
+    parser.add_argument("--format", help="输出格式（webp | jpeg | png）")
+    parser.add_argument("--quality", type=int, help="输出质量（1-100）")
+    parser.add_argument("--budget-mb", type=float, help="每本书缩略图预算（MB，0 表示不限制）")
+    parser.add_argument("--thumbnails-only", action="store_true", help="只处理缩略图")
+    parser.add_argument("--covers-only", action="store_true", help="只处理封面")
+    parser.add_argument("--dry-run", action="store_true", help="只统计，不写入")
+    args = parser.parse_args()
+
+    def resolve_output(default: ImageOutput) -> ImageOutput:
+        return ImageOutput(args.format or default.format, args.quality or default.quality)
+
+    budget_bytes = THUMBNAIL_BUDGET_BYTES if args.budget_mb is None else int(args.budget_mb * 1024 * 1024)
+
+    db = SessionLocal()
+    try:
+        if not args.covers_only:
+            output = resolve_output(THUMBNAIL_OUTPUT)
+            logger.info(f"重新编码缩略图：{output.format} q={output.quality}，每本书预算 {budget_bytes / 1024 / 1024:.1f} MB")
+            report("缩略图", reencode_thumbnails(db, output, budget_bytes, args.book_id, args.dry_run), args.dry_run)
+        if not args.thumbnails_only:
+            output = resolve_output(COVER_OUTPUT)
+            logger.info(f"重新编码封面：{output.format} q={output.quality}")
+            report("封面", reencode_covers(db, output, args.book_id, args.dry_run), args.dry_run)
+    finally:
+        db.close()
+
+
+if __name__ == "__main__":
+    main()
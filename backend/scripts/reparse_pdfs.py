@@ -12,6 +12,7 @@ PDF 重解析脚本
 可选参数：
     --book-id <id>   只重解析指定书籍
     --dry-run        只列出待处理书籍，不实际写入数据库
+    --workers <n>    解析进程数（默认按 CPU 核数，1 为串行）
 """
 
 import sys
@@ -20,11 +21,13 @@ import argparse
 import logging
 import json
 from pathlib import Path
+from typing import Optional
 
 # 确保能找到 app 包
 sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
 
 from app.parsers.pdf_parser import PDFParser
+from app.utils.words_codec import encode_words_for_storage
 from app.models.database import SessionLocal, UPLOADS_DIR
 from sqlalchemy import text
 
@@ -49,7 +52,7 @@ def resolve_book_path(file_path: str) -> Path:
     return (UPLOADS_DIR / path.name).resolve()
 
 
-def reparse_book(db, book_id: str, file_path: Path, dry_run: bool = False) -> bool:
+def reparse_book(db, book_id: str, file_path: Path, dry_run: bool = False, workers: Optional[int] = None) -> bool:
     """重解析单本 PDF，更新所有页面的文本和单词坐标。"""
     if not file_path.exists():
         logger.warning(f"  [跳过] 文件不存在: {file_path}")
@@ -57,7 +60,7 @@ def reparse_book(db, book_id: str, file_path: Path, dry_run: bool = False) -> bo
 
     logger.info(f"  解析中... {file_path.name}")
     try:
-        parser = PDFParser()
+        parser = PDFParser(workers=workers)
         result = parser.parse(str(file_path), book_id)
         pages = result.get("pages", [])
         logger.info(f"  解析完成，共 {len(pages)} 页")
@@ -69,7 +72,14 @@ def reparse_book(db, book_id: str, file_path: Path, dry_run: bool = False) -> bo
         for page in pages:
             page_num = page["page_number"]
             text_content = page.get("text_content", "")
-            words_data = page.get("words_data", [])
+            words_data, words_packed = encode_words_for_storage(page.get("words_data", []))
+            params = {
+                "book_id": book_id,
+                "page_num": page_num,
+                "text_content": text_content,
+                "words_data": json.dumps(words_data, ensure_ascii=False) if words_data is not None else None,
+                "words_packed": words_packed,
+            }
 
             # 检查是否已有该页记录
             existing = db.execute(
@@ -81,28 +91,18 @@ def reparse_book(db, book_id: str, file_path: Path, dry_run: bool = False) -> bo
                 db.execute(
                     text("""
                         UPDATE pages
-                        SET text_content = :text_content, words_data = :words_data
+                        SET text_content = :text_content, words_data = :words_data, words_packed = :words_packed
                         WHERE book_id = :book_id AND page_number = :page_num
                     """),
-                    {
-                        "book_id": book_id,
-                        "page_num": page_num,
-                        "text_content": text_content,
-                        "words_data": json.dumps(words_data, ensure_ascii=False),
-                    },
+                    params,
                 )
             else:
                 db.execute(
                     text("""
-                        INSERT INTO pages (book_id, page_number, text_content, words_data, images)
-                        VALUES (:book_id, :page_num, :text_content, :words_data, '[]')
+                        INSERT INTO pages (book_id, page_number, text_content, words_data, words_packed, images)
+                        VALUES (:book_id, :page_num, :text_content, :words_data, :words_packed, '[]')
                     """),
-                    {
-                        "book_id": book_id,
-                        "page_num": page_num,
-                        "text_content": text_content,
-                        "words_data": json.dumps(words_data, ensure_ascii=False),
-                    },
+                    params,
                 )
 
         db.commit()
@@ -119,6 +119,7 @@ def main():
     parser = argparse.ArgumentParser(description="重解析数据库中的 PDF 书籍")
     parser.add_argument("--book-id", help="只重解析指定书籍 ID")
     parser.add_argument("--dry-run", action="store_true", help="仅列出，不写入")
+    parser.add_argument("--workers", type=int, default=None, help="解析进程数（默认按 CPU 核数，1 为串行）")
     args = parser.parse_args()
 
     db = SessionLocal()
@@ -146,7 +147,7 @@ def main():
             resolved_path = resolve_book_path(file_path)
 
             logger.info(f"\n[{book_id[:8]}...] {title}")
-            ok = reparse_book(db, book_id, resolved_path, dry_run=args.dry_run)
+            ok = reparse_book(db, book_id, resolved_path, dry_run=args.dry_run, workers=args.workers)
             if ok:
                 success += 1
             else:
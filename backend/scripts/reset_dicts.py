@@ -39,6 +39,11 @@ def reset_dicts():
     if index_db.exists():
         index_db.unlink()
         print(f"Deleted {index_db}")
+    # WAL 模式的附属文件，残留的 -wal 会被新建的索引库误读
+    for suffix in ("-wal", "-shm"):
+        sidecar = index_db.with_name(index_db.name + suffix)
+        if sidecar.exists():
+            sidecar.unlink()
 
     # 3.1. Delete index DB (Backend/Data - Legacy/Ghost location)
     legacy_index_db = project_root / "backend" / "data" / "mdx_index.db"
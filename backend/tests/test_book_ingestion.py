@@ -0,0 +1,143 @@
+import json
+
+import pytest
+from fastapi import BackgroundTasks, HTTPException
+from sqlalchemy import create_engine
+from sqlalchemy.orm import sessionmaker
+from sqlalchemy.pool import StaticPool
+
+from app.models.database import Base
+from app.models.models import Book, Page
+from app.parsers.txt_parser import CHARS_PER_PAGE, TXTParser
+from app.routers import books
+from app.services import book_service
+
+
+@pytest.fixture
+def session_factory(monkeypatch):
+    engine = create_engine(
+        "sqlite://", connect_args={"check_same_thread": False}, poolclass=StaticPool
+    )
+    Base.metadata.create_all(engine, tables=[Book.__table__, Page.__table__])
+    factory = sessionmaker(bind=engine, autocommit=False, autoflush=False)
+    monkeypatch.setattr(book_service, "SessionLocal", factory)
+    yield factory
+    engine.dispose()
+
+
+def _write_txt(path, pages):
+    """写入约 pages 页的英文文本"""
+    line = "The quick brown fox jumps over the lazy dog again and again.\n"
+    path.write_text(line * (CHARS_PER_PAGE // len(line) * pages), encoding="utf-8")
+
+
+def _add_book(factory, book_id, filename):
+    db = factory()
+    db.add(Book(id=book_id, title="sample", format="txt", file_path=f"uploads/{filename}", status="processing"))
+    db.commit()
+    db.close()
+
+
+def test_parse_matches_iter_pages(tmp_path):
+    """测试 parse 与 read_metadata + iter_pages 结果一致"""
+    path = tmp_path / "book.txt"
+    _write_txt(path, 3)
+
+    parsed = TXTParser().parse(str(path), "book-1")
+    parser = TXTParser()
+    metadata = parser.read_metadata(str(path), "book-1")
+    pages = list(parser.iter_pages(str(path), "book-1"))
+
+    assert parsed["pages"] == pages
+    assert parsed["total_pages"] == metadata["total_pages"] == len(pages)
+    assert [p["page_number"] for p in pages] == list(range(1, len(pages) + 1))
+
+
+def test_ingestion_commits_pages_in_batches(tmp_path, session_factory, monkeypatch):
+    """测试逐批提交：解析过程中已入库的页面和进度对其他会话可见"""
+    _write_txt(tmp_path / "book.txt", 12)
+    _add_book(session_factory, "book-1", "book.txt")
+    monkeypatch.setattr(book_service, "UPLOADS_DIR", tmp_path)
+    monkeypatch.setattr(book_service, "INGEST_FIRST_BATCH_PAGES", 2)
+    monkeypatch.setattr(book_service, "INGEST_BATCH_PAGES", 5)
+
+    observed = []
+    iter_pages = TXTParser.iter_pages
+
+    def observing_iter_pages(self, file_path, book_id):
+        for page in iter_pages(self, file_path, book_id):
+            db = session_factory()
+            book = db.query(Book).filter(Book.id == book_id).first()
+            observed.append((page["page_number"], book.processed_pages, db.query(Page).count()))
+            db.close()
+            yield page
+
+    monkeypatch.setattr(TXTParser, "iter_pages", observing_iter_pages)
+
+    book_service.verify_and_process_book_task("book-1")
+
+    db = session_factory()
+    book = db.query(Book).filter(Book.id == "book-1").first()
+    assert book.status == "completed"
+    assert book.processed_pages == book.total_pages == db.query(Page).count()
+    assert book.language == "en"
+    db.close()
+
+    # 第 3 页解析时首批（2 页）已提交，第 8 页解析时第二批（5 页）已提交
+    progress = {page_number: processed for page_number, processed, _ in observed}
+    assert progress[1] == 0
+    assert progress[3] == 2
+    assert progress[8] == 7
+    assert all(processed == count for _, processed, count in observed)
+
+
+def test_reprocessing_replaces_existing_pages(tmp_path, session_factory, monkeypatch):
+    """测试重新处理同一本书不会留下重复页面"""
+    _write_txt(tmp_path / "book.txt", 3)
+    _add_book(session_factory, "book-1", "book.txt")
+    monkeypatch.setattr(book_service, "UPLOADS_DIR", tmp_path)
+
+    book_service.verify_and_process_book_task("book-1")
+    book_service.verify_and_process_book_task("book-1")
+
+    db = session_factory()
+    book = db.query(Book).filter(Book.id == "book-1").first()
+    assert db.query(Page).count() == book.total_pages
+    db.close()
+
+
+def test_page_not_ready_while_processing(session_factory):
+    """测试入库中尚未写入的页面返回可重试的 404"""
+    db = session_factory()
+    db.add(Book(id="book-1", title="sample", format="txt", file_path="uploads/book.txt", status="processing", total_pages=10))
+    db.commit()
+
+    with pytest.raises(HTTPException) as exc:
+        books.get_book_page("book-1", 5, BackgroundTasks(), db)
+    assert exc.value.detail == "Page not ready"
+    assert exc.value.headers == {"Retry-After": "1"}
+
+    # 超出总页数时仍是普通 404
+    with pytest.raises(HTTPException) as exc:
+        books.get_book_page("book-1", 11, BackgroundTasks(), db)
+    assert exc.value.detail == "Page not found"
+    db.close()
+
+
+def test_page_words_are_stored_packed(tmp_path, session_factory, monkeypatch):
+    """测试入库时单词坐标写入打包列，页面接口返回与解析结果相同的 words_data"""
+    _write_txt(tmp_path / "book.txt", 2)
+    _add_book(session_factory, "book-1", "book.txt")
+    monkeypatch.setattr(book_service, "UPLOADS_DIR", tmp_path)
+
+    book_service.verify_and_process_book_task("book-1")
+
+    expected = next(TXTParser().iter_pages(str(tmp_path / "book.txt"), "book-1"))["words_data"]
+    db = session_factory()
+    page = db.query(Page).filter(Page.book_id == "book-1", Page.page_number == 1).first()
+    assert page.words_data is None
+    assert page.words_packed is not None
+
+    response = books.get_book_page("book-1", 1, BackgroundTasks(), db)
+    assert json.loads(response.body)["words_data"] == expected
+    db.close()
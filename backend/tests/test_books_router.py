@@ -1,9 +1,26 @@
 from pathlib import Path
 
+import fitz
+import pytest
 from fastapi import HTTPException
 from fastapi.responses import FileResponse
+from sqlalchemy import create_engine
+from sqlalchemy.orm import sessionmaker
 
+from app.models.database import Base
+from app.models.models import Book
 from app.routers import books
+from app.services.image_output import THUMBNAIL_OUTPUT
+
+
+@pytest.fixture
+def db_session():
+    engine = create_engine("sqlite://")
+    Base.metadata.create_all(engine, tables=[Book.__table__])
+    session = sessionmaker(bind=engine)()
+    yield session
+    session.close()
+    engine.dispose()
 
 
 def test_get_page_thumbnail_reads_from_uploads_dir(tmp_path, monkeypatch):
@@ -14,7 +31,6 @@ def test_get_page_thumbnail_reads_from_uploads_dir(tmp_path, monkeypatch):
     thumbnail_path = thumbnail_dir / "page_2.png"
     thumbnail_path.write_bytes(b"png")
 
-    monkeypatch.setattr(books, "BASE_DIR", tmp_path)
     monkeypatch.setattr(books, "UPLOADS_DIR", uploads_dir)
 
     response = books.get_page_thumbnail("book-1", 2)
@@ -23,18 +39,42 @@ def test_get_page_thumbnail_reads_from_uploads_dir(tmp_path, monkeypatch):
     assert Path(response.path) == thumbnail_path
 
 
-def test_get_page_thumbnail_returns_404_when_missing(tmp_path, monkeypatch):
+def test_get_page_thumbnail_returns_404_when_missing(tmp_path, monkeypatch, db_session):
     """测试缩略图缺失时返回 404"""
     uploads_dir = tmp_path / "uploads"
     uploads_dir.mkdir(parents=True)
 
-    monkeypatch.setattr(books, "BASE_DIR", tmp_path)
     monkeypatch.setattr(books, "UPLOADS_DIR", uploads_dir)
 
     try:
-        books.get_page_thumbnail("missing-book", 1)
+        books.get_page_thumbnail("missing-book", 1, db_session)
     except HTTPException as exc:
         assert exc.status_code == 404
         assert exc.detail == "Thumbnail not found"
     else:
         raise AssertionError("Expected HTTPException when thumbnail is missing")
+
+
+def test_get_page_thumbnail_renders_missing_thumbnail_on_demand(tmp_path, monkeypatch, db_session):
+    """测试缩略图缺失时按需渲染 PDF 页面并缓存"""
+    uploads_dir = tmp_path / "uploads"
+    uploads_dir.mkdir(parents=True)
+    doc = fitz.open()
+    for _ in range(2):
+        doc.new_page(width=200, height=300)
+    doc.save(uploads_dir / "file-1.pdf")
+    doc.close()
+    db_session.add(Book(id="book-1", title="t", format="pdf", file_path="uploads/file-1.pdf", status="completed"))
+    db_session.commit()
+
+    monkeypatch.setattr(books, "UPLOADS_DIR", uploads_dir)
+
+    response = books.get_page_thumbnail("book-1", 2, db_session)
+    thumbnail_path = uploads_dir / "thumbnails" / "book-1" / f"page_2{THUMBNAIL_OUTPUT.extension}"
+    assert Path(response.path) == thumbnail_path
+    assert thumbnail_path.stat().st_size > 0
+
+    # 超出页数仍返回 404
+    with pytest.raises(HTTPException) as exc:
+        books.get_page_thumbnail("book-1", 3, db_session)
+    assert exc.value.detail == "Thumbnail not found"
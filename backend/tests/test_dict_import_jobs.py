@@ -0,0 +1,94 @@
+import json
+from datetime import datetime, timedelta
+from pathlib import Path
+
+from app.services import dict_import_jobs
+from app.services.dict_import_jobs import DictImportJobs
+from app.services.dict_manager import DictManager
+
+
+def _write_job(jobs_dir: Path, job_id: str, status: str, updated_at: datetime):
+    job = {
+        "job_id": job_id,
+        "dict_name": job_id,
+        "filename": f"{job_id}.mdx",
+        "source": f"{job_id}.mdx",
+        "status": status,
+        "phase": "done" if status not in ("queued", "running") else "pending",
+        "created_at": updated_at.isoformat(),
+        "updated_at": updated_at.isoformat(),
+    }
+    (jobs_dir / f"{job_id}.json").write_text(json.dumps(job), encoding="utf-8")
+
+
+def test_prunes_expired_and_excess_finished_jobs(tmp_path: Path, monkeypatch):
+    """测试已结束任务按保留期限与数量清理，进行中的任务保留"""
+    monkeypatch.setattr(dict_import_jobs, "MAX_FINISHED_JOBS", 2)
+    manager = DictManager(dicts_dir=tmp_path / "dicts")
+    jobs_dir = manager.dicts_dir / "import_jobs"
+    jobs_dir.mkdir()
+    now = datetime.now()
+
+    _write_job(jobs_dir, "expired", "completed", now - timedelta(days=30))
+    _write_job(jobs_dir, "old-failed", "failed", now - timedelta(hours=3))
+    _write_job(jobs_dir, "recent-cancelled", "cancelled", now - timedelta(hours=2))
+    _write_job(jobs_dir, "recent-completed", "completed", now - timedelta(hours=1))
+    _write_job(jobs_dir, "still-queued", "queued", now - timedelta(days=30))
+
+    jobs = DictImportJobs(manager)
+
+    assert {j["job_id"] for j in jobs.list_jobs()} == {"recent-cancelled", "recent-completed", "still-queued"}
+    assert sorted(p.stem for p in jobs_dir.glob("*.json")) == ["recent-cancelled", "recent-completed", "still-queued"]
+
+
+def test_resumed_job_keeps_already_installed_dict(tmp_path: Path, monkeypatch):
+    """测试导入前检查发现词典已安装时不清理词典，任务标记为完成"""
+    manager = DictManager(dicts_dir=tmp_path / "dicts")
+    jobs = DictImportJobs(manager)
+    _write_job(jobs.jobs_dir, "resumed", "running", datetime.now())
+    (jobs.jobs_dir / "resumed.mdx").write_bytes(b"mdx")
+    job = json.loads((jobs.jobs_dir / "resumed.json").read_text(encoding="utf-8"))
+    job["phase"] = "indexing"
+    jobs._jobs["resumed"] = job
+
+    removed = []
+    monkeypatch.setattr(manager, "get_dicts", lambda: [])
+
+    def import_dict(*args, **kwargs):
+        raise dict_import_jobs.DictAlreadyExists("词典 resumed 已存在")
+
+    monkeypatch.setattr(manager, "import_dict", import_dict)
+    monkeypatch.setattr(manager, "remove_dict", removed.append)
+
+    jobs._run_job("resumed")
+
+    assert removed == []
+    assert jobs.get("resumed")["status"] == "completed"
+
+
+def test_submit_copies_upload_outside_lock(tmp_path: Path, monkeypatch):
+    """测试上传文件落盘时不持有任务锁，同名词典在落盘期间不能重复提交"""
+    manager = DictManager(dicts_dir=tmp_path / "dicts")
+    jobs = DictImportJobs(manager)
+    monkeypatch.setattr(jobs, "_enqueue", lambda job_id: None)
+
+    class Upload:
+        def __init__(self):
+            self.chunks = [b"mdx-data", b""]
+
+        def read(self, size=-1):
+            assert not jobs._lock.locked()
+            assert jobs.list_jobs() == []
+            try:
+                jobs.submit(Upload(), "other.mdx", "sample")
+            except ValueError as e:
+                assert "正在导入中" in str(e)
+            else:
+                raise AssertionError("同名词典落盘期间重复提交应当失败")
+            return self.chunks.pop(0)
+
+    job = jobs.submit(Upload(), "sample.mdx", "sample")
+
+    assert job["status"] == "queued"
+    assert job["bytes_total"] == len(b"mdx-data")
+    assert jobs._reserved_names == set()
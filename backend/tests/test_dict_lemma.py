@@ -10,9 +10,11 @@ from app.services import jmdict_service
 
 @pytest.fixture(autouse=True)
 def clear_lemma_caches():
-    dict_service._get_ecdict_entry_info.cache_clear()
+    dict_service._get_ecdict_entry_info_from_db.cache_clear()
+    dict_service.get_lookup_cache().invalidate()
     yield
-    dict_service._get_ecdict_entry_info.cache_clear()
+    dict_service._get_ecdict_entry_info_from_db.cache_clear()
+    dict_service.get_lookup_cache().invalidate()
 
 
 def test_get_lemma_candidates_handles_double_consonant_and_plural():
@@ -104,6 +106,16 @@ def test_lookup_word_all_sources_tries_lemma_per_dictionary(monkeypatch):
                 return {"word": "fleck", "meanings": [{"partOfSpeech": "n.", "definitions": [{"definition": "a small spot"}]}]}
             return None
 
+        def lookup_many(self, terms, dict_names):
+            hits = {}
+            for dict_name in dict_names:
+                for term in terms:
+                    result = self.lookup_word(term, source=dict_name)
+                    if result:
+                        hits[dict_name] = (term, result)
+                        break
+            return hits
+
         def word_exists(self, word):
             return word == "fleck"
 
@@ -246,3 +258,178 @@ def test_lookup_word_uses_japanese_lemma_for_jmdict():
     assert result["lookup_term"] == "行った"
     assert result["lemma_from"] == "行く"
     assert result["source"] == "JMdict"
+
+
+def _stub_remote(calls):
+    """代替远程兜底：记录调用并返回未找到"""
+
+    async def lookup_remote(fallback):
+        calls.append("network")
+        return None
+
+    return lookup_remote
+
+
+def test_lookup_word_serves_repeat_queries_from_cache(monkeypatch):
+    calls = []
+
+    class StubDictManager:
+        config_version = 1
+
+        def get_config_version(self):
+            return self.config_version
+
+        def lookup_word(self, word, source=None):
+            calls.append(word)
+            if word == "apple":
+                return {"word": "apple", "source": source, "html_content": "<b>apple</b>", "meanings": [{"definition": "苹果"}]}
+            return None
+
+    manager = StubDictManager()
+    monkeypatch.setattr(dict_service, "get_dict_manager", lambda: manager)
+    monkeypatch.setattr(dict_service.ecdict_service, "get_word_details", lambda word: None)
+    monkeypatch.setattr(dict_service, "_lookup_remote", _stub_remote(calls))
+    cache = dict_service.get_lookup_cache()
+    stats_before = cache.stats()
+
+    first = dict_service.lookup_word(db=None, word="Apple", source="LemmaDict")
+    first["html_content"] = "mutated by caller"
+    second = dict_service.lookup_word(db=None, word="apple", source="LemmaDict")
+    assert second["html_content"] == "<b>apple</b>"
+    assert calls.count("apple") == 1
+
+    # 未找到的结果同样缓存
+    assert dict_service.lookup_word(db=None, word="zzzz", source="LemmaDict") is None
+    lookups = len(calls)
+    assert dict_service.lookup_word(db=None, word="zzzz", source="LemmaDict") is None
+    assert len(calls) == lookups
+
+    stats = cache.stats()
+    assert stats["hits"] - stats_before["hits"] == 2
+    assert stats["negative_hits"] - stats_before["negative_hits"] == 1
+
+    # 词典配置版本变化后重新查询
+    manager.config_version = 2
+    dict_service.lookup_word(db=None, word="apple", source="LemmaDict")
+    assert calls.count("apple") == 2
+
+
+def test_prefetch_lookups_warms_cache_for_page_words(monkeypatch):
+    calls = []
+
+    class StubDictManager:
+        def get_config_version(self):
+            return 1
+
+        def get_dicts(self):
+            return [{"name": "Stub", "type": "imported", "is_active": True}]
+
+        def lookup_many_groups(self, term_groups, dict_names=None):
+            calls.append(len(term_groups))
+            hits = []
+            for terms in term_groups:
+                found = {}
+                for term in terms:
+                    if term.lower() == "apple":
+                        found["Stub"] = (term, {"word": "apple", "html_content": "<b>apple</b>", "meanings": []})
+                        break
+                hits.append(found)
+            return hits
+
+        def lookup_many(self, terms, dict_names=None):
+            calls.append("single")
+            return {}
+
+    monkeypatch.setattr(dict_service, "get_dict_manager", lambda: StubDictManager())
+    monkeypatch.setattr(dict_service.ecdict_service, "get_word_details", lambda word: None)
+    monkeypatch.setattr(dict_service, "_lookup_remote", _stub_remote(calls))
+
+    stats = dict_service.prefetch_lookups(["Apple,", "apple", "zzzz"])
+    assert stats == {"requested": 2, "warmed": 1, "cached": 0}
+    # 整批单词只查询一次，且不触发 AI / 网络兜底
+    assert calls == [2]
+
+    result = dict_service.lookup_word(db=None, word="apple")
+    assert result["source"] == "Stub"
+    assert calls == [2]
+
+    # 已缓存的单词不再重复预取
+    assert dict_service.prefetch_lookups(["apple"]) == {"requested": 0, "warmed": 0, "cached": 1}
+
+
+def test_batch_lookup_streams_ndjson_with_set_based_queries(monkeypatch):
+    import json
+    from fastapi.testclient import TestClient
+    from app.main import app
+
+    calls = []
+
+    class StubDictManager:
+        def get_config_version(self):
+            return 1
+
+        def get_dicts(self):
+            return [{"name": "Stub", "type": "imported", "is_active": True}]
+
+        def lookup_many_groups(self, term_groups, dict_names=None):
+            calls.append(("mdx", len(term_groups)))
+            return [
+                {"Stub": ("apple", {"word": "apple", "html_content": "<b>apple</b>", "meanings": []})}
+                if "apple" in [t.lower() for t in terms]
+                else {}
+                for terms in term_groups
+            ]
+
+        def word_exists(self, word):
+            calls.append(("single", word))
+            return False
+
+    def get_words_details(words):
+        words = list(words)
+        calls.append(("ecdict", len(words)))
+        return {w: ({"word": "pear", "translation": "梨", "phonetic": "peə"} if w == "pear" else None) for w in words}
+
+    monkeypatch.setattr(dict_service, "get_dict_manager", lambda: StubDictManager())
+    monkeypatch.setattr(dict_service.ecdict_service, "get_words_details", get_words_details)
+    monkeypatch.setattr(dict_service.ecdict_service, "get_word_details", lambda word: calls.append(("single", word)))
+    monkeypatch.setattr(dict_service, "_lookup_remote", _stub_remote(calls))
+
+    response = TestClient(app).post("/api/dict/batch", json={"words": ["Apple", "pear", "zzzz", "apple"]})
+    assert response.status_code == 200
+    assert response.headers["content-type"].startswith("application/x-ndjson")
+
+    lines = [json.loads(line) for line in response.text.splitlines()]
+    assert [line["word"] for line in lines] == ["Apple", "pear", "zzzz", "apple"]
+    assert [line["found"] for line in lines] == [True, True, False, True]
+    assert lines[0]["result"]["source"] == "Stub"
+    assert lines[1]["result"]["source"] == "ECDICT"
+    assert lines[2]["result"] is None
+
+    # 原型候选、导入词典、词头补充各一次集合查询，没有逐词查询或网络请求
+    assert [c[0] for c in calls] == ["ecdict", "mdx", "ecdict"]
+
+
+def test_batch_lookup_rejects_too_many_words():
+    from fastapi.testclient import TestClient
+    from app.main import app
+
+    words = ["word"] * (dict_service.BATCH_LOOKUP_MAX_WORDS + 1)
+    response = TestClient(app).post("/api/dict/batch", json={"words": words})
+    assert response.status_code == 400
+
+
+def test_lemma_validation_uses_explicit_preloaded_details(monkeypatch):
+    """批量查询预先取回的 ECDICT 结果通过参数传入原型校验，不再逐词查询，也不依赖模块级共享状态"""
+    calls = []
+    monkeypatch.setattr(dict_service, "get_headword_index", lambda: None)
+    monkeypatch.setattr(dict_service.lemma_service, "get_lemmas", lambda word: ())
+    monkeypatch.setattr(dict_service.ecdict_service, "get_word_details", lambda word: calls.append(word))
+
+    preloaded = {"boxes": {"pos": "n:100"}, "box": {"pos": "n:80/v:20"}, "boxe": None}
+    assert dict_service._get_lemma_candidates("boxes", preloaded=preloaded) == ["box"]
+    assert dict_service._get_lookup_terms("boxes", preloaded=preloaded) == ["box", "boxes"]
+    assert calls == []
+
+    # 同一组数据可被多次、并发使用，不会被前一次调用消耗掉
+    assert dict_service._get_lemma_candidates("boxes", preloaded=preloaded) == ["box"]
+    assert calls == []
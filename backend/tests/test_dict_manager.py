@@ -1,6 +1,7 @@
 import pytest
 import tempfile
 import shutil
+import time
 from pathlib import Path
 from app.services.dict_manager import DictManager
 
@@ -135,3 +136,378 @@ def test_lookup_word_not_found(dict_manager: DictManager):
     result = dict_manager.lookup_word("nonexistentwordxyz")
 
     assert result is None
+
+
+def _add_indexed_dict(manager: DictManager, name: str, entries: dict) -> None:
+    """直接写入索引库和配置，构造一个已导入的词典"""
+    import sqlite3
+
+    conn = sqlite3.connect(manager.index_db)
+    cursor = conn.execute("INSERT INTO dicts (name, filename, size) VALUES (?, ?, 0)", (name, f"{name}.mdx"))
+    dict_id = cursor.lastrowid
+    conn.executemany(
+        "INSERT INTO entries (dict_id, word, word_lower, content) VALUES (?, ?, ?, ?)",
+        [(dict_id, word, word.lower(), content) for word, content in entries.items()],
+    )
+    conn.commit()
+    conn.close()
+
+    manager.config["dicts"][name] = {"name": name, "filename": f"{name}.mdx", "size": 0, "is_active": True}
+    manager.config["priority"].insert(0, name)
+    manager._save_config(manager.config)
+    manager._invalidate_dict_ids()
+
+
+def test_lookup_reuses_thread_connection(dict_manager: DictManager, monkeypatch):
+    """测试重复查询复用线程内连接，不再每次 connect"""
+    import sqlite3
+
+    _add_indexed_dict(dict_manager, "DictA", {"apple": "<span class=\"pos\">n.</span> 苹果"})
+    _add_indexed_dict(dict_manager, "DictB", {"apple": "苹果公司"})
+    dict_manager.lookup_word("apple")
+
+    connect_calls = []
+    original_connect = sqlite3.connect
+    monkeypatch.setattr(sqlite3, "connect", lambda *a, **kw: connect_calls.append(a) or original_connect(*a, **kw))
+
+    for _ in range(5):
+        assert dict_manager.lookup_word("apple", source="DictB")["source"] == "DictB"
+        assert dict_manager.check_sources("apple") == {"DictA": True, "DictB": True}
+
+    assert connect_calls == []
+
+
+def test_dict_id_cache_invalidated_on_remove(dict_manager: DictManager):
+    """测试删除词典后 dict_id 缓存失效"""
+    _add_indexed_dict(dict_manager, "DictA", {"apple": "苹果"})
+    assert "DictA" in dict_manager._get_dict_ids()
+
+    dict_manager.remove_dict("DictA")
+
+    assert "DictA" not in dict_manager._get_dict_ids()
+    assert dict_manager.lookup_word("apple") is None
+
+
+def test_lookup_does_not_reread_config(dict_manager: DictManager, monkeypatch):
+    """测试查询热路径不再重复读取 dicts_config.json"""
+    _add_indexed_dict(dict_manager, "DictA", {"apple": "苹果"})
+    dict_manager._refresh_config(force=True)
+
+    load_calls = []
+    original_load = dict_manager._load_config
+    monkeypatch.setattr(dict_manager, "_load_config", lambda: load_calls.append(1) or original_load())
+
+    for _ in range(5):
+        assert dict_manager.lookup_word("apple") is not None
+        dict_manager.check_sources("apple")
+        dict_manager.get_dicts()
+
+    assert load_calls == []
+
+
+def test_external_config_edit_is_picked_up(dict_manager: DictManager):
+    """测试外部修改配置文件后，内存配置会重新加载并递增版本号"""
+    import json
+
+    _add_indexed_dict(dict_manager, "DictA", {"apple": "苹果"})
+    assert dict_manager.lookup_word("apple") is not None
+    version = dict_manager.config_version
+
+    config = json.loads(dict_manager.config_file.read_text(encoding="utf-8"))
+    config["dicts"]["DictA"]["is_active"] = False
+    dict_manager.config_file.write_text(json.dumps(config, indent=4), encoding="utf-8")
+
+    dict_manager._refresh_config(force=True)
+
+    assert dict_manager.config_version > version
+    assert dict_manager.lookup_word("apple") is None
+
+
+def test_lookup_many_resolves_terms_and_redirects(dict_manager: DictManager):
+    """测试批量查询：按词典优先级返回、每个词典取第一个命中词、解析重定向"""
+    _add_indexed_dict(dict_manager, "DictA", {"flecks": "@@@LINK=fleck", "fleck": "<span class=\"pos\">n.</span> 斑点"})
+    _add_indexed_dict(dict_manager, "DictB", {"flecks": "斑点（复数）"})
+    _add_indexed_dict(dict_manager, "DictC", {"fleck": "@@@LINK=missing"})
+
+    hits = dict_manager.lookup_many(["fleck", "flecks"], ["DictA", "DictB", "DictC"])
+
+    # 后导入的词典排在优先级前面
+    assert list(hits) == ["DictB", "DictA"]
+    term, result = hits["DictA"]
+    assert term == "fleck"
+    assert result["word"] == "fleck"
+    assert result["partOfSpeech"] == "n."
+    assert hits["DictB"][0] == "flecks"
+
+    term, result = dict_manager.lookup_many(["flecks"], ["DictA"])["DictA"]
+    assert term == "flecks"
+    assert result["word"] == "fleck"
+
+
+def test_lookup_many_skips_inactive_dicts(dict_manager: DictManager):
+    """测试批量查询跳过已禁用词典"""
+    _add_indexed_dict(dict_manager, "DictA", {"apple": "苹果"})
+    dict_manager.toggle_dict("DictA", False)
+
+    assert dict_manager.lookup_many(["apple"], ["DictA"]) == {}
+
+
+def test_legacy_index_db_is_migrated_to_composite_index(temp_dicts_dir: Path):
+    """测试旧版索引库启动时迁移为 (dict_id, word_lower) 复合索引"""
+    import sqlite3
+
+    index_db = temp_dicts_dir / "mdx_index.db"
+    conn = sqlite3.connect(index_db)
+    conn.execute("CREATE TABLE dicts (id INTEGER PRIMARY KEY AUTOINCREMENT, name TEXT NOT NULL UNIQUE, filename TEXT NOT NULL, size INTEGER, word_count INTEGER, created_at TIMESTAMP, is_active BOOLEAN DEFAULT 1)")
+    conn.execute("CREATE TABLE entries (id INTEGER PRIMARY KEY AUTOINCREMENT, dict_id INTEGER NOT NULL, word TEXT NOT NULL, word_lower TEXT NOT NULL, offset INTEGER DEFAULT 0, length INTEGER DEFAULT 0)")
+    conn.execute("CREATE INDEX idx_entries_word ON entries(word_lower)")
+    conn.execute("CREATE INDEX idx_entries_dict ON entries(dict_id)")
+    conn.commit()
+    conn.close()
+
+    manager = DictManager(dicts_dir=temp_dicts_dir)
+
+    conn = sqlite3.connect(manager.index_db)
+    indexes = {row[0] for row in conn.execute("SELECT name FROM sqlite_master WHERE type='index' AND tbl_name='entries'")}
+    plan = " ".join(str(row) for row in conn.execute("EXPLAIN QUERY PLAN SELECT word FROM entries WHERE dict_id = 1 AND word_lower = 'a'"))
+    version = conn.execute("PRAGMA user_version").fetchone()[0]
+    conn.close()
+
+    assert "idx_entries_dict_word" in indexes
+    assert "idx_entries_word" not in indexes
+    assert "idx_entries_dict_word" in plan
+    assert version >= 1
+
+
+def test_compressed_content_is_transparent(dict_manager: DictManager):
+    """测试压缩存储的词条内容在查询时透明解压"""
+    import sqlite3
+    import zlib
+
+    long_html = "<span class=\"pos\">n.</span> 苹果 " + "<i>example</i> " * 50
+    _add_indexed_dict(dict_manager, "DictA", {"apple": "placeholder", "apples": "@@@LINK=apple"})
+    conn = sqlite3.connect(dict_manager.index_db)
+    conn.execute("UPDATE entries SET content = ? WHERE word_lower = 'apple'", (zlib.compress(long_html.encode("utf-8")),))
+    conn.commit()
+    conn.close()
+
+    result = dict_manager.lookup_word("apples")
+    assert result["word"] == "apple"
+    assert result["partOfSpeech"] == "n."
+
+    term, result = dict_manager.lookup_many(["apples"], ["DictA"])["DictA"]
+    assert result["html_content"] == long_html
+
+
+def test_compact_index_round_trip(dict_manager: DictManager):
+    """测试压缩命令重写内容并报告体积，解压后内容不变"""
+    import sqlite3
+
+    long_html = "<div>" + "释义 definition " * 100 + "</div>"
+    _add_indexed_dict(dict_manager, "DictA", {"apple": long_html, "apples": "@@@LINK=apple"})
+
+    report = dict_manager.compact_index(compress=True)
+    stats = report["dicts"][0]
+    assert stats["name"] == "DictA"
+    assert stats["rewritten"] == 1
+    assert stats["content_bytes_after"] < stats["content_bytes_before"]
+
+    conn = sqlite3.connect(dict_manager.index_db)
+    types = dict(conn.execute("SELECT word_lower, typeof(content) FROM entries").fetchall())
+    conn.close()
+    assert types == {"apple": "blob", "apples": "text"}
+    assert dict_manager.lookup_word("apple")["html_content"] == long_html
+
+    dict_manager.compact_index(compress=False, vacuum=False)
+    assert dict_manager.lookup_word("apple")["html_content"] == long_html
+
+
+def _write_mdx(path: Path, entries: dict) -> Path:
+    """使用 mdict_utils 生成真实的 MDX 文件"""
+    from mdict_utils.base.writemdict import MDictWriter
+
+    writer = MDictWriter(entries, "Test", "Test dictionary")
+    with open(path, "wb") as f:
+        writer.write(f)
+    return path
+
+
+def test_import_dict_bulk_index_reports_progress(dict_manager: DictManager, temp_dicts_dir: Path):
+    """测试批量导入：全部词条可查询，并通过 progress_callback 报告总数和速率"""
+    entries = {f"word{i}": f"<span class=\"pos\">n.</span> 释义 {i}" for i in range(12000)}
+    entries["alias"] = "@@@LINK=word7"
+    mdx_file = _write_mdx(temp_dicts_dir / "bulk.mdx", entries)
+
+    progress = []
+    result = dict_manager.import_dict(mdx_file, "BulkDict", progress_callback=lambda *args: progress.append(args))
+
+    assert result["word_count"] == len(entries)
+    assert progress[-1][0] == len(entries)
+    assert all(total == len(entries) and rate >= 0 for _, total, rate in progress)
+    assert dict_manager.lookup_word("alias")["word"] == "word7"
+    assert dict_manager.lookup_word("WORD11999")["source"] == "BulkDict"
+
+
+def test_import_dict_resumes_from_checkpoint(dict_manager: DictManager, temp_dicts_dir: Path):
+    """测试导入中断后从检查点继续，且不会重复写入词条"""
+    from app.services.dict_manager import ImportCancelled
+
+    entries = {f"word{i:05d}": f"释义 {i}" for i in range(12000)}
+    mdx_file = _write_mdx(temp_dicts_dir / "resume.mdx", entries)
+
+    calls = []
+    with pytest.raises(ImportCancelled):
+        dict_manager.import_dict(
+            mdx_file,
+            "ResumeDict",
+            progress_callback=lambda *args: calls.append(args),
+            should_cancel=lambda: len(calls) >= 1,
+        )
+    assert dict_manager.lookup_word("word00001") is None
+
+    # 模拟重启：新的管理器实例从检查点继续
+    manager = DictManager(dicts_dir=temp_dicts_dir)
+    progress = []
+    result = manager.import_dict(mdx_file, "ResumeDict", progress_callback=lambda *args: progress.append(args), resume=True)
+
+    assert result["word_count"] == len(entries)
+    assert progress[0][0] > calls[0][0]
+    assert manager.lookup_word("word00001")["source"] == "ResumeDict"
+    assert manager.lookup_word("word11999")["source"] == "ResumeDict"
+
+    import sqlite3
+
+    conn = sqlite3.connect(manager.index_db)
+    total = conn.execute("SELECT COUNT(*) FROM entries").fetchone()[0]
+    leftovers = conn.execute("SELECT COUNT(*) FROM entries_staging").fetchone()[0]
+    checkpoints = conn.execute("SELECT COUNT(*) FROM import_checkpoints").fetchone()[0]
+    conn.close()
+    assert (total, leftovers, checkpoints) == (len(entries), 0, 0)
+
+
+def _write_mdd(path: Path, resources: dict) -> Path:
+    """使用 mdict_utils 生成真实的 MDD 资源文件"""
+    from mdict_utils.base.writemdict import MDictWriter
+
+    writer = MDictWriter(resources, "Test", "Test resources", is_mdd=True)
+    with open(path, "wb") as f:
+        writer.write(f)
+    return path
+
+
+def test_get_resource_reuses_reader_and_caches_bytes(dict_manager: DictManager, temp_dicts_dir: Path, monkeypatch):
+    """测试 MDD 资源读取：读取器跨请求复用，热点资源命中字节缓存"""
+    from app.services import mdx_parser
+
+    png = bytes(range(256)) * 8
+    source_dir = temp_dicts_dir / "source"
+    source_dir.mkdir()
+    mdx_file = _write_mdx(source_dir / "res.mdx", {"apple": "<img src=\"img/a.png\">"})
+    _write_mdd(source_dir / "res.mdd", {"\\img\\a.png": png, "\\style.css": b"body{}"})
+    dict_manager.import_dict(mdx_file, "ResDict")
+
+    opened = []
+    original_init = mdx_parser.MDXParser.__init__
+
+    def counting_init(self, path):
+        opened.append(path)
+        original_init(self, path)
+
+    monkeypatch.setattr(mdx_parser.MDXParser, "__init__", counting_init)
+
+    data, etag = dict_manager.get_resource_with_etag("ResDict", "img/a.png")
+    assert data == png
+    assert dict_manager.get_resource("ResDict", "/style.css") == b"body{}"
+    assert dict_manager.get_resource_with_etag("ResDict", "img/a.png") == (data, etag)
+    assert dict_manager.get_resource("ResDict", "img/missing.png") is None
+    assert len(opened) <= 1
+
+    dict_manager.remove_dict("ResDict")
+    assert dict_manager.get_resource("ResDict", "img/a.png") is None
+
+
+def test_lookup_reuses_stored_projection(dict_manager: DictManager, monkeypatch):
+    """测试音标/词性/中文摘要只在首次查询时解析，规则版本变化后重新派生"""
+    from app.services import dict_manager as dict_manager_module
+
+    html = '<span class="phon">/ˈæp.əl/</span><span class="pos">noun</span><div>苹果；苹果树</div>'
+    _add_indexed_dict(dict_manager, "ProjDict", {"apple": html})
+
+    calls = []
+    original = DictManager._extract_chinese_summary
+    monkeypatch.setattr(
+        DictManager, "_extract_chinese_summary", lambda self, content: calls.append(1) or original(self, content)
+    )
+
+    first = dict_manager.lookup_word("apple")
+    second = dict_manager.lookup_word("apple")
+    assert first == second
+    assert (first["phonetic"], first["partOfSpeech"]) == ("ˈæp.əl", "noun")
+    assert "苹果" in first["chinese_summary"]
+    assert len(calls) == 1
+
+    monkeypatch.setattr(dict_manager_module, "PROJECTION_VERSION", dict_manager_module.PROJECTION_VERSION + 1)
+    dict_manager.lookup_word("apple")
+    assert len(calls) == 2
+
+
+def test_lookup_many_groups_batches_projection_writes(dict_manager: DictManager, monkeypatch):
+    """测试批量查询的派生字段一次取回、由后台合并回写；索引库被导入锁住时不等待写锁"""
+    import sqlite3
+
+    words = {f"word{i}": f'<span class="pos">noun</span><div>释义{i}</div>' for i in range(30)}
+    _add_indexed_dict(dict_manager, "ProjDict", words)
+
+    saved = []
+    original_save = dict_manager._save_projections
+    monkeypatch.setattr(dict_manager, "_save_projections", lambda rows: saved.append(rows) or original_save(rows))
+
+    groups = [[word] for word in words] + [["word0"]]
+    results = dict_manager.lookup_many_groups(groups)
+    assert all(result["ProjDict"][1]["partOfSpeech"] == "noun" for result in results)
+    # 查询路径只入队，不做写事务
+    assert saved == []
+    dict_manager.flush_projections()
+    assert len(saved) == 1 and len(saved[0]) == len(words)
+
+    # 全部命中已存储的派生字段，不再回写
+    dict_manager.lookup_many_groups(groups)
+    dict_manager.flush_projections()
+    assert len(saved) == 1
+
+    # 另一个连接持有写锁（如后台导入）：查询照常返回，回写直接跳过
+    _add_indexed_dict(dict_manager, "OtherDict", {"pear": '<span class="pos">noun</span>梨'})
+    writer = sqlite3.connect(dict_manager.index_db)
+    writer.execute("BEGIN IMMEDIATE")
+    try:
+        started = time.perf_counter()
+        assert dict_manager.lookup_many(["pear"])["OtherDict"][1]["partOfSpeech"] == "noun"
+        dict_manager.flush_projections()
+        assert time.perf_counter() - started < 0.5
+    finally:
+        writer.rollback()
+        writer.close()
+
+    # 写锁释放后，未写入的派生字段在下一次回写时落盘
+    assert dict_manager._pending_projections
+    dict_manager.flush_projections()
+    assert not dict_manager._pending_projections
+    assert len(saved) == 3
+
+
+def test_derive_projections_precomputes_entries(dict_manager: DictManager):
+    """测试批量重建派生字段：跳过重定向条目，force 时全部重建"""
+    _add_indexed_dict(
+        dict_manager,
+        "ProjDict",
+        {"apple": '<span class="pos">noun</span>苹果', "pear": "梨", "apples": "@@@LINK=apple"},
+    )
+
+    report = dict_manager.derive_projections()
+    assert report["dicts"] == {"ProjDict": 2}
+    assert dict_manager.derive_projections()["dicts"] == {"ProjDict": 0}
+
+    forced = dict_manager.derive_projections(force=True)
+    assert forced["cleared"] == 2
+    assert forced["dicts"] == {"ProjDict": 2}
+    assert dict_manager.lookup_word("apples")["partOfSpeech"] == "noun"
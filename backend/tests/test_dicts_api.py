@@ -2,9 +2,21 @@ import pytest
 from fastapi.testclient import TestClient
 from pathlib import Path
 import tempfile
+import time
 from app.main import app
 
 
+def _wait_for_job(client, job_id: str, timeout: float = 10.0) -> dict:
+    """轮询导入任务直到结束"""
+    deadline = time.time() + timeout
+    while time.time() < deadline:
+        job = client.get(f"/api/dicts/import/{job_id}").json()
+        if job["status"] not in ("queued", "running"):
+            return job
+        time.sleep(0.05)
+    raise AssertionError(f"导入任务超时: {job_id}")
+
+
 @pytest.fixture
 def client(tmp_path: Path):
     """测试客户端 fixture，确保使用独立的临时目录"""
@@ -80,6 +92,62 @@ class TestImportDict:
         assert "文件过大" in data["detail"]
 
 
+    def test_import_dict_runs_as_job(self, client, tmp_path: Path):
+        """测试导入立即返回任务 ID，后台完成后可查询结果"""
+        from mdict_utils.base.writemdict import MDictWriter
+
+        mdx_file = tmp_path / "jobdict.mdx"
+        writer = MDictWriter({"apple": "<b>apple</b>", "banana": "<b>banana</b>"}, "Test", "Test dictionary")
+        with open(mdx_file, "wb") as f:
+            writer.write(f)
+
+        with open(mdx_file, "rb") as f:
+            files = {"file": ("jobdict.mdx", f, "application/octet-stream")}
+            response = client.post("/api/dicts/import", files=files)
+
+        assert response.status_code == 202
+        job = _wait_for_job(client, response.json()["job"]["job_id"])
+        assert job["status"] == "completed"
+        assert job["entries_indexed"] == 2
+        assert job["bytes_processed"] == job["bytes_total"]
+        assert any(d["name"] == "jobdict" for d in client.get("/api/dicts").json())
+
+    def test_import_job_not_found(self, client):
+        """测试查询和取消不存在的导入任务"""
+        assert client.get("/api/dicts/import/missing").status_code == 404
+        assert client.delete("/api/dicts/import/missing").status_code == 404
+
+
+class TestDictResource:
+    """测试词典资源 API"""
+
+    def test_resource_etag_and_not_modified(self, client, tmp_path: Path):
+        """测试资源响应带 ETag/Cache-Control，条件请求返回 304"""
+        from mdict_utils.base.writemdict import MDictWriter
+
+        for suffix, entries, is_mdd in (
+            (".mdx", {"apple": "<b>apple</b>"}, False),
+            (".mdd", {"\\img\\a.png": b"\x89PNG" + b"0" * 64}, True),
+        ):
+            with open(tmp_path / f"resdict{suffix}", "wb") as f:
+                MDictWriter(entries, "Test", "Test", is_mdd=is_mdd).write(f)
+
+        from app.routers.dicts import get_dict_manager
+
+        get_dict_manager().import_dict(tmp_path / "resdict.mdx", "resdict")
+
+        response = client.get("/api/dicts/resdict/resource/img/a.png")
+        assert response.status_code == 200
+        assert response.headers["content-type"] == "image/png"
+        assert "max-age" in response.headers["cache-control"]
+        etag = response.headers["etag"]
+
+        response = client.get("/api/dicts/resdict/resource/img/a.png", headers={"If-None-Match": etag})
+        assert response.status_code == 304
+
+        assert client.get("/api/dicts/resdict/resource/img/missing.png").status_code == 404
+
+
 class TestDeleteDict:
     """测试删除词典 API"""
 
@@ -109,7 +177,8 @@ class TestToggleDict:
         # 先导入一个词典
         with open(valid_mdx_file, "rb") as f:
             files = {"file": ("test.mdx", f, "application/octet-stream")}
-            client.post("/api/dicts/import", files=files)
+            response = client.post("/api/dicts/import", files=files)
+        _wait_for_job(client, response.json()["job"]["job_id"])
 
         # 启用它
         response = client.patch("/api/dicts/test/toggle", json={"active": True})
@@ -122,7 +191,8 @@ class TestToggleDict:
         # 先导入一个词典
         with open(valid_mdx_file, "rb") as f:
             files = {"file": ("test.mdx", f, "application/octet-stream")}
-            client.post("/api/dicts/import", files=files)
+            response = client.post("/api/dicts/import", files=files)
+        _wait_for_job(client, response.json()["job"]["job_id"])
 
         # 禁用它
         response = client.patch("/api/dicts/test/toggle", json={"active": False})
@@ -0,0 +1,101 @@
+import sqlite3
+from pathlib import Path
+
+import pytest
+
+from app.services import ecdict_service
+
+
+@pytest.fixture
+def ecdict_db(tmp_path: Path, monkeypatch):
+    """与 ECDICT 发行版相同结构的最小 stardict 表（word 列为 COLLATE NOCASE）"""
+    db_path = tmp_path / "ecdict.db"
+    conn = sqlite3.connect(db_path)
+    conn.execute(
+        'CREATE TABLE stardict (id INTEGER PRIMARY KEY, "word" VARCHAR(64) COLLATE NOCASE NOT NULL UNIQUE, '
+        "phonetic TEXT, definition TEXT, translation TEXT, pos TEXT, exchange TEXT)"
+    )
+    conn.executemany(
+        "INSERT INTO stardict (word, phonetic, translation, pos) VALUES (?, ?, ?, ?)",
+        [
+            ("apple", "ˈæpl", "n. 苹果", "n:100"),
+            ("spot", "spɒt", "n. 斑点", "n:60/v:40"),
+            ("study", "ˈstʌdi", "v. 学习", "v:70/n:30"),
+            ("bake", "beɪk", "v. 烘焙", "v:100"),
+            ("US", "ˌjuːˈes", "美国", ""),
+        ],
+    )
+    conn.commit()
+    conn.close()
+
+    monkeypatch.setattr(ecdict_service, "get_db_path", lambda: str(db_path))
+    yield db_path
+    ecdict_service._pool.close_all()
+
+
+def test_get_word_details_direct_case_and_lemma(ecdict_db):
+    """原词、大小写变体和词形还原都能命中"""
+    assert ecdict_service.get_word_details("apple")["translation"] == "n. 苹果"
+    assert ecdict_service.get_word_details("Apple")["word"] == "apple"
+    assert ecdict_service.get_word_details("spotted")["word"] == "spot"
+    assert ecdict_service.get_word_details("studies")["word"] == "study"
+    assert ecdict_service.get_word_details("baking")["word"] == "bake"
+    assert ecdict_service.get_word_details("us")["word"] == "US"
+    assert ecdict_service.get_word_details("zzzz") is None
+
+
+def test_get_word_details_runs_single_query(ecdict_db):
+    """每次查词只执行一条 SELECT，不再查询 PRAGMA table_info"""
+    ecdict_service.get_word_details("apple")
+    conn = ecdict_service._get_connection()
+    statements = []
+    conn.set_trace_callback(statements.append)
+    try:
+        assert ecdict_service.get_word_details("spotted")["word"] == "spot"
+    finally:
+        conn.set_trace_callback(None)
+
+    assert len(statements) == 1
+    assert "PRAGMA" not in statements[0]
+
+
+def test_get_words_details_matches_single_lookups(ecdict_db):
+    """批量查询结果与逐词查询一致"""
+    words = ["Apple", "spotted", "studies", "baking", "us", "zzzz"]
+    batch = ecdict_service.get_words_details(words)
+    assert batch == {word: ecdict_service.get_word_details(word) for word in words}
+
+
+def test_headword_index_lookup_and_pos(ecdict_db):
+    """词头索引不区分大小写，返回归一化词性；不存在的词返回 None"""
+    from app.services.ecdict_headwords import HeadwordIndex
+
+    conn = sqlite3.connect(ecdict_db)
+    index = HeadwordIndex.from_rows(conn.execute("SELECT word, pos FROM stardict"))
+    conn.close()
+
+    assert len(index) == 5
+    assert index.lookup("Spot") == ("n", "v")
+    assert index.lookup("us") == ()
+    assert "APPLE" in index
+    assert index.lookup("spotted") is None
+    assert index.lookup("") is None
+    assert index.memory_bytes() > 0
+
+
+def test_lemma_validation_uses_headword_index_without_sqlite(ecdict_db, monkeypatch):
+    """词头索引加载后，原型生成与校验不再查询 ECDICT 或导入词典"""
+    from app.services import dict_service, ecdict_headwords
+
+    index = ecdict_headwords.HeadwordIndex.from_rows([("spot", "n:60/v:40"), ("study", "v:70/n:30")])
+    monkeypatch.setattr(ecdict_headwords, "_index", index)
+
+    def fail(*args, **kwargs):
+        raise AssertionError("不应访问 SQLite")
+
+    monkeypatch.setattr(dict_service.ecdict_service, "get_word_details", fail)
+    monkeypatch.setattr(dict_service, "get_dict_manager", fail)
+
+    assert "spot" in dict_service._get_lookup_terms("spotted")
+    assert "study" in dict_service._get_lookup_terms("studies")
+    assert dict_service._get_ecdict_entry_info("zzzz") == (False, ())
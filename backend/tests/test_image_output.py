@@ -0,0 +1,78 @@
+import fitz
+import pytest
+
+from app.parsers.epub_parser import EPUBParser
+from app.parsers.pdf_parser import PDFParser
+from app.services.image_output import ImageOutput, encode_pixmap, page_budget, transcode_image
+
+
+@pytest.fixture
+def pixmap():
+    doc = fitz.open()
+    page = doc.new_page(width=300, height=400)
+    for i in range(30):
+        page.insert_text((20, 20 + i * 12), f"Line {i} of a page preview with some text", fontsize=9)
+    pix = page.get_pixmap(matrix=fitz.Matrix(2, 2))
+    doc.close()
+    return pix
+
+
+def test_formats_and_quality(pixmap):
+    """测试各格式输出与质量参数"""
+    png = encode_pixmap(pixmap, ImageOutput("png"))
+    jpeg_high = encode_pixmap(pixmap, ImageOutput("jpg", 95))
+    jpeg_low = encode_pixmap(pixmap, ImageOutput("jpeg", 40))
+    webp = encode_pixmap(pixmap, ImageOutput("webp", 70))
+
+    assert png.startswith(b"\x89PNG")
+    assert jpeg_high.startswith(b"\xff\xd8") and len(jpeg_low) < len(jpeg_high)
+    assert webp[8:12] == b"WEBP" and len(webp) < len(png)
+    assert ImageOutput("jpg").extension == ".jpg"
+    with pytest.raises(ValueError):
+        ImageOutput("bmp")
+
+
+def test_budget_reduces_quality_then_size(pixmap):
+    """测试超出单页上限时逐级降质、缩小"""
+    output = ImageOutput("jpeg", 90)
+    full = encode_pixmap(pixmap, output)
+    limited = encode_pixmap(pixmap, output, max_bytes=len(full) // 3)
+    assert len(limited) <= len(full) // 3
+
+    # 达不到上限时返回尝试过的最小结果
+    smallest = encode_pixmap(pixmap, output, max_bytes=1)
+    assert 1 < len(smallest) <= len(limited)
+
+    assert page_budget(0, 100) is None
+    assert page_budget(1000, 10) == 100
+
+
+def test_transcode_image(pixmap):
+    """测试重新编码任意位图，无法解码时返回 None"""
+    data, ext = transcode_image(pixmap.tobytes("png"), ImageOutput("jpeg", 70))
+    assert ext == ".jpg" and data.startswith(b"\xff\xd8")
+    assert transcode_image(b"<svg xmlns='http://www.w3.org/2000/svg'></svg>", ImageOutput()) is None
+
+
+def test_cover_extractors_use_cover_output(tmp_path, pixmap, monkeypatch):
+    """测试 PDF/EPUB 封面按 COVER_OUTPUT 编码保存"""
+    monkeypatch.setattr("app.parsers.pdf_parser.COVER_OUTPUT", ImageOutput("jpeg", 80))
+    monkeypatch.setattr("app.parsers.epub_parser.COVER_OUTPUT", ImageOutput("jpeg", 80))
+
+    pdf_path = tmp_path / "book.pdf"
+    doc = fitz.open()
+    doc.new_page(width=200, height=300).insert_text((20, 40), "Cover")
+    doc.save(pdf_path)
+    doc.close()
+    metadata = PDFParser(workers=1).read_metadata(str(pdf_path), "book-1")
+    assert metadata["cover_image"] == "book-1_cover.jpg"
+    assert (tmp_path / "covers" / "book-1_cover.jpg").read_bytes().startswith(b"\xff\xd8")
+
+    # EPUB：PNG 封面转为更小的 JPEG；SVG 保持原样
+    covers_dir = tmp_path / "epub_covers"
+    covers_dir.mkdir()
+    parser = EPUBParser()
+    assert parser._save_cover(pixmap.tobytes("png"), ".png", covers_dir, "book-2") == "book-2_cover.jpg"
+    svg = b"<svg xmlns='http://www.w3.org/2000/svg'>" + b" " * 200 + b"</svg>"
+    assert parser._save_cover(svg, ".svg", covers_dir, "book-3") == "book-3_cover.svg"
+    assert (covers_dir / "book-3_cover.svg").read_bytes() == svg
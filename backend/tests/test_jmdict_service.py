@@ -0,0 +1,104 @@
+import gzip
+import importlib.util
+from pathlib import Path
+
+import pytest
+
+from app.services import jmdict_service
+
+JMDICT_XML = """<?xml version="1.0" encoding="UTF-8"?>
+<JMdict>
+<entry><ent_seq>1358280</ent_seq>
+  <k_ele><keb>食べる</keb><ke_pri>ichi1</ke_pri></k_ele>
+  <r_ele><reb>たべる</reb><re_pri>ichi1</re_pri></r_ele>
+  <sense><pos>Ichidan verb</pos><gloss>to eat</gloss></sense>
+</entry>
+<entry><ent_seq>1586420</ent_seq>
+  <k_ele><keb>見る</keb><ke_pri>ichi1</ke_pri></k_ele>
+  <r_ele><reb>みる</reb></r_ele>
+  <sense><pos>Ichidan verb</pos><gloss>to see</gloss><gloss>to look</gloss></sense>
+</entry>
+</JMdict>
+"""
+
+
+def _load_build_script():
+    path = Path(__file__).resolve().parents[1] / "scripts" / "build_jmdict_db.py"
+    spec = importlib.util.spec_from_file_location("build_jmdict_db", path)
+    module = importlib.util.module_from_spec(spec)
+    spec.loader.exec_module(module)
+    return module
+
+
+@pytest.fixture
+def jmdict_db(tmp_path: Path, monkeypatch):
+    """用构建脚本从最小 JMdict XML 生成词库"""
+    source = tmp_path / "JMdict_e.gz"
+    with gzip.open(source, "wt", encoding="utf-8") as f:
+        f.write(JMDICT_XML)
+    output = tmp_path / "jmdict.db"
+    _load_build_script().build_database(source, output)
+
+    monkeypatch.setattr(jmdict_service, "get_db_path", lambda: str(output))
+    jmdict_service.clear_payload_cache()
+    yield output
+    jmdict_service.clear_payload_cache()
+    jmdict_service._pool.close_all()
+
+
+def _trace(statements):
+    conn = jmdict_service._get_connection()
+    conn.set_trace_callback(statements.append)
+    return conn
+
+
+def test_metadata_records_format(jmdict_db):
+    metadata = jmdict_service._load_metadata()
+    assert metadata["format_version"] == "2"
+    assert metadata["payload_format"] == "json"
+    assert jmdict_service.get_entry_count() == 2
+
+
+def test_decoded_payloads_are_cached_by_entry_id(jmdict_db):
+    """第二次查询同一词条不再读取和解码 payload"""
+    first = jmdict_service.get_word_details("食べる")
+    assert first["word"] == "食べる"
+    assert first["phonetic"] == "たべる"
+    assert first["meanings"][0]["definitions"] == [{"definition": "to eat"}]
+
+    statements = []
+    conn = _trace(statements)
+    try:
+        # 以读音查询命中同一词条
+        second = jmdict_service.get_word_details("たべる")
+    finally:
+        conn.set_trace_callback(None)
+
+    assert second["raw_data"]["entries"] == first["raw_data"]["entries"]
+    assert not any("payload" in sql for sql in statements)
+
+
+def test_first_word_details_resolves_terms_in_one_query(jmdict_db):
+    """多个检索词一次 IN 查询，按顺序返回第一个命中的词"""
+    statements = []
+    conn = _trace(statements)
+    try:
+        term, result = jmdict_service.get_first_word_details(["食べた", "食べる", "見る"])
+    finally:
+        conn.set_trace_callback(None)
+
+    assert term == "食べる"
+    assert result["word"] == "食べる"
+    term_queries = [sql for sql in statements if "FROM terms" in sql]
+    assert len(term_queries) == 1
+    assert jmdict_service.get_first_word_details(["無い"]) is None
+
+
+def test_lookup_jmdict_terms_uses_batched_resolution(jmdict_db, monkeypatch):
+    from app.services import dict_service
+
+    monkeypatch.setattr(jmdict_service, "get_word_details", lambda word: pytest.fail("不应逐词查询"))
+    result = dict_service._lookup_jmdict_terms("見た", ["見る", "見た"])
+    assert result["word"] == "見る"
+    assert result["lookup_term"] == "見た"
+    assert result["lemma_from"] == "見る"
@@ -0,0 +1,132 @@
+import sqlite3
+from pathlib import Path
+
+import pytest
+
+from app.services import lemma_service
+
+
+@pytest.fixture
+def lemma_db(tmp_path: Path, monkeypatch):
+    """由带 exchange 字段的最小 stardict 表生成词形还原表"""
+    ecdict_path = tmp_path / "ecdict.db"
+    conn = sqlite3.connect(ecdict_path)
+    conn.execute("CREATE TABLE stardict (word TEXT COLLATE NOCASE UNIQUE, exchange TEXT)")
+    conn.executemany(
+        "INSERT INTO stardict VALUES (?, ?)",
+        [
+            ("run", "p:ran/d:run/i:running/3:runs"),
+            ("ran", "0:run/1:p"),
+            ("mouse", "s:mice"),
+            ("good", "r:better/t:best"),
+            ("well", "r:better/t:best"),
+            ("apple", ""),
+        ],
+    )
+    conn.commit()
+    conn.close()
+
+    output = tmp_path / "ecdict_lemmas.db"
+    assert lemma_service.build_lemma_table(str(ecdict_path), str(output)) == 8
+
+    monkeypatch.setattr(lemma_service, "get_db_path", lambda: str(output))
+    monkeypatch.setattr(lemma_service, "_forms_to_lemmas", None)
+    monkeypatch.setattr(lemma_service, "_lemmas_to_forms", None)
+    yield output
+    lemma_service._pool.close_all()
+
+
+def test_parse_exchange():
+    assert lemma_service.parse_exchange("Run", "p:ran/d:run/i:running") == [("ran", "run", "p"), ("running", "run", "i")]
+    assert lemma_service.parse_exchange("ran", "0:run/1:p") == [("ran", "run", "p")]
+    assert lemma_service.parse_exchange("apple", "") == []
+
+
+def test_lookup_from_table(lemma_db):
+    """建表后一次索引查询即可还原，metadata 记录格式版本"""
+    conn = sqlite3.connect(lemma_db)
+    metadata = dict(conn.execute("SELECT key, value FROM metadata"))
+    kinds = conn.execute("SELECT kinds FROM inflections WHERE form = 'ran'").fetchone()[0]
+    conn.close()
+    assert metadata["format_version"] == str(lemma_service.LEMMA_TABLE_VERSION)
+    assert kinds == "p"
+
+    assert lemma_service.get_lemmas("Ran") == ("run",)
+    assert lemma_service.get_lemmas("better") == ("good", "well")
+    assert lemma_service.get_lemmas("apple") == ()
+    assert set(lemma_service.get_inflections("run")) == {"ran", "running", "runs"}
+    assert lemma_service.get_lemma_candidates("mice") == ["mouse"]
+    # 表中没有的词回退到后缀规则
+    assert lemma_service.get_lemma_candidates("baked") == ["bak", "bake"]
+
+
+def test_in_memory_table_matches_sqlite(lemma_db):
+    words = ["ran", "better", "mice", "apple", "running"]
+    from_sqlite = {w: lemma_service.get_lemmas(w) for w in words}
+    assert lemma_service.load_lemma_table()
+    assert {w: lemma_service.get_lemmas(w) for w in words} == from_sqlite
+    assert set(lemma_service.get_inflections("mouse")) == {"mice"}
+
+
+def test_call_sites_share_lemma_table(lemma_db, monkeypatch):
+    """查词原型候选、ECDICT 词形回退、例句提取变体都使用同一张表"""
+    from app.services import dict_service, ecdict_service
+    from app.utils.lemmatizer import get_word_variants
+
+    monkeypatch.setattr(dict_service, "_get_ecdict_entry_info", lambda word, preloaded=None: (False, ()))
+    assert dict_service._get_lemma_candidates("mice") == ["mouse"]
+    assert ecdict_service._inflection_candidates("ran") == ["run"]
+    assert {"mouse", "mice"} <= get_word_variants("mice")
+    assert {"run", "ran", "running", "runs"} <= get_word_variants("ran")
+
+
+def test_call_sites_share_rule_fallback(monkeypatch):
+    """表中没有的词：三处调用都回退到 lemma_service 的同一套规则"""
+    from app.services import dict_service, ecdict_service
+    from app.utils.lemmatizer import get_word_variants
+
+    monkeypatch.setattr(lemma_service, "get_db_path", lambda: "/nonexistent/ecdict_lemmas.db")
+    monkeypatch.setattr(lemma_service, "_forms_to_lemmas", None)
+    monkeypatch.setattr(lemma_service, "_lemmas_to_forms", None)
+    headwords = {"spot": ("v", "n"), "box": ("n",), "happy": ("j",), "strew": ("v",), "this": ("r",)}
+    monkeypatch.setattr(
+        dict_service,
+        "_get_ecdict_entry_info",
+        lambda word, preloaded=None: (word in headwords, headwords.get(word, ())),
+    )
+    monkeypatch.setattr(dict_service, "get_dict_manager", lambda: None)
+
+    for word in ("spotted", "boxes", "happier", "strewn", "evening"):
+        expected = lemma_service.rule_candidates(word)
+        assert dict_service._get_lemma_candidates(word, validate_candidates=False) == expected
+        assert ecdict_service._inflection_candidates(word) == expected
+        # 例句变体只加入通过校验的候选
+        validated = set(dict_service.get_validated_lemmas(word))
+        assert validated <= get_word_variants(word)
+        assert not (set(expected) - validated) & get_word_variants(word)
+
+    assert "thi" not in get_word_variants("this")
+    assert lemma_service.rule_candidates("strewn") == ["strew"]
+    assert lemma_service.rule_candidates("evening") == []
+    assert {"went", "gone", "goes", "going"} <= get_word_variants("go")
+
+
+def test_rule_fallback_keeps_homographs_and_candidate_order(monkeypatch):
+    """表中没有的词：同形词保留全部原型，规则候选顺序与查词侧原有规则一致"""
+    from app.services import dict_service
+
+    monkeypatch.setattr(lemma_service, "get_db_path", lambda: "/nonexistent/ecdict_lemmas.db")
+    monkeypatch.setattr(lemma_service, "_forms_to_lemmas", None)
+    monkeypatch.setattr(lemma_service, "_lemmas_to_forms", None)
+    monkeypatch.setattr(dict_service, "_get_ecdict_entry_info", lambda word, preloaded=None: (False, ()))
+
+    def fallback(word):
+        return dict_service._get_lemma_candidates(word, validate_candidates=False)
+
+    assert fallback("lives") == ["life", "live"]
+    assert fallback("axes") == ["axis", "axe"]
+    assert fallback("walked") == ["walk", "walke"]
+    assert fallback("running") == ["run", "runne", "runn"]
+    # 双写形式由规则生成，不再逐词列入不规则表
+    assert {"ran", "running"} <= set(lemma_service.rule_inflections("run"))
+    assert "stopped" in lemma_service.rule_inflections("stop")
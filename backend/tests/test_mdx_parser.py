@@ -19,3 +19,89 @@ def test_parse_empty_header(test_file):
     entries = list(parser.parse())
 
     assert len(entries) == 0, "空文件应该没有词条"
+
+
+def _write_dict(path: Path, entries: dict, is_mdd: bool = False) -> Path:
+    """生成多记录块的 MDX/MDD 文件（小块便于覆盖跨块定位）"""
+    from mdict_utils.base.writemdict import MDictWriter
+
+    writer = MDictWriter(entries, "Test", "Test", block_size=1024, is_mdd=is_mdd)
+    with open(path, "wb") as f:
+        writer.write(f)
+    return path
+
+
+def test_parse_records_offsets_for_direct_reads(tmp_path: Path):
+    """测试解析时记录真实偏移，按偏移直接读取的内容与顺序解析一致"""
+    entries = {f"word{i:04d}": f"<p>definition {i} " + "x" * (i % 50) + "</p>" for i in range(400)}
+    parser = MDXParser(_write_dict(tmp_path / "offsets.mdx", entries))
+
+    parsed = list(parser.parse())
+    assert len(parser._get_block_table()) > 1
+    assert parsed[1]["offset"] > 0
+    for entry in parsed[::37] + parsed[-1:]:
+        assert parser.get_entry_content(entry["offset"], entry["length"]) == entry["content"].strip("\x00")
+
+
+
+
+def test_parse_resume_skips_earlier_record_blocks(tmp_path: Path, monkeypatch):
+    """测试从检查点继续解析：结果与完整解析的后半段一致，且之前的记录块不再解压"""
+    entries = {f"word{i:04d}": f"<p>definition {i} " + "x" * (i % 50) + "</p>" for i in range(400)}
+    path = _write_dict(tmp_path / "resume.mdx", entries)
+    full = list(MDXParser(path).parse())
+
+    parser = MDXParser(path)
+    blocks = parser._get_block_table()
+    start = 300
+    decoded = []
+    original = parser.mdx._decode_block
+    monkeypatch.setattr(parser.mdx, "_decode_block", lambda *args: decoded.append(1) or original(*args))
+
+    assert list(parser.parse(start=start)) == full[start:]
+    first_block = max(i for i, block in enumerate(blocks) if block[2] <= full[start]["offset"])
+    assert len(decoded) == len(blocks) - first_block < len(blocks)
+    assert list(parser.parse(start=len(full))) == []
+
+def test_read_at_decompresses_each_block_once(tmp_path: Path, monkeypatch):
+    """测试 MDD 资源按偏移读取，同一记录块只解压一次"""
+    resources = {f"\\img\\{i:03d}.png": bytes([i % 256]) * (100 + i) for i in range(60)}
+    parser = MDXParser(_write_dict(tmp_path / "res.mdd", resources, is_mdd=True))
+    spans = {e["word"]: (e["offset"], e["length"]) for e in parser.parse()}
+
+    decoded = []
+    original = parser.mdx._decode_block
+    monkeypatch.setattr(parser.mdx, "_decode_block", lambda *args: decoded.append(1) or original(*args))
+
+    for _ in range(3):
+        for key, data in resources.items():
+            assert parser.read_at(*spans[key]) == data
+    assert len(decoded) == len(parser._get_block_table())
+    parser.close()
+
+
+def test_cached_parser_eviction_closes_readers(tmp_path: Path, monkeypatch):
+    """测试读取器被 LRU 淘汰或文件被替换时释放内存映射，被淘汰的读取器仍可重新读取"""
+    from app.services import mdx_parser
+
+    monkeypatch.setattr(mdx_parser, "MAX_OPEN_READERS", 1)
+    monkeypatch.setattr(mdx_parser, "_reader_cache", mdx_parser.OrderedDict())
+    first_path = _write_dict(tmp_path / "first.mdx", {"apple": "<p>apple</p>"})
+    second_path = _write_dict(tmp_path / "second.mdx", {"pear": "<p>pear</p>"})
+
+    first = mdx_parser.get_cached_parser(first_path)
+    assert first.get_content_by_word("apple") == "<p>apple</p>"
+    assert first._mm is not None
+
+    mdx_parser.get_cached_parser(second_path)
+    assert first._mm is None
+    assert first.get_content_by_word("apple") == "<p>apple</p>"
+    first.close()
+
+    second = mdx_parser.get_cached_parser(second_path)
+    second.get_content_by_word("pear")
+    _write_dict(second_path, {"pear": "<p>new pear</p>", "plum": "<p>plum</p>"})
+    replaced = mdx_parser.get_cached_parser(second_path)
+    assert replaced is not second and second._mm is None
+    assert replaced.get_content_by_word("pear") == "<p>new pear</p>"
+    mdx_parser.evict_cached_parsers()
@@ -0,0 +1,61 @@
+"""
+test_pdf_parser_parallel.py
+
+验证 PDFParser 多进程解析模式与串行解析输出一致、页码顺序不变，
+以及进程池不可用时退回串行。
+"""
+
+import fitz
+import pytest
+
+from app.parsers import pdf_parser
+from app.parsers.pdf_parser import PDFParser
+
+
+@pytest.fixture
+def two_column_pdf(tmp_path):
+    path = tmp_path / "two_column.pdf"
+    doc = fitz.open()
+    for page_num in range(1, 8):
+        page = doc.new_page(width=595, height=842)
+        page.insert_textbox(fitz.Rect(50, 50, 545, 80), f"Chapter {page_num}", fontsize=16)
+        page.insert_textbox(fitz.Rect(50, 100, 287, 792), f"Left column text of page {page_num}. " * 20, fontsize=9)
+        page.insert_textbox(fitz.Rect(307, 100, 545, 792), f"Right column text of page {page_num}. " * 20, fontsize=9)
+    doc.save(path)
+    doc.close()
+    return path
+
+
+def test_parallel_output_matches_serial(two_column_pdf, monkeypatch):
+    """测试多进程模式按页码顺序输出，且与串行结果完全一致"""
+    serial = list(PDFParser(workers=1).iter_pages(str(two_column_pdf), "book-1"))
+
+    monkeypatch.setattr(pdf_parser, "PARALLEL_MIN_PAGES", 1)
+    monkeypatch.setattr(pdf_parser, "PAGES_PER_SHARD", 2)
+    parallel = list(PDFParser(workers=2).iter_pages(str(two_column_pdf), "book-1"))
+
+    assert [page["page_number"] for page in parallel] == list(range(1, 8))
+    assert parallel == serial
+    assert "Left column text of page 3" in parallel[2]["text_content"]
+
+
+def test_falls_back_to_serial_without_process_pool(two_column_pdf, monkeypatch):
+    """测试无法创建进程池时退回串行解析"""
+
+    def unavailable(*args, **kwargs):
+        raise OSError("no processes")
+
+    monkeypatch.setattr(pdf_parser, "PARALLEL_MIN_PAGES", 1)
+    monkeypatch.setattr(pdf_parser, "ProcessPoolExecutor", unavailable)
+    pages = list(PDFParser(workers=4).iter_pages(str(two_column_pdf), "book-1"))
+
+    assert [page["page_number"] for page in pages] == list(range(1, 8))
+
+
+def test_worker_count_from_environment(monkeypatch):
+    """测试 PDF_PARSE_WORKERS 环境变量控制默认进程数"""
+    monkeypatch.setenv("PDF_PARSE_WORKERS", "3")
+    assert PDFParser().workers == 3
+
+    monkeypatch.setenv("PDF_PARSE_WORKERS", "invalid")
+    assert 1 <= PDFParser().workers <= 4
@@ -0,0 +1,58 @@
+import sqlite3
+import threading
+from pathlib import Path
+
+import pytest
+
+from app.services.readonly_db import ReadOnlyConnectionPool
+
+
+@pytest.fixture
+def db_path(tmp_path: Path) -> Path:
+    path = tmp_path / "ref.db"
+    conn = sqlite3.connect(path)
+    conn.execute("CREATE TABLE t (word TEXT)")
+    conn.execute("INSERT INTO t VALUES ('apple')")
+    conn.commit()
+    conn.close()
+    return path
+
+
+def test_connection_is_read_only_and_leaves_no_side_files(db_path):
+    """只读打开：不能写入，也不会在词库旁生成 -wal / -journal 文件"""
+    pool = ReadOnlyConnectionPool("test", lambda: str(db_path), row_factory=sqlite3.Row)
+    conn = pool.get()
+    assert conn.execute("SELECT word FROM t").fetchone()["word"] == "apple"
+    assert pool.get() is conn
+
+    with pytest.raises(sqlite3.OperationalError):
+        conn.execute("INSERT INTO t VALUES ('pear')")
+
+    pool.close_all()
+    assert sorted(p.name for p in db_path.parent.iterdir()) == ["ref.db"]
+
+
+def test_missing_database_returns_none(tmp_path: Path):
+    pool = ReadOnlyConnectionPool("test", lambda: str(tmp_path / "missing.db"))
+    assert pool.get() is None
+
+
+def test_connections_of_exited_threads_are_closed(db_path):
+    """线程退出后，其连接在下一次新建连接时被关闭并移出连接池"""
+    pool = ReadOnlyConnectionPool("test", lambda: str(db_path))
+    opened = []
+
+    def worker():
+        opened.append(pool.get())
+
+    for _ in range(5):
+        thread = threading.Thread(target=worker)
+        thread.start()
+        thread.join()
+
+    pool.get()
+    assert pool.size() == 1
+    with pytest.raises(sqlite3.ProgrammingError):
+        opened[0].execute("SELECT 1")
+    pool.close_all()
+    assert pool.size() == 0
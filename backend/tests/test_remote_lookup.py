@@ -0,0 +1,217 @@
+import asyncio
+import json
+import threading
+import time
+from http.server import BaseHTTPRequestHandler, ThreadingHTTPServer
+
+import pytest
+
+from app.services import dict_service
+from app.services import supplier_factory
+from app.services.remote_lookup import AI_SOURCE, FREE_DICT_SOURCE, CircuitBreaker, RemoteLookupClient
+
+
+class StubDictionaryServer:
+    """本地 Free Dictionary API 桩：记录每个单词的请求次数和最大并发数"""
+
+    def __init__(self, delay: float = 0.1):
+        self.delay = delay
+        self.hits = {}
+        self.active = 0
+        self.max_active = 0
+        self._lock = threading.Lock()
+        stub = self
+
+        class Handler(BaseHTTPRequestHandler):
+            def do_GET(self):
+                word = self.path.rsplit("/", 1)[-1]
+                with stub._lock:
+                    stub.hits[word] = stub.hits.get(word, 0) + 1
+                    stub.active += 1
+                    stub.max_active = max(stub.max_active, stub.active)
+                try:
+                    time.sleep(stub.delay)
+                    if word == "missing":
+                        self._reply(404, {"title": "No Definitions Found"})
+                    elif word == "boom":
+                        self._reply(500, {"error": "internal"})
+                    else:
+                        self._reply(200, [{"word": word, "phonetic": f"/{word}/", "meanings": []}])
+                finally:
+                    with stub._lock:
+                        stub.active -= 1
+
+            def _reply(self, status, payload):
+                body = json.dumps(payload).encode("utf-8")
+                self.send_response(status)
+                self.send_header("Content-Type", "application/json")
+                self.send_header("Content-Length", str(len(body)))
+                self.end_headers()
+                self.wfile.write(body)
+
+            def log_message(self, format, *args):
+                pass
+
+        self.server = ThreadingHTTPServer(("127.0.0.1", 0), Handler)
+        self.url = f"http://127.0.0.1:{self.server.server_address[1]}/api/v2/entries/en/{{word}}"
+        self._thread = threading.Thread(target=self.server.serve_forever, daemon=True)
+        self._thread.start()
+
+    def close(self):
+        self.server.shutdown()
+        self.server.server_close()
+
+
+@pytest.fixture
+def stub_server():
+    server = StubDictionaryServer()
+    yield server
+    server.close()
+
+
+@pytest.fixture
+def make_client(stub_server):
+    clients = []
+
+    def factory(**kwargs):
+        client = RemoteLookupClient(free_dict_url=stub_server.url, **kwargs)
+        clients.append(client)
+        return client
+
+    yield factory
+    for client in clients:
+        client.close()
+
+
+def _gather(client, words):
+    async def run():
+        return await asyncio.gather(*(client.free_dictionary(word) for word in words))
+
+    return asyncio.run(run())
+
+
+def test_identical_inflight_words_are_coalesced(stub_server, make_client):
+    client = make_client()
+    results = _gather(client, ["apple"] * 5)
+
+    assert stub_server.hits["apple"] == 1
+    assert all(result == [{"word": "apple", "phonetic": "/apple/", "meanings": []}] for result in results)
+    assert client.stats()["coalesced"] == 4
+
+    # 同步调用方共享同一个事件循环和连接池
+    assert client.run_sync(client.free_dictionary("apple"))[0]["word"] == "apple"
+    assert stub_server.hits["apple"] == 2
+
+
+def test_per_host_concurrency_is_limited(stub_server, make_client):
+    client = make_client(per_host_limit=2)
+    words = [f"word{i}" for i in range(6)]
+    results = _gather(client, words)
+
+    assert [result[0]["word"] for result in results] == words
+    assert stub_server.max_active == 2
+
+
+def test_breaker_skips_source_after_repeated_failures(stub_server, make_client):
+    now = [0.0]
+    client = make_client()
+    client.breakers[FREE_DICT_SOURCE] = CircuitBreaker(FREE_DICT_SOURCE, failure_threshold=2, cooldown=30, clock=lambda: now[0])
+
+    # 404 表示未收录，不计入失败
+    for _ in range(3):
+        assert client.run_sync(client.free_dictionary("missing")) is None
+    assert client.breakers[FREE_DICT_SOURCE].state == CircuitBreaker.CLOSED
+
+    for _ in range(2):
+        assert client.run_sync(client.free_dictionary("boom")) is None
+    assert client.breakers[FREE_DICT_SOURCE].state == CircuitBreaker.OPEN
+
+    # 冷却期内直接跳过，不再请求
+    assert client.run_sync(client.free_dictionary("apple")) is None
+    assert "apple" not in stub_server.hits
+    assert client.stats()["skipped"] == 1
+
+    # 冷却结束后放行一次试探请求，成功即恢复
+    now[0] += 31
+    assert client.run_sync(client.free_dictionary("apple"))[0]["word"] == "apple"
+    assert client.breakers[FREE_DICT_SOURCE].state == CircuitBreaker.CLOSED
+
+
+def test_half_open_trial_failure_reopens_breaker():
+    now = [0.0]
+    breaker = CircuitBreaker("stub", failure_threshold=1, cooldown=10, clock=lambda: now[0])
+    breaker.record_failure()
+    assert not breaker.allow()
+
+    now[0] += 10
+    assert breaker.allow()
+    # 试探请求在途时其他请求仍被跳过
+    assert not breaker.allow()
+    breaker.record_failure()
+    assert breaker.state == CircuitBreaker.OPEN
+    assert not breaker.allow()
+
+
+def test_ai_breaker_counts_only_supplier_errors(make_client, monkeypatch):
+    class StubFactory:
+        active = None
+
+        def get_active_supplier_config(self):
+            return self.active
+
+    factory = StubFactory()
+    calls = []
+
+    def fake_chat(prompt, raise_errors=False, **kwargs):
+        calls.append(prompt)
+        if prompt == "boom":
+            raise RuntimeError("supplier down")
+        return "" if prompt == "empty" else "ok"
+
+    monkeypatch.setattr(supplier_factory, "get_supplier_factory", lambda: factory)
+    monkeypatch.setattr(supplier_factory, "chat_with_active_supplier", fake_chat)
+    client = make_client(failure_threshold=2)
+    breaker = client.breakers[AI_SOURCE]
+
+    # 未配置供应商：不发起调用，也不计入失败
+    for _ in range(3):
+        assert client.run_sync(client.ai_chat("hello")) is None
+    assert calls == []
+    assert breaker.stats() == {"state": CircuitBreaker.CLOSED, "failures": 0}
+
+    # 供应商正常但回复为空不算失败
+    factory.active = object()
+    assert client.run_sync(client.ai_chat("empty")) == ""
+    assert breaker.stats()["failures"] == 0
+
+    for _ in range(2):
+        assert client.run_sync(client.ai_chat("boom")) is None
+    assert breaker.state == CircuitBreaker.OPEN
+    assert client.stats()["failures"] == 2
+
+
+def test_lookup_word_async_uses_remote_client(stub_server, make_client, monkeypatch):
+    class StubDictManager:
+        def get_config_version(self):
+            return 1
+
+        def lookup_word(self, word, source=None):
+            return None
+
+    saved = []
+    monkeypatch.setattr(dict_service, "get_dict_manager", lambda: StubDictManager())
+    monkeypatch.setattr(dict_service.ecdict_service, "get_word_details", lambda word: None)
+    monkeypatch.setattr(dict_service.cache_service, "save_dictionary_cache", lambda db, word, data: saved.append(word))
+    client = make_client()
+    monkeypatch.setattr(dict_service, "get_remote_client", lambda: client)
+    dict_service.get_lookup_cache().invalidate()
+
+    db = object()  # 只用于写入查词结果缓存（已替换为桩）
+    result = asyncio.run(dict_service.lookup_word_async(db, "Quokka", source="StubDict"))
+    assert result["word"] == "quokka"
+    assert result["phonetic"] == "/quokka/"
+    assert saved == ["quokka"]
+
+    # 第二次从查词缓存返回，不再请求远程
+    asyncio.run(dict_service.lookup_word_async(db, "quokka", source="StubDict"))
+    assert stub_server.hits["quokka"] == 1
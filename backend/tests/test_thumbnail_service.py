@@ -4,6 +4,7 @@ import pytest
 import tempfile
 import shutil
 from pathlib import Path
+from app.services.image_output import ImageOutput
 from app.services.thumbnail_service import ThumbnailService
 
 
@@ -158,3 +159,116 @@ class TestThumbnailServiceDeleteThumbnails:
             pytest.fail(f"delete_thumbnails 抛出了异常: {e}")
 
         shutil.rmtree(temp_dir)
+
+
+class TestThumbnailServiceGenerate:
+    """测试 PyMuPDF 缩略图生成"""
+
+    @pytest.fixture
+    def pdf_path(self, tmp_path):
+        import fitz
+
+        path = tmp_path / "book.pdf"
+        doc = fitz.open()
+        for i in range(3):
+            page = doc.new_page(width=200, height=300)
+            page.insert_text((20, 40), f"Page {i + 1}")
+        doc.save(path)
+        doc.close()
+        return path
+
+    def test_generate_thumbnails_page_range(self, tmp_path, pdf_path):
+        """测试按页段生成缩略图，已存在的跳过"""
+        service = ThumbnailService(tmp_path / "uploads", output=ImageOutput("png"))
+        thumbnails_dir = service.get_thumbnails_dir("book-1")
+        (thumbnails_dir / "page_1.png").write_bytes(b"existing")
+
+        assert service.generate_thumbnails(str(pdf_path), "book-1", start=1, end=3) is True
+
+        assert (thumbnails_dir / "page_1.png").read_bytes() == b"existing"
+        assert (thumbnails_dir / "page_2.png").read_bytes().startswith(b"\x89PNG")
+        assert not (thumbnails_dir / "page_3.png").exists()
+        assert not list(thumbnails_dir.glob(".*.tmp"))
+
+    def test_ensure_thumbnail_renders_once(self, tmp_path, pdf_path):
+        """测试按需渲染并缓存，超出页数返回 None"""
+        service = ThumbnailService(tmp_path / "uploads")
+
+        path = service.ensure_thumbnail(str(pdf_path), "book-1", 3)
+        assert path == tmp_path / "uploads" / "thumbnails" / "book-1" / f"page_3{service.output.extension}"
+        mtime = path.stat().st_mtime_ns
+        assert service.ensure_thumbnail(str(pdf_path), "book-1", 3).stat().st_mtime_ns == mtime
+        assert service.ensure_thumbnail(str(pdf_path), "book-1", 4) is None
+
+    def test_lazy_mode_skips_background_generation(self, tmp_path, pdf_path, monkeypatch):
+        """测试 lazy 模式下不提交后台任务"""
+        from app.services import thumbnail_service
+
+        monkeypatch.setattr(thumbnail_service, "THUMBNAIL_MODE", "lazy")
+        assert ThumbnailService(tmp_path / "uploads").schedule_thumbnails(str(pdf_path), "book-1") == []
+
+    def test_schedule_thumbnails_in_background_pool(self, tmp_path, pdf_path, monkeypatch):
+        """测试后台进程池按页段生成全部缩略图"""
+        from app.services import thumbnail_service
+
+        monkeypatch.setattr(thumbnail_service, "THUMBNAIL_MODE", "background")
+        monkeypatch.setattr(thumbnail_service, "THUMBNAIL_PAGES_PER_TASK", 2)
+        service = ThumbnailService(tmp_path / "uploads")
+        try:
+            futures = service.schedule_thumbnails(str(pdf_path), "book-1")
+            assert len(futures) == 2
+            assert all(future.result(timeout=60) for future in futures)
+        finally:
+            thumbnail_service.shutdown_thumbnail_pool()
+
+        thumbnails_dir = tmp_path / "uploads" / "thumbnails" / "book-1"
+        ext = service.output.extension
+        assert sorted(p.name for p in thumbnails_dir.glob(f"*{ext}")) == [f"page_{i}{ext}" for i in (1, 2, 3)]
+
+    def test_background_task_does_not_recreate_deleted_book_dir(self, tmp_path, pdf_path):
+        """测试书籍删除后后台任务不再重新创建缩略图目录"""
+        from concurrent.futures import Future
+
+        from app.services import thumbnail_service
+
+        service = ThumbnailService(tmp_path / "uploads")
+        pending = Future()
+        thumbnail_service._track_task("book-1", pending)
+        service.get_thumbnails_dir("book-1")
+
+        service.delete_thumbnails("book-1")
+        assert pending.cancelled()
+        assert "book-1" not in thumbnail_service._pending_tasks
+
+        # 已开始的任务：目录不存在时直接停止，不写入孤立文件
+        result = thumbnail_service._generate_page_range(
+            str(tmp_path / "uploads"), service.output, 0, str(pdf_path), "book-1", 100, 1, 3
+        )
+        assert result is True
+        assert not (tmp_path / "uploads" / "thumbnails" / "book-1").exists()
+
+    def test_output_format_and_legacy_png(self, tmp_path, pdf_path):
+        """测试按配置格式输出，同时仍能找到旧版 PNG 缩略图"""
+        service = ThumbnailService(tmp_path / "uploads", output=ImageOutput("jpeg", 60))
+        thumbnails_dir = service.get_thumbnails_dir("book-1")
+        (thumbnails_dir / "page_1.png").write_bytes(b"legacy")
+
+        service.generate_thumbnails(str(pdf_path), "book-1")
+
+        assert service.get_thumbnail_file("book-1", 1) == thumbnails_dir / "page_1.png"
+        assert service.get_thumbnail_path("book-1", 1) == "uploads/thumbnails/book-1/page_1.png"
+        assert (thumbnails_dir / "page_2.jpg").read_bytes().startswith(b"\xff\xd8")
+        assert not (thumbnails_dir / "page_2.png").exists()
+
+    def test_storage_budget_limits_page_size(self, tmp_path, pdf_path):
+        """测试每本书的存储预算按页均摊，超出时降质缩小"""
+        unlimited = ThumbnailService(tmp_path / "a", output=ImageOutput("jpeg", 90), budget_bytes=0)
+        unlimited.generate_thumbnails(str(pdf_path), "book-1")
+        full_size = sum(p.stat().st_size for p in (tmp_path / "a" / "thumbnails" / "book-1").iterdir())
+
+        budget = full_size // 2
+        limited = ThumbnailService(tmp_path / "b", output=ImageOutput("jpeg", 90), budget_bytes=budget)
+        limited.generate_thumbnails(str(pdf_path), "book-1")
+        limited_size = sum(p.stat().st_size for p in (tmp_path / "b" / "thumbnails" / "book-1").iterdir())
+
+        assert limited_size <= budget
@@ -0,0 +1,70 @@
+import pytest
+
+from app.utils.words_codec import (
+    WORDS_FORMAT_VERSION,
+    PackedWords,
+    encode_words_for_storage,
+    load_word_texts,
+    load_words,
+    pack_words,
+    unpack_words,
+)
+
+
+PDF_WORDS = [
+    {"text": "Chapter", "x": 72.02400207519531, "y": 51.5, "width": 60.25, "height": 16.0, "block_id": 0},
+    {"text": "naïve", "x": 50.0, "y": 100.75, "width": 31.125, "height": 10.5, "block_id": 1},
+    {"text": "東京", "x": 307.5, "y": 100.75, "width": 18.0, "height": 10.5, "block_id": 2},
+]
+TXT_WORDS = [
+    {"text": "quick", "x": 0, "y": 0, "width": 50, "height": 20},
+    {"text": "fox", "x": 60, "y": 0, "width": 30, "height": 20},
+]
+
+
+def test_round_trip_pdf_words():
+    """测试 PDF 单词（float 坐标 + block_id）往返一致"""
+    assert unpack_words(pack_words(PDF_WORDS)) == PDF_WORDS
+
+
+def test_round_trip_integer_coordinates():
+    """测试整数坐标解码后仍为 int，且没有 block_id 键"""
+    decoded = unpack_words(pack_words(TXT_WORDS))
+    assert decoded == TXT_WORDS
+    assert all(type(word["x"]) is int for word in decoded)
+    assert unpack_words(pack_words([])) == []
+
+
+def test_packed_words_is_lazy_sequence():
+    """测试惰性视图：长度、下标、切片和只取文本"""
+    words = PackedWords(pack_words(PDF_WORDS))
+    assert len(words) == 3
+    assert words.texts() == ["Chapter", "naïve", "東京"]
+    assert words._columns is None
+    assert words[-1] == PDF_WORDS[-1]
+    assert words[:2] == PDF_WORDS[:2]
+    with pytest.raises(IndexError):
+        words[3]
+
+
+def test_rejects_unknown_version_and_data():
+    """测试版本不匹配或不是打包数据时报错"""
+    blob = bytearray(pack_words(TXT_WORDS))
+    blob[3] = WORDS_FORMAT_VERSION + 1
+    with pytest.raises(ValueError):
+        PackedWords(bytes(blob))
+    with pytest.raises(ValueError):
+        PackedWords(b'[{"text": "a"}]')
+
+
+def test_storage_falls_back_to_json_for_unknown_fields():
+    """测试含未知字段的单词保留 JSON 形式"""
+    words = [{"text": "a", "x": 1, "y": 2, "width": 3, "height": 4, "furigana": "あ"}]
+    assert encode_words_for_storage(words) == (words, None)
+    assert load_words(words, None) == words
+    assert load_word_texts(words, None) == ["a"]
+
+    words_data, words_packed = encode_words_for_storage(TXT_WORDS)
+    assert words_data is None
+    assert load_words(None, words_packed).to_list() == TXT_WORDS
+    assert load_word_texts(None, words_packed) == ["quick", "fox"]
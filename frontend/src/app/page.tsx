@@ -196,6 +196,7 @@ function BookCardContent({
                 book.status === 'failed' ? 'bg-red-100 text-red-700' : 'bg-blue-100 text-blue-700'
               }`}>
                 {book.status}
+                {book.status === 'processing' && book.total_pages > 0 && ` ${book.processed_pages ?? 0}/${book.total_pages}`}
               </span>
             )}
           </div>
@@ -204,23 +204,39 @@ function ReaderContent() {
     setIsContentLoading(true);
     log.debug('Fetching page data', { page: currentPage });
     const controller = new AbortController();
-
-    fetch(`${getApiUrl()}/api/books/${id}/pages/${currentPage}`, { signal: controller.signal })
-      .then((res) => res.json())
-      .then((data) => {
-        log.debug('Page data received', {
-          textContentLength: data?.text_content?.length || 0
+    let retryTimer: ReturnType<typeof setTimeout> | null = null;
+
+    const loadPage = () => {
+      fetch(`${getApiUrl()}/api/books/${id}/pages/${currentPage}`, { signal: controller.signal })
+        .then((res) => {
+          // 书籍仍在入库、该页尚未写入：按 Retry-After 稍后重试
+          const retryAfter = res.headers.get('Retry-After');
+          if (res.status === 404 && retryAfter) {
+            retryTimer = setTimeout(loadPage, (Number(retryAfter) || 1) * 1000);
+            return undefined;
+          }
+          return res.json();
+        })
+        .then((data) => {
+          if (data === undefined) return;
+          log.debug('Page data received', {
+            textContentLength: data?.text_content?.length || 0
+          });
+          setPageData(data);
+        })
+        .catch((err) => {
+          if (err?.name === 'AbortError') {
+            return;
+          }
+          log.error('Failed to fetch page data', err);
         });
-        setPageData(data);
-      })
-      .catch((err) => {
-        if (err?.name === 'AbortError') {
-          return;
-        }
-        log.error('Failed to fetch page data', err);
-      });
+    };
+    loadPage();
 
-    return () => controller.abort();
+    return () => {
+      controller.abort();
+      if (retryTimer) clearTimeout(retryTimer);
+    };
   }, [id, currentPage]);
 
   // Save reading progress (debounced)
@@ -1,5 +1,5 @@
 import { useState, useRef } from 'react';
-import { importDict } from '../lib/api';
+import { importDict, cancelDictImportJob } from '../lib/api';
 
 interface DictImportDialogProps {
   onClose: () => void;
@@ -13,6 +13,8 @@ export function DictImportDialog({ onClose, onImportComplete }: DictImportDialog
   const [progress, setProgress] = useState(0);
   const [importPhase, setImportPhase] = useState<'uploading' | 'parsing' | 'done'>('uploading');
   const [error, setError] = useState('');
+  const [jobId, setJobId] = useState<string | null>(null);
+  const [cancelling, setCancelling] = useState(false);
 
   const fileInputRef = useRef<HTMLInputElement>(null);
 
@@ -35,15 +37,29 @@ export function DictImportDialog({ onClose, onImportComplete }: DictImportDialog
     setImportPhase('uploading');
     setProgress(0);
     setError('');
+    setJobId(null);
+    setCancelling(false);
 
     try {
-      await importDict(file, name || undefined, (percent) => {
-        const pct = Math.round(percent);
-        setProgress(pct);
-        if (pct >= 100) {
+      await importDict(
+        file,
+        name || undefined,
+        (percent) => {
+          const pct = Math.round(percent);
+          setProgress(pct);
+          if (pct >= 100) {
+            setImportPhase('parsing');
+          }
+        },
+        (job) => {
+          // 后台建索引阶段：按已处理词条数显示进度
           setImportPhase('parsing');
+          if (job.job_id) setJobId(job.job_id);
+          if (job.entries_total > 0) {
+            setProgress(Math.round((job.entries_indexed / job.entries_total) * 100));
+          }
         }
-      });
+      );
       // Ensure it hits 100% on completion
       setProgress(100);
       setImportPhase('parsing');
@@ -55,8 +71,22 @@ export function DictImportDialog({ onClose, onImportComplete }: DictImportDialog
         onClose();
       }, 500);
     } catch (error: any) {
-      setError(error.message || '导入失败');
+      setError(error.message === 'Import cancelled' ? '已取消导入' : error.message || '导入失败');
       setImporting(false);
+      setCancelling(false);
+      setJobId(null);
+    }
+  };
+
+  const handleCancelImport = async () => {
+    if (!jobId) return;
+    setCancelling(true);
+    try {
+      // 后端在下一个批次边界停止并清理，轮询随后以 cancelled 结束
+      await cancelDictImportJob(jobId);
+    } catch (error: any) {
+      setError(error.message || '取消导入失败');
+      setCancelling(false);
     }
   };
 
@@ -164,13 +194,22 @@ export function DictImportDialog({ onClose, onImportComplete }: DictImportDialog
             >
               {importing ? '导入中...' : '开始导入'}
             </button>
-            <button
-              onClick={onClose}
-              disabled={importing}
-              className="flex-1 border py-2 rounded disabled:border-gray-300"
-            >
-              取消
-            </button>
+            {importing ? (
+              <button
+                onClick={handleCancelImport}
+                disabled={!jobId || cancelling}
+                className="flex-1 border border-red-300 text-red-600 py-2 rounded disabled:border-gray-300 disabled:text-gray-400"
+              >
+                {cancelling ? '正在取消...' : '取消导入'}
+              </button>
+            ) : (
+              <button
+                onClick={onClose}
+                className="flex-1 border py-2 rounded disabled:border-gray-300"
+              >
+                取消
+              </button>
+            )}
           </div>
         </div>
       </div>
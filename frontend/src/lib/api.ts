@@ -64,6 +64,7 @@ export interface Book {
   format: string;
   cover_image: string | null;
   total_pages: number;
+  processed_pages?: number | null;
   status: "processing" | "completed" | "failed";
   book_type?: string;
   language?: string | null;
@@ -194,6 +195,61 @@ export async function lookupWordMultipleSources(word: string, sources: string[])
   };
 }
 
+export interface BatchLookupItem {
+  word: string;
+  lookup_term: string;
+  found: boolean;
+  result: any | null;
+}
+
+// Batch dictionary lookup: results stream back as NDJSON, onItem fires for each line as it arrives
+export async function lookupWordsBatch(
+  words: string[],
+  onItem?: (item: BatchLookupItem) => void,
+  options: { fallback?: boolean; signal?: AbortSignal } = {},
+): Promise<BatchLookupItem[]> {
+  const res = await fetch(`${API_URL}/api/dict/batch`, {
+    method: "POST",
+    headers: { "Content-Type": "application/json" },
+    body: JSON.stringify({ words, fallback: options.fallback ?? false }),
+    signal: options.signal,
+  });
+  if (!res.ok || !res.body) {
+    let detail = "Batch lookup failed";
+    try {
+      const errorData = await res.json();
+      detail = errorData.detail || detail;
+    } catch {
+      detail = `Batch lookup failed (HTTP ${res.status})`;
+    }
+    throw new Error(detail);
+  }
+
+  const items: BatchLookupItem[] = [];
+  const reader = res.body.getReader();
+  const decoder = new TextDecoder();
+  let buffer = "";
+
+  const emit = (line: string) => {
+    if (!line.trim()) return;
+    const item = JSON.parse(line) as BatchLookupItem;
+    items.push(item);
+    onItem?.(item);
+  };
+
+  while (true) {
+    const { done, value } = await reader.read();
+    if (done) break;
+    buffer += decoder.decode(value, { stream: true });
+    const lines = buffer.split("\n");
+    buffer = lines.pop() ?? "";
+    lines.forEach(emit);
+  }
+  emit(buffer + decoder.decode());
+
+  return items;
+}
+
 // Check word sources
 export async function checkWordSources(
   word: string,
@@ -878,6 +934,35 @@ export async function deleteDict(dictName: string): Promise<void> {
   if (!res.ok) throw new Error('Failed to delete dict');
 }
 
+/**
+ * 轮询词典导入任务直到完成
+ */
+export async function waitForDictImportJob(
+  jobId: string,
+  onJobProgress?: (job: any) => void,
+  interval = 1000
+): Promise<any> {
+  for (;;) {
+    const res = await fetchWithTimeout(`${API_URL}/api/dicts/import/${jobId}`, 5000);
+    if (!res.ok) throw new Error(`Failed to get import job: ${res.status}`);
+    const job = await res.json();
+    onJobProgress?.(job);
+    if (job.status === 'completed') return { message: '词典导入成功', dict: job.result, job };
+    if (job.status === 'failed') throw new Error(job.error || 'Import failed');
+    if (job.status === 'cancelled') throw new Error('Import cancelled');
+    await new Promise((r) => setTimeout(r, interval));
+  }
+}
+
+/**
+ * 取消词典导入任务
+ */
+export async function cancelDictImportJob(jobId: string): Promise<any> {
+  const res = await fetchWithTimeout(`${API_URL}/api/dicts/import/${jobId}`, 5000, { method: 'DELETE' });
+  if (!res.ok) throw new Error(`Failed to cancel import job: ${res.status}`);
+  return res.json();
+}
+
 /**
  * 导入词典
  * @param file - MDX 文件
@@ -886,7 +971,8 @@ export async function deleteDict(dictName: string): Promise<void> {
 export function importDict(
   file: File,
   name?: string,
-  onProgress?: (progress: number) => void
+  onProgress?: (progress: number) => void,
+  onJobProgress?: (job: any) => void
 ): Promise<any> {
   return new Promise((resolve, reject) => {
     const formData = new FormData();
@@ -906,13 +992,21 @@ export function importDict(
 
     xhr.onload = () => {
       if (xhr.status >= 200 && xhr.status < 300) {
+        let response: any;
         try {
-          const response = JSON.parse(xhr.responseText);
-          resolve(response);
+          response = JSON.parse(xhr.responseText);
         } catch {
           // If response is not JSON
           resolve(xhr.responseText);
+          return;
+        }
+        // 上传完成后后端在后台建立索引，轮询任务直到结束
+        const jobId = response?.job?.job_id;
+        if (!jobId) {
+          resolve(response);
+          return;
         }
+        waitForDictImportJob(jobId, onJobProgress).then(resolve, reject);
       } else {
         try {
           const errorData = JSON.parse(xhr.responseText);
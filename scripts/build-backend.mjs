@@ -21,6 +21,22 @@ if (!pyinstallerPath) {
   process.exit(1);
 }
 
+// The lemma table (static/ecdict_lemmas.db) is derived from ECDICT's exchange
+// field and must ship with every build; backend.spec refuses to build without it.
+const pythonPath = path.join(
+  path.dirname(pyinstallerPath),
+  process.platform === "win32" ? "python.exe" : "python"
+);
+const lemmaResult = spawnSync(pythonPath, ["scripts/build_lemma_table.py"], {
+  cwd: backendDir,
+  stdio: "inherit",
+});
+
+if (lemmaResult.error || lemmaResult.status !== 0) {
+  console.error(lemmaResult.error ?? "Failed to build static/ecdict_lemmas.db");
+  process.exit(lemmaResult.status || 1);
+}
+
 const result = spawnSync(
   pyinstallerPath,
   ["backend.spec", "--noconfirm", "--clean"],